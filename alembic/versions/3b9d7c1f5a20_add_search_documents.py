@@ -0,0 +1,63 @@
+"""Add search documents
+
+Revision ID: 3b9d7c1f5a20
+Revises: 8f2b4d6e1a37
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d7c1f5a20'
+down_revision: Union[str, Sequence[str], None] = '8f2b4d6e1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('search_documents',
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=300), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('entity_type', 'entity_id')
+    )
+    op.create_index(op.f('ix_search_documents_category'), 'search_documents', ['category'], unique=False)
+    op.create_index(op.f('ix_search_documents_status'), 'search_documents', ['status'], unique=False)
+    op.create_index('ix_search_documents_updated_at', 'search_documents', ['updated_at'], unique=False)
+    # Index existing rows; enum columns store member names, the index stores values
+    op.execute(
+        "INSERT INTO search_documents "
+        "(entity_type, entity_id, title, content, status, priority, category, updated_at) "
+        "SELECT 'testcase', id, title, COALESCE(description, '') || ' ' || COALESCE(steps, ''), "
+        "LOWER(status), LOWER(priority), NULL, updated_at FROM testcases"
+    )
+    op.execute(
+        "INSERT INTO search_documents "
+        "(entity_type, entity_id, title, content, status, priority, category, updated_at) "
+        "SELECT 'project', id, name, COALESCE(description, ''), "
+        "LOWER(status), NULL, NULL, updated_at FROM projects"
+    )
+    op.execute(
+        "INSERT INTO search_documents "
+        "(entity_type, entity_id, title, content, status, priority, category, updated_at) "
+        "SELECT 'tag', id, category || ': ' || value, COALESCE(description, ''), "
+        "NULL, NULL, category, updated_at FROM tags"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_search_documents_updated_at', table_name='search_documents')
+    op.drop_index(op.f('ix_search_documents_status'), table_name='search_documents')
+    op.drop_index(op.f('ix_search_documents_category'), table_name='search_documents')
+    op.drop_table('search_documents')
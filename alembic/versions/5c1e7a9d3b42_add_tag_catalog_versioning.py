@@ -0,0 +1,45 @@
+"""Add tag catalog versioning
+
+Revision ID: 5c1e7a9d3b42
+Revises: 193734616fae
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d3b42'
+down_revision: Union[str, Sequence[str], None] = '193734616fae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    catalog_versions = op.create_table('catalog_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(catalog_versions, [{'name': 'tags', 'version': 0}])
+    op.create_table('tag_tombstones',
+    sa.Column('tag_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('catalog_version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tag_id')
+    )
+    op.create_index(op.f('ix_tag_tombstones_catalog_version'), 'tag_tombstones', ['catalog_version'], unique=False)
+    op.add_column('tags', sa.Column('catalog_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_tags_catalog_version'), 'tags', ['catalog_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tags_catalog_version'), table_name='tags')
+    op.drop_column('tags', 'catalog_version')
+    op.drop_index(op.f('ix_tag_tombstones_catalog_version'), table_name='tag_tombstones')
+    op.drop_table('tag_tombstones')
+    op.drop_table('catalog_versions')
@@ -0,0 +1,43 @@
+"""Add change log
+
+Revision ID: 6d4e2a9c8b13
+Revises: 3b9d7c1f5a20
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d4e2a9c8b13'
+down_revision: Union[str, Sequence[str], None] = '3b9d7c1f5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The log starts empty; clients sync existing data through the list endpoints first
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Counter row writers lock to append in order; it must exist before the first write
+    catalog_versions = sa.table(
+        'catalog_versions', sa.column('name', sa.String), sa.column('version', sa.Integer)
+    )
+    op.bulk_insert(catalog_versions, [{'name': 'changes', 'version': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM catalog_versions WHERE name = 'changes'")
+    op.drop_table('change_log')
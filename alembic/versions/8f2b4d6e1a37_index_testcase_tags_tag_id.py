@@ -0,0 +1,28 @@
+"""Index testcase_tags.tag_id for tag usage counts
+
+Revision ID: 8f2b4d6e1a37
+Revises: 5c1e7a9d3b42
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2b4d6e1a37'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a9d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_testcase_tags_tag_id'), 'testcase_tags', ['tag_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_testcase_tags_tag_id'), table_name='testcase_tags')
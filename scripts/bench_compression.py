@@ -0,0 +1,122 @@
+"""
+Benchmark for response compression.
+
+Compresses representative responses (a 100-row TestCasesListPage, a
+CreateTestCasePage with a large inline tag catalog and a JSON list of 100
+test cases) with every available coding at several levels, and prints the
+CPU time per response against the bytes saved.
+
+Usage:
+    uv run python scripts/bench_compression.py [--rows 100] [--tags 500] [--iterations 50]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from fasthtml.common import to_xml
+
+from tcm.compression import AVAILABLE_ENCODINGS
+from tcm.pages.testcases.create import CreateTestCasePage
+from tcm.pages.testcases.list import TestCasesListPage
+from tcm.schemas.testcase import TestCaseListResponse
+
+from scripts.bench_fragment_cache import build_rows
+
+# Levels to compare per coding (the configured defaults are in the middle)
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 11), "zstd": (1, 3, 19)}
+
+
+def build_tags(count: int) -> list[dict]:
+    """Build a tag catalog like the one embedded in the tag picker."""
+    categories = ["module", "component", "feature", "environment", "team"]
+    return [
+        {
+            "id": i,
+            "category": categories[i % len(categories)],
+            "value": f"{categories[i % len(categories)]}-value-{i}",
+            "is_predefined": i % 3 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def build_json(count: int) -> bytes:
+    """Serialize a JSON test case list like GET /api/testcases returns."""
+    now = datetime(2025, 1, 1)
+    testcases = [
+        {
+            "id": i,
+            "title": f"Verify checkout flow variant {i}",
+            "description": "Customer completes checkout with a saved card",
+            "steps": "1. Add item to cart\n2. Open checkout\n3. Pay with saved card",
+            "expected_results": "Order is confirmed and a receipt is emailed",
+            "status": "active",
+            "priority": "medium",
+            "created_at": now,
+            "updated_at": now,
+            "tags": [
+                {
+                    "id": t,
+                    "category": "module",
+                    "value": f"module-{t}",
+                    "is_predefined": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for t in range(3)
+            ],
+        }
+        for i in range(count)
+    ]
+    payload = TestCaseListResponse(testcases=testcases, total=count, skip=0, limit=count)
+    return payload.model_dump_json().encode()
+
+
+def measure(payload: bytes, coding: str, level: int, iterations: int) -> tuple[float, int]:
+    """Return mean CPU milliseconds and compressed size for one coding/level."""
+    compressor_class = AVAILABLE_ENCODINGS[coding]
+    total = 0.0
+    size = 0
+    for _ in range(iterations):
+        start = time.process_time()
+        compressor = compressor_class(level)
+        compressed = compressor.compress(payload, flush=False) + compressor.finish()
+        total += time.process_time() - start
+        size = len(compressed)
+    return total / iterations * 1000, size
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = {
+        f"{args.rows}-row list page": to_xml(
+            TestCasesListPage(testcases=build_rows(args.rows), total=args.rows, page_size=args.rows)
+        ).encode(),
+        f"create page ({args.tags} tags)": to_xml(
+            CreateTestCasePage(available_tags=build_tags(args.tags))
+        ).encode(),
+        f"{args.rows} test cases JSON": build_json(args.rows),
+    }
+
+    print(f"codings available: {', '.join(AVAILABLE_ENCODINGS)}")
+    for name, payload in payloads.items():
+        print(f"\n{name}: {len(payload):,} bytes")
+        for coding in AVAILABLE_ENCODINGS:
+            for level in LEVELS[coding]:
+                cpu_ms, size = measure(payload, coding, level, args.iterations)
+                saved = 1 - size / len(payload)
+                print(
+                    f"  {coding:>4} level {level:>2}: {cpu_ms:7.2f} ms CPU, "
+                    f"{size:>9,} bytes ({saved:6.1%} saved)"
+                )
+
+
+if __name__ == "__main__":
+    main()
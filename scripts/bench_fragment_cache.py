@@ -0,0 +1,84 @@
+"""
+Benchmark for the rendered HTML fragment cache.
+
+Renders a 100-row TestCasesListPage with the fragment cache disabled, cold
+(cleared before every render) and warm, and prints the mean render time and
+the cache hit ratio.
+
+Usage:
+    uv run python scripts/bench_fragment_cache.py [--rows 100] [--iterations 200]
+"""
+
+import argparse
+import time
+
+from fasthtml.common import to_xml
+
+from tcm.pages.components.cache import fragment_cache
+from tcm.pages.testcases.list import TestCasesListPage
+
+
+def build_rows(count: int) -> list[dict]:
+    """Build representative test case rows with a few tags each."""
+    return [
+        {
+            "id": i,
+            "title": f"Verify checkout flow variant {i}",
+            "description": "Customer completes checkout with a saved card",
+            "status": ["draft", "active", "deprecated", "archived"][i % 4],
+            "priority": ["low", "medium", "high", "critical"][i % 4],
+            "updated_at": f"2025-01-01T00:00:{i % 60:02d}",
+            "tags": [
+                {"id": t, "category": "module", "value": f"module-{t}", "is_predefined": True}
+                for t in range(3)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def render(rows: list[dict]) -> str:
+    """Render the full list page to HTML."""
+    return to_xml(TestCasesListPage(testcases=rows, total=len(rows), page_size=len(rows)))
+
+
+def measure(rows: list[dict], iterations: int, before_each=None) -> float:
+    """Return mean render time in milliseconds."""
+    total = 0.0
+    for _ in range(iterations):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        render(rows)
+        total += time.perf_counter() - start
+    return total / iterations * 1000
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+
+    fragment_cache.enabled = False
+    disabled = measure(rows, args.iterations)
+
+    fragment_cache.enabled = True
+    cold = measure(rows, args.iterations, before_each=fragment_cache.clear)
+
+    fragment_cache.clear()
+    render(rows)  # warm up
+    warm = measure(rows, args.iterations)
+
+    print(f"{args.rows}-row TestCasesListPage, {args.iterations} iterations")
+    print(f"  cache disabled: {disabled:8.2f} ms/render")
+    print(f"  cold cache:     {cold:8.2f} ms/render")
+    print(f"  warm cache:     {warm:8.2f} ms/render ({disabled / warm:.1f}x faster)")
+    print(f"  stats: {fragment_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
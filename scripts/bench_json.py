@@ -0,0 +1,202 @@
+"""
+Benchmark for JSON list serialization.
+
+Seeds a temporary SQLite database with test cases carrying three tags each,
+then times one page of ``GET /api/testcases`` at 100 and 1,000 rows in two
+ways:
+
+- validated: ORM objects loaded with their tags, ``TestCaseResponse``
+  validated per row, then validated and serialized again against the
+  ``response_model`` and encoded with ``json.dumps``, as FastAPI does for a
+  returned model
+- fast: response columns selected into dicts and encoded with
+  pydantic-core (``tcm.fast_json``), as the list endpoints now do
+
+Both include the database queries. The bodies are checked to be equal.
+
+It then compares the full representation with ``fields=summary`` (see
+``tcm.fieldsets``): the bytes read from the database for the page's test
+case columns, the response size and the time per page.
+
+Usage:
+    uv run python -m scripts.bench_json [--rows 100 1000] [--iterations 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "tcm_bench_json.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from tcm.aggregates import TESTCASE_LIST_OPTIONS  # noqa: E402
+from tcm.database import Base, async_session_maker, engine  # noqa: E402
+from tcm.fast_json import TESTCASE_RESPONSE_COLUMNS, json_response, load_testcase_rows  # noqa: E402
+from tcm.fieldsets import (  # noqa: E402
+    TESTCASE_FIELDS,
+    TESTCASE_FIELDSETS,
+    parse_fields,
+    selected_columns,
+)
+from tcm.models.associations import testcase_tags  # noqa: E402
+from tcm.models.tag import Tag  # noqa: E402
+from tcm.models.testcase import TestCase  # noqa: E402
+from tcm.schemas.testcase import TestCaseListResponse, TestCaseResponse  # noqa: E402
+
+TAGS_PER_TESTCASE = 3
+
+# Text of a typical test case: a few sentences of description, ten steps
+DESCRIPTION = "Checkout with a saved card for a returning customer. " * 4
+STEPS = "".join(f"{n}. Perform step {n} of the checkout and check the page\n" for n in range(1, 11))
+EXPECTED_RESULTS = "Order confirmed and confirmation e-mail sent. " * 3
+
+response_adapter = TypeAdapter(TestCaseListResponse)
+
+
+async def seed(rows: int):
+    """Create the schema and insert the benchmark data."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Tag),
+            [{"category": f"category_{i % 10}", "value": f"value-{i}"} for i in range(50)],
+        )
+        await conn.execute(
+            insert(TestCase),
+            [
+                {
+                    "title": f"Verify checkout flow variant {i}",
+                    "description": DESCRIPTION,
+                    "steps": STEPS,
+                    "expected_results": EXPECTED_RESULTS,
+                }
+                for i in range(rows)
+            ],
+        )
+        await conn.execute(
+            insert(testcase_tags),
+            [
+                {"testcase_id": i + 1, "tag_id": (i + offset) % 50 + 1}
+                for i in range(rows)
+                for offset in range(TAGS_PER_TESTCASE)
+            ],
+        )
+
+
+async def validated(limit: int) -> bytes:
+    """Serialize a page the way the endpoint did with model validation."""
+    async with async_session_maker() as session:
+        query = (
+            select(TestCase)
+            .options(*TESTCASE_LIST_OPTIONS)
+            .order_by(TestCase.id.desc())
+            .limit(limit)
+        )
+        testcases = (await session.execute(query)).scalars().all()
+        for testcase in testcases:
+            testcase.tags.sort(key=lambda tag: tag.id)
+        response = TestCaseListResponse(
+            testcases=[TestCaseResponse.model_validate(tc) for tc in testcases],
+            total=len(testcases),
+            skip=0,
+            limit=limit,
+        )
+        # FastAPI: dump the returned model, validate against response_model, serialize
+        content = response_adapter.validate_python(response.model_dump())
+        return json.dumps(
+            response_adapter.dump_python(content, mode="json"),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode()
+
+
+async def fast(limit: int, fields: str | None = None) -> bytes:
+    """Serialize a page through the fast JSON path, optionally with a fieldset."""
+    selected = parse_fields(fields, TESTCASE_FIELDS, TESTCASE_FIELDSETS)
+    async with async_session_maker() as session:
+        query = (
+            select(*selected_columns(TESTCASE_RESPONSE_COLUMNS, selected))
+            .order_by(TestCase.id.desc())
+            .limit(limit)
+        )
+        testcases = await load_testcase_rows(session, query, tags="tags" in selected)
+        return json_response(
+            {"testcases": testcases, "total": len(testcases), "skip": 0, "limit": limit}
+        ).body
+
+
+async def summary(limit: int) -> bytes:
+    """Serialize a page through the fast JSON path with fields=summary."""
+    return await fast(limit, "summary")
+
+
+async def db_bytes(limit: int, fields: str | None = None) -> int:
+    """Return the size of the test case column values read for a page."""
+    selected = parse_fields(fields, TESTCASE_FIELDS, TESTCASE_FIELDSETS)
+    async with async_session_maker() as session:
+        query = (
+            select(*selected_columns(TESTCASE_RESPONSE_COLUMNS, selected))
+            .order_by(TestCase.id.desc())
+            .limit(limit)
+        )
+        rows = (await session.execute(query)).all()
+    return sum(len(str(value).encode()) for row in rows for value in row if value is not None)
+
+
+async def measure(render, limit: int, iterations: int) -> float:
+    """Return the mean milliseconds per page over the iterations."""
+    await render(limit)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await render(limit)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+async def run(row_counts: list[int], iterations: int):
+    """Seed once and compare the paths at each page size."""
+    await seed(max(row_counts))
+    print(f"GET /api/testcases, {TAGS_PER_TESTCASE} tags per test case")
+    for limit in row_counts:
+        assert json.loads(await validated(limit)) == json.loads(await fast(limit))
+        validated_ms = await measure(validated, limit, iterations)
+        fast_ms = await measure(fast, limit, iterations)
+        print(
+            f"  {limit:>5} rows: validated {validated_ms:8.2f} ms, "
+            f"fast {fast_ms:8.2f} ms ({validated_ms / fast_ms:4.1f}x)"
+        )
+
+    print("GET /api/testcases vs. ?fields=summary")
+    for limit in row_counts:
+        full_db, summary_db = await db_bytes(limit), await db_bytes(limit, "summary")
+        full_body, summary_body = len(await fast(limit)), len(await summary(limit))
+        full_ms = await measure(fast, limit, iterations)
+        summary_ms = await measure(summary, limit, iterations)
+        print(
+            f"  {limit:>5} rows: from DB {full_db / 1024:7.1f} -> {summary_db / 1024:6.1f} KiB, "
+            f"body {full_body / 1024:7.1f} -> {summary_body / 1024:6.1f} KiB, "
+            f"{full_ms:7.2f} -> {summary_ms:6.2f} ms"
+        )
+    await engine.dispose()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.iterations))
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
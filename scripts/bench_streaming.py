@@ -0,0 +1,208 @@
+"""
+Benchmark for streaming HTML rendering.
+
+Seeds a temporary SQLite database with a 10k-tag catalog and a project with
+10k test cases, then measures time-to-first-byte, total time and peak RSS
+growth for the tags list and project view pages, comparing the streaming
+routes against buffered rendering (full FT tree + ``to_xml``) of the same
+data. Each measurement runs in a fresh subprocess so peak RSS is not shared.
+
+Usage:
+    uv run python -m scripts.bench_streaming [--rows 10000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "tcm_bench_streaming.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+
+from fasthtml.common import to_xml  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from tcm.database import Base, async_session_maker, engine  # noqa: E402
+from tcm.main import app  # noqa: E402
+from tcm.models.associations import project_testcases  # noqa: E402
+from tcm.models.project import Project  # noqa: E402
+from tcm.models.tag import Tag  # noqa: E402
+from tcm.models.testcase import TestCase  # noqa: E402
+from tcm.pages.projects import ViewProjectPage  # noqa: E402
+from tcm.pages.tags import TagsListPage  # noqa: E402
+
+PAGES = {"tags": "/tags", "project": "/projects/1"}
+
+# Near-empty page used to load modules and open the connection before measuring
+WARMUP_PATH = "/tags?category=warmup"
+
+
+async def seed(rows: int):
+    """Create the schema and insert the benchmark data."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        categories = [f"category_{i}" for i in range(40)]
+        await conn.execute(
+            insert(Tag),
+            [
+                {
+                    "category": categories[i % len(categories)],
+                    "value": f"value-{i:05d}",
+                    "description": f"Benchmark tag {i}",
+                    "is_predefined": i % 7 == 0,
+                }
+                for i in range(rows)
+            ],
+        )
+        await conn.execute(
+            insert(TestCase),
+            [
+                {
+                    "title": f"Verify checkout flow variant {i}",
+                    "steps": "1. Add item\n2. Checkout",
+                    "expected_results": "Order confirmed",
+                }
+                for i in range(rows)
+            ],
+        )
+        await conn.execute(insert(Project), [{"name": "Benchmark project"}])
+        await conn.execute(
+            insert(project_testcases),
+            [{"project_id": 1, "testcase_id": i + 1} for i in range(rows)],
+        )
+
+
+async def render_buffered(page: str) -> tuple[float, float]:
+    """Load all rows and render the full page tree; TTFB equals total time."""
+    start = time.perf_counter()
+    async with async_session_maker() as session:
+        if page == "tags":
+            result = await session.execute(
+                select(Tag.id, Tag.category, Tag.value, Tag.description, Tag.is_predefined)
+                .order_by(Tag.category, Tag.value)
+            )
+            tags = [dict(row) for row in result.mappings()]
+            categories = sorted({tag["category"] for tag in tags})
+            html = to_xml(TagsListPage(tags=tags, categories=categories))
+        else:
+            project = await session.get(Project, 1)
+            testcases = (await session.execute(select(TestCase))).scalars().all()
+            rows = [
+                {
+                    "id": tc.id,
+                    "title": tc.title,
+                    "status": tc.status.value,
+                    "priority": tc.priority.value,
+                    "updated_at": tc.updated_at.isoformat(),
+                }
+                for tc in testcases
+            ]
+            html = to_xml(
+                ViewProjectPage(
+                    project={
+                        "id": project.id,
+                        "name": project.name,
+                        "status": project.status.value,
+                    },
+                    testcases=rows,
+                )
+            )
+    elapsed = time.perf_counter() - start
+    assert html
+    return elapsed, elapsed
+
+
+async def render_streaming(page: str) -> tuple[float, float]:
+    """Request the streaming route through the ASGI app and time the first byte."""
+    return await request(PAGES[page])
+
+
+async def request(url: str) -> tuple[float, float]:
+    """Send a GET through the ASGI app; return (time to first body byte, total time)."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 1234),
+        "root_path": "",
+    }
+    start = time.perf_counter()
+    first_byte = None
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal first_byte
+        if message["type"] == "http.response.body" and message.get("body") and first_byte is None:
+            first_byte = time.perf_counter() - start
+
+    await app(scope, receive, send)
+    return first_byte, time.perf_counter() - start
+
+
+def run_child(page: str, mode: str):
+    """Measure one page/mode and print the result as JSON."""
+    render = render_streaming if mode == "streaming" else render_buffered
+
+    async def measure():
+        await request(WARMUP_PATH)
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        ttfb, total = await render(page)
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"ttfb": ttfb, "total": total, "rss_growth_kb": after - before}
+
+    print(json.dumps(asyncio.run(measure())))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--child", nargs=2, metavar=("PAGE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    asyncio.run(seed(args.rows))
+    print(f"{args.rows} rows per page")
+    for page in PAGES:
+        for mode in ("buffered", "streaming"):
+            output = subprocess.run(
+                [sys.executable, "-m", "scripts.bench_streaming", "--child", page, mode],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"  {page:>8} {mode:>9}: TTFB {result['ttfb'] * 1000:8.1f} ms, "
+                f"total {result['total'] * 1000:8.1f} ms, "
+                f"peak RSS +{result['rss_growth_kb'] / 1024:6.1f} MB"
+            )
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Aggregate membership and usage counts.
+
+List views show how many test cases belong to a project or use a tag.
+Computing that with ``len(project.testcases)`` loads every associated test
+case (and, through the selectin cascade, their tags and projects) per row.
+These helpers count the association tables instead, in grouped subqueries
+that are outer-joined to the page query, so a page costs one query however
+large its collections are.
+"""
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+
+from tcm.models.associations import project_testcases, testcase_tags
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+# Loader options for test case list views: each row's tags, but neither the
+# tags' other test cases nor the test cases' projects
+TESTCASE_LIST_OPTIONS = (
+    selectinload(TestCase.tags).raiseload(Tag.testcases),
+    raiseload(TestCase.projects),
+)
+
+
+def project_testcase_counts():
+    """
+    Grouped subquery with the number of test cases in each project.
+
+    Returns:
+        Subquery with columns project_id and testcase_count
+    """
+    return (
+        select(project_testcases.c.project_id, func.count().label("testcase_count"))
+        .group_by(project_testcases.c.project_id)
+        .subquery("project_testcase_counts")
+    )
+
+
+def tag_usage_counts():
+    """
+    Grouped subquery with the number of test cases using each tag.
+
+    Returns:
+        Subquery with columns tag_id and usage_count
+    """
+    return (
+        select(testcase_tags.c.tag_id, func.count().label("usage_count"))
+        .group_by(testcase_tags.c.tag_id)
+        .subquery("tag_usage_counts")
+    )
+
+
+def with_testcase_count(query: Select) -> Select:
+    """
+    Add a testcase_count column to a query selecting projects.
+
+    Args:
+        query: Select statement whose FROM includes Project
+
+    Returns:
+        Select statement yielding (..., testcase_count) rows
+    """
+    counts = project_testcase_counts()
+    return query.outerjoin(counts, counts.c.project_id == Project.id).add_columns(
+        func.coalesce(counts.c.testcase_count, 0).label("testcase_count")
+    )
+
+
+def with_usage_count(query: Select) -> Select:
+    """
+    Add a usage_count column to a query selecting tags.
+
+    Args:
+        query: Select statement whose FROM includes Tag
+
+    Returns:
+        Select statement yielding (..., usage_count) rows
+    """
+    counts = tag_usage_counts()
+    return query.outerjoin(counts, counts.c.tag_id == Tag.id).add_columns(
+        func.coalesce(counts.c.usage_count, 0).label("usage_count")
+    )
+
+
+async def get_testcase_count(session: AsyncSession, project_id: int) -> int:
+    """
+    Count the test cases in a single project.
+
+    Args:
+        session: Database session
+        project_id: Project ID
+
+    Returns:
+        Number of test cases in the project
+    """
+    return await session.scalar(
+        select(func.count())
+        .select_from(project_testcases)
+        .where(project_testcases.c.project_id == project_id)
+    )
+
+
+async def get_usage_count(session: AsyncSession, tag_id: int) -> int:
+    """
+    Count the test cases using a single tag.
+
+    Args:
+        session: Database session
+        tag_id: Tag ID
+
+    Returns:
+        Number of test cases with the tag
+    """
+    return await session.scalar(
+        select(func.count()).select_from(testcase_tags).where(testcase_tags.c.tag_id == tag_id)
+    )
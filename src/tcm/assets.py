@@ -0,0 +1,281 @@
+"""
+Static asset pipeline: fingerprinting, precompression and image variants.
+
+``build_assets`` copies every file under ``static/`` into ``static/dist/``
+with a content hash in its name, writes gzip (and brotli, when the
+``brotli`` package is installed) variants next to compressible files,
+renders resized WebP/AVIF variants of raster images (when ``Pillow`` is
+installed) and records everything in ``static/dist/manifest.json``.
+
+``asset_url`` maps logical paths such as ``css/styles.css`` to their
+fingerprinted URL, falling back to the plain ``/static/...`` URL when no
+manifest has been built. ``AssetStaticFiles`` serves the fingerprinted files
+with ``Cache-Control: immutable`` and negotiates the precompressed variants.
+
+Run the build with:
+    uv run python -m tcm.assets
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+import tempfile
+from functools import cache
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+logger = logging.getLogger("tcm.assets")
+
+STATIC_DIR = Path(__file__).parent / "static"
+BUILD_DIRNAME = "dist"
+MANIFEST_NAME = "manifest.json"
+STATIC_URL = "/static"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# File types worth precompressing (images are already compressed)
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map"}
+
+# Raster images get resized variants in these widths and formats
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+IMAGE_WIDTHS = (64, 128, 256, 512)
+IMAGE_FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+
+# Content codings in server preference order, with their file suffix
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _digest(data: bytes) -> str:
+    """Return the short content hash used in fingerprinted names."""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _fingerprinted_name(relative: Path, data: bytes) -> Path:
+    """Insert the content hash before the suffix (styles.css -> styles.<hash>.css)."""
+    return relative.with_name(f"{relative.stem}.{_digest(data)}{relative.suffix}")
+
+
+def _write_compressed_variants(path: Path, data: bytes) -> list[str]:
+    """Write .gz (and .br if available) next to path; return the encodings written."""
+    encodings = []
+
+    gz_path = path.with_name(path.name + ".gz")
+    with open(gz_path, "wb") as raw, gzip.GzipFile(
+        filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0
+    ) as gz:
+        gz.write(data)
+    encodings.append("gzip")
+
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+        encodings.append("br")
+
+    return encodings
+
+
+def _write_image_variants(source: Path, relative: Path, output_dir: Path) -> dict[str, str]:
+    """Render resized modern-format variants of a raster image."""
+    try:
+        from PIL import Image, features
+    except ImportError:
+        logger.info("Pillow not installed, skipping image variants for %s", relative)
+        return {}
+
+    variants = {}
+    with Image.open(source) as image:
+        image.load()
+        for width in IMAGE_WIDTHS:
+            if width >= image.width:
+                continue
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            for suffix, image_format in IMAGE_FORMATS.items():
+                if not features.check(suffix):
+                    continue
+                logical = relative.with_name(f"{relative.stem}-{width}w.{suffix}")
+                target = output_dir / logical
+                target.parent.mkdir(parents=True, exist_ok=True)
+                resized.save(target, format=image_format, quality=80)
+                data = target.read_bytes()
+                hashed = _fingerprinted_name(logical, data)
+                target.rename(output_dir / hashed)
+                variants[logical.as_posix()] = hashed.as_posix()
+    return variants
+
+
+def build_assets(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """
+    Build fingerprinted, precompressed assets and the manifest.
+
+    The build is written to a staging directory next to ``dist`` and swapped
+    in when complete, so a running server keeps serving the previous build
+    meanwhile.
+
+    Args:
+        static_dir: Source static directory; output goes to ``static_dir/dist``
+
+    Returns:
+        Manifest mapping logical paths to fingerprinted paths
+    """
+    build_dir = static_dir / BUILD_DIRNAME
+    staging_prefix = f".{BUILD_DIRNAME}-"
+    static_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = Path(tempfile.mkdtemp(prefix=staging_prefix, dir=static_dir))
+
+    manifest = {}
+    for source in sorted(static_dir.rglob("*")):
+        relative = source.relative_to(static_dir)
+        top = relative.parts[0]
+        if not source.is_file() or top == BUILD_DIRNAME or top.startswith(staging_prefix):
+            continue
+
+        data = source.read_bytes()
+        hashed = _fingerprinted_name(relative, data)
+        target = output_dir / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        manifest[relative.as_posix()] = hashed.as_posix()
+
+        if source.suffix in COMPRESSIBLE_SUFFIXES:
+            _write_compressed_variants(target, data)
+        if source.suffix.lower() in IMAGE_SUFFIXES:
+            manifest.update(_write_image_variants(source, relative, output_dir))
+
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    # mkdtemp makes the directory private to the building user
+    output_dir.chmod(0o755)
+    _swap_build(output_dir, build_dir)
+    load_manifest.cache_clear()
+    logger.info("Built %d static assets into %s", len(manifest), build_dir)
+    return manifest
+
+
+def _swap_build(output_dir: Path, build_dir: Path) -> None:
+    """Replace the build directory with a finished staging directory."""
+    previous = None
+    if build_dir.exists():
+        # Directories cannot be replaced in one rename, so move the old build aside first
+        previous = Path(tempfile.mkdtemp(prefix=output_dir.name, dir=output_dir.parent))
+        os.replace(build_dir, previous / BUILD_DIRNAME)
+    os.replace(output_dir, build_dir)
+    if previous is not None:
+        shutil.rmtree(previous)
+
+
+@cache
+def load_manifest(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """Load the asset manifest, or an empty mapping if assets were not built."""
+    manifest_path = static_dir / BUILD_DIRNAME / MANIFEST_NAME
+    if not manifest_path.is_file():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def asset_url(path: str) -> str:
+    """
+    Return the URL for a static asset.
+
+    Args:
+        path: Logical path relative to the static directory (e.g. "css/styles.css")
+
+    Returns:
+        Fingerprinted URL if the asset was built, otherwise the plain static URL
+    """
+    hashed = load_manifest().get(path)
+    if hashed:
+        return f"{STATIC_URL}/{BUILD_DIRNAME}/{hashed}"
+    return f"{STATIC_URL}/{path}"
+
+
+def image_srcset(path: str, image_format: str) -> str:
+    """
+    Return a ``srcset`` listing the built variants of a raster image.
+
+    Args:
+        path: Logical path of the source image (e.g. "images/logo.png")
+        image_format: Variant format, a key of ``IMAGE_FORMATS`` (e.g. "webp")
+
+    Returns:
+        Comma-separated "url widthw" candidates, empty if no variant was built
+    """
+    manifest = load_manifest()
+    stem = path.rsplit(".", 1)[0]
+    candidates = []
+    for width in IMAGE_WIDTHS:
+        hashed = manifest.get(f"{stem}-{width}w.{image_format}")
+        if hashed:
+            candidates.append(f"{STATIC_URL}/{BUILD_DIRNAME}/{hashed} {width}w")
+    return ", ".join(candidates)
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Parse an Accept-Encoding header into the set of acceptable codings."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class AssetStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves built assets as immutable, precompressed files.
+
+    Files under ``dist/`` have content hashes in their names, so they are
+    cached for a year and served from their ``.br``/``.gz`` variant when the
+    client accepts it. Other files keep the default revalidation behaviour.
+    """
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope,
+        status_code: int = 200,
+    ) -> Response:
+        build_dir = Path(self.directory) / BUILD_DIRNAME
+        path = Path(full_path)
+        if build_dir not in path.parents or path.name == MANIFEST_NAME:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            if encoding in accepted and variant.is_file():
+                return FileResponse(
+                    variant,
+                    status_code=status_code,
+                    headers={**headers, "Content-Encoding": encoding},
+                    media_type=mimetypes.guess_type(path.name)[0],
+                    stat_result=os.stat(variant),
+                )
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers.update(headers)
+        return response
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for logical, hashed in build_assets().items():
+        print(f"{logical} -> {hashed}")
@@ -0,0 +1,131 @@
+"""
+Change feed over the append-only change log.
+
+``read_changes`` returns the changes after a cursor (a ``change_log`` ID).
+``wait_for_changes`` long-polls: if nothing is newer than the cursor it
+waits until a commit in this process wakes it or, for commits made by other
+processes, until the next periodic check, up to a timeout. No database
+connection is held while waiting.
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tcm.events import on_commit
+from tcm.models.changes import change_log
+
+
+class ChangeNotifier:
+    """Wakes long-polling readers when a transaction commits in this process."""
+
+    def __init__(self):
+        """Initialize the notifier."""
+        # One future per waiter, created on the waiter's own event loop
+        self._waiters: set[asyncio.Future] = set()
+
+    def notify(self) -> None:
+        """Wake all current waiters."""
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for the next commit.
+
+        Args:
+            timeout: Longest time to wait in seconds
+
+        Returns:
+            True if woken by a commit, False on timeout
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            self._waiters.discard(waiter)
+
+
+change_notifier = ChangeNotifier()
+
+
+@on_commit
+def _notify_readers(changes) -> None:
+    """Wake long-polling readers after every committed write."""
+    change_notifier.notify()
+
+
+async def read_changes(session: AsyncSession, since: int, limit: int) -> list[dict]:
+    """
+    Read the changes after a cursor, oldest first.
+
+    Args:
+        session: Database session
+        since: Cursor of the last change already seen (0 for the beginning)
+        limit: Maximum number of changes to return
+
+    Returns:
+        List of change dicts, each with its cursor
+    """
+    result = await session.execute(
+        select(
+            change_log.c.id.label("cursor"),
+            change_log.c.entity_type,
+            change_log.c.entity_id,
+            change_log.c.related_id,
+            change_log.c.action,
+            change_log.c.changed_at,
+        )
+        .where(change_log.c.id > since)
+        .order_by(change_log.c.id)
+        .limit(limit)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def latest_cursor(session: AsyncSession) -> int:
+    """
+    Return the cursor of the newest change (0 if the log is empty).
+
+    Args:
+        session: Database session
+    """
+    result = await session.execute(select(func.coalesce(func.max(change_log.c.id), 0)))
+    return result.scalar_one()
+
+
+async def wait_for_changes(
+    session_factory: async_sessionmaker[AsyncSession],
+    since: int,
+    limit: int,
+    wait: float,
+    poll_interval: float,
+) -> list[dict]:
+    """
+    Read the changes after a cursor, waiting for new ones if there are none.
+
+    Args:
+        session_factory: Factory for the short sessions of each check
+        since: Cursor of the last change already seen
+        limit: Maximum number of changes to return
+        wait: Longest time to wait for changes in seconds (0 to return at once)
+        poll_interval: Longest time between checks in seconds
+
+    Returns:
+        List of change dicts; empty if none arrived in time
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        async with session_factory() as session:
+            changes = await read_changes(session, since, limit)
+        remaining = deadline - time.monotonic()
+        if changes or remaining <= 0:
+            return changes
+        await change_notifier.wait(min(poll_interval, remaining))
@@ -0,0 +1,46 @@
+"""
+Command line interface (``tcm``).
+
+Commands:
+    serve   Run the production server (see ``tcm.server``)
+"""
+
+import argparse
+import logging
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run a tcm command.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(prog="tcm", description="Test Case Management")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser(
+        "serve", help="Run the production server with several worker processes"
+    )
+    serve_parser.add_argument("--host", help="Address to bind (default: HOST setting)")
+    serve_parser.add_argument("--port", type=int, help="Port to bind (default: PORT setting)")
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: SERVER_WORKERS setting, 0 for one per CPU core)",
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if args.command == "serve":
+        from tcm.server import serve
+
+        serve(host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Negotiated response compression middleware.
+
+Compresses HTML, JSON and other text responses with the best coding the
+client accepts: brotli (``brotli`` package), zstd (``zstandard`` package)
+or gzip (always available). Responses below a size threshold, with a
+content type outside the allowlist, or already encoded (precompressed
+static assets) pass through untouched. Streaming responses are compressed
+chunk by chunk and flushed, so clients receive output as it is produced.
+"""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tcm.config import settings
+
+
+class _GzipCompressor:
+    """Incremental gzip compressor."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    """Incremental brotli compressor."""
+
+    def __init__(self, level: int):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        output = self._compressor.process(data)
+        if flush:
+            output += self._compressor.flush()
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    """Incremental zstd compressor."""
+
+    def __init__(self, level: int):
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(self._flush_block)
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _module_available(name: str) -> bool:
+    """Return True if an optional codec module can be imported."""
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+# Supported codings in server preference order: (coding, compressor, optional module)
+_CODECS = (
+    ("br", _BrotliCompressor, "brotli"),
+    ("zstd", _ZstdCompressor, "zstandard"),
+    ("gzip", _GzipCompressor, None),
+)
+
+DEFAULT_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+
+AVAILABLE_ENCODINGS = {
+    coding: compressor
+    for coding, compressor, module in _CODECS
+    if module is None or _module_available(module)
+}
+
+
+def negotiate_encoding(accept_encoding: str, encodings=None) -> str | None:
+    """
+    Pick the content coding for a response.
+
+    Honors client q-values and breaks ties with the server preference order.
+
+    Args:
+        accept_encoding: Accept-Encoding request header value
+        encodings: Codings the server may use, in preference order
+
+    Returns:
+        Chosen coding, or None if the client accepts none of them
+    """
+    encodings = list(AVAILABLE_ENCODINGS if encodings is None else encodings)
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best = None
+    best_weight = 0.0
+    for coding in encodings:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def _encoded_etag(etag: str, coding: str) -> str:
+    """Give the compressed representation its own entity tag ("abc" -> "abc-gzip")."""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing eligible responses with a negotiated coding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        content_types: list[str] | None = None,
+        levels: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = {ct.lower() for ct in (content_types or [])}
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, coding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request state machine wrapping the downstream send callable."""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str | None, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self._send = send
+        self.start_message: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _eligible(self, message: Message) -> bool:
+        """Decide from the response headers whether the body may be compressed."""
+        headers = Headers(raw=message["headers"])
+        if message["status"] in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type in self.middleware.content_types
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            if not self._eligible(message):
+                self.passthrough = True
+                await self._send(message)
+                return
+            # Negotiable representation: caches must key on Accept-Encoding
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if self.coding is None:
+                self.passthrough = True
+                await self._send(message)
+                return
+            # Hold the start message until the first body chunk decides the framing
+            self.start_message = message
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            level = self.middleware.levels[self.coding]
+            self.compressor = AVAILABLE_ENCODINGS[self.coding](level)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.coding
+            if "etag" in headers:
+                headers["ETag"] = _encoded_etag(headers["etag"], self.coding)
+
+            if more_body:
+                # Streaming: length unknown, compress and flush chunk by chunk
+                del headers["Content-Length"]
+                await self._send(start)
+            else:
+                compressed = self.compressor.compress(body, flush=False) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start)
+                await self._send({**message, "body": compressed})
+                return
+
+        if more_body:
+            chunk = self.compressor.compress(body, flush=True)
+        else:
+            chunk = self.compressor.compress(body, flush=False) + self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def compression_levels() -> dict[str, int]:
+    """Per-coding compression levels from settings."""
+    return {
+        "gzip": settings.compression_gzip_level,
+        "br": settings.compression_brotli_quality,
+        "zstd": settings.compression_zstd_level,
+    }
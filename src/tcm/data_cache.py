@@ -0,0 +1,95 @@
+"""
+In-process TTL cache with single-flight recomputation.
+
+Concurrent misses for the same key share one in-flight computation instead
+of each running the underlying queries. Values are dropped after ``ttl``
+seconds or when ``invalidate`` is called (e.g. from a commit listener).
+
+The computation runs in a task of its own rather than in the request that
+missed first, so a cancelled request (client disconnect) only stops
+waiting and the others still get the value. It must therefore not use the
+request's session: computations open their own from the session factory.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """
+    Async TTL cache whose concurrent misses are coalesced (single flight).
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: dict[Hashable, tuple[float, Any]] = {}
+        # Keyed by (generation, key): callers arriving after a write never
+        # join a computation that started before it
+        self._inflight: dict[tuple[int, Hashable], asyncio.Task] = {}
+        # Bumped by invalidate() so results computed before a write are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, computing it at most once concurrently.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value on a miss; it runs
+                detached from the caller, so it must not use the caller's session
+
+        Returns:
+            Cached or freshly computed value
+        """
+        entry = self._values.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        flight = (self._generation, key)
+        task = self._inflight.get(flight)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._compute(key, compute, self._generation))
+            # Retrieve the error even if every caller stopped waiting
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[flight] = task
+        # Shielded: a cancelled caller does not cancel the shared computation
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        """Run a computation and store its value unless a write happened meanwhile."""
+        try:
+            value = await compute()
+        finally:
+            self._inflight.pop((generation, key), None)
+
+        if self.ttl > 0 and generation == self._generation:
+            self._values[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop all cached values and stop sharing computations already running."""
+        self._generation += 1
+        self._values.clear()
+
+    def stats(self) -> dict:
+        """Return cache metrics."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "ttl_seconds": self.ttl,
+            "entries": len(self._values),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
@@ -9,13 +9,26 @@ from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
-from tcm.config import settings
+from tcm.config import pool_limits, settings
+from tcm.load_shedding import MonitoredQueuePool
+
+# Pool sized so all server workers together stay within the connection budget,
+# reporting checkout waits to the load shedder
+_pool_options = {}
+if not settings.database_url.startswith("sqlite"):
+    pool_size, max_overflow = pool_limits()
+    _pool_options = {
+        "poolclass": MonitoredQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+    }
 
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
     future=True,
+    **_pool_options,
 )
 
 # Create async session factory
@@ -54,3 +67,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 # Alias for convenience
 get_async_session = get_db
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency returning the session factory.
+
+    For routes that run several queries concurrently, each on its own
+    session (a single AsyncSession cannot be used concurrently).
+
+    Usage:
+        @app.get("/items/")
+        async def read_items(session_factory=Depends(get_session_factory)):
+            async with session_factory() as session:
+                ...
+    """
+    return async_session_maker
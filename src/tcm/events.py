@@ -0,0 +1,89 @@
+"""
+Commit-time change notifications.
+
+Collects the entities created, updated and deleted in each ORM flush and,
+once the surrounding transaction commits, passes them to the registered
+listeners. Caches and other derived state subscribe here instead of every
+write path in ``tcm.routes`` having to notify them individually.
+"""
+
+import logging
+from collections.abc import Callable
+from typing import NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("tcm.events")
+
+_CHANGES_KEY = "tcm_pending_changes"
+
+
+class EntityChange(NamedTuple):
+    """A single committed entity change."""
+
+    entity_type: str  # Table name, e.g. "testcases"
+    entity_id: int
+    action: str  # "created", "updated" or "deleted"
+
+
+_listeners: list[Callable[[list[EntityChange]], None]] = []
+
+
+def on_commit(listener: Callable[[list[EntityChange]], None]):
+    """
+    Register a listener called with the changes of every committed transaction.
+
+    Can be used as a decorator. Listeners run synchronously after the commit
+    and must not raise; errors are logged and swallowed.
+
+    Args:
+        listener: Callable receiving the list of EntityChange records
+
+    Returns:
+        The listener, unchanged
+    """
+    _listeners.append(listener)
+    return listener
+
+
+def _entity_id(obj) -> int | None:
+    """Return the integer primary key of a mapped object, if it has one."""
+    return getattr(obj, "id", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    """Record entity changes of the flush on the session until commit."""
+    changes = session.info.setdefault(_CHANGES_KEY, [])
+    for action, objects in (
+        ("created", session.new),
+        ("updated", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        for obj in objects:
+            entity_id = _entity_id(obj)
+            if entity_id is None:
+                continue
+            if action == "updated" and not session.is_modified(obj):
+                continue
+            changes.append(EntityChange(obj.__tablename__, entity_id, action))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    """Hand the committed changes to all listeners."""
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        try:
+            listener(changes)
+        except Exception:
+            logger.exception("Commit listener %r failed", listener)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """Forget changes of a rolled back transaction."""
+    session.info.pop(_CHANGES_KEY, None)
@@ -0,0 +1,225 @@
+"""
+Relationship expansion for API responses.
+
+``expand=testcases,testcases.tags`` on a project, or ``expand=projects`` on
+a test case, embeds related records in the response so clients do not have
+to chain requests. Expansions are resolved by an ``ExpansionLoader``
+created per request: each relationship level is loaded for all parent
+records at once, in one query over the association table, so the number of
+queries depends on the expansion and not on the number of records.
+
+Nesting is limited to MAX_EXPAND_DEPTH levels, and a request whose
+expansions would load more than MAX_EXPANDED_ROWS related records is
+rejected instead of building an unbounded response.
+"""
+
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from tcm.aggregates import with_testcase_count
+from tcm.fast_json import (
+    PROJECT_RESPONSE_COLUMNS,
+    TAG_RESPONSE_COLUMNS,
+    TESTCASE_RESPONSE_COLUMNS,
+)
+from tcm.models.associations import project_testcases, testcase_tags
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+# Deepest expansion path, e.g. testcases.tags
+MAX_EXPAND_DEPTH = 2
+
+# Most related records one request may load through expansions
+MAX_EXPANDED_ROWS = 5000
+
+
+@dataclass(frozen=True)
+class Relation:
+    """A relationship that can be expanded, through an association table."""
+
+    target: str
+    association: Table
+    parent_column: ColumnElement
+    child_column: ColumnElement
+
+
+# Expandable relationships of each resource type
+RELATIONS = {
+    "project": {
+        "testcases": Relation(
+            "testcase",
+            project_testcases,
+            project_testcases.c.project_id,
+            project_testcases.c.testcase_id,
+        ),
+    },
+    "testcase": {
+        "projects": Relation(
+            "project",
+            project_testcases,
+            project_testcases.c.testcase_id,
+            project_testcases.c.project_id,
+        ),
+        "tags": Relation(
+            "tag",
+            testcase_tags,
+            testcase_tags.c.testcase_id,
+            testcase_tags.c.tag_id,
+        ),
+    },
+    "tag": {},
+}
+
+
+def target_query(entity_type: str):
+    """
+    Build the query selecting an expanded resource in its response shape.
+
+    Expanded projects carry their test case count; expanded tags are shaped
+    like the tags nested in test cases, without a usage count.
+
+    Args:
+        entity_type: "project", "testcase" or "tag"
+
+    Returns:
+        Tuple of (select statement, target primary key column)
+    """
+    if entity_type == "project":
+        return with_testcase_count(select(*PROJECT_RESPONSE_COLUMNS)), Project.id
+    if entity_type == "testcase":
+        return select(*TESTCASE_RESPONSE_COLUMNS), TestCase.id
+    return select(*TAG_RESPONSE_COLUMNS), Tag.id
+
+
+def parse_expand(expand: str | None, entity_type: str) -> dict:
+    """
+    Parse an expand parameter into a tree of relationship names.
+
+    ``testcases.tags`` implies ``testcases``.
+
+    Args:
+        expand: Comma-separated dotted relationship paths, or None
+        entity_type: Type of the resource being expanded
+
+    Returns:
+        Nested dict mapping each relationship name to its sub-expansions
+
+    Raises:
+        HTTPException: If a path is unknown or nested too deeply
+    """
+    tree: dict = {}
+    for path in (expand or "").split(","):
+        path = path.strip()
+        if not path:
+            continue
+        names = path.split(".")
+        if len(names) > MAX_EXPAND_DEPTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Expansion {path} is nested deeper than {MAX_EXPAND_DEPTH} levels",
+            )
+        node, current_type = tree, entity_type
+        for name in names:
+            relation = RELATIONS[current_type].get(name)
+            if relation is None:
+                raise HTTPException(status_code=400, detail=f"Unknown expansion: {path}")
+            node = node.setdefault(name, {})
+            current_type = relation.target
+    return tree
+
+
+class ExpansionLoader:
+    """
+    Per-request loader embedding related records into response dicts.
+
+    Each (relationship, level) is loaded with a single query for all parent
+    records; the loader counts the related rows it has loaded across the
+    request and stops at the maximum.
+    """
+
+    def __init__(self, session: AsyncSession, max_rows: int = MAX_EXPANDED_ROWS):
+        """
+        Initialize the loader.
+
+        Args:
+            session: Database session of the request
+            max_rows: Most related records the request may load
+        """
+        self.session = session
+        self.max_rows = max_rows
+        self.rows_loaded = 0
+
+    async def expand(self, entity_type: str, items: list[dict], tree: dict) -> list[dict]:
+        """
+        Embed the expansions in the tree into records of one type.
+
+        Args:
+            entity_type: Type of the records
+            items: Response dicts, each with an "id"; updated in place
+            tree: Expansions returned by parse_expand
+
+        Returns:
+            The items
+
+        Raises:
+            HTTPException: If the expansions exceed the row limit
+        """
+        if not items:
+            return items
+        for name, subtree in tree.items():
+            relation = RELATIONS[entity_type][name]
+            related = await self.load(relation, {item["id"] for item in items})
+            children = []
+            for item in items:
+                # Copy, so a record shared by several parents expands in each
+                item[name] = [dict(record) for record in related.get(item["id"], [])]
+                children.extend(item[name])
+            await self.expand(relation.target, children, subtree)
+        return items
+
+    async def load(self, relation: Relation, parent_ids: set[int]) -> dict[int, list]:
+        """
+        Load the related records of many parents in one query.
+
+        Args:
+            relation: Relationship to load
+            parent_ids: IDs of the parent records
+
+        Returns:
+            Dict mapping each parent ID to its related records, ordered by
+            the related record's ID
+
+        Raises:
+            HTTPException: If the rows loaded would exceed the limit
+        """
+        query, target_id = target_query(relation.target)
+        remaining = self.max_rows - self.rows_loaded
+        query = (
+            query.add_columns(relation.parent_column.label("expand_parent_id"))
+            .join(relation.association, relation.child_column == target_id)
+            .where(relation.parent_column.in_(parent_ids))
+            .order_by(target_id)
+            .limit(remaining + 1)
+        )
+        result = await self.session.execute(query)
+        rows = result.mappings().all()
+
+        self.rows_loaded += len(rows)
+        if self.rows_loaded > self.max_rows:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Expansion would load more than {self.max_rows} related records",
+            )
+
+        related: dict[int, list] = {}
+        for row in rows:
+            record = {key: value for key, value in row.items() if key != "expand_parent_id"}
+            if relation.target == "tag":
+                record["usage_count"] = None
+            related.setdefault(row["expand_parent_id"], []).append(record)
+        return related
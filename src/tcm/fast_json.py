@@ -0,0 +1,156 @@
+"""
+Fast JSON path for list endpoints.
+
+Serializing a page of ORM objects through ``TestCaseResponse.model_validate``
+validates every row and nested tag, after which FastAPI validates and
+serializes the result once more against ``response_model``. For data read
+straight from the database neither pass catches anything, so list endpoints
+instead select the response columns directly, assemble plain dicts shaped
+like the response schemas and encode them in one call to pydantic-core's
+JSON serializer. The response is returned as a ``Response``, which FastAPI
+sends as is; ``response_model`` still documents the shape in OpenAPI.
+"""
+
+from collections.abc import Iterable, Mapping
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tcm.models.associations import testcase_tags
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+# Columns of TagResponse, in schema field order
+TAG_RESPONSE_COLUMNS = (
+    Tag.category,
+    Tag.value,
+    Tag.description,
+    Tag.is_predefined,
+    Tag.id,
+    Tag.created_at,
+    Tag.updated_at,
+)
+
+# Columns of TestCaseResponse (without tags), in schema field order
+TESTCASE_RESPONSE_COLUMNS = (
+    TestCase.title,
+    TestCase.description,
+    TestCase.preconditions,
+    TestCase.steps,
+    TestCase.expected_results,
+    TestCase.actual_results,
+    TestCase.status,
+    TestCase.priority,
+    TestCase.created_by,
+    TestCase.updated_by,
+    TestCase.id,
+    TestCase.created_at,
+    TestCase.updated_at,
+)
+
+# Columns of ProjectResponse (without testcase_count), in schema field order
+PROJECT_RESPONSE_COLUMNS = (
+    Project.name,
+    Project.description,
+    Project.status,
+    Project.start_date,
+    Project.end_date,
+    Project.created_by,
+    Project.updated_by,
+    Project.id,
+    Project.created_at,
+    Project.updated_at,
+)
+
+
+def json_response(
+    content,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    Encode trusted data as a JSON response without model validation.
+
+    Enums are encoded as their values and datetimes in ISO 8601, exactly as
+    the response schemas would encode them.
+
+    Args:
+        content: Dicts, lists and scalars to encode
+        status_code: HTTP status code
+        headers: Extra response headers
+
+    Returns:
+        JSON response
+    """
+    return Response(
+        content=to_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def tag_rows(rows: Iterable[Mapping], usage_count: bool = True) -> list[dict]:
+    """
+    Shape selected tag rows like TagResponse.
+
+    Args:
+        rows: Row mappings with the selected tag columns (for top-level tags,
+            including a usage_count column when requested) or, for nested
+            tags, all TAG_RESPONSE_COLUMNS
+        usage_count: Whether the rows are top-level tags (nested tags carry
+            no usage count)
+
+    Returns:
+        List of tag dicts
+    """
+    if usage_count:
+        return [dict(row) for row in rows]
+    return [
+        {
+            **{column.key: row[column.key] for column in TAG_RESPONSE_COLUMNS},
+            "usage_count": None,
+        }
+        for row in rows
+    ]
+
+
+async def load_testcase_rows(
+    session: AsyncSession, query: Select, tags: bool = True
+) -> list[dict]:
+    """
+    Run a test case page query and shape the rows like TestCaseResponse.
+
+    The page's tags are loaded in a second query over the association
+    table, keyed by test case, instead of through the ORM relationship.
+
+    Args:
+        session: Database session
+        query: Paginated query selecting TESTCASE_RESPONSE_COLUMNS, or a
+            subset of them including TestCase.id
+        tags: Whether to load and embed the tags
+
+    Returns:
+        List of test case dicts, in query order, each with its tags
+    """
+    result = await session.execute(query)
+    testcases = [dict(row) for row in result.mappings()]
+    if not testcases or not tags:
+        return testcases
+
+    tags_by_testcase: dict[int, list] = {testcase["id"]: [] for testcase in testcases}
+    tags_result = await session.execute(
+        select(testcase_tags.c.testcase_id, *TAG_RESPONSE_COLUMNS)
+        .join(Tag, Tag.id == testcase_tags.c.tag_id)
+        .where(testcase_tags.c.testcase_id.in_(list(tags_by_testcase)))
+        .order_by(Tag.id)
+    )
+    for row in tags_result.mappings():
+        tags_by_testcase[row["testcase_id"]].append(row)
+
+    for testcase in testcases:
+        testcase["tags"] = tag_rows(tags_by_testcase[testcase["id"]], usage_count=False)
+    return testcases
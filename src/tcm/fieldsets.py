@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets for list endpoints.
+
+``GET /api/testcases``, ``/api/projects`` and ``/api/tags`` accept a
+``fields`` parameter: a comma-separated list of response fields, or the name
+of a preset such as ``summary``. Only the columns behind those fields are
+selected, so the long text columns of test cases (steps, expected results
+and so on) are not read from the database or sent when a client only needs
+a table of titles. Without ``fields`` the full representation is returned.
+
+List pages rendered on the server do not go through the API; their ORM
+queries defer the same text columns with ``deferred_text``.
+"""
+
+from collections.abc import Iterable, Mapping
+
+from fastapi import HTTPException
+from sqlalchemy.orm import InstrumentedAttribute, defer
+
+from tcm.fast_json import (
+    PROJECT_RESPONSE_COLUMNS,
+    TAG_RESPONSE_COLUMNS,
+    TESTCASE_RESPONSE_COLUMNS,
+)
+from tcm.models.testcase import TestCase
+
+# Response fields of each list endpoint, in schema field order
+TESTCASE_FIELDS = (*(column.key for column in TESTCASE_RESPONSE_COLUMNS), "tags")
+PROJECT_FIELDS = (*(column.key for column in PROJECT_RESPONSE_COLUMNS), "testcase_count")
+TAG_FIELDS = (*(column.key for column in TAG_RESPONSE_COLUMNS), "usage_count")
+
+# Named fieldsets; "summary" matches the *Summary response schemas
+TESTCASE_FIELDSETS = {
+    "summary": ("id", "title", "status", "priority", "updated_at", "tags"),
+}
+PROJECT_FIELDSETS = {
+    "summary": ("id", "name", "status", "start_date", "end_date", "updated_at", "testcase_count"),
+}
+TAG_FIELDSETS = {
+    "summary": ("id", "category", "value", "is_predefined", "usage_count"),
+}
+
+# Large text columns, deferred in list contexts
+TESTCASE_TEXT_COLUMNS = (
+    TestCase.description,
+    TestCase.preconditions,
+    TestCase.steps,
+    TestCase.expected_results,
+    TestCase.actual_results,
+)
+
+
+def parse_fields(
+    fields: str | None,
+    allowed: tuple[str, ...],
+    presets: Mapping[str, tuple[str, ...]],
+) -> tuple[str, ...]:
+    """
+    Resolve a fields parameter to the response fields to return.
+
+    Args:
+        fields: Comma-separated field names or a preset name, or None
+        allowed: All response fields, in schema field order
+        presets: Named fieldsets
+
+    Returns:
+        Requested fields in schema field order, always including id
+
+    Raises:
+        HTTPException: If a field is unknown
+    """
+    if not fields:
+        return allowed
+    if fields in presets:
+        requested = set(presets[fields])
+    else:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return tuple(name for name in allowed if name in requested)
+
+
+def selected_columns(
+    columns: Iterable[InstrumentedAttribute], fields: tuple[str, ...]
+) -> list[InstrumentedAttribute]:
+    """
+    Pick the columns behind the requested fields.
+
+    Args:
+        columns: Response columns of the entity
+        fields: Fields returned by parse_fields
+
+    Returns:
+        Columns whose keys are among the fields, in schema field order
+    """
+    return [column for column in columns if column.key in fields]
+
+
+def deferred_text(*keep: InstrumentedAttribute) -> list:
+    """
+    Build loader options deferring test case text columns.
+
+    Accessing a deferred column raises instead of issuing a query per row.
+
+    Args:
+        *keep: Text columns the caller still needs
+
+    Returns:
+        List of defer options for the other text columns
+    """
+    kept = {column.key for column in keep}
+    return [
+        defer(column, raiseload=True)
+        for column in TESTCASE_TEXT_COLUMNS
+        if column.key not in kept
+    ]
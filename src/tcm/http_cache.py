@@ -0,0 +1,201 @@
+"""
+HTTP conditional request helpers.
+
+Builds ETag / Last-Modified validators from entity timestamps and evaluates
+If-None-Match, If-Modified-Since and If-Match request headers so routes can
+answer with 304 Not Modified (or 412 Precondition Failed) before doing any
+serialization or rendering work.
+"""
+
+import hashlib
+import re
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
+
+# Browsers and API clients may keep a copy, but must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+# Suffix the compression middleware appends to ETags of encoded representations
+_CODING_SUFFIX = re.compile(r'-(?:gzip|br|zstd)"$')
+
+# Extension added by derived_etag, ignored by If-Match
+_DERIVED_SUFFIX = re.compile(r'\.[0-9a-f]+"$')
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the given parts.
+
+    Args:
+        *parts: Values identifying a representation (kind, id, updated_at, ...)
+
+    Returns:
+        Quoted strong ETag string
+    """
+    raw = "|".join(
+        part.isoformat() if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+
+
+def derived_etag(etag: str, *parts) -> str:
+    """
+    Extend an ETag with values derived from other resources.
+
+    Use this for data a representation shows but the resource does not own,
+    such as usage counts: the extended ETag changes with those values for
+    If-None-Match, while ``check_if_match`` compares only the original ETag,
+    so updates are not rejected when only the derived data changed.
+
+    Args:
+        etag: ETag of the resource's own fields (from ``make_etag``)
+        *parts: Derived values shown in the representation
+
+    Returns:
+        Quoted strong ETag string
+    """
+    extension = make_etag(*parts)[1:17]
+    return f'{etag[:-1]}.{extension}"'
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Return dt as an aware UTC datetime (naive values are assumed to be UTC)."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+def latest(*timestamps: datetime | None) -> datetime | None:
+    """
+    Return the most recent of the given timestamps, ignoring None values.
+
+    Args:
+        *timestamps: Candidate timestamps
+
+    Returns:
+        Latest timestamp (as aware UTC) or None if none were given
+    """
+    values = [_as_utc(ts) for ts in timestamps if ts is not None]
+    return max(values) if values else None
+
+
+def http_date(dt: datetime) -> str:
+    """
+    Format a datetime as an HTTP-date (RFC 9110).
+
+    Args:
+        dt: Datetime to format
+
+    Returns:
+        HTTP-date string in GMT
+    """
+    return format_datetime(_as_utc(dt), usegmt=True)
+
+
+def _parse_etags(header: str) -> list[str]:
+    """Split an If-None-Match / If-Match header into individual entity tags."""
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _base_tag(etag: str) -> str:
+    """Strip a content-coding suffix, mapping "abc-gzip" back to "abc"."""
+    return _CODING_SUFFIX.sub('"', etag)
+
+
+def _opaque(etag: str) -> str:
+    """Strip the weak indicator from an entity tag (for weak comparison)."""
+    return _base_tag(etag[2:] if etag.startswith("W/") else etag)
+
+
+def set_validators(
+    response: Response,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> None:
+    """
+    Attach ETag, Last-Modified and Cache-Control headers to a response.
+
+    Args:
+        response: Response to decorate
+        etag: Strong ETag for the representation
+        last_modified: Optional last modification time
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified(
+    request: Request,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the client sent no entity tags.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the representation
+        last_modified: Current last modification time
+
+    Returns:
+        A 304 response if the client's copy is still fresh, otherwise None
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _parse_etags(if_none_match)
+        fresh = "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+    else:
+        fresh = False
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                since = None
+            # HTTP-dates only carry whole seconds
+            if since is not None:
+                fresh = _as_utc(last_modified).replace(microsecond=0) <= since
+
+    if not fresh:
+        return None
+
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """
+    Enforce an If-Match precondition for lost-update protection.
+
+    Extensions added by ``derived_etag`` are ignored, so a client's ETag
+    matches as long as the resource's own fields are unchanged.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource's own fields
+
+    Raises:
+        HTTPException: 412 if the client's entity tag no longer matches
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return
+
+    tags = _parse_etags(if_match)
+    # If-Match uses strong comparison, so weak tags never match
+    if "*" in tags or etag in {_DERIVED_SUFFIX.sub('"', _base_tag(tag)) for tag in tags}:
+        return
+
+    raise HTTPException(
+        status_code=412,
+        detail="Resource has been modified since it was retrieved",
+        headers={"ETag": etag},
+    )
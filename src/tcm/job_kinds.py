@@ -0,0 +1,363 @@
+"""
+Background job kinds.
+
+``JOB_KINDS`` maps each kind accepted by ``POST /api/jobs`` to its handler
+and parameter schema. Handlers work in batches of one short transaction
+each and save their position with ``JobContext.save`` in that transaction,
+so a job interrupted by a worker restart resumes after the last committed
+batch.
+
+Kinds:
+    search.reindex      Rebuild the search index (see ``tcm.search_index``)
+    project.clone       Copy a project with its test case memberships
+    testcases.import    Create test cases
+    testcases.export    Write test cases to a CSV file, fetched from
+                        ``GET /api/jobs/{id}/output``
+"""
+
+import csv
+import os
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import raiseload
+
+from tcm.config import settings
+from tcm.jobs import JobContext, JobError, JobKind
+from tcm.models.associations import project_testcases, testcase_tags
+from tcm.models.project import Project
+from tcm.models.search import DOCUMENT_SOURCES
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+from tcm.schemas.job import (
+    CloneProjectParams,
+    ExportTestCasesParams,
+    ImportTestCasesParams,
+    ReindexParams,
+)
+from tcm.search_index import rebuild_entity_documents
+
+# Rows per transaction of the clone, import and export jobs
+BATCH_SIZE = 500
+
+# Columns of exported test cases; tags are written as "category:value; ..."
+EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "preconditions",
+    "steps",
+    "expected_results",
+    "actual_results",
+    "status",
+    "priority",
+    "tags",
+    "created_by",
+    "updated_by",
+    "created_at",
+    "updated_at",
+)
+
+
+async def reindex_search(context: JobContext, params: ReindexParams) -> dict:
+    """Rebuild the search index, one entity type after the other."""
+    async with context.session_factory() as session:
+        total = 0
+        for model, _ in DOCUMENT_SOURCES.values():
+            total += (await session.execute(select(func.count(model.id)))).scalar_one()
+
+    state = context.state
+    counts: dict[str, int] = dict(state.get("counts", {}))
+    progress = state.get("progress", 0)
+    await context.report(progress, total)
+
+    entity_types = list(DOCUMENT_SOURCES)
+    first = entity_types.index(state["entity_type"]) if "entity_type" in state else 0
+    for entity_type in entity_types[first:]:
+        counts.setdefault(entity_type, 0)
+
+        async def save_batch(session, high: int, rows: int) -> None:
+            nonlocal progress
+            progress += rows
+            counts[entity_type] += rows
+            await context.save(
+                session,
+                state={
+                    "entity_type": entity_type,
+                    "after": high,
+                    "progress": progress,
+                    "counts": counts,
+                },
+                progress=progress,
+            )
+
+        after = state.get("after", 0) if entity_type == state.get("entity_type") else 0
+        await rebuild_entity_documents(
+            context.session_factory,
+            entity_type,
+            params.batch_size,
+            after=after,
+            on_batch=save_batch,
+        )
+
+    await context.report(progress, max(total, progress))
+    return {"documents": counts}
+
+
+async def clone_project(context: JobContext, params: CloneProjectParams) -> dict:
+    """Copy a project, then add the source project's test cases to the copy in batches."""
+    if "clone_id" not in context.state:
+        async with context.session_factory() as session:
+            source = await session.get(
+                Project, params.project_id, options=[raiseload(Project.testcases)]
+            )
+            if source is None:
+                raise JobError(f"Project with id {params.project_id} not found")
+            taken = await session.execute(select(Project.id).where(Project.name == params.name))
+            if taken.first() is not None:
+                raise JobError(f"Project with name '{params.name}' already exists")
+
+            clone = Project(
+                name=params.name,
+                description=source.description,
+                status=source.status,
+                start_date=source.start_date,
+                end_date=source.end_date,
+                created_by=source.created_by,
+            )
+            session.add(clone)
+            await session.flush()
+            total = (
+                await session.execute(
+                    select(func.count())
+                    .select_from(project_testcases)
+                    .where(project_testcases.c.project_id == params.project_id)
+                )
+            ).scalar_one()
+            await context.save(
+                session, state={"clone_id": clone.id, "after": 0, "copied": 0}, total=total
+            )
+            await session.commit()
+
+    clone_id = context.state["clone_id"]
+    after, copied = context.state["after"], context.state["copied"]
+    while True:
+        async with context.session_factory() as session:
+            testcase_ids = (
+                await session.execute(
+                    select(project_testcases.c.testcase_id)
+                    .where(
+                        project_testcases.c.project_id == params.project_id,
+                        project_testcases.c.testcase_id > after,
+                    )
+                    .order_by(project_testcases.c.testcase_id)
+                    .limit(BATCH_SIZE)
+                )
+            ).scalars().all()
+            if not testcase_ids:
+                break
+            clone = await session.get(Project, clone_id, options=[raiseload(Project.testcases)])
+            if clone is None:
+                raise JobError(f"Project with id {clone_id} was deleted while being copied")
+
+            # Memberships are written directly; touching the project records the change
+            await session.execute(
+                insert(project_testcases),
+                [
+                    {"project_id": clone_id, "testcase_id": testcase_id}
+                    for testcase_id in testcase_ids
+                ],
+            )
+            clone.updated_at = func.now()
+            after = testcase_ids[-1]
+            copied += len(testcase_ids)
+            await context.save(
+                session,
+                state={"clone_id": clone_id, "after": after, "copied": copied},
+                progress=copied,
+            )
+            await session.commit()
+
+    return {"project_id": clone_id, "testcases": copied}
+
+
+async def import_testcases(context: JobContext, params: ImportTestCasesParams) -> dict:
+    """Create test cases, one transaction per batch."""
+    testcases = params.testcases
+    start = context.state.get("next", 0)
+    ids: list[int] = list(context.state.get("ids", []))
+
+    async with context.session_factory() as session:
+        tag_ids = {tag_id for testcase in testcases[start:] for tag_id in testcase.tag_ids}
+        found = set((await session.execute(select(Tag.id).where(Tag.id.in_(tag_ids)))).scalars())
+        if tag_ids - found:
+            raise JobError(f"Tags with IDs {tag_ids - found} not found")
+    await context.report(start, len(testcases))
+
+    for offset in range(start, len(testcases), BATCH_SIZE):
+        batch = testcases[offset : offset + BATCH_SIZE]
+        async with context.session_factory() as session:
+            tag_ids = {tag_id for testcase in batch for tag_id in testcase.tag_ids}
+            tags = {
+                tag.id: tag
+                for tag in (
+                    await session.execute(
+                        select(Tag).where(Tag.id.in_(tag_ids)).options(raiseload(Tag.testcases))
+                    )
+                ).scalars()
+            }
+            if tag_ids - tags.keys():
+                raise JobError(f"Tags with IDs {tag_ids - tags.keys()} not found")
+
+            created = [
+                TestCase(
+                    **testcase.model_dump(exclude={"tag_ids"}),
+                    tags=[tags[tag_id] for tag_id in dict.fromkeys(testcase.tag_ids)],
+                )
+                for testcase in batch
+            ]
+            session.add_all(created)
+            await session.flush()
+            ids += [testcase.id for testcase in created]
+            done = offset + len(batch)
+            await context.save(session, state={"next": done, "ids": ids}, progress=done)
+            await session.commit()
+
+    return {"created": len(ids), "ids": ids}
+
+
+def export_path(job_id: int) -> Path:
+    """Return the path of a job's export file."""
+    return Path(settings.jobs_output_dir) / f"job-{job_id}.csv"
+
+
+def append_csv(path: str, rows: list[list[str]], size: int) -> int:
+    """
+    Append rows to a CSV file, first cutting it back to a known size.
+
+    Runs in the job process pool (JOBS_PROCESS_WORKERS).
+
+    Args:
+        path: CSV file path
+        rows: Rows of strings
+        size: Size of the file's committed content; anything after it was
+            written by an interrupted attempt and is dropped
+
+    Returns:
+        New size of the file in bytes
+    """
+    with open(path, "a+", encoding="utf-8", newline="") as file:
+        file.truncate(size)
+        csv.writer(file).writerows(rows)
+    return os.path.getsize(path)
+
+
+# Test case columns read for the export; tags are read separately
+EXPORT_FIELDS = tuple(column for column in EXPORT_COLUMNS if column != "tags")
+
+
+def export_row(values: dict, tags: list[tuple[str, str]]) -> list[str]:
+    """Convert a test case's EXPORT_FIELDS values and its tags to a row of EXPORT_COLUMNS."""
+    values = values | {
+        "status": values["status"].value,
+        "priority": values["priority"].value,
+        "tags": "; ".join(f"{category}:{value}" for category, value in tags),
+        "created_at": values["created_at"].isoformat(),
+        "updated_at": values["updated_at"].isoformat(),
+    }
+    return [str(values[column] or "") for column in EXPORT_COLUMNS]
+
+
+def append_export_rows(
+    path: str, testcases: list[tuple], tags: list[tuple[int, str, str]], size: int
+) -> int:
+    """
+    Render a batch of test cases as CSV rows and append them to the export file.
+
+    Runs in the job process pool (JOBS_PROCESS_WORKERS), so both building the
+    rows and writing them stay off the event loop.
+
+    Args:
+        path: CSV file path
+        testcases: Test cases as tuples of EXPORT_FIELDS values
+        tags: (test case ID, category, value) of the batch's tag assignments
+        size: Size of the file's committed content (see ``append_csv``)
+
+    Returns:
+        New size of the file in bytes
+    """
+    tags_by_testcase: dict[int, list[tuple[str, str]]] = {}
+    for testcase_id, category, value in tags:
+        tags_by_testcase.setdefault(testcase_id, []).append((category, value))
+    rows = []
+    for testcase in testcases:
+        values = dict(zip(EXPORT_FIELDS, testcase, strict=True))
+        rows.append(export_row(values, tags_by_testcase.get(values["id"], [])))
+    return append_csv(path, rows, size)
+
+
+async def export_testcases(context: JobContext, params: ExportTestCasesParams) -> dict:
+    """Write the matching test cases to a CSV file, in ID order."""
+    filters = []
+    if params.status is not None:
+        filters.append(TestCase.status == params.status)
+    if params.project_id is not None:
+        filters.append(
+            TestCase.id.in_(
+                select(project_testcases.c.testcase_id).where(
+                    project_testcases.c.project_id == params.project_id
+                )
+            )
+        )
+
+    path = export_path(context.job_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    after = context.state.get("after", 0)
+    exported = context.state.get("rows", 0)
+    size = context.state.get("size", 0)
+    if size == 0:
+        size = await context.run_cpu(append_csv, str(path), [list(EXPORT_COLUMNS)], 0)
+
+    async with context.session_factory() as session:
+        total = (
+            await session.execute(select(func.count(TestCase.id)).where(*filters))
+        ).scalar_one()
+    await context.report(exported, total)
+
+    while True:
+        # Read plain column values; the rows are built in the process pool
+        async with context.session_factory() as session:
+            testcases = [
+                tuple(row)
+                for row in await session.execute(
+                    select(*(getattr(TestCase, field) for field in EXPORT_FIELDS))
+                    .where(TestCase.id > after, *filters)
+                    .order_by(TestCase.id)
+                    .limit(BATCH_SIZE)
+                )
+            ]
+            if not testcases:
+                break
+            tags = [
+                tuple(row)
+                for row in await session.execute(
+                    select(testcase_tags.c.testcase_id, Tag.category, Tag.value)
+                    .join(Tag, Tag.id == testcase_tags.c.tag_id)
+                    .where(testcase_tags.c.testcase_id.in_([row[0] for row in testcases]))
+                    .order_by(Tag.category, Tag.value)
+                )
+            ]
+        size = await context.run_cpu(append_export_rows, str(path), testcases, tags, size)
+        after = testcases[-1][0]
+        exported += len(testcases)
+        await context.report(exported, state={"after": after, "rows": exported, "size": size})
+
+    return {"file": path.name, "rows": exported}
+
+
+JOB_KINDS = {
+    "search.reindex": JobKind(reindex_search, ReindexParams),
+    "project.clone": JobKind(clone_project, CloneProjectParams),
+    "testcases.import": JobKind(import_testcases, ImportTestCasesParams),
+    "testcases.export": JobKind(export_testcases, ExportTestCasesParams),
+}
@@ -0,0 +1,478 @@
+"""
+In-process background jobs.
+
+Operations that take longer than a request may (reindexing, bulk imports and
+exports, cloning a project) run as jobs: ``POST /api/jobs`` stores the job in
+the ``jobs`` table and returns at once, and clients poll ``GET /api/jobs/{id}``
+for its status, progress and result.
+
+Every server worker runs a ``JobRunner``. It claims due jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so two workers never claim the same
+job, and runs up to JOBS_CONCURRENCY of them at a time as tasks on its event
+loop. While a job runs, the runner refreshes its heartbeat:
+
+- a job whose heartbeat is older than JOBS_STALE_AFTER belonged to a worker
+  that died and is claimed again; handlers save the state to resume from
+  (``JobContext.save``) in the transaction of each step, so a claimed-again
+  job continues where the last committed step left off
+- a worker stopping gracefully puts its jobs back in the queue
+- a job that raises is retried after a delay doubling with each attempt,
+  until it has used its attempts; ``JobError`` fails it at once
+- a cancelled job is stopped at its next await
+
+CPU-heavy steps go through ``JobContext.run_cpu`` to a process pool
+(JOBS_PROCESS_WORKERS) so they do not hold up the worker's event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tcm.change_feed import ChangeNotifier
+from tcm.config import settings
+from tcm.models.jobs import JobStatus, jobs
+
+logger = logging.getLogger("tcm.jobs")
+
+# Identifies this process in the jobs it runs
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+# Longest delay before a retry in seconds, however many attempts failed
+MAX_RETRY_DELAY = 3600.0
+
+# Wakes the runner of this process when a job is submitted, cancelled or ends
+job_notifier = ChangeNotifier()
+
+
+class JobError(Exception):
+    """Raised by a handler for errors a retry cannot fix (the job fails at once)."""
+
+
+class JobLostError(Exception):
+    """The job was taken over by another worker or is no longer running here."""
+
+
+def utcnow() -> datetime:
+    """Current time; job timestamps are written by the workers in UTC."""
+    return datetime.now(UTC)
+
+
+def retry_delay(attempts: int, base: float) -> float:
+    """
+    Seconds to wait before the next attempt of a failed job.
+
+    Args:
+        attempts: Attempts made so far
+        base: Delay after the first attempt
+    """
+    return min(base * 2 ** max(attempts - 1, 0), MAX_RETRY_DELAY)
+
+
+class JobContext:
+    """A running job as its handler sees it: saved state and progress reporting."""
+
+    def __init__(
+        self,
+        job_id: int,
+        session_factory: async_sessionmaker[AsyncSession],
+        state: dict | None = None,
+        executor: Executor | None = None,
+    ):
+        """
+        Initialize the context.
+
+        Args:
+            job_id: Job ID
+            session_factory: Factory for the handler's sessions
+            state: State saved by an earlier attempt (empty on the first)
+            executor: Process pool for ``run_cpu`` (None: a thread)
+        """
+        self.job_id = job_id
+        self.session_factory = session_factory
+        self.state: dict = dict(state or {})
+        self._executor = executor
+
+    async def save(
+        self,
+        session: AsyncSession,
+        state: dict | None = None,
+        progress: int | None = None,
+        total: int | None = None,
+    ) -> None:
+        """
+        Record progress, and the state to resume from, in the handler's transaction.
+
+        Saving in the same transaction as the step's writes means a job
+        claimed again after a crash resumes exactly after the last committed
+        step.
+
+        Args:
+            session: Session of the step's transaction (committed by the handler)
+            state: State to resume from
+            progress: Units of work done
+            total: Units of work in all, once known
+
+        Raises:
+            JobLostError: If the job no longer runs in this worker; the step must
+                be rolled back
+        """
+        values: dict[str, Any] = {"heartbeat_at": utcnow()}
+        if state is not None:
+            self.state = dict(state)
+            values["state"] = self.state
+        if progress is not None:
+            values["progress"] = progress
+        if total is not None:
+            values["total"] = total
+        result = await session.execute(
+            update(jobs)
+            .where(
+                jobs.c.id == self.job_id,
+                jobs.c.status == JobStatus.RUNNING.value,
+                jobs.c.worker == WORKER_ID,
+            )
+            .values(**values)
+        )
+        if result.rowcount != 1:
+            raise JobLostError(f"Job {self.job_id} is no longer running in this worker")
+
+    async def report(
+        self, progress: int, total: int | None = None, state: dict | None = None
+    ) -> None:
+        """
+        Record progress on a session of its own.
+
+        Args:
+            progress: Units of work done
+            total: Units of work in all, once known
+            state: State to resume from
+        """
+        async with self.session_factory() as session:
+            await self.save(session, state=state, progress=progress, total=total)
+            await session.commit()
+
+    async def run_cpu(self, func: Callable, *args):
+        """
+        Run a CPU-heavy function off the event loop.
+
+        With JOBS_PROCESS_WORKERS set it runs in the worker's process pool, so
+        the function and its arguments must be picklable (a module-level
+        function and plain data); otherwise it runs in a thread.
+
+        Args:
+            func: Function to call
+            *args: Its arguments
+
+        Returns:
+            The function's result
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args)
+        )
+
+
+# Runs a job: gets its context and validated parameters, returns its result
+JobHandler = Callable[[JobContext, Any], Awaitable[dict | None]]
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """A kind of job: its handler and the schema of its parameters."""
+
+    handler: JobHandler
+    params: type[BaseModel]
+
+
+async def submit_job(
+    session: AsyncSession,
+    kind: str,
+    params: dict,
+    max_attempts: int | None = None,
+) -> int:
+    """
+    Queue a job and commit.
+
+    Args:
+        session: Database session
+        kind: Job kind
+        params: JSON-serializable job parameters
+        max_attempts: Runs before the job fails (defaults to the
+            JOBS_MAX_ATTEMPTS setting)
+
+    Returns:
+        ID of the new job
+    """
+    result = await session.execute(
+        insert(jobs).values(
+            kind=kind,
+            status=JobStatus.QUEUED.value,
+            params=params,
+            progress=0,
+            attempts=0,
+            max_attempts=max_attempts or settings.jobs_max_attempts,
+            cancel_requested=False,
+            run_after=utcnow(),
+        )
+    )
+    await session.commit()
+    job_notifier.notify()
+    return result.inserted_primary_key[0]
+
+
+class JobRunner:
+    """Claims due jobs and runs them, a bounded number at a time."""
+
+    def __init__(self, kinds: dict[str, JobKind]):
+        """
+        Initialize the runner.
+
+        Args:
+            kinds: Job kinds by name
+        """
+        self.kinds = kinds
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._loop: asyncio.Task | None = None
+        self._executor: Executor | None = None
+        # Running jobs by ID, and why a job's task was cancelled
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._stop_reasons: dict[int, str] = {}
+        self._last_heartbeat = 0.0
+
+    @property
+    def running(self) -> int:
+        """Number of jobs running in this process."""
+        return len(self._tasks)
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """
+        Start claiming and running jobs.
+
+        Args:
+            session_factory: Factory for the runner's and handlers' sessions
+        """
+        if self._loop is not None and not self._loop.done():
+            return
+        self.session_factory = session_factory
+        if settings.jobs_process_workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                settings.jobs_process_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._loop = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the runner, putting its running jobs back in the queue."""
+        if self._loop is not None:
+            self._loop.cancel()
+            try:
+                await self._loop
+            except asyncio.CancelledError:
+                pass
+            self._loop = None
+        for job_id, task in list(self._tasks.items()):
+            self._stop_reasons[job_id] = "shutdown"
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _run(self) -> None:
+        """Check for due jobs and cancellations until stopped."""
+        while True:
+            # Waiting first keeps the checks off a freshly started worker's startup
+            await job_notifier.wait(
+                min(settings.jobs_poll_interval, settings.jobs_heartbeat_interval)
+            )
+            try:
+                await self._check_running()
+                free = settings.jobs_concurrency - len(self._tasks)
+                if free > 0:
+                    for job in await self.claim(free):
+                        self._tasks[job["id"]] = asyncio.create_task(self._execute(job))
+            except Exception:
+                logger.exception("Job runner check failed")
+
+    async def claim(self, limit: int) -> list[dict]:
+        """
+        Claim due jobs for this worker.
+
+        Due jobs are queued jobs past their ``run_after`` and running jobs
+        whose worker stopped sending heartbeats. A stale job that has used its
+        attempts fails, and one with a pending cancellation is cancelled,
+        instead of being run again.
+
+        Args:
+            limit: Most jobs to claim
+
+        Returns:
+            The claimed job rows
+        """
+        now = utcnow()
+        stale = now - timedelta(seconds=settings.jobs_stale_after)
+        async with self.session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(jobs)
+                    .where(
+                        or_(
+                            and_(
+                                jobs.c.status == JobStatus.QUEUED.value,
+                                jobs.c.run_after <= now,
+                            ),
+                            and_(
+                                jobs.c.status == JobStatus.RUNNING.value,
+                                jobs.c.heartbeat_at < stale,
+                            ),
+                        )
+                    )
+                    .order_by(jobs.c.id)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+            ).mappings().all()
+
+            claimed = []
+            for row in rows:
+                values: dict[str, Any]
+                if row["status"] == JobStatus.RUNNING.value and row["cancel_requested"]:
+                    values = {"status": JobStatus.CANCELLED.value, "finished_at": now}
+                elif row["attempts"] >= row["max_attempts"]:
+                    values = {
+                        "status": JobStatus.FAILED.value,
+                        "error": row["error"] or f"Worker {row['worker']} stopped responding",
+                        "finished_at": now,
+                    }
+                else:
+                    values = {
+                        "status": JobStatus.RUNNING.value,
+                        "worker": WORKER_ID,
+                        "attempts": row["attempts"] + 1,
+                        "heartbeat_at": now,
+                        "started_at": now,
+                    }
+                    claimed.append({**row, **values})
+                await session.execute(update(jobs).where(jobs.c.id == row["id"]).values(**values))
+            await session.commit()
+
+        for job in claimed:
+            logger.info("Running job %s (%s), attempt %s", job["id"], job["kind"], job["attempts"])
+        return claimed
+
+    async def _check_running(self) -> None:
+        """Refresh the heartbeats of running jobs and stop cancelled or lost ones."""
+        if not self._tasks:
+            return
+        ids = list(self._tasks)
+        async with self.session_factory() as session:
+            if time.monotonic() - self._last_heartbeat >= settings.jobs_heartbeat_interval:
+                await session.execute(
+                    update(jobs)
+                    .where(
+                        jobs.c.id.in_(ids),
+                        jobs.c.status == JobStatus.RUNNING.value,
+                        jobs.c.worker == WORKER_ID,
+                    )
+                    .values(heartbeat_at=utcnow())
+                )
+                self._last_heartbeat = time.monotonic()
+            rows = (
+                await session.execute(
+                    select(jobs.c.id, jobs.c.status, jobs.c.worker, jobs.c.cancel_requested)
+                    .where(jobs.c.id.in_(ids))
+                )
+            ).all()
+            await session.commit()
+
+        found = {row.id: row for row in rows}
+        for job_id in ids:
+            row = found.get(job_id)
+            if row is not None and row.cancel_requested:
+                reason = "cancelled"
+            elif row is None or row.status != JobStatus.RUNNING.value or row.worker != WORKER_ID:
+                reason = "lost"
+            else:
+                continue
+            task = self._tasks.get(job_id)
+            if task is not None and job_id not in self._stop_reasons:
+                self._stop_reasons[job_id] = reason
+                task.cancel()
+
+    async def _execute(self, job: dict) -> None:
+        """Run a claimed job and record how it ended."""
+        job_id = job["id"]
+        context = JobContext(job_id, self.session_factory, job["state"], self._executor)
+        try:
+            kind = self.kinds.get(job["kind"])
+            if kind is None:
+                raise JobError(f"Unknown job kind: {job['kind']}")
+            result = await kind.handler(context, kind.params.model_validate(job["params"]))
+        except asyncio.CancelledError:
+            reason = self._stop_reasons.get(job_id, "shutdown")
+            if reason == "shutdown":
+                # Not the job's fault: the attempt does not count
+                await self._finish(
+                    job_id,
+                    status=JobStatus.QUEUED.value,
+                    attempts=job["attempts"] - 1,
+                    run_after=utcnow(),
+                    finished_at=None,
+                )
+            elif reason == "cancelled":
+                await self._finish(job_id, status=JobStatus.CANCELLED.value)
+            logger.info("Job %s stopped (%s)", job_id, reason)
+        except JobLostError:
+            logger.warning("Job %s was taken over by another worker", job_id)
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            if isinstance(exc, JobError) or job["attempts"] >= job["max_attempts"]:
+                logger.exception("Job %s failed", job_id)
+                await self._finish(job_id, status=JobStatus.FAILED.value, error=error)
+            else:
+                delay = retry_delay(job["attempts"], settings.jobs_retry_delay)
+                logger.warning("Job %s failed, retrying in %.0f s: %s", job_id, delay, error)
+                await self._finish(
+                    job_id,
+                    status=JobStatus.QUEUED.value,
+                    error=error,
+                    run_after=utcnow() + timedelta(seconds=delay),
+                    finished_at=None,
+                )
+        else:
+            await self._finish(job_id, status=JobStatus.SUCCEEDED.value, result=result, error=None)
+            logger.info("Job %s succeeded", job_id)
+        finally:
+            self._tasks.pop(job_id, None)
+            self._stop_reasons.pop(job_id, None)
+            job_notifier.notify()
+
+    async def _finish(self, job_id: int, **values) -> None:
+        """Record the end of a run, unless another worker took the job over."""
+        values.setdefault("finished_at", utcnow())
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    update(jobs)
+                    .where(
+                        jobs.c.id == job_id,
+                        jobs.c.status == JobStatus.RUNNING.value,
+                        jobs.c.worker == WORKER_ID,
+                    )
+                    .values(**values)
+                )
+                await session.commit()
+        except Exception:
+            # The heartbeat stops, so another worker picks the job up later
+            logger.exception("Failed to record the end of job %s", job_id)
@@ -0,0 +1,249 @@
+"""
+Live updates for open pages over Server-Sent Events.
+
+Each worker process runs one ``Broadcaster``. While at least one client is
+connected, its relay task follows the change log (``tcm.change_feed``):
+commits in this process wake it at once, commits by other processes are
+picked up at the next periodic check. Each batch of changes is read and
+turned into events once and then fanned out to the subscribed clients, so
+an open page costs no queries of its own.
+
+Every client has a bounded queue and publishing never waits for a client.
+A client that falls behind has its backlog replaced by a single ``resync``
+event, telling the page to reload its data. Clients also get a ``resync``
+when a batch of changes cannot be turned into events; the relay logs the
+error and moves on past the batch.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tcm.change_feed import change_notifier, latest_cursor, read_changes
+from tcm.config import settings
+
+logger = logging.getLogger("tcm.live_updates")
+
+# Changes read by one relay query
+RELAY_BATCH_SIZE = 500
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RETRY_MS = 3000
+
+# Comment line keeping idle connections (and proxies) from timing out
+HEARTBEAT = ": heartbeat\n\n"
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    """A Server-Sent Event for one topic."""
+
+    topic: str
+    event: str
+    data: dict = field(default_factory=dict)
+    # Change log cursor, sent as the event ID for reconnecting clients
+    id: int | None = None
+
+    def encode(self) -> str:
+        """Serialize the event in the text/event-stream format."""
+        lines = [f"event: {self.event}"]
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append(f"data: {json.dumps(self.data)}")
+        return "\n".join(lines) + "\n\n"
+
+
+# Turns a batch of changes into events, reading what it needs from the session
+EventBuilder = Callable[[AsyncSession, list[dict]], Awaitable[list[LiveEvent]]]
+
+
+class Subscriber:
+    """A connected client: its topics and bounded event queue."""
+
+    def __init__(self, topics: Iterable[str], queue_size: int):
+        """
+        Initialize the subscriber.
+
+        Args:
+            topics: Topics whose events the client receives
+            queue_size: Most events held for the client
+        """
+        self.topics = frozenset(topics)
+        self.queue: asyncio.Queue[LiveEvent] = asyncio.Queue(max(queue_size, 1))
+        self.dropped = 0
+
+    def offer(self, event: LiveEvent) -> None:
+        """
+        Queue an event without waiting.
+
+        If the queue is full the client is too far behind to catch up event
+        by event: the backlog is dropped and replaced by a ``resync`` event.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(LiveEvent(event.topic, "resync", id=event.id))
+
+    async def next(self, timeout: float) -> LiveEvent | None:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Longest time to wait in seconds
+
+        Returns:
+            The event, or None on timeout
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class Broadcaster:
+    """Fans out events built from the change log to the subscribed clients."""
+
+    def __init__(self, build_events: EventBuilder):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            build_events: Builds the events of each batch of changes
+        """
+        self.build_events = build_events
+        # Cursor of the last change relayed
+        self.cursor = 0
+        self._subscribers: set[Subscriber] = set()
+        self._relay: asyncio.Task | None = None
+        self._starting = asyncio.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._subscribers)
+
+    async def subscribe(
+        self,
+        topics: Iterable[str],
+        session_factory: async_sessionmaker[AsyncSession],
+        last_event_id: int | None = None,
+        queue_size: int | None = None,
+    ) -> Subscriber:
+        """
+        Connect a client, starting the relay if it is not running.
+
+        A reconnecting client passes the ID of the last event it received; if
+        changes were relayed since, it gets a ``resync`` event first.
+
+        Args:
+            topics: Topics whose events the client receives
+            session_factory: Factory for the relay's short sessions
+            last_event_id: Last event ID the client received, if reconnecting
+            queue_size: Most events held for the client (defaults to the
+                LIVE_UPDATES_QUEUE_SIZE setting)
+
+        Returns:
+            The subscriber
+        """
+        subscriber = Subscriber(topics, queue_size or settings.live_updates_queue_size)
+        async with self._starting:
+            if self._relay is None or self._relay.done():
+                async with session_factory() as session:
+                    self.cursor = await latest_cursor(session)
+                self._relay = asyncio.create_task(self._relay_changes(session_factory))
+            if last_event_id is not None and last_event_id < self.cursor:
+                subscriber.offer(LiveEvent("", "resync", id=self.cursor))
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Disconnect a client; the relay stops after the last one leaves."""
+        self._subscribers.discard(subscriber)
+
+    async def close(self) -> None:
+        """Disconnect every client and stop the relay."""
+        self._subscribers.clear()
+        if self._relay is not None:
+            self._relay.cancel()
+            try:
+                await self._relay
+            except asyncio.CancelledError:
+                pass
+            self._relay = None
+
+    def publish(self, event: LiveEvent) -> None:
+        """Queue an event for every client subscribed to its topic."""
+        for subscriber in self._subscribers:
+            if event.topic in subscriber.topics:
+                subscriber.offer(event)
+
+    def resync_all(self) -> None:
+        """Queue a ``resync`` event for every client."""
+        for subscriber in self._subscribers:
+            subscriber.offer(LiveEvent("", "resync", id=self.cursor))
+
+    async def _relay_changes(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Read new changes and publish their events while clients are connected."""
+        while self._subscribers:
+            changes, events, failed = [], [], False
+            try:
+                async with session_factory() as session:
+                    changes = await read_changes(session, self.cursor, RELAY_BATCH_SIZE)
+                    events = await self.build_events(session, changes) if changes else []
+            except Exception:
+                logger.exception("Failed to relay changes after cursor %s", self.cursor)
+                failed = True
+
+            if changes:
+                self.cursor = changes[-1]["cursor"]
+                if failed:
+                    # Retrying the batch would fail the same way: skip it and
+                    # have every page reload its data instead
+                    self.resync_all()
+                for event in events:
+                    self.publish(event)
+                if len(changes) == RELAY_BATCH_SIZE:
+                    continue
+            await change_notifier.wait(settings.changes_poll_interval)
+
+
+async def event_stream(
+    broadcaster: Broadcaster,
+    topics: Iterable[str],
+    session_factory: async_sessionmaker[AsyncSession],
+    heartbeat: float,
+    last_event_id: int | None = None,
+) -> AsyncIterator[str]:
+    """
+    Subscribe a client and stream its events in the text/event-stream format.
+
+    The client is subscribed once the stream starts and unsubscribed when it
+    is closed, so a response whose body is never sent leaves nothing behind.
+    Sends a heartbeat comment whenever no event arrived for ``heartbeat``
+    seconds.
+
+    Args:
+        broadcaster: Broadcaster to subscribe to
+        topics: Topics whose events the client receives
+        session_factory: Factory for the relay's short sessions
+        heartbeat: Seconds between heartbeats on an idle stream
+        last_event_id: Last event ID the client received, if reconnecting
+
+    Yields:
+        Encoded events and heartbeats
+    """
+    subscriber = await broadcaster.subscribe(topics, session_factory, last_event_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            event = await subscriber.next(heartbeat)
+            yield HEARTBEAT if event is None else event.encode()
+    finally:
+        broadcaster.unsubscribe(subscriber)
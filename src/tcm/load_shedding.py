@@ -0,0 +1,417 @@
+"""
+Load shedding and per-route-class concurrency limits.
+
+Requests are sorted into route classes, each with its own concurrency
+limit and queue-time budget per worker process:
+
+- ``heavy``: reads that run large queries (search, project pages, exports)
+- ``read``: other GET and HEAD requests
+- ``write``: POST, PUT, PATCH and DELETE requests
+
+A request waits in its class's queue while the class is at its limit, and
+is answered ``503 Service Unavailable`` with ``Retry-After`` if no slot
+frees up within the budget. Since the classes do not share slots, a spike
+of heavy reads cannot take the capacity kept for writes. Exempt paths
+(health checks, metrics, static files and the long-lived event streams) are
+never limited.
+
+By default the limits are derived from the worker's share of database
+connections (see ``class_limits``), so the requests admitted at once never
+need more connections than the worker's pool holds.
+
+The limits also adapt to the database: the connection pool records how
+long each checkout waited. After a wait over the threshold the pool is
+considered congested for a cooldown period, during which heavy reads are
+refused at once and other reads are refused instead of queueing, leaving
+the pool to the requests already running and to writes.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+from collections import deque
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from tcm.config import Settings, pool_limits, settings
+
+logger = logging.getLogger("tcm.load_shedding")
+
+# Methods that never change data; any other method is a write
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class PoolWaitMonitor:
+    """Records database pool checkout waits and tracks congestion."""
+
+    def __init__(self, threshold: float, cooldown: float):
+        """
+        Initialize the monitor.
+
+        Args:
+            threshold: Checkout wait in seconds at which the pool is congested
+            cooldown: Seconds the pool stays congested after such a wait
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._congested_until = 0.0
+
+    def checkout(self) -> None:
+        """Count one checkout."""
+        self.checkouts += 1
+
+    def record(self, seconds: float) -> None:
+        """Record how long a checkout waited for a connection."""
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        if seconds >= self.threshold:
+            self.slow_checkouts += 1
+            self._congested_until = time.monotonic() + self.cooldown
+
+    def congested_for(self) -> float:
+        """Return the seconds of congestion left (0 if the pool is not congested)."""
+        return max(self._congested_until - time.monotonic(), 0.0)
+
+    def stats(self) -> dict:
+        """Return pool wait metrics."""
+        return {
+            "checkouts": self.checkouts,
+            "slow_checkouts": self.slow_checkouts,
+            "average_wait": round(self.total_wait / self.checkouts, 6) if self.checkouts else 0.0,
+            "max_wait": round(self.max_wait, 6),
+            "congested_for": round(self.congested_for(), 3),
+        }
+
+
+# Pool waits of this process's database engine
+pool_monitor = PoolWaitMonitor(
+    settings.load_shedding_pool_wait_threshold, settings.load_shedding_cooldown
+)
+
+
+class _MonitoredQueue(AsyncAdaptedQueue):
+    """Pool queue reporting how long takes waited to ``pool_monitor``."""
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        # Non-blocking takes never wait (and also drain the pool on dispose)
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            pool_monitor.record(time.perf_counter() - start)
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool reporting its checkouts and their waits to ``pool_monitor``.
+
+    Only the wait for a connection on the pool's queue is timed; opening a
+    new connection is not, so one slow connect does not count as congestion.
+    """
+
+    _queue_class = _MonitoredQueue
+
+    def connect(self):
+        pool_monitor.checkout()
+        return super().connect()
+
+
+class RouteClassLimit:
+    """Concurrency limit with a FIFO queue for one route class."""
+
+    def __init__(self, name: str, limit: int, queue_timeout: float):
+        """
+        Initialize the limit.
+
+        Args:
+            name: Route class name
+            limit: Requests of the class running at the same time
+            queue_timeout: Seconds a request may wait for a slot (0: no queueing)
+        """
+        self.name = name
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    @property
+    def full(self) -> bool:
+        """True if a new request would have to queue."""
+        return self.active >= self.limit or bool(self._waiters)
+
+    async def acquire(self, queue: bool = True) -> bool:
+        """
+        Take a slot, waiting up to the queue timeout for one to free up.
+
+        Args:
+            queue: Whether to wait if the class is full
+
+        Returns:
+            True if a slot was taken (release it with ``release``)
+        """
+        if not self.full:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if not queue or self.queue_timeout <= 0:
+            self.shed += 1
+            return False
+
+        # One future per waiter, so the limit is not bound to an event loop
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away; hand back a slot given to it meanwhile
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._discard(future)
+            raise
+        waited = time.perf_counter() - start
+        self.total_queue_wait += waited
+        self.max_queue_wait = max(self.max_queue_wait, waited)
+
+        # A slot may have been handed over just as the wait timed out
+        if future.done() and not future.cancelled():
+            self.admitted += 1
+            return True
+        self._discard(future)
+        self.shed += 1
+        return False
+
+    def release(self) -> None:
+        """Free a slot, handing it to the longest-waiting request."""
+        self.active -= 1
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+                return
+
+    def _discard(self, future: asyncio.Future) -> None:
+        """Remove a request that stopped waiting from the queue."""
+        future.cancel()
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        """Return the class's metrics."""
+        waited = self.admitted + self.shed
+        return {
+            "limit": self.limit,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "max_queue_wait": round(self.max_queue_wait, 6),
+            "average_queue_wait": round(self.total_queue_wait / waited, 6) if waited else 0.0,
+        }
+
+
+def compile_paths(patterns: list[str]) -> re.Pattern:
+    """
+    Compile path patterns into one regular expression.
+
+    ``*`` matches within one path segment and ``**`` matches anything,
+    e.g. ``/projects/*`` matches ``/projects/7`` and ``/static/**`` matches
+    every static file.
+    """
+    alternatives = [
+        re.escape(pattern).replace(r"\*\*", ".*").replace(r"\*", "[^/]*") for pattern in patterns
+    ]
+    return re.compile(f"(?:{'|'.join(alternatives) or '(?!)'})")
+
+
+class LoadShedder:
+    """Sorts requests into route classes and admits or sheds them."""
+
+    def __init__(
+        self,
+        limits: list[RouteClassLimit],
+        exempt_paths: list[str],
+        heavy_paths: list[str],
+        retry_after: int = 5,
+        monitor: PoolWaitMonitor | None = None,
+    ):
+        """
+        Initialize the shedder.
+
+        Args:
+            limits: Limits of the heavy, read and write route classes
+            exempt_paths: Path patterns that are never limited
+            heavy_paths: Path patterns of heavy reads
+            retry_after: Retry-After seconds of requests shed after queueing
+            monitor: Database pool monitor (None: the limits do not adapt)
+        """
+        self.limits = {limit.name: limit for limit in limits}
+        self.exempt_paths = compile_paths(exempt_paths)
+        self.heavy_paths = compile_paths(heavy_paths)
+        self.retry_after = retry_after
+        self.monitor = monitor
+        self.shed_congested = 0
+
+    def classify(self, method: str, path: str) -> str | None:
+        """Return the route class of a request, or None if it is exempt."""
+        if self.exempt_paths.fullmatch(path):
+            return None
+        if method not in SAFE_METHODS:
+            return "write"
+        if self.heavy_paths.fullmatch(path):
+            return "heavy"
+        return "read"
+
+    async def admit(self, route_class: str) -> tuple[bool, int]:
+        """
+        Take a slot of a route class.
+
+        Args:
+            route_class: Route class of the request
+
+        Returns:
+            Whether the request was admitted, and if not, its Retry-After seconds
+        """
+        limit = self.limits[route_class]
+        congested = self.monitor.congested_for() if self.monitor else 0.0
+        if congested and route_class != "write":
+            # Heavy reads are refused outright; other reads only if they would queue
+            if route_class == "heavy" or limit.full:
+                limit.shed += 1
+                self.shed_congested += 1
+                return False, max(math.ceil(congested), 1)
+        if await limit.acquire():
+            return True, 0
+        return False, self.retry_after
+
+    def release(self, route_class: str) -> None:
+        """Free a slot of a route class."""
+        self.limits[route_class].release()
+
+    def stats(self) -> dict:
+        """Return load shedding metrics."""
+        return {
+            "classes": {name: limit.stats() for name, limit in self.limits.items()},
+            "shed_congested": self.shed_congested,
+            "database_pool": self.monitor.stats() if self.monitor else None,
+        }
+
+
+def class_limits(config: Settings = settings) -> dict[str, int]:
+    """
+    Return the concurrency limit of each route class for one worker.
+
+    Limits set to 0 are derived from the worker's database connections
+    (pool size plus overflow, see ``tcm.config.pool_limits``): a quarter each
+    for writes and heavy reads and the rest for other reads, at least one
+    each. A warning is logged if the limits add up to more requests than
+    the worker has connections, since the pool then saturates before the
+    limits apply and writes may find no free connection.
+
+    Args:
+        config: Settings with the LOAD_SHEDDING_* limits and the pool sizing
+
+    Returns:
+        Mapping of route class name to its limit
+    """
+    pool_size, max_overflow = pool_limits(config)
+    connections = pool_size + max_overflow
+    heavy = config.load_shedding_heavy_limit or max(1, connections // 4)
+    write = config.load_shedding_write_limit or max(1, connections // 4)
+    read = config.load_shedding_read_limit or max(1, connections - heavy - write)
+    if heavy + read + write > connections:
+        logger.warning(
+            "Load shedding admits %d requests at a time, but each worker has only %d "
+            "database connections",
+            heavy + read + write,
+            connections,
+        )
+    return {"heavy": heavy, "read": read, "write": write}
+
+
+def load_shedder_from_settings() -> LoadShedder:
+    """Build the load shedder configured by the LOAD_SHEDDING_* settings."""
+    limits = class_limits()
+    return LoadShedder(
+        limits=[
+            RouteClassLimit(
+                "heavy", limits["heavy"], settings.load_shedding_heavy_queue_timeout
+            ),
+            RouteClassLimit("read", limits["read"], settings.load_shedding_read_queue_timeout),
+            RouteClassLimit(
+                "write", limits["write"], settings.load_shedding_write_queue_timeout
+            ),
+        ],
+        exempt_paths=settings.load_shedding_exempt_paths,
+        heavy_paths=settings.load_shedding_heavy_paths,
+        retry_after=settings.load_shedding_retry_after,
+        monitor=pool_monitor,
+    )
+
+
+class LoadSheddingMiddleware:
+    """
+    ASGI middleware admitting requests through a ``LoadShedder``.
+    """
+
+    def __init__(self, app: ASGIApp, shedder: LoadShedder):
+        self.app = app
+        self.shedder = shedder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.shedder.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        admitted, retry_after = await self.shedder.admit(route_class)
+        if not admitted:
+            await _send_busy(send, retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.release(route_class)
+
+
+async def _send_busy(send: Send, retry_after: int) -> None:
+    """Send a 503 response asking the client to retry later."""
+    body = json.dumps({"detail": "Server is busy, please retry later"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -4,31 +4,97 @@ Test Case Management (TCM) - Main Application Entry Point
 This module initializes the FastAPI application and includes all routes.
 """
 
+import asyncio
 import logging
-from pathlib import Path
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
+from tcm.assets import STATIC_DIR, AssetStaticFiles, build_assets
+from tcm.compression import CompressionMiddleware, compression_levels
 from tcm.config import settings
-from tcm.routes import tags, testcases, projects, auth, tag_pages, project_pages, testcase_pages, dashboard_pages, search_pages
+from tcm.database import async_session_maker
+from tcm.load_shedding import LoadSheddingMiddleware, load_shedder_from_settings
+from tcm.pages import lazy
+from tcm.routes.dashboard_pages import dashboard_cache
+from tcm.tag_index import tag_index_cache
+from tcm.routes import (
+    tags,
+    testcases,
+    projects,
+    batch,
+    changes,
+    live,
+    jobs,
+    auth,
+    tag_pages,
+    project_pages,
+    testcase_pages,
+    dashboard_pages,
+    search_pages,
+)
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
+logger = logging.getLogger("tcm.main")
+
+# Page modules are imported on first use (see tcm.pages.lazy)
+page_cache = lazy.lazy_module("tcm.pages.components.cache")
+
+
+def _report_preload(future: asyncio.Future) -> None:
+    """Log a page module that failed to import during preload."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Preloading page modules failed", exc_info=future.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work with the application and stop it on shutdown."""
+    preload = None
+    if settings.preload_pages:
+        # Import the page modules; startup does not wait for them
+        preload = asyncio.get_running_loop().run_in_executor(None, lazy.load_all)
+        preload.add_done_callback(_report_preload)
+    if settings.jobs_enabled:
+        jobs.runner.start(async_session_maker)
+    yield
+    # Running jobs go back to the queue for the next worker
+    await jobs.runner.stop()
+    if preload is not None:
+        # Failures were logged by _report_preload
+        await asyncio.wait([preload])
+
 
 app = FastAPI(
     title="Test Case Management",
     description="Web application for test case creation and tracking",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-# Mount static files
-static_dir = Path(__file__).parent / "static"
-if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+# Compress HTML/JSON/text responses with the best coding the client accepts
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        content_types=settings.compression_content_types,
+        levels=compression_levels(),
+    )
+
+# Limit concurrent requests per route class and shed load when the DB pool is congested
+load_shedder = load_shedder_from_settings()
+if settings.load_shedding_enabled:
+    app.add_middleware(LoadSheddingMiddleware, shedder=load_shedder)
+
+# Mount static files (fingerprinted builds under /static/dist are served immutable)
+if STATIC_DIR.exists():
+    if settings.build_assets_on_startup:
+        build_assets(STATIC_DIR)
+    app.mount("/static", AssetStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 # Include routers
 app.include_router(auth.router)  # Authentication routes (no prefix for /login)
@@ -40,6 +106,10 @@ app.include_router(testcase_pages.router)  # Test case management pages
 app.include_router(tags.router, prefix="/api")
 app.include_router(testcases.router, prefix="/api")
 app.include_router(projects.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(changes.router, prefix="/api")
+app.include_router(live.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
 
 
 @app.get("/")
@@ -58,12 +128,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for in-process caches and load shedding."""
+    return {
+        "fragment_cache": page_cache.fragment_cache.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "tag_index_cache": tag_index_cache.stats(),
+        "load_shedding": load_shedder.stats(),
+    }
+
+
 if __name__ == "__main__":
-    import uvicorn
+    if settings.debug:
+        # Single process reloading on code changes
+        import uvicorn
 
-    uvicorn.run(
-        "tcm.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug,
-    )
+        uvicorn.run("tcm.main:app", host=settings.host, port=settings.port, reload=True)
+    else:
+        from tcm.server import serve
+
+        serve()
@@ -6,6 +6,10 @@ from tcm.models.tag import Tag
 from tcm.models.testcase import TestCase, TestCaseStatus, TestCasePriority
 from tcm.models.project import Project, ProjectStatus
 from tcm.models.associations import testcase_tags, project_testcases
+from tcm.models.catalog import catalog_versions, tag_tombstones
+from tcm.models.search import search_documents
+from tcm.models.changes import change_log
+from tcm.models.jobs import jobs, JobStatus
 
 __all__ = [
     "Tag",
@@ -16,4 +20,10 @@ __all__ = [
     "ProjectStatus",
     "testcase_tags",
     "project_testcases",
+    "catalog_versions",
+    "tag_tombstones",
+    "search_documents",
+    "change_log",
+    "jobs",
+    "JobStatus",
 ]
@@ -13,7 +13,14 @@ testcase_tags = Table(
     "testcase_tags",
     Base.metadata,
     Column("testcase_id", Integer, ForeignKey("testcases.id", ondelete="CASCADE"), primary_key=True),
-    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # Indexed on its own for per-tag usage counts (the primary key leads with testcase_id)
+    Column(
+        "tag_id",
+        Integer,
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
     Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
 )
 
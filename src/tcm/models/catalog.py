@@ -0,0 +1,119 @@
+"""
+Tag catalog versioning tables.
+
+The tag catalog version is a single counter bumped by every flush that
+writes tags. Each tag records the version that last changed it and deleted
+tags leave a tombstone, so a client holding version N can be sent only what
+changed after N. The counter row is updated inside the writing transaction,
+so concurrent tag writers are serialized on it and versions become visible
+in order. Deleting a tag also touches the test cases that carried it, since
+their representations (and the collections holding them) change.
+"""
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Table,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from tcm.database import Base
+from tcm.models.associations import testcase_tags
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+# Name of the counter row used for the tag catalog
+TAG_CATALOG = "tags"
+
+# Name of the counter row serializing change log writers (see tcm.models.changes)
+CHANGE_LOG = "changes"
+
+# Monotonic counters, one row per catalog
+catalog_versions = Table(
+    "catalog_versions",
+    Base.metadata,
+    Column("name", String(50), primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+)
+
+# Tags deleted from the catalog and the catalog version that deleted them
+tag_tombstones = Table(
+    "tag_tombstones",
+    Base.metadata,
+    Column("tag_id", Integer, primary_key=True, autoincrement=False),
+    Column("catalog_version", Integer, nullable=False, index=True),
+)
+
+
+@event.listens_for(catalog_versions, "after_create")
+def _create_counter(target, connection: Connection, **kw) -> None:
+    """Start the tag catalog and change log counters at 0 when the table is created."""
+    connection.execute(
+        insert(catalog_versions),
+        [{"name": TAG_CATALOG, "version": 0}, {"name": CHANGE_LOG, "version": 0}],
+    )
+
+
+def bump_catalog_version(connection: Connection, name: str = TAG_CATALOG) -> int:
+    """
+    Increment a catalog version within the current transaction.
+
+    Args:
+        connection: Connection of the writing transaction
+        name: Name of the counter row
+
+    Returns:
+        The new catalog version
+    """
+    result = connection.execute(
+        update(catalog_versions)
+        .where(catalog_versions.c.name == name)
+        .values(version=catalog_versions.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(catalog_versions).values(name=name, version=1))
+        return 1
+    return connection.execute(
+        select(catalog_versions.c.version).where(catalog_versions.c.name == name)
+    ).scalar_one()
+
+
+@event.listens_for(Session, "before_flush")
+def _version_tag_writes(session: Session, flush_context, instances) -> None:
+    """Stamp written tags with a new catalog version and tombstone deleted ones."""
+    written = [obj for obj in session.new if isinstance(obj, Tag)]
+    written += [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, Tag) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, Tag)]
+    if not written and not deleted_ids:
+        return
+
+    connection = session.connection()
+    version = bump_catalog_version(connection)
+    for tag in written:
+        tag.catalog_version = version
+    if deleted_ids:
+        # IDs can be reused by some backends, so keep only the latest tombstone
+        connection.execute(delete(tag_tombstones).where(tag_tombstones.c.tag_id.in_(deleted_ids)))
+        connection.execute(
+            insert(tag_tombstones),
+            [{"tag_id": tag_id, "catalog_version": version} for tag_id in deleted_ids],
+        )
+        # Run before the assignments are removed so the tagged cases can be found
+        tagged = select(testcase_tags.c.testcase_id).where(testcase_tags.c.tag_id.in_(deleted_ids))
+        connection.execute(
+            update(TestCase.__table__)
+            .where(TestCase.__table__.c.id.in_(tagged))
+            .values(updated_at=func.now())
+        )
@@ -0,0 +1,135 @@
+"""
+Append-only change log.
+
+Every flush that creates, updates or deletes a test case, project or tag,
+or adds or removes a tag assignment or project membership, appends one row
+per change to ``change_log`` in the writing transaction. The log's ``id``
+is the cursor of the change feed (``GET /api/changes``).
+
+Writers bump the "changes" counter in ``catalog_versions`` before
+appending, which serializes them on the counter row until they commit. Log
+IDs therefore become visible in increasing order, and a reader that has
+seen ID N never later finds a committed change below N.
+
+The counter is bumped before the flush, ahead of the tag catalog counter
+(see ``tcm.models.catalog``), so every transaction takes the two counter
+rows in the same order, however many times it flushes. Only flushes that
+will append rows take it; a flush whose entities were only marked dirty,
+without a real change, does not.
+
+The cost is throughput: transactions that change logged entities commit
+one at a time, since each holds the counter row lock from its first such
+flush until commit. Keep those transactions short; long batch and job
+transactions block every other writer for their whole duration.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String, Table, event, func, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import PASSIVE_NO_INITIALIZE, get_history
+
+from tcm.database import Base
+from tcm.models.catalog import CHANGE_LOG, bump_catalog_version
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+# One row per committed change, in commit order
+change_log = Table(
+    "change_log",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    # testcase, project, tag, testcase_tag or project_testcase
+    Column("entity_type", String(20), nullable=False),
+    # For memberships, the test case (testcase_tag) or project (project_testcase)
+    Column("entity_id", Integer, nullable=False),
+    # For memberships, the tag (testcase_tag) or test case (project_testcase)
+    Column("related_id", Integer, nullable=True),
+    # created, updated, deleted; memberships: added, removed
+    Column("action", String(10), nullable=False),
+    Column("changed_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+_ENTITY_TYPES = {TestCase: "testcase", Project: "project", Tag: "tag"}
+
+# Membership collections of each model as (membership type, attribute, whether
+# the model is the membership's entity_id side)
+_MEMBERSHIPS = {
+    TestCase: (("testcase_tag", "tags", True), ("project_testcase", "projects", False)),
+    Tag: (("testcase_tag", "testcases", False),),
+    Project: (("project_testcase", "testcases", True),),
+}
+
+
+def _membership_changes(obj) -> set[tuple]:
+    """Return an object's membership changes as (type, entity ID, related ID, action)."""
+    changes = set()
+    for entity_type, attribute, owner_first in _MEMBERSHIPS.get(type(obj), ()):
+        # Pending changes only; never load a collection just to inspect it
+        history = get_history(obj, attribute, passive=PASSIVE_NO_INITIALIZE)
+        for action, others in (("added", history.added), ("removed", history.deleted)):
+            for other in others:
+                ids = (obj.id, other.id) if owner_first else (other.id, obj.id)
+                changes.add((entity_type, *ids, action))
+    return changes
+
+
+def _will_log_changes(session: Session) -> bool:
+    """Return whether the pending flush will append rows to the change log."""
+    if any(type(obj) in _ENTITY_TYPES for obj in (*session.new, *session.deleted)):
+        return True
+    # Dirty objects log only real column changes or membership changes
+    return any(
+        type(obj) in _ENTITY_TYPES and session.is_modified(obj) for obj in session.dirty
+    )
+
+
+# Inserted ahead of the other before_flush listeners, in particular the tag catalog's
+@event.listens_for(Session, "before_flush", insert=True)
+def _lock_change_log(session: Session, flush_context, instances) -> None:
+    """Take the change log counter before any other counter if the flush logs changes."""
+    if _will_log_changes(session):
+        bump_catalog_version(session.connection(), CHANGE_LOG)
+
+
+@event.listens_for(Session, "after_flush")
+def _log_changes(session: Session, flush_context) -> None:
+    """Append the flush's entity and membership changes to the change log."""
+    rows = []
+    memberships: set[tuple] = set()
+    for action, objects in (
+        ("created", session.new),
+        ("updated", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        for obj in objects:
+            entity_type = _ENTITY_TYPES.get(type(obj))
+            if entity_type is None:
+                continue
+            if action != "deleted":
+                # Both sides of a membership report it; the set keeps one
+                memberships |= _membership_changes(obj)
+            if action == "updated" and not session.is_modified(obj, include_collections=False):
+                continue
+            rows.append(
+                {
+                    "entity_type": entity_type,
+                    "entity_id": obj.id,
+                    "related_id": None,
+                    "action": action,
+                }
+            )
+
+    rows += [
+        {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "related_id": related_id,
+            "action": action,
+        }
+        for entity_type, entity_id, related_id, action in sorted(memberships)
+    ]
+    if not rows:
+        return
+
+    # The change log counter was locked by _lock_change_log
+    session.connection().execute(insert(change_log), rows)
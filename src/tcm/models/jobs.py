@@ -0,0 +1,69 @@
+"""
+Background job table.
+
+One row per job submitted through ``POST /api/jobs``. The row is the job's
+durable state: the runner of each server worker claims queued rows, records
+progress and the state a handler needs to resume, and stores the result or
+error when the job ends (see ``tcm.jobs``). Jobs are written with Core
+statements only, so their progress updates do not count as entity changes
+for caches and change notifications.
+"""
+
+from enum import StrEnum
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    func,
+)
+
+from tcm.database import Base
+
+
+class JobStatus(StrEnum):
+    """Status enum for background jobs."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# Statuses a job does not leave on its own
+FINISHED_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+jobs = Table(
+    "jobs",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    # Handler name, e.g. "search.reindex"
+    Column("kind", String(50), nullable=False, index=True),
+    Column("status", String(20), nullable=False, default=JobStatus.QUEUED.value),
+    Column("params", JSON, nullable=False),
+    # What the handler saved to resume from after a retry or worker restart
+    Column("state", JSON, nullable=True),
+    Column("result", JSON, nullable=True),
+    Column("error", Text, nullable=True),
+    Column("progress", Integer, nullable=False, default=0),
+    Column("total", Integer, nullable=True),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("max_attempts", Integer, nullable=False, default=1),
+    Column("cancel_requested", Boolean, nullable=False, default=False),
+    # Worker process (host:pid) running the job
+    Column("worker", String(100), nullable=True),
+    # Queued jobs are not claimed before this time (retry backoff)
+    Column("run_after", DateTime(timezone=True), nullable=False),
+    Column("heartbeat_at", DateTime(timezone=True), nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+    Index("ix_jobs_status_run_after", "status", "run_after"),
+)
@@ -0,0 +1,198 @@
+"""
+Unified search index table.
+
+``search_documents`` holds one row per test case, project and tag with the
+text that search matches (a short, heavily weighted ``title`` and a longer
+``content``) and the columns search filters on. Rows are rewritten from
+their source tables by a flush listener in the writing transaction, so the
+index is always consistent with committed data. ``tcm.search_index``
+queries the table and rebuilds it in batches.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    and_,
+    case,
+    delete,
+    event,
+    func,
+    literal,
+    null,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Select
+
+from tcm.database import Base
+from tcm.models.project import Project, ProjectStatus
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase, TestCasePriority, TestCaseStatus
+
+# One document per searchable entity
+search_documents = Table(
+    "search_documents",
+    Base.metadata,
+    Column("entity_type", String(20), primary_key=True),
+    Column("entity_id", Integer, primary_key=True, autoincrement=False),
+    Column("title", String(300), nullable=False),
+    Column("content", Text, nullable=False, default=""),
+    Column("status", String(20), nullable=True, index=True),
+    Column("priority", String(20), nullable=True),
+    Column("category", String(50), nullable=True, index=True),
+    Column("updated_at", DateTime(timezone=True), nullable=True),
+    Index("ix_search_documents_updated_at", "updated_at"),
+)
+
+
+def _enum_value(column, enum_class) -> ColumnElement:
+    """Map a non-native enum column (which stores names) to the enum values."""
+    return case(*[(column == member, member.value) for member in enum_class])
+
+
+def _joined_text(*columns) -> ColumnElement:
+    """Concatenate nullable text columns with spaces."""
+    text = func.coalesce(columns[0], "")
+    for column in columns[1:]:
+        text = text + " " + func.coalesce(column, "")
+    return text
+
+
+def testcase_documents() -> Select:
+    """Select the search documents of test cases."""
+    return select(
+        literal("testcase").label("entity_type"),
+        TestCase.id.label("entity_id"),
+        TestCase.title.label("title"),
+        _joined_text(TestCase.description, TestCase.steps).label("content"),
+        _enum_value(TestCase.status, TestCaseStatus).label("status"),
+        _enum_value(TestCase.priority, TestCasePriority).label("priority"),
+        null().label("category"),
+        TestCase.updated_at.label("updated_at"),
+    )
+
+
+def project_documents() -> Select:
+    """Select the search documents of projects."""
+    return select(
+        literal("project").label("entity_type"),
+        Project.id.label("entity_id"),
+        Project.name.label("title"),
+        _joined_text(Project.description).label("content"),
+        _enum_value(Project.status, ProjectStatus).label("status"),
+        null().label("priority"),
+        null().label("category"),
+        Project.updated_at.label("updated_at"),
+    )
+
+
+def tag_documents() -> Select:
+    """Select the search documents of tags."""
+    return select(
+        literal("tag").label("entity_type"),
+        Tag.id.label("entity_id"),
+        (Tag.category + ": " + Tag.value).label("title"),
+        _joined_text(Tag.description).label("content"),
+        null().label("status"),
+        null().label("priority"),
+        Tag.category.label("category"),
+        Tag.updated_at.label("updated_at"),
+    )
+
+
+# Entity type -> (source model, select of its documents)
+DOCUMENT_SOURCES = {
+    "testcase": (TestCase, testcase_documents),
+    "project": (Project, project_documents),
+    "tag": (Tag, tag_documents),
+}
+
+_ENTITY_TYPES = {model: entity_type for entity_type, (model, _) in DOCUMENT_SOURCES.items()}
+
+_DOCUMENT_COLUMNS = [
+    "entity_type",
+    "entity_id",
+    "title",
+    "content",
+    "status",
+    "priority",
+    "category",
+    "updated_at",
+]
+
+
+def reindex_documents(
+    connection: Connection,
+    entity_type: str,
+    ids: list[int] | None = None,
+    id_range: tuple[int, int | None] | None = None,
+) -> None:
+    """
+    Rewrite the search documents of some entities from their source rows.
+
+    Documents are upserted rather than deleted and inserted again, so a
+    write and a rebuild batch reindexing the same rows concurrently both
+    succeed (the later one wins) instead of one failing on the primary key.
+    Documents whose source row no longer exists are removed.
+
+    Args:
+        connection: Connection of the writing transaction
+        entity_type: "testcase", "project" or "tag"
+        ids: Entity IDs to reindex
+        id_range: Inclusive (low, high) range of entity IDs to reindex; a
+            high of None leaves the range open-ended
+    """
+    model, documents = DOCUMENT_SOURCES[entity_type]
+    if id_range is not None:
+        low, high = id_range
+        target = search_documents.c.entity_id >= low
+        source = model.id >= low
+        if high is not None:
+            target = and_(target, search_documents.c.entity_id <= high)
+            source = and_(source, model.id <= high)
+    else:
+        target = search_documents.c.entity_id.in_(ids)
+        source = model.id.in_(ids)
+
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    upsert = dialect.insert(search_documents).from_select(
+        _DOCUMENT_COLUMNS, documents().where(source)
+    )
+    connection.execute(
+        upsert.on_conflict_do_update(
+            index_elements=["entity_type", "entity_id"],
+            set_={column: upsert.excluded[column] for column in _DOCUMENT_COLUMNS[2:]},
+        )
+    )
+    connection.execute(
+        delete(search_documents).where(
+            search_documents.c.entity_type == entity_type,
+            target,
+            search_documents.c.entity_id.not_in(select(model.id).where(source)),
+        )
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _index_writes(session: Session, flush_context) -> None:
+    """Reindex the searchable entities written or deleted by the flush."""
+    # Adding or removing tags and members does not change any document
+    modified = [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    touched: dict[str, set[int]] = {}
+    for obj in (*session.new, *modified, *session.deleted):
+        entity_type = _ENTITY_TYPES.get(type(obj))
+        if entity_type is not None:
+            touched.setdefault(entity_type, set()).add(obj.id)
+    if not touched:
+        return
+
+    connection = session.connection()
+    for entity_type, ids in touched.items():
+        reindex_documents(connection, entity_type, sorted(ids))
@@ -6,7 +6,7 @@ Tags are used to categorize and filter test cases across various dimensions.
 
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -31,6 +31,10 @@ class Tag(Base):
     value: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(String(500), nullable=True)
     is_predefined: Mapped[bool] = mapped_column(default=True, nullable=False)
+    # Tag catalog version of the last write (see tcm.tag_catalog)
+    catalog_version: Mapped[int] = mapped_column(
+        Integer, server_default="0", default=0, index=True, nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -0,0 +1,146 @@
+"""
+Rendered HTML fragment cache for FastHTML components.
+
+Components that render the same markup for the same entity version can be
+wrapped with ``cached_component``. The first render is serialized with
+``to_xml`` and stored; later renders with an identical key are injected into
+the parent tree as raw HTML instead of rebuilding the FT tree.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+
+from fasthtml.common import NotStr, to_xml
+
+from tcm.config import settings
+
+
+class FragmentCache:
+    """
+    Size-bounded LRU cache of serialized HTML fragments.
+
+    Entries are evicted least-recently-used first once the total size of the
+    stored fragments exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> str | None:
+        """Return the cached fragment for key, or None on a miss."""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def put(self, key: tuple, html: str) -> None:
+        """Store a fragment, evicting old entries to stay under max_bytes."""
+        size = len(html)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = html
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, key: tuple, render: Callable[[], object]) -> NotStr:
+        """
+        Return the cached fragment for key, rendering and storing it on a miss.
+
+        Args:
+            key: Cache key (component name, entity id, updated_at, params)
+            render: Callable producing the FT tree for the fragment
+
+        Returns:
+            Raw HTML that can be embedded in a parent FT tree
+        """
+        html = self.get(key)
+        if html is None:
+            html = to_xml(render(), indent=False)
+            self.put(key, html)
+        return NotStr(html)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Return cache metrics."""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+fragment_cache = FragmentCache(
+    max_bytes=settings.fragment_cache_max_bytes,
+    enabled=settings.fragment_cache_enabled,
+)
+
+
+def cached_component(name: str, key: Callable[..., tuple | None]):
+    """
+    Decorator caching a component's rendered HTML in the fragment cache.
+
+    Args:
+        name: Component name, used as the first element of the cache key
+        key: Callable receiving the component's arguments and returning the
+            remaining key parts (entity id, updated_at, relevant params), or
+            None when the arguments can't be keyed and must be rendered
+
+    Returns:
+        Decorator for a FastHTML component function
+    """
+
+    def decorator(component):
+        @wraps(component)
+        def wrapper(*args, **kwargs):
+            if not fragment_cache.enabled:
+                return component(*args, **kwargs)
+            parts = key(*args, **kwargs)
+            if parts is None:
+                return component(*args, **kwargs)
+            return fragment_cache.get_or_render(
+                (name, *parts), lambda: component(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
@@ -4,6 +4,8 @@ Reusable form components for FastHTML pages.
 
 from fasthtml.common import *
 
+from tcm.pages.components.cache import cached_component
+
 
 def InputField(
     name: str,
@@ -267,6 +269,15 @@ def CheckboxField(
     )
 
 
+@cached_component(
+    "tag-badge",
+    key=lambda value, category="", is_predefined=False, show_category=False: (
+        value,
+        category,
+        is_predefined,
+        show_category,
+    ),
+)
 def TagBadge(
     value: str,
     category: str = "",
@@ -361,37 +372,27 @@ def CategoryGroup(
 def TagPickerField(
     name: str,
     label: str,
-    available_tags: list[dict],
-    selected_tag_ids: list[int] = None,
+    selected_tags: list[dict] = None,
+    categories: list[str] = None,
 ):
     """
-    Enhanced tag picker field with autocomplete, pills, and browse modal.
+    Enhanced tag picker field with typeahead, pills, and browse modal.
+
+    Only the selected tags are rendered into the page. Typeahead suggestions
+    come from ``GET /api/tags/suggest`` as the user types, and each category
+    in the browse modal is loaded from the same endpoint when expanded.
 
     Args:
         name: Field name attribute
         label: Label text for the field
-        available_tags: List of available tag dictionaries
-        selected_tag_ids: List of selected tag IDs
+        selected_tags: List of selected tag dictionaries (id, category, value)
+        categories: List of tag categories for the browse modal
 
     Returns:
         FastHTML div containing enhanced tag picker
     """
-    selected_tag_ids = selected_tag_ids or []
-
-    # Get selected tags
-    selected_tags = [tag for tag in available_tags if tag["id"] in selected_tag_ids]
-
-    # Group tags by category for the browse modal
-    tags_by_category = {}
-    for tag in available_tags:
-        cat = tag["category"]
-        if cat not in tags_by_category:
-            tags_by_category[cat] = []
-        tags_by_category[cat].append(tag)
-
-    # Create JSON data for JavaScript
-    tags_json = str(available_tags).replace("'", '"')
-    selected_ids_json = str(selected_tag_ids)
+    selected_tags = selected_tags or []
+    categories = categories or []
 
     return Div(
         Label(label, fr=name, cls="form-label"),
@@ -418,7 +419,7 @@ def TagPickerField(
                 id=f"{name}_pills",
             ),
 
-            # Input with autocomplete
+            # Input with typeahead
             Div(
                 Input(
                     type="text",
@@ -426,7 +427,7 @@ def TagPickerField(
                     placeholder="Type to search tags...",
                     cls="tag-picker-input",
                     autocomplete="off",
-                    onkeyup=f"filterTags('{name}')",
+                    oninput=f"filterTags('{name}')",
                 ),
                 Button(
                     "Browse",
@@ -452,13 +453,13 @@ def TagPickerField(
             Input(
                 type="hidden",
                 name=name,
-                value=str(tag_id),
+                value=str(tag["id"]),
                 data_tag_input=name,
             )
-            for tag_id in selected_tag_ids
+            for tag in selected_tags
         ],
 
-        # Browse modal
+        # Browse modal (category contents are fetched when a group is opened)
         Div(
             Div(
                 Div(
@@ -479,25 +480,14 @@ def TagPickerField(
                                 cls="category-summary",
                             ),
                             Div(
-                                *[
-                                    Label(
-                                        Input(
-                                            type="checkbox",
-                                            value=str(tag["id"]),
-                                            checked=tag["id"] in selected_tag_ids,
-                                            onchange=f"toggleTagInModal('{name}', {tag['id']})",
-                                        ),
-                                        Span(tag["value"]),
-                                        cls="tag-option-label",
-                                    )
-                                    for tag in tags_by_category[category]
-                                ],
+                                P("Loading...", cls="form-help-text"),
                                 cls="category-tags",
                             ),
                             cls="category-group-modal",
-                            open=True,
+                            data_category=category,
+                            ontoggle=f"loadTagCategory('{name}', this)",
                         )
-                        for category in sorted(tags_by_category.keys())
+                        for category in categories
                     ],
                     cls="modal-body",
                 ),
@@ -518,11 +508,5 @@ def TagPickerField(
             onclick=f"closeModalOnBackdrop(event, '{name}')",
         ),
 
-        # JavaScript data
-        Script(f"""
-            window.tagPickerData = window.tagPickerData || {{}};
-            window.tagPickerData['{name}'] = {tags_json};
-        """),
-
         cls="form-group tag-picker-field",
     )
@@ -1,49 +1,80 @@
 """
 Layout components for consistent page structure.
+
+The layout markup around the main area only depends on the header and footer
+flags (the title is substituted into it), so it is rendered once per flag
+combination when this module is loaded instead of being rebuilt as an FT tree
+for every page.
 """
 
+from html import escape
+
 from fasthtml.common import *
 
+from tcm.assets import asset_url, image_srcset
 
-def PageLayout(
-    *content,
-    title: str = "Test Case Management",
-    show_header: bool = True,
-    show_footer: bool = True,
-):
-    """
-    Consistent page layout wrapper for all pages.
+# Stand-ins for the title and main area while the shells are rendered
+_TITLE_MARKER = "tcm-layout-title"
+_MAIN_MARKER = "<!--tcm-layout-main-->"
 
-    Args:
-        *content: Content to display in the main area
-        title: Page title for the browser tab
-        show_header: Whether to display the header
-        show_footer: Whether to display the footer
+# Opening tag of the main area, as rendered by Main(cls="page-main")
+_MAIN_OPEN = '<main class="page-main">'
+_MAIN_CLOSE = "</main>"
 
-    Returns:
-        FastHTML page structure with header, main content, and footer
-    """
+# Header logo and its rendered size in CSS pixels
+_LOGO = "images/tcm_logo_1.png"
+_LOGO_SIZE = 32
+
+
+def _logo():
+    """Build the header logo, offering the built WebP/AVIF variants first."""
+    sources = []
+    for image_format in ("avif", "webp"):
+        srcset = image_srcset(_LOGO, image_format)
+        if srcset:
+            sources.append(
+                Source(type=f"image/{image_format}", srcset=srcset, sizes=f"{_LOGO_SIZE}px")
+            )
+    return Picture(
+        *sources,
+        Img(
+            src=asset_url(_LOGO),
+            alt="",
+            width=_LOGO_SIZE,
+            height=_LOGO_SIZE,
+            cls="header-logo",
+        ),
+    )
+
+
+def _layout(main, title: str, show_header: bool, show_footer: bool):
+    """Build the page layout FT tree around a main element."""
     return Html(
         Head(
             Title(title),
             Meta(charset="utf-8"),
             Meta(name="viewport", content="width=device-width, initial-scale=1"),
-            Link(rel="stylesheet", href="/static/css/styles.css"),
-            Script(src="/static/js/tag-picker.js", defer=True),
+            Link(rel="stylesheet", href=asset_url("css/styles.css")),
+            Script(src=asset_url("js/tag-picker.js"), defer=True),
         ),
         Body(
             Div(
                 (
                     Header(
                         H1(
-                            A("Test Case Management", href="/dashboard", cls="header-title-link")
+                            A(
+                                _logo(),
+                                "Test Case Management",
+                                href="/dashboard",
+                                cls="header-title-link",
+                            )
                         ),
                         cls="page-header",
                     )
                     if show_header
                     else None
                 ),
-                Main(*content, cls="page-main"),
+                main,
                 (
                     Footer(
                         P(f"© 2025 Test Case Management. All rights reserved."),
@@ -56,3 +87,71 @@ def PageLayout(
             )
         ),
     )
+
+
+def _render_shell(show_header: bool, show_footer: bool) -> tuple[str, str]:
+    """
+    Render the layout around the main element.
+
+    Returns:
+        Tuple of (markup before the main element with the title marker,
+        markup after it)
+    """
+    page = to_xml(
+        _layout(NotStr(_MAIN_MARKER), _TITLE_MARKER, show_header, show_footer), indent=False
+    )
+    head, _, tail = page.partition(_MAIN_MARKER)
+    return head, tail
+
+
+# Layout shells by (show_header, show_footer)
+_SHELLS = {
+    (show_header, show_footer): _render_shell(show_header, show_footer)
+    for show_header in (True, False)
+    for show_footer in (True, False)
+}
+
+
+def _shell(title: str, show_header: bool, show_footer: bool) -> tuple[str, str]:
+    """Return the precomputed shell halves with the title filled in."""
+    head, tail = _SHELLS[bool(show_header), bool(show_footer)]
+    # Escaped the way to_xml escapes text content
+    return head.replace(_TITLE_MARKER, escape(title, quote=False), 1), tail
+
+
+def layout_shell(title: str, show_header: bool = True, show_footer: bool = True) -> tuple[str, str]:
+    """
+    Render the PageLayout shell around an empty main area.
+
+    Args:
+        title: Page title for the browser tab
+        show_header: Whether to display the header
+        show_footer: Whether to display the footer
+
+    Returns:
+        Tuple of (document head through the opening main tag, closing markup)
+    """
+    head, tail = _shell(title, show_header, show_footer)
+    return head + _MAIN_OPEN, _MAIN_CLOSE + tail
+
+
+def PageLayout(
+    *content,
+    title: str = "Test Case Management",
+    show_header: bool = True,
+    show_footer: bool = True,
+):
+    """
+    Consistent page layout wrapper for all pages.
+
+    Args:
+        *content: Content to display in the main area
+        title: Page title for the browser tab
+        show_header: Whether to display the header
+        show_footer: Whether to display the footer
+
+    Returns:
+        Raw HTML of the page with header, main content, and footer
+    """
+    head, tail = _shell(title, show_header, show_footer)
+    return Safe(head + to_xml(Main(*content, cls="page-main"), indent=False) + tail)
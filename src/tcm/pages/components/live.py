@@ -0,0 +1,41 @@
+"""
+Live updates for pages kept open.
+
+``LiveUpdates`` subscribes a page to topics of the ``/api/events`` stream
+(Server-Sent Events). ``live-updates.js`` applies the events in place:
+statistics deltas and new activity items on the dashboard, and the test
+case count of a project page. Changes that cannot be applied in place show
+a notice offering to reload the page.
+"""
+
+from fasthtml.common import A, Div, Script, Span
+
+from tcm.assets import asset_url
+
+
+def LiveUpdates(*topics: str, reload_on_resync: bool = False):
+    """
+    Subscribe the page to live update topics.
+
+    Args:
+        *topics: Topics to subscribe to ("dashboard", "project:<id>")
+        reload_on_resync: Reload the page instead of showing the notice when
+            the stream fell behind and events were dropped
+
+    Returns:
+        FastHTML div element with the out-of-date notice and the script
+    """
+    return Div(
+        Div(
+            Span("This page is out of date.", cls="live-notice-message"),
+            " ",
+            A("Reload", href="", cls="live-notice-reload"),
+            cls="live-notice",
+            role="status",
+            hidden=True,
+        ),
+        Script(src=asset_url("js/live-updates.js"), defer=True),
+        id="live-updates",
+        data_live_topics=" ".join(topics),
+        data_live_resync="reload" if reload_on_resync else "notice",
+    )
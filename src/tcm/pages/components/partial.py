@@ -0,0 +1,69 @@
+"""
+Partial page updates for list pages.
+
+A list page wraps its results (table, summary and pagination) in
+``PartialTarget`` and marks its filter form with ``data-partial-target``.
+``partial-lists.js`` then submits the filters and follows pagination links
+with an ``HX-Request: true`` header, swaps in the returned fragment and
+pushes the new URL to the browser history. Routes check
+``is_partial_request`` and render only the fragment, skipping the layout,
+the filter form and the data behind its dropdowns.
+"""
+
+from fasthtml.common import Div, Script
+from starlette.requests import Request
+from starlette.responses import Response
+
+from tcm.assets import asset_url
+
+# Request header sent by partial-lists.js (the same one htmx sends)
+PARTIAL_HEADER = "HX-Request"
+
+
+def is_partial_request(request: Request) -> bool:
+    """
+    Check whether a request asks for the results fragment only.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        True if the HX-Request header is "true"
+    """
+    return request.headers.get(PARTIAL_HEADER, "").lower() == "true"
+
+
+def vary_on_partial(response: Response) -> Response:
+    """
+    Mark a list page response as depending on the HX-Request header.
+
+    Full pages and fragments share a URL, so caches must keep them apart.
+
+    Args:
+        response: Full page or fragment response
+
+    Returns:
+        The response, with HX-Request added to its Vary header
+    """
+    response.headers.add_vary_header(PARTIAL_HEADER)
+    return response
+
+
+def PartialTarget(*content, id: str, cls: str = ""):
+    """
+    Wrap the part of a list page replaced by partial updates.
+
+    Args:
+        *content: Results content (tables, summary, pagination)
+        id: Element ID, referenced by the filter form's data-partial-target
+        cls: CSS class(es)
+
+    Returns:
+        FastHTML div element
+    """
+    return Div(*content, id=id, cls=cls, data_partial_root="true")
+
+
+def PartialListScript():
+    """Load the script performing partial list updates."""
+    return Script(src=asset_url("js/partial-lists.js"), defer=True)
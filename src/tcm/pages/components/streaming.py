@@ -0,0 +1,170 @@
+"""
+Streaming rendering for large pages.
+
+Instead of building the whole FT tree and serializing it with ``to_xml``
+before sending anything, a streaming page sends the static ``PageLayout``
+shell first, then the page content with its large sections (table bodies,
+option lists) rendered item by item from async iterators over the database
+result. Time-to-first-byte no longer depends on page size, and only one
+buffered chunk of rows is held in memory at a time.
+
+Page components mark where streamed items go with ``Slot(name)``; the route
+supplies an async iterable per slot name.
+"""
+
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+
+from fasthtml.common import NotStr, to_xml
+from starlette.responses import StreamingResponse
+
+from tcm.pages.components.layout import layout_shell
+
+_SLOT_MARKER = "<!--tcm-slot:{}-->"
+_SLOT_PATTERN = re.compile(r"<!--tcm-slot:([\w-]+)-->")
+
+# Streamed items are batched into chunks of roughly this many bytes
+CHUNK_SIZE = 16 * 1024
+
+SlotContent = dict[str, AsyncIterable]
+
+
+def Slot(name: str):
+    """
+    Placeholder for content streamed into a page.
+
+    Args:
+        name: Slot name, matched against the iterables passed to the renderer
+
+    Returns:
+        Raw HTML marker replaced by the streamed items
+    """
+    return NotStr(_SLOT_MARKER.format(name))
+
+
+def _serialize(item) -> str:
+    """Serialize a streamed item (FT component, cached fragment or string)."""
+    if isinstance(item, (str, NotStr)):
+        return str(item)
+    return to_xml(item, indent=False)
+
+
+def split_slot(component, name: str) -> tuple[str, str]:
+    """
+    Render a component and split it around a slot.
+
+    Useful for wrappers (table frames, groups) opened and closed around a run
+    of streamed rows.
+
+    Args:
+        component: FT component containing ``Slot(name)``
+        name: Slot name
+
+    Returns:
+        Tuple of (markup before the slot, markup after the slot)
+    """
+    before, _, after = _serialize(component).partition(_SLOT_MARKER.format(name))
+    return before, after
+
+
+async def render_slots(
+    content,
+    slots: SlotContent,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """
+    Serialize content, streaming each slot's items in place of its marker.
+
+    Markup preceding the first slot is yielded on its own so it can be flushed
+    before the first row is fetched; streamed items are batched into chunks of
+    about ``chunk_size`` bytes.
+
+    Args:
+        content: FT component containing slot markers
+        slots: Async iterables of FT components or strings, by slot name
+        chunk_size: Approximate size of the chunks yielded for streamed items
+
+    Yields:
+        HTML chunks
+    """
+    parts = _SLOT_PATTERN.split(_serialize(content))
+    # re.split alternates literal markup and captured slot names
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            if part:
+                yield part
+            continue
+
+        items = slots.get(part)
+        if items is None:
+            continue
+        buffer: list[str] = []
+        size = 0
+        async for item in items:
+            html = _serialize(item)
+            buffer.append(html)
+            size += len(html)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer)
+
+
+def StreamingPageResponse(
+    render: Callable[[], Awaitable[tuple[object, SlotContent]]],
+    title: str,
+    status_code: int = 200,
+    show_header: bool = True,
+    show_footer: bool = True,
+) -> StreamingResponse:
+    """
+    Stream a page: layout shell first, then content and slot items as rendered.
+
+    Args:
+        render: Coroutine function loading page data and returning the content
+            component and its slot iterables; it runs after the shell is sent
+        title: Page title for the browser tab
+        status_code: HTTP status code
+        show_header: Whether to display the header
+        show_footer: Whether to display the footer
+
+    Returns:
+        Streaming HTML response
+    """
+
+    async def body():
+        head, tail = layout_shell(title, show_header, show_footer)
+        yield head
+        content, slots = await render()
+        async for chunk in render_slots(content, slots):
+            yield chunk
+        yield tail
+
+    return StreamingResponse(body(), status_code=status_code, media_type="text/html")
+
+
+def StreamingFragmentResponse(
+    render: Callable[[], Awaitable[tuple[object, SlotContent]]],
+    status_code: int = 200,
+) -> StreamingResponse:
+    """
+    Stream a page fragment: content and slot items, without the layout shell.
+
+    Used to answer partial update requests for streamed pages.
+
+    Args:
+        render: Coroutine function returning the fragment component and its
+            slot iterables
+        status_code: HTTP status code
+
+    Returns:
+        Streaming HTML response
+    """
+
+    async def body():
+        content, slots = await render()
+        async for chunk in render_slots(content, slots):
+            yield chunk
+
+    return StreamingResponse(body(), status_code=status_code, media_type="text/html")
@@ -8,9 +8,17 @@ from tcm.pages.components import (
     ActionButton,
     TagBadge,
 )
+from tcm.pages.components.live import LiveUpdates
 
 
-def StatisticsWidget(title: str, count: int, icon: str = "", color: str = "blue", href: str = None):
+def StatisticsWidget(
+    title: str,
+    count: int,
+    icon: str = "",
+    color: str = "blue",
+    href: str = None,
+    stat: str = "",
+):
     """
     Render a statistics widget showing a count and title.
 
@@ -20,6 +28,7 @@ def StatisticsWidget(title: str, count: int, icon: str = "", color: str = "blue"
         icon: Optional icon character or emoji
         color: Color scheme (blue, green, orange, purple)
         href: Optional URL to navigate to when clicked
+        stat: Statistics key, used by live updates to adjust the count
 
     Returns:
         FastHTML div element with statistic display
@@ -41,6 +50,7 @@ def StatisticsWidget(title: str, count: int, icon: str = "", color: str = "blue"
     return Div(
         inner_content,
         cls=f"stat-widget stat-widget-{color}",
+        data_stat=stat or None,
     )
 
 
@@ -117,6 +127,7 @@ def ActivityFeedItem(
             cls="activity-item-inner",
         ),
         cls="activity-item",
+        data_entity=f"{entity_type}:{entity_id}",
     )
 
 
@@ -220,6 +231,7 @@ def DashboardPage(
                 StatisticsWidget(
                     title="Test Cases",
                     count=stats.get("testcases", 0),
+                    stat="testcases",
                     icon="\U0001F4CB",  # 📋
                     color="blue",
                     href="/testcases",
@@ -227,6 +239,7 @@ def DashboardPage(
                 StatisticsWidget(
                     title="Projects",
                     count=stats.get("projects", 0),
+                    stat="projects",
                     icon="\U0001F4C1",  # 📁
                     color="green",
                     href="/projects",
@@ -234,6 +247,7 @@ def DashboardPage(
                 StatisticsWidget(
                     title="Tags",
                     count=stats.get("tags", 0),
+                    stat="tags",
                     icon="\U0001F3F7",  # 🏷
                     color="orange",
                     href="/tags",
@@ -258,6 +272,7 @@ def DashboardPage(
                 ),
                 cls="dashboard-content",
             ),
+            LiveUpdates("dashboard", reload_on_resync=True),
             cls="container container-wide",
         ),
         title="Dashboard - Test Case Management",
@@ -0,0 +1,88 @@
+"""
+Lazy loading of page modules.
+
+Importing ``fasthtml`` and the page component modules is a large part of the
+application's cold start, and none of it is needed before the first page is
+rendered. Route modules refer to page modules through ``lazy_module``
+proxies, which import the module on first attribute access, and serialize
+components with this module's ``to_xml``.
+
+``load_all`` imports every page module referred to this way; the application
+runs it in the background once it is serving, so the first page view usually
+finds them loaded.
+"""
+
+import importlib
+from functools import cache
+from types import ModuleType
+
+# Proxies by module name
+_modules: dict[str, "LazyModule"] = {}
+
+
+class LazyModule:
+    """Proxy for a module imported on first attribute access."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the proxy.
+
+        Args:
+            name: Absolute module name
+        """
+        self._name = name
+        self._module: ModuleType | None = None
+
+    def _load(self) -> ModuleType:
+        """Import the module, if not done yet."""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        # Later lookups of the same name skip the proxy
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """
+    Return a proxy importing a module on first use.
+
+    Args:
+        name: Absolute module name, e.g. "tcm.pages.dashboard"
+
+    Returns:
+        The module's proxy (one per module name)
+    """
+    if name not in _modules:
+        _modules[name] = LazyModule(name)
+    return _modules[name]
+
+
+def load_all() -> None:
+    """Import every module behind a lazy proxy."""
+    for module in list(_modules.values()):
+        module._load()
+
+
+@cache
+def _to_xml():
+    """Import fasthtml's serializer."""
+    from fasthtml.common import to_xml
+
+    return to_xml
+
+
+def to_xml(*elms, **kwargs) -> str:
+    """
+    Serialize FT components to HTML with ``fasthtml.common.to_xml``.
+
+    fasthtml is imported on the first call.
+    """
+    return _to_xml()(*elms, **kwargs)
@@ -2,13 +2,14 @@
 Project management pages for browsing, creating, and editing projects.
 """
 
-from tcm.pages.projects.list import ProjectsListPage
+from tcm.pages.projects.list import ProjectsListPage, ProjectsResults
 from tcm.pages.projects.create import CreateProjectPage
 from tcm.pages.projects.edit import EditProjectPage, NotFoundPage
 from tcm.pages.projects.view import ViewProjectPage
 
 __all__ = [
     "ProjectsListPage",
+    "ProjectsResults",
     "CreateProjectPage",
     "EditProjectPage",
     "ViewProjectPage",
@@ -10,8 +10,11 @@ from tcm.pages.components import (
     ErrorMessage,
     SuccessMessage,
 )
+from tcm.pages.components.cache import cached_component
+from tcm.pages.components.partial import PartialListScript, PartialTarget
 
 
+@cached_component("project-status-badge", key=lambda status: (status,))
 def StatusBadge(status: str):
     """
     Render a status badge for a project.
@@ -61,7 +64,7 @@ def ProjectRow(project: dict):
     else:
         date_range = "-"
 
-    testcase_count = len(project.get("testcase_ids", []))
+    testcase_count = project.get("testcase_count", 0)
 
     return Tr(
         Td(A(project["name"], href=f"/projects/{project['id']}", cls="project-link")),
@@ -116,6 +119,21 @@ def ProjectsTable(projects: list[dict]):
     )
 
 
+def ProjectsResults(projects: list[dict]):
+    """
+    Render the results part of the projects list.
+
+    This is the fragment returned for partial updates.
+
+    Args:
+        projects: List of project data dictionaries
+
+    Returns:
+        FastHTML div element replaced by partial updates
+    """
+    return PartialTarget(ProjectsTable(projects), id="projects-results", cls="projects-content")
+
+
 def ProjectsListPage(
     projects: list[dict],
     statuses: list[str],
@@ -176,14 +194,13 @@ def ProjectsListPage(
                     method="get",
                     action="/projects",
                     cls="filter-form",
+                    data_partial_target="projects-results",
                 ),
                 cls="filter-section",
             ),
             # Projects content
-            Div(
-                ProjectsTable(projects),
-                cls="projects-content",
-            ),
+            ProjectsResults(projects),
+            PartialListScript(),
             # Delete confirmation script
             Script("""
                 function confirmDelete(projectId, projectName) {
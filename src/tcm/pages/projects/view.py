@@ -2,16 +2,57 @@
 View project details page.
 """
 
+from urllib.parse import urlencode
+
 from fasthtml.common import *
 from tcm.pages.components import (
     PageLayout,
     ActionButton,
     ErrorMessage,
+    InputField,
+    SelectField,
     SuccessMessage,
 )
+from tcm.assets import asset_url
+from tcm.pages.components.cache import cached_component
+from tcm.pages.components.live import LiveUpdates
 from tcm.pages.projects.list import StatusBadge
+from tcm.pages.testcases.list import PaginationControls
+
+
+# Filter options for test case status and priority
+TESTCASE_STATUS_OPTIONS = [
+    ("", "All Statuses"),
+    ("draft", "Draft"),
+    ("active", "Active"),
+    ("deprecated", "Deprecated"),
+    ("archived", "Archived"),
+]
 
+TESTCASE_PRIORITY_OPTIONS = [
+    ("", "All Priorities"),
+    ("low", "Low"),
+    ("medium", "Medium"),
+    ("high", "High"),
+    ("critical", "Critical"),
+]
+
+
+def _row_key(testcase: dict, project_id: int):
+    """Fragment cache key for a project member row (None if the row has no version)."""
+    if not testcase.get("updated_at"):
+        return None
+    return (
+        testcase["id"],
+        testcase["updated_at"],
+        project_id,
+        testcase.get("title", ""),
+        testcase.get("status", "draft"),
+        testcase.get("priority", "medium"),
+    )
 
+
+@cached_component("project-view-row", key=_row_key)
 def TestCaseRow(testcase: dict, project_id: int):
     """
     Render a single test case row in the project view.
@@ -56,11 +97,173 @@ def TestCasesTable(testcases: list[dict], project_id: int):
         FastHTML table element
     """
     if not testcases:
-        return Div(
-            P("No test cases in this project.", cls="empty-message"),
-            cls="empty-state",
-        )
+        return TestCasesEmptyState()
+
+    return TestCasesTableFrame(*[TestCaseRow(tc, project_id) for tc in testcases])
+
+
+def TestCasesEmptyState(message: str = "No test cases in this project."):
+    """Render the empty state shown when a project has no (matching) test cases."""
+    return Div(
+        P(message, cls="empty-message"),
+        cls="empty-state",
+    )
 
+
+# Member list query parameters and their defaults
+DEFAULT_MEMBER_LISTING = {
+    "q": "",
+    "status": "",
+    "priority": "",
+    "sort": "added",
+    "order": "asc",
+    "page": 1,
+}
+
+
+def member_list_url(project_id: int, listing: dict, **changes) -> str:
+    """
+    Build the project page URL for a member listing.
+
+    Args:
+        project_id: Project ID
+        listing: Current listing parameters (see DEFAULT_MEMBER_LISTING)
+        **changes: Parameters to override
+
+    Returns:
+        URL with only the non-default parameters in its query string
+    """
+    params = {**listing, **changes}
+    query = urlencode(
+        {
+            key: value
+            for key, value in params.items()
+            if key in DEFAULT_MEMBER_LISTING and value != DEFAULT_MEMBER_LISTING[key]
+        }
+    )
+    return f"/projects/{project_id}?{query}" if query else f"/projects/{project_id}"
+
+
+def MemberStatusRollup(project_id: int, status_counts: dict[str, int], listing: dict):
+    """
+    Render per-status member counts, each linking to the status filter.
+
+    Args:
+        project_id: Project ID
+        status_counts: Member count per status value
+        listing: Current listing parameters
+
+    Returns:
+        FastHTML div element with one badge link per status
+    """
+    return Div(
+        *[
+            A(
+                Span(status.replace("_", " ").title(), cls=f"status-badge status-{status}"),
+                Span(f" {count}"),
+                href=member_list_url(project_id, listing, status=status, page=1),
+                cls="status-rollup-item" + (" active" if listing["status"] == status else ""),
+            )
+            for status, count in status_counts.items()
+        ],
+        cls="status-rollup",
+    )
+
+
+def MemberFilterBar(project_id: int, listing: dict):
+    """
+    Render the search, filter and sort form for a project's members.
+
+    Args:
+        project_id: Project ID
+        listing: Current listing parameters
+
+    Returns:
+        FastHTML div element with the filter form
+    """
+    return Div(
+        Form(
+            Div(
+                Div(
+                    InputField(
+                        name="q",
+                        label="Search",
+                        placeholder="Search by title...",
+                        value=listing["q"],
+                    ),
+                    cls="filter-field filter-field-wide",
+                ),
+                Div(
+                    SelectField(
+                        name="status",
+                        label="Status",
+                        options=TESTCASE_STATUS_OPTIONS,
+                        selected_value=listing["status"],
+                    ),
+                    cls="filter-field",
+                ),
+                Div(
+                    SelectField(
+                        name="priority",
+                        label="Priority",
+                        options=TESTCASE_PRIORITY_OPTIONS,
+                        selected_value=listing["priority"],
+                    ),
+                    cls="filter-field",
+                ),
+                Div(
+                    SelectField(
+                        name="sort",
+                        label="Sort By",
+                        options=[
+                            ("added", "Date Added"),
+                            ("title", "Title"),
+                            ("status", "Status"),
+                            ("priority", "Priority"),
+                        ],
+                        selected_value=listing["sort"],
+                    ),
+                    cls="filter-field",
+                ),
+                Div(
+                    SelectField(
+                        name="order",
+                        label="Order",
+                        options=[("asc", "Ascending"), ("desc", "Descending")],
+                        selected_value=listing["order"],
+                    ),
+                    cls="filter-field",
+                ),
+                cls="filter-fields",
+            ),
+            Div(
+                Button("Filter", type="submit", cls="btn btn-secondary btn-small"),
+                Button(
+                    "Clear",
+                    type="button",
+                    onclick=f"window.location.href='/projects/{project_id}'",
+                    cls="btn btn-secondary btn-small",
+                ),
+                cls="filter-actions",
+            ),
+            method="get",
+            action=f"/projects/{project_id}",
+            cls="filter-form",
+        ),
+        cls="filter-section",
+    )
+
+
+def TestCasesTableFrame(*rows):
+    """
+    Render the project test cases table around the given rows.
+
+    Args:
+        *rows: Table rows (TestCaseRow elements or a streaming Slot)
+
+    Returns:
+        FastHTML table element
+    """
     return Table(
         Thead(
             Tr(
@@ -70,31 +273,128 @@ def TestCasesTable(testcases: list[dict], project_id: int):
                 Th("Actions", cls="text-right"),
             )
         ),
-        Tbody(*[TestCaseRow(tc, project_id) for tc in testcases]),
+        Tbody(*rows),
         cls="data-table",
     )
 
 
+def TestCasePickerFilters():
+    """
+    Render the search and filter fields of the add test cases modal.
+
+    The tag options are filled in by the picker script from the tag catalog
+    when the modal is first opened.
+
+    Returns:
+        FastHTML div element with the filter fields
+    """
+    return Div(
+        Div(
+            InputField(
+                name="picker_search",
+                label="Search",
+                placeholder="Search by title...",
+            ),
+            cls="filter-field filter-field-wide",
+            oninput="searchTestCases()",
+        ),
+        Div(
+            SelectField(
+                name="picker_status",
+                label="Status",
+                options=TESTCASE_STATUS_OPTIONS,
+            ),
+            cls="filter-field",
+            onchange="searchTestCases()",
+        ),
+        Div(
+            SelectField(
+                name="picker_priority",
+                label="Priority",
+                options=TESTCASE_PRIORITY_OPTIONS,
+            ),
+            cls="filter-field",
+            onchange="searchTestCases()",
+        ),
+        Div(
+            SelectField(
+                name="picker_tag_id",
+                label="Tag",
+                options=[("", "All Tags")],
+            ),
+            cls="filter-field",
+            onchange="searchTestCases()",
+        ),
+        cls="filter-fields",
+    )
+
+
+def project_page_title(project: dict) -> str:
+    """Browser title for a project view page."""
+    return f"{project['name']} - Test Case Management"
+
+
 def ViewProjectPage(
     project: dict,
     testcases: list[dict],
-    available_testcases: list[dict],
     success_message: str = "",
     error_message: str = "",
 ):
     """
     Render the project details view page.
 
+    Test cases that can be added are searched on demand by the add test
+    cases modal, so they are not part of the page.
+
     Args:
         project: Project data dictionary
         testcases: List of test cases in the project
-        available_testcases: List of all available test cases (for adding)
         success_message: Success message to display
         error_message: Error message to display
 
     Returns:
         FastHTML page with project details
     """
+    return PageLayout(
+        ViewProjectContent(
+            project,
+            testcase_count=len(testcases),
+            testcases_table=TestCasesTable(testcases, project["id"]),
+            success_message=success_message,
+            error_message=error_message,
+        ),
+        title=project_page_title(project),
+    )
+
+
+def ViewProjectContent(
+    project: dict,
+    testcase_count: int,
+    testcases_table,
+    success_message: str = "",
+    error_message: str = "",
+    status_counts: dict[str, int] | None = None,
+    listing: dict | None = None,
+    matching_count: int | None = None,
+    total_pages: int = 1,
+):
+    """
+    Render the main content of the project details view page.
+
+    Args:
+        project: Project data dictionary
+        testcase_count: Number of test cases in the project
+        testcases_table: Test cases table or empty state
+        success_message: Success message to display
+        error_message: Error message to display
+        status_counts: Member count per status (shows the status rollup)
+        listing: Member listing parameters (shows filters and pagination)
+        matching_count: Number of members matching the listing filters
+        total_pages: Number of member pages
+
+    Returns:
+        FastHTML container element
+    """
     # Format dates
     start_date = project.get("start_date", "")
     end_date = project.get("end_date", "")
@@ -109,212 +409,191 @@ def ViewProjectPage(
     else:
         end_date_display = "Not set"
 
-    # Filter available test cases (exclude already added ones)
-    testcase_ids = {tc["id"] for tc in testcases}
-    remaining_testcases = [tc for tc in available_testcases if tc["id"] not in testcase_ids]
-
-    return PageLayout(
+    return Div(
+        # Header section
         Div(
-            # Header section
+            H2(project["name"], cls="page-title"),
             Div(
-                H2(project["name"], cls="page-title"),
-                Div(
-                    ActionButton("Back to Projects", href="/projects", btn_type="secondary"),
-                    ActionButton("Edit", href=f"/projects/{project['id']}/edit", btn_type="secondary"),
-                    ActionButton(
-                        "Delete",
-                        onclick=f"confirmDelete({project['id']}, '{project['name']}')",
-                        btn_type="danger",
-                    ),
-                    cls="page-actions",
+                ActionButton("Back to Projects", href="/projects", btn_type="secondary"),
+                ActionButton("Edit", href=f"/projects/{project['id']}/edit", btn_type="secondary"),
+                ActionButton(
+                    "Delete",
+                    onclick=f"confirmDelete({project['id']}, '{project['name']}')",
+                    btn_type="danger",
                 ),
-                cls="page-header-content",
+                cls="page-actions",
             ),
-            SuccessMessage(success_message),
-            ErrorMessage(error_message),
-            # Project details section
+            cls="page-header-content",
+        ),
+        SuccessMessage(success_message),
+        ErrorMessage(error_message),
+        # Project details section
+        Div(
+            H3("Project Details", cls="section-title"),
             Div(
-                H3("Project Details", cls="section-title"),
                 Div(
-                    Div(
-                        Strong("Status:"),
-                        Span(" "),
-                        StatusBadge(project["status"]),
-                        cls="detail-item",
-                    ),
-                    Div(
-                        Strong("Description:"),
-                        P(project.get("description") or "No description provided", cls="detail-text"),
-                        cls="detail-item",
-                    ),
-                    Div(
-                        Strong("Start Date:"),
-                        Span(f" {start_date_display}"),
-                        cls="detail-item",
-                    ),
-                    Div(
-                        Strong("End Date:"),
-                        Span(f" {end_date_display}"),
-                        cls="detail-item",
-                    ),
-                    Div(
-                        Strong("Test Cases:"),
-                        Span(f" {len(testcases)}"),
-                        cls="detail-item",
-                    ),
-                    cls="details-grid",
+                    Strong("Status:"),
+                    Span(" "),
+                    StatusBadge(project["status"]),
+                    cls="detail-item",
+                ),
+                Div(
+                    Strong("Description:"),
+                    P(project.get("description") or "No description provided", cls="detail-text"),
+                    cls="detail-item",
+                ),
+                Div(
+                    Strong("Start Date:"),
+                    Span(f" {start_date_display}"),
+                    cls="detail-item",
+                ),
+                Div(
+                    Strong("End Date:"),
+                    Span(f" {end_date_display}"),
+                    cls="detail-item",
+                ),
+                Div(
+                    Strong("Test Cases:"),
+                    Span(f" {testcase_count}"),
+                    cls="detail-item",
+                    id="project-testcase-count",
                 ),
-                cls="details-section",
+                cls="details-grid",
             ),
-            # Test cases section
+            cls="details-section",
+        ),
+        # Test cases section
+        Div(
             Div(
+                H3("Test Cases", cls="section-title"),
                 Div(
-                    H3("Test Cases", cls="section-title"),
-                    Div(
-                        Button(
-                            "Add Test Cases",
-                            type="button",
-                            onclick="showAddTestCaseModal()",
-                            cls="btn btn-primary btn-small",
-                        ),
-                        cls="section-actions",
+                    Button(
+                        "Add Test Cases",
+                        type="button",
+                        onclick=f"showAddTestCaseModal({project['id']})",
+                        cls="btn btn-primary btn-small",
                     ),
-                    cls="section-header",
+                    cls="section-actions",
                 ),
-                TestCasesTable(testcases, project["id"]),
-                cls="testcases-section",
+                cls="section-header",
             ),
-            # Add test case modal
+            MemberStatusRollup(project["id"], status_counts, listing or DEFAULT_MEMBER_LISTING)
+            if status_counts
+            else None,
+            MemberFilterBar(project["id"], listing) if listing else None,
+            P(
+                f"{matching_count} of {testcase_count} test cases match",
+                cls="results-summary",
+            )
+            if listing and matching_count != testcase_count
+            else None,
+            testcases_table,
+            PaginationControls(
+                listing["page"], total_pages, member_list_url(project["id"], listing, page=1)
+            )
+            if listing
+            else None,
+            cls="testcases-section",
+        ),
+        # Add test case modal
+        Div(
             Div(
                 Div(
-                    Div(
-                        H3("Add Test Cases to Project"),
-                        Button(
-                            "×",
-                            type="button",
-                            onclick="hideAddTestCaseModal()",
-                            cls="modal-close",
-                        ),
-                        cls="modal-header",
+                    H3("Add Test Cases to Project"),
+                    Button(
+                        "×",
+                        type="button",
+                        onclick="hideAddTestCaseModal()",
+                        cls="modal-close",
                     ),
-                    Div(
-                        P("Select test cases to add to this project:", cls="modal-description") if remaining_testcases else P("All available test cases have been added to this project.", cls="modal-description"),
-                        Div(
-                            *[
-                                Div(
-                                    Label(
-                                        Input(
-                                            type="checkbox",
-                                            name="testcase_ids",
-                                            value=str(tc["id"]),
-                                            cls="testcase-checkbox",
-                                        ),
-                                        Span(tc["title"], cls="testcase-label"),
-                                        cls="testcase-option",
-                                    ),
-                                    cls="testcase-item",
-                                )
-                                for tc in remaining_testcases
-                            ] if remaining_testcases else [],
-                            cls="testcase-list",
-                            id="testcase-list",
-                        ),
-                        cls="modal-body",
+                    cls="modal-header",
+                ),
+                Div(
+                    TestCasePickerFilters(),
+                    P(
+                        "Loading test cases...",
+                        cls="modal-description",
+                        id="testcase-picker-summary",
                     ),
                     Div(
-                        Button("Cancel", type="button", onclick="hideAddTestCaseModal()", cls="btn btn-secondary"),
-                        Button("Add Selected", type="button", onclick=f"addSelectedTestCases({project['id']})", cls="btn btn-primary", disabled=not remaining_testcases),
-                        cls="modal-footer",
+                        cls="testcase-list",
+                        id="testcase-list",
+                    ),
+                    Button(
+                        "Load more",
+                        type="button",
+                        onclick="loadMoreTestCases()",
+                        cls="btn btn-secondary btn-small",
+                        id="testcase-picker-more",
+                        style="display: none;",
+                    ),
+                    cls="modal-body",
+                ),
+                Div(
+                    Button(
+                        "Cancel",
+                        type="button",
+                        onclick="hideAddTestCaseModal()",
+                        cls="btn btn-secondary",
+                    ),
+                    Button(
+                        "Add Selected",
+                        type="button",
+                        onclick=f"addSelectedTestCases({project['id']})",
+                        cls="btn btn-primary",
+                        id="testcase-picker-add",
+                        disabled=True,
                     ),
-                    cls="modal-content",
+                    cls="modal-footer",
                 ),
-                id="add-testcase-modal",
-                cls="modal",
-                style="display: none;",
+                cls="modal-content",
             ),
-            # Scripts
-            Script("""
-                function confirmDelete(projectId, projectName) {
-                    if (confirm('Are you sure you want to delete the project "' + projectName + '"?')) {
-                        fetch('/api/projects/' + projectId, {
-                            method: 'DELETE',
-                        }).then(response => {
-                            if (response.ok) {
-                                window.location.href = '/projects?success=Project deleted successfully';
-                            } else {
-                                response.json().then(data => {
-                                    alert('Error: ' + (data.detail || 'Failed to delete project'));
-                                });
-                            }
-                        }).catch(error => {
-                            alert('Error: ' + error.message);
-                        });
-                    }
-                }
-
-                function confirmRemoveTestCase(projectId, testcaseId, testcaseTitle) {
-                    if (confirm('Are you sure you want to remove "' + testcaseTitle + '" from this project?')) {
-                        fetch('/api/projects/' + projectId + '/testcases/' + testcaseId, {
-                            method: 'DELETE',
-                        }).then(response => {
-                            if (response.ok) {
-                                window.location.href = '/projects/' + projectId + '?success=Test case removed successfully';
-                            } else {
-                                response.json().then(data => {
-                                    alert('Error: ' + (data.detail || 'Failed to remove test case'));
-                                });
-                            }
-                        }).catch(error => {
-                            alert('Error: ' + error.message);
-                        });
-                    }
-                }
-
-                function showAddTestCaseModal() {
-                    document.getElementById('add-testcase-modal').style.display = 'flex';
-                }
-
-                function hideAddTestCaseModal() {
-                    document.getElementById('add-testcase-modal').style.display = 'none';
-                }
-
-                function addSelectedTestCases(projectId) {
-                    const checkboxes = document.querySelectorAll('.testcase-checkbox:checked');
-                    const testcaseIds = Array.from(checkboxes).map(cb => cb.value);
-
-                    if (testcaseIds.length === 0) {
-                        alert('Please select at least one test case to add.');
-                        return;
-                    }
-
-                    // Add test cases one by one
-                    let promises = testcaseIds.map(testcaseId =>
-                        fetch('/api/projects/' + projectId + '/testcases/' + testcaseId, {
-                            method: 'POST',
-                        })
-                    );
-
-                    Promise.all(promises).then(responses => {
-                        const allOk = responses.every(r => r.ok);
-                        if (allOk) {
-                            window.location.href = '/projects/' + projectId + '?success=Test cases added successfully';
+            id="add-testcase-modal",
+            cls="modal",
+            style="display: none;",
+        ),
+        LiveUpdates(f"project:{project['id']}"),
+        # Scripts
+        Script(src=asset_url("js/project-testcase-picker.js"), defer=True),
+        Script("""
+            function confirmDelete(projectId, projectName) {
+                if (confirm('Are you sure you want to delete the project "' + projectName + '"?')) {
+                    fetch('/api/projects/' + projectId, {
+                        method: 'DELETE',
+                    }).then(response => {
+                        if (response.ok) {
+                            window.location.href = '/projects?success=Project deleted successfully';
                         } else {
-                            alert('Some test cases could not be added. Please try again.');
+                            response.json().then(data => {
+                                alert('Error: ' + (data.detail || 'Failed to delete project'));
+                            });
                         }
                     }).catch(error => {
                         alert('Error: ' + error.message);
                     });
                 }
+            }
 
-                // Close modal when clicking outside
-                window.onclick = function(event) {
-                    const modal = document.getElementById('add-testcase-modal');
-                    if (event.target === modal) {
-                        hideAddTestCaseModal();
-                    }
+            function confirmRemoveTestCase(projectId, testcaseId, testcaseTitle) {
+                const question = 'Are you sure you want to remove "' + testcaseTitle
+                    + '" from this project?';
+                if (confirm(question)) {
+                    fetch('/api/projects/' + projectId + '/testcases/' + testcaseId, {
+                        method: 'DELETE',
+                    }).then(response => {
+                        if (response.ok) {
+                            window.location.href = '/projects/' + projectId
+                                + '?success=Test case removed successfully';
+                        } else {
+                            response.json().then(data => {
+                                alert('Error: ' + (data.detail || 'Failed to remove test case'));
+                            });
+                        }
+                    }).catch(error => {
+                        alert('Error: ' + error.message);
+                    });
                 }
-            """),
-            cls="container container-wide",
-        ),
-        title=f"{project['name']} - Test Case Management",
+            }
+        """),
+        cls="container container-wide",
     )
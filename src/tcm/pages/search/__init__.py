@@ -2,13 +2,51 @@
 Search page for global search across all entities.
 """
 
+from urllib.parse import urlencode
+
 from fasthtml.common import *
 from tcm.pages.components import (
     PageLayout,
     ActionButton,
     TagBadge,
     SelectField,
+    ErrorMessage,
 )
+from tcm.pages.testcases.list import PaginationControls
+
+# Display names of the searchable entity types
+ENTITY_LABELS = {
+    "testcase": "Test Cases",
+    "project": "Projects",
+    "tag": "Tags",
+}
+
+
+def search_url(
+    query: str,
+    entity_type: str = "",
+    status_filter: str = "",
+    category_filter: str = "",
+) -> str:
+    """
+    Build the search page URL for a query and its filters.
+
+    Args:
+        query: Search query
+        entity_type: Entity type filter
+        status_filter: Status filter
+        category_filter: Category filter (for tags)
+
+    Returns:
+        URL with only the non-empty parameters in its query string
+    """
+    params = {
+        "q": query,
+        "entity_type": entity_type,
+        "status": status_filter,
+        "category": category_filter,
+    }
+    return "/search?" + urlencode({key: value for key, value in params.items() if value})
 
 
 def SearchForm(
@@ -54,7 +92,7 @@ def SearchForm(
                     Label("Search", **{"for": "query"}),
                     Input(
                         type="text",
-                        name="query",
+                        name="q",
                         id="query",
                         placeholder="Search for test cases, projects, or tags...",
                         value=query,
@@ -219,40 +257,41 @@ def SearchResultItem(result: dict):
         return Div()
 
 
-def SearchResultsSection(entity_type: str, results: list[dict], query: str = ""):
+def SearchFacets(
+    query: str,
+    facets: dict[str, int],
+    entity_type: str = "",
+    status_filter: str = "",
+    category_filter: str = "",
+):
     """
-    Render a section of search results grouped by entity type.
+    Render the number of matches per entity type, each linking to that type.
 
     Args:
-        entity_type: Type of entity (testcase, project, tag)
-        results: List of result dicts
-        query: Search query for highlighting
+        query: Search query
+        facets: Match count per entity type
+        entity_type: Current entity type filter
+        status_filter: Current status filter
+        category_filter: Current category filter
 
     Returns:
-        FastHTML div element with results section
+        FastHTML div element with one link per entity type, plus "All"
     """
-    entity_type_labels = {
-        "testcase": "Test Cases",
-        "project": "Projects",
-        "tag": "Tags",
-    }
-
-    if not results:
-        return None
-
+    choices = [("", "All", sum(facets.values()))]
+    choices += [
+        (etype, ENTITY_LABELS.get(etype, etype.title()), count)
+        for etype, count in facets.items()
+    ]
     return Div(
-        Div(
-            H3(
-                f"{entity_type_labels.get(entity_type, entity_type.title())} ({len(results)})",
-                cls="results-section-title",
-            ),
-            cls="results-section-header",
-        ),
-        Div(
-            *[SearchResultItem(result) for result in results],
-            cls="results-section-content",
-        ),
-        cls="search-results-section",
+        *[
+            A(
+                f"{label} ({count})",
+                href=search_url(query, etype, status_filter, category_filter),
+                cls="status-rollup-item" + (" active" if entity_type == etype else ""),
+            )
+            for etype, label, count in choices
+        ],
+        cls="status-rollup search-facets",
     )
 
 
@@ -261,8 +300,12 @@ def SearchPage(
     entity_type: str = "",
     status_filter: str = "",
     category_filter: str = "",
-    results: dict = None,
+    results: list[dict] = None,
+    facets: dict[str, int] = None,
     total_count: int = 0,
+    current_page: int = 1,
+    total_pages: int = 1,
+    timed_out: list[str] = None,
 ):
     """
     Render the search page with form and results.
@@ -272,13 +315,18 @@ def SearchPage(
         entity_type: Current entity type filter
         status_filter: Current status filter
         category_filter: Current category filter
-        results: Dictionary of results grouped by entity type
-        total_count: Total number of results across all types
+        results: Result dicts for the current page, best match first
+        facets: Number of matches per entity type
+        total_count: Total number of results matching all filters
+        current_page: Current results page (1-indexed)
+        total_pages: Total number of results pages
+        timed_out: Entity types whose results took too long to load (and
+            are missing from the page)
 
     Returns:
         FastHTML page with search interface
     """
-    results = results or {}
+    results = results or []
 
     # Show results summary if there's a query
     results_summary = None
@@ -297,13 +345,6 @@ def SearchPage(
                 cls="results-summary-container",
             )
 
-    # Build results sections
-    result_sections = []
-    for etype in ["testcase", "project", "tag"]:
-        if etype in results and results[etype]:
-            section = SearchResultsSection(etype, results[etype], query)
-            if section:
-                result_sections.append(section)
 
     return PageLayout(
         Div(
@@ -321,9 +362,32 @@ def SearchPage(
             ),
             # Results summary
             results_summary,
-            # Results sections
+            SearchFacets(query, facets, entity_type, status_filter, category_filter)
+            if query and facets
+            else None,
+            ErrorMessage(
+                "Search for "
+                + ", ".join(ENTITY_LABELS.get(etype, etype) for etype in timed_out)
+                + " took too long; those results are not shown."
+            )
+            if timed_out
+            else None,
+            # Ranked results
             Div(
-                *result_sections if result_sections else [],
+                Div(
+                    Div(
+                        *[SearchResultItem(result) for result in results],
+                        cls="results-section-content",
+                    ),
+                    cls="search-results-section",
+                )
+                if results
+                else None,
+                PaginationControls(
+                    current_page,
+                    total_pages,
+                    search_url(query, entity_type, status_filter, category_filter),
+                ),
                 cls="search-results",
             ),
             cls="container container-wide",
@@ -12,6 +12,7 @@ from tcm.pages.components import (
     ErrorMessage,
     SuccessMessage,
 )
+from tcm.pages.components.partial import PartialListScript, PartialTarget
 
 
 def TagRow(tag: dict):
@@ -60,11 +61,29 @@ def TagsTable(tags: list[dict]):
         FastHTML table element
     """
     if not tags:
-        return Div(
-            P("No tags found.", cls="empty-message"),
-            cls="empty-state",
-        )
+        return TagsEmptyState()
 
+    return TagsTableFrame(*[TagRow(tag) for tag in tags])
+
+
+def TagsEmptyState():
+    """Render the empty state shown when no tags match."""
+    return Div(
+        P("No tags found.", cls="empty-message"),
+        cls="empty-state",
+    )
+
+
+def TagsTableFrame(*rows):
+    """
+    Render the tags table around the given rows.
+
+    Args:
+        *rows: Table rows (TagRow elements or a streaming Slot)
+
+    Returns:
+        FastHTML table element
+    """
     return Table(
         Thead(
             Tr(
@@ -75,29 +94,49 @@ def TagsTable(tags: list[dict]):
                 Th("Actions"),
             )
         ),
-        Tbody(*[TagRow(tag) for tag in tags]),
+        Tbody(*rows),
         cls="data-table",
     )
 
 
-def CategoryTagsGroup(category: str, tags: list[dict]):
+def CategoryTagsGroup(category: str, tags: list[dict], count: int | None = None, table=None):
     """
     Render a group of tags for a category.
 
     Args:
         category: Category name
         tags: List of tags in this category
+        count: Number of tags in the category (defaults to len(tags))
+        table: Pre-built table to use instead of rendering tags
 
     Returns:
         FastHTML CategoryGroup element
     """
     return CategoryGroup(
         category=category,
-        count=len(tags),
-        children=TagsTable(tags),
+        count=len(tags) if count is None else count,
+        children=TagsTable(tags) if table is None else table,
     )
 
 
+def TagsResults(content_list: list):
+    """
+    Render the results part of the tags list.
+
+    This is the fragment returned for partial updates.
+
+    Args:
+        content_list: Tag tables, category groups or streaming slots to show
+
+    Returns:
+        FastHTML div element replaced by partial updates
+    """
+    return PartialTarget(*content_list, id="tags-results", cls="tags-content")
+
+
+TAGS_PAGE_TITLE = "Tags - Test Case Management"
+
+
 def TagsListPage(
     tags: list[dict],
     categories: list[str],
@@ -120,19 +159,9 @@ def TagsListPage(
     Returns:
         FastHTML page with tags list
     """
-    # Prepare category options for filter dropdown
-    category_options = [("", "All Categories")] + [
-        (cat, cat.replace("_", " ").title()) for cat in categories
-    ]
-
     # Handle empty state
     if not tags:
-        content_list = [
-            Div(
-                P("No tags found.", cls="empty-message"),
-                cls="empty-state",
-            )
-        ]
+        content_list = [TagsEmptyState()]
     # Group tags by category if needed
     elif grouped and not current_category:
         tags_by_category = {}
@@ -150,69 +179,102 @@ def TagsListPage(
         content_list = [TagsTable(tags)]
 
     return PageLayout(
+        TagsListContent(
+            content_list,
+            categories=categories,
+            current_category=current_category,
+            success_message=success_message,
+            error_message=error_message,
+        ),
+        title=TAGS_PAGE_TITLE,
+    )
+
+
+def TagsListContent(
+    content_list: list,
+    categories: list[str],
+    current_category: str = "",
+    success_message: str = "",
+    error_message: str = "",
+):
+    """
+    Render the main content of the tags list page.
+
+    Args:
+        content_list: Tag tables, category groups or streaming slots to show
+        categories: List of available categories for filtering
+        current_category: Currently selected category filter
+        success_message: Success message to display
+        error_message: Error message to display
+
+    Returns:
+        FastHTML container element
+    """
+    # Prepare category options for filter dropdown
+    category_options = [("", "All Categories")] + [
+        (cat, cat.replace("_", " ").title()) for cat in categories
+    ]
+
+    return Div(
         Div(
+            H2("Tags Management", cls="page-title"),
             Div(
-                H2("Tags Management", cls="page-title"),
-                Div(
-                    ActionButton("Create New Tag", href="/tags/new", btn_type="primary"),
-                    cls="page-actions",
-                ),
-                cls="page-header-content",
+                ActionButton("Create New Tag", href="/tags/new", btn_type="primary"),
+                cls="page-actions",
             ),
-            SuccessMessage(success_message),
-            ErrorMessage(error_message),
-            # Filter section
-            Div(
-                Form(
-                    Div(
-                        SelectField(
-                            name="category",
-                            label="Filter by Category",
-                            options=category_options,
-                            selected_value=current_category,
-                            placeholder="All Categories",
-                        ),
-                        cls="filter-field",
-                    ),
-                    Button("Filter", type="submit", cls="btn btn-secondary btn-small"),
-                    Button(
-                        "Clear",
-                        type="button",
-                        onclick="window.location.href='/tags'",
-                        cls="btn btn-secondary btn-small",
+            cls="page-header-content",
+        ),
+        SuccessMessage(success_message),
+        ErrorMessage(error_message),
+        # Filter section
+        Div(
+            Form(
+                Div(
+                    SelectField(
+                        name="category",
+                        label="Filter by Category",
+                        options=category_options,
+                        selected_value=current_category,
+                        placeholder="All Categories",
                     ),
-                    method="get",
-                    action="/tags",
-                    cls="filter-form",
+                    cls="filter-field",
                 ),
-                cls="filter-section",
-            ),
-            # Tags content
-            Div(
-                *content_list,
-                cls="tags-content",
+                Button("Filter", type="submit", cls="btn btn-secondary btn-small"),
+                Button(
+                    "Clear",
+                    type="button",
+                    onclick="window.location.href='/tags'",
+                    cls="btn btn-secondary btn-small",
+                ),
+                method="get",
+                action="/tags",
+                cls="filter-form",
+                data_partial_target="tags-results",
             ),
-            # Delete confirmation script
-            Script("""
-                function confirmDelete(tagId, tagValue) {
-                    if (confirm('Are you sure you want to delete the tag "' + tagValue + '"?')) {
-                        fetch('/api/tags/' + tagId, {
-                            method: 'DELETE',
-                        }).then(response => {
-                            if (response.ok) {
-                                window.location.href = '/tags?success=Tag deleted successfully';
-                            } else {
-                                response.json().then(data => {
-                                    alert('Error: ' + (data.detail || 'Failed to delete tag'));
-                                });
-                            }
-                        }).catch(error => {
-                            alert('Error: ' + error.message);
-                        });
-                    }
-                }
-            """),
-            cls="container container-wide",
+            cls="filter-section",
         ),
-        title="Tags - Test Case Management",
+        # Tags content
+        TagsResults(content_list),
+        PartialListScript(),
+        # Delete confirmation script
+        Script("""
+            function confirmDelete(tagId, tagValue) {
+                if (confirm('Are you sure you want to delete the tag "' + tagValue + '"?')) {
+                    fetch('/api/tags/' + tagId, {
+                        method: 'DELETE',
+                    }).then(response => {
+                        if (response.ok) {
+                            window.location.href = '/tags?success=Tag deleted successfully';
+                        } else {
+                            response.json().then(data => {
+                                alert('Error: ' + (data.detail || 'Failed to delete tag'));
+                            });
+                        }
+                    }).catch(error => {
+                        alert('Error: ' + error.message);
+                    });
+                }
+            }
+        """),
+        cls="container container-wide",
     )
@@ -74,7 +74,8 @@ def MultiSelectTagField(
 
 
 def CreateTestCasePage(
-    available_tags: list[dict] = None,
+    tag_categories: list[str] = None,
+    selected_tags: list[dict] = None,
     error_message: str = "",
     form_data: dict | None = None,
 ):
@@ -82,7 +83,8 @@ def CreateTestCasePage(
     Render the create test case page.
 
     Args:
-        available_tags: List of available tags for selection
+        tag_categories: List of tag categories for the tag browser
+        selected_tags: Previously selected tags for repopulating the tag picker
         error_message: Error message to display
         form_data: Previously submitted form data for repopulating fields
 
@@ -90,7 +92,6 @@ def CreateTestCasePage(
         FastHTML page with test case creation form
     """
     form_data = form_data or {}
-    available_tags = available_tags or []
 
     # Status options
     status_options = [
@@ -168,8 +169,8 @@ def CreateTestCasePage(
                     TagPickerField(
                         name="tag_ids",
                         label="Tags",
-                        available_tags=available_tags,
-                        selected_tag_ids=form_data.get("tag_ids", []),
+                        selected_tags=selected_tags,
+                        categories=tag_categories,
                     ),
                     Div(
                         SubmitButton("Create Test Case"),
@@ -75,24 +75,20 @@ def MultiSelectTagField(
 
 def EditTestCasePage(
     testcase: dict,
-    available_tags: list[dict] = None,
+    tag_categories: list[str] = None,
     error_message: str = "",
 ):
     """
     Render the edit test case page.
 
     Args:
-        testcase: Test case data dictionary
-        available_tags: List of available tags for selection
+        testcase: Test case data dictionary (tags are shown as selected)
+        tag_categories: List of tag categories for the tag browser
         error_message: Error message to display
 
     Returns:
         FastHTML page with test case edit form
     """
-    available_tags = available_tags or []
-
-    # Get selected tag IDs from testcase
-    selected_tag_ids = [tag["id"] for tag in testcase.get("tags", [])]
 
     # Status options
     status_options = [
@@ -170,8 +166,8 @@ def EditTestCasePage(
                     TagPickerField(
                         name="tag_ids",
                         label="Tags",
-                        available_tags=available_tags,
-                        selected_tag_ids=selected_tag_ids,
+                        selected_tags=testcase.get("tags", []),
+                        categories=tag_categories,
                     ),
                     Div(
                         SubmitButton("Save Changes"),
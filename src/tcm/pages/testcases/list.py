@@ -2,6 +2,8 @@
 Test cases list page for browsing and managing test cases.
 """
 
+from urllib.parse import urlencode
+
 from fasthtml.common import *
 from tcm.pages.components import (
     PageLayout,
@@ -12,8 +14,31 @@ from tcm.pages.components import (
     ErrorMessage,
     SuccessMessage,
 )
+from tcm.assets import asset_url
+from tcm.pages.components.cache import cached_component
+from tcm.pages.components.partial import PartialListScript, PartialTarget
+
+
+def _row_key(testcase: dict):
+    """
+    Fragment cache key for a test case row (None if the row has no version).
+
+    The displayed fields are part of the key as well, so a row can never be
+    served stale when two writes land within the timestamp resolution.
+    """
+    if not testcase.get("updated_at"):
+        return None
+    return (
+        testcase["id"],
+        testcase["updated_at"],
+        testcase["title"],
+        testcase["status"],
+        testcase["priority"],
+        len(testcase.get("tags", [])),
+    )
 
 
+@cached_component("testcases-list-row", key=_row_key)
 def TestCaseRow(testcase: dict):
     """
     Render a single test case row in the list.
@@ -150,6 +175,64 @@ def PaginationControls(current_page: int, total_pages: int, base_url: str):
     return Div(*controls, cls="pagination-controls")
 
 
+def TestCasesResults(
+    testcases: list[dict],
+    total: int,
+    page: int = 1,
+    page_size: int = 20,
+    search: str = "",
+    status_filter: str = "",
+    priority_filter: str = "",
+    tag_filter: str = "",
+):
+    """
+    Render the results part of the test cases list: summary, table and pagination.
+
+    This is the fragment returned for partial updates.
+
+    Args:
+        testcases: List of test case data dictionaries
+        total: Total number of test cases (before pagination)
+        page: Current page number (1-indexed)
+        page_size: Number of items per page
+        search: Search query
+        status_filter: Status filter value
+        priority_filter: Priority filter value
+        tag_filter: Tag filter value (tag ID)
+
+    Returns:
+        FastHTML div element replaced by partial updates
+    """
+    # Calculate pagination
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+
+    # Build base URL for pagination (preserving filters)
+    url_params = {
+        "search": search,
+        "status": status_filter,
+        "priority": priority_filter,
+        "tag_id": tag_filter,
+    }
+    query = urlencode({key: value for key, value in url_params.items() if value})
+    base_url = f"/testcases?{query}" if query else "/testcases"
+
+    return PartialTarget(
+        # Results summary
+        Div(
+            P(f"Showing {len(testcases)} of {total} test cases", cls="results-summary"),
+            cls="results-info",
+        ),
+        # Test cases content
+        Div(
+            TestCasesTable(testcases),
+            cls="testcases-content",
+        ),
+        # Pagination
+        PaginationControls(page, total_pages, base_url),
+        id="testcases-results",
+    )
+
+
 def TestCasesListPage(
     testcases: list[dict],
     total: int,
@@ -159,7 +242,7 @@ def TestCasesListPage(
     status_filter: str = "",
     priority_filter: str = "",
     tag_filter: str = "",
-    available_tags: list[dict] = None,
+    selected_tag: dict | None = None,
     success_message: str = "",
     error_message: str = "",
 ):
@@ -175,31 +258,14 @@ def TestCasesListPage(
         status_filter: Status filter value
         priority_filter: Priority filter value
         tag_filter: Tag filter value (tag ID)
-        available_tags: List of available tags for filtering
+        selected_tag: The filtered tag, if any; the other tags are loaded
+            from the tag catalog by js/tag-filter.js
         success_message: Success message to display
         error_message: Error message to display
 
     Returns:
         FastHTML page with test cases list
     """
-    available_tags = available_tags or []
-
-    # Calculate pagination
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
-
-    # Build base URL for pagination (preserving filters)
-    base_url_parts = ["/testcases?"]
-    url_params = []
-    if search:
-        url_params.append(f"search={search}")
-    if status_filter:
-        url_params.append(f"status={status_filter}")
-    if priority_filter:
-        url_params.append(f"priority={priority_filter}")
-    if tag_filter:
-        url_params.append(f"tag_id={tag_filter}")
-    base_url = "/testcases?" + "&".join(url_params) if url_params else "/testcases"
-
     # Status options
     status_options = [
         ("", "All Statuses"),
@@ -218,11 +284,12 @@ def TestCasesListPage(
         ("critical", "Critical"),
     ]
 
-    # Tag options
-    tag_options = [("", "All Tags")] + [
-        (str(tag["id"]), f"{tag['category']}: {tag['value']}")
-        for tag in available_tags
-    ]
+    # Tag options (filled in from the tag catalog in the browser)
+    tag_options = [("", "All Tags")]
+    if selected_tag:
+        tag_options.append(
+            (str(selected_tag["id"]), f"{selected_tag['category']}: {selected_tag['value']}")
+        )
 
     return PageLayout(
         Div(
@@ -275,6 +342,7 @@ def TestCasesListPage(
                                 selected_value=tag_filter,
                             ),
                             cls="filter-field",
+                            data_tag_catalog=True,
                         ),
                         cls="filter-fields",
                     ),
@@ -291,21 +359,22 @@ def TestCasesListPage(
                     method="get",
                     action="/testcases",
                     cls="filter-form",
+                    data_partial_target="testcases-results",
                 ),
                 cls="filter-section",
             ),
-            # Results summary
-            Div(
-                P(f"Showing {len(testcases)} of {total} test cases", cls="results-summary"),
-                cls="results-info",
-            ),
-            # Test cases content
-            Div(
-                TestCasesTable(testcases),
-                cls="testcases-content",
+            TestCasesResults(
+                testcases,
+                total,
+                page=page,
+                page_size=page_size,
+                search=search,
+                status_filter=status_filter,
+                priority_filter=priority_filter,
+                tag_filter=tag_filter,
             ),
-            # Pagination
-            PaginationControls(page, total_pages, base_url),
+            PartialListScript(),
+            Script(src=asset_url("js/tag-filter.js"), defer=True),
             # Delete confirmation script
             Script("""
                 function confirmDelete(testcaseId, testcaseTitle) {
@@ -0,0 +1,126 @@
+"""
+Queries over the test cases of a project.
+
+Shared by the project API and the project view page so both paginate, sort
+and filter members the same way. Sorting by status or priority uses their
+logical order rather than the alphabetical order of the stored values, and
+every sort ends with the test case ID so pages are stable.
+"""
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tcm.models.associations import project_testcases
+from tcm.models.testcase import TestCase, TestCasePriority, TestCaseStatus
+
+# Logical rank of each status / priority, for sorting
+# (comparisons go through the column type, so values bind as stored)
+_STATUS_RANK = case(
+    *[(TestCase.status == status, rank) for rank, status in enumerate(TestCaseStatus)],
+    else_=len(TestCaseStatus),
+)
+_PRIORITY_RANK = case(
+    *[(TestCase.priority == priority, rank) for rank, priority in enumerate(TestCasePriority)],
+    else_=len(TestCasePriority),
+)
+
+# Sort keys accepted by member listings, mapped to their ORDER BY expression
+MEMBER_SORTS = {
+    "added": project_testcases.c.created_at,
+    "title": TestCase.title,
+    "status": _STATUS_RANK,
+    "priority": _PRIORITY_RANK,
+}
+
+
+def member_filters(
+    project_id: int,
+    status: TestCaseStatus | str | None = None,
+    priority: TestCasePriority | str | None = None,
+    q: str = "",
+) -> list:
+    """
+    Build the WHERE clauses selecting a project's (filtered) members.
+
+    Args:
+        project_id: Project ID
+        status: Optional status filter
+        priority: Optional priority filter
+        q: Optional title search
+
+    Returns:
+        List of SQL expressions to pass to ``where``
+    """
+    filters = [project_testcases.c.project_id == project_id]
+    if status:
+        filters.append(TestCase.status == TestCaseStatus(status))
+    if priority:
+        filters.append(TestCase.priority == TestCasePriority(priority))
+    if q.strip():
+        filters.append(TestCase.title.ilike(f"%{q.strip()}%"))
+    return filters
+
+
+def member_query(*columns, filters: list, sort: str = "added", order: str = "asc") -> Select:
+    """
+    Select the given columns of a project's members in the requested order.
+
+    Args:
+        *columns: Entities or columns to select (e.g. TestCase)
+        filters: Clauses from member_filters
+        sort: One of MEMBER_SORTS
+        order: "asc" or "desc"
+
+    Returns:
+        Select statement ready for offset/limit
+    """
+    key = MEMBER_SORTS[sort]
+    direction = (lambda column: column.desc()) if order == "desc" else (lambda column: column.asc())
+    return (
+        select(*columns)
+        .join(project_testcases, project_testcases.c.testcase_id == TestCase.id)
+        .where(*filters)
+        .order_by(direction(key), direction(TestCase.id))
+    )
+
+
+async def count_members(session: AsyncSession, filters: list) -> int:
+    """
+    Count the members matching the given filters.
+
+    Args:
+        session: Database session
+        filters: Clauses from member_filters
+
+    Returns:
+        Number of matching members
+    """
+    return await session.scalar(
+        select(func.count())
+        .select_from(project_testcases)
+        .join(TestCase, TestCase.id == project_testcases.c.testcase_id)
+        .where(*filters)
+    )
+
+
+async def member_status_counts(session: AsyncSession, project_id: int) -> dict[str, int]:
+    """
+    Count a project's members per status in one GROUP BY query.
+
+    Args:
+        session: Database session
+        project_id: Project ID
+
+    Returns:
+        Mapping of every status value to its member count (zeros included)
+    """
+    result = await session.execute(
+        select(TestCase.status, func.count())
+        .join(project_testcases, project_testcases.c.testcase_id == TestCase.id)
+        .where(project_testcases.c.project_id == project_id)
+        .group_by(TestCase.status)
+    )
+    counts = {status.value: 0 for status in TestCaseStatus}
+    for status, count in result.all():
+        counts[status.value if hasattr(status, "value") else status] = count
+    return counts
@@ -11,11 +11,14 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from starlette.status import HTTP_302_FOUND, HTTP_303_SEE_OTHER
 
 from tcm.config import settings
-from tcm.pages.login import LoginPage
+from tcm.pages.lazy import lazy_module, to_xml
 
 # Configure logger for authentication events
 logger = logging.getLogger("tcm.auth")
 
+# Page modules, imported on first use
+login_views = lazy_module("tcm.pages.login")
+
 router = APIRouter(tags=["authentication"])
 
 # Placeholder user database (to be replaced with actual database)
@@ -63,10 +66,8 @@ async def get_login_page(request: Request):
     Returns:
         HTML response with login form
     """
-    from fasthtml.common import to_xml
-
     # TODO: Check if user is already authenticated, redirect to dashboard if yes
-    return HTMLResponse(content=to_xml(LoginPage()))
+    return HTMLResponse(content=to_xml(login_views.LoginPage()))
 
 
 @router.post("/api/auth/login")
@@ -91,20 +92,18 @@ async def post_login(
     # Get client IP address
     client_ip = request.client.host if request.client else "unknown"
 
-    from fasthtml.common import to_xml
-
     # Validate credentials (placeholder logic)
     if username not in PLACEHOLDER_USERS:
         log_failed_login(username, client_ip, "invalid_username", request)
         return HTMLResponse(
-            content=to_xml(LoginPage(error_message="Invalid username or password")),
+            content=to_xml(login_views.LoginPage(error_message="Invalid username or password")),
             status_code=200,
         )
 
     if PLACEHOLDER_USERS[username] != password:
         log_failed_login(username, client_ip, "invalid_password", request)
         return HTMLResponse(
-            content=to_xml(LoginPage(error_message="Invalid username or password")),
+            content=to_xml(login_views.LoginPage(error_message="Invalid username or password")),
             status_code=200,
         )
 
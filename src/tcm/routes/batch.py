@@ -0,0 +1,290 @@
+"""
+API route for transactional batches of write operations.
+
+``POST /api/batch`` runs an ordered list of API write operations (create a
+tag, create test cases with it, add them to a project, ...) in one request
+and one database transaction: either every operation is committed or, if
+one fails, none is. Operations run through the regular route handlers, on a
+shared session whose commits only flush, so validation and responses are
+the same as for the individual requests.
+
+An operation can name its result with ``ref`` and later operations can use
+values from it as ``$<ref>.<field>``, either as a whole JSON string value in
+the body or within the path, e.g. ``"tag_ids": ["$login.id"]`` or
+``/projects/$release.id/testcases/$case.id``.
+"""
+
+import inspect
+import json
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.routing import compile_path
+
+from tcm.database import get_session_factory
+from tcm.fast_json import json_response
+from tcm.routes import projects, tags, testcases
+from tcm.schemas.batch import BatchRequest, BatchResponse
+from tcm.schemas.project import ProjectCreate, ProjectUpdate
+from tcm.schemas.tag import TagCreate, TagUpdate
+from tcm.schemas.testcase import TestCaseCreate, TestCaseUpdate
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+# Back-reference to a field of an earlier operation's result
+REFERENCE = re.compile(r"\$([A-Za-z_]\w*)\.(\w+)")
+
+
+class BatchSession(AsyncSession):
+    """
+    Session shared by the operations of a batch.
+
+    Route handlers commit after each write; here a commit only flushes, so
+    the changes stay in the batch's transaction until it commits as a whole.
+    """
+
+    async def commit(self) -> None:
+        """Flush pending changes instead of committing."""
+        await self.flush()
+
+    async def begin_batch(self) -> None:
+        """Open the batch's transaction, so operation savepoints nest inside it."""
+        connection = await self.connection()
+        if connection.dialect.name == "sqlite":
+            # pysqlite only begins a transaction before DML, so a savepoint
+            # opened first would start its own and commit on release
+            await connection.exec_driver_sql("BEGIN")
+
+    async def commit_batch(self) -> None:
+        """Commit the batch's transaction."""
+        await super().commit()
+
+
+@dataclass(frozen=True)
+class BatchRoute:
+    """An API write operation that can be part of a batch."""
+
+    method: str
+    path: str
+    handler: Callable
+    status_code: int = 200
+    body_param: str | None = None
+    body_model: type[BaseModel] | None = None
+
+    def match(self, method: str, path: str) -> dict[str, Any] | None:
+        """Return the path parameters if the operation targets this route."""
+        if method != self.method:
+            return None
+        regex, _, convertors = compile_path(self.path)
+        match = regex.match(path)
+        if not match:
+            return None
+        return {
+            name: convertors[name].convert(value) for name, value in match.groupdict().items()
+        }
+
+
+# Operations allowed in a batch, with paths relative to /api
+BATCH_ROUTES = (
+    BatchRoute("POST", "/tags", tags.create_tag, 201, "tag_data", TagCreate),
+    BatchRoute("PATCH", "/tags/{tag_id:int}", tags.update_tag, 200, "tag_data", TagUpdate),
+    BatchRoute("DELETE", "/tags/{tag_id:int}", tags.delete_tag, 204),
+    BatchRoute(
+        "POST", "/testcases", testcases.create_testcase, 201, "testcase_data", TestCaseCreate
+    ),
+    BatchRoute(
+        "PATCH",
+        "/testcases/{testcase_id:int}",
+        testcases.update_testcase,
+        200,
+        "testcase_data",
+        TestCaseUpdate,
+    ),
+    BatchRoute("DELETE", "/testcases/{testcase_id:int}", testcases.delete_testcase, 204),
+    BatchRoute(
+        "POST", "/testcases/{testcase_id:int}/tags/{tag_id:int}", testcases.add_tag_to_testcase
+    ),
+    BatchRoute(
+        "DELETE",
+        "/testcases/{testcase_id:int}/tags/{tag_id:int}",
+        testcases.remove_tag_from_testcase,
+    ),
+    BatchRoute(
+        "POST", "/projects", projects.create_project, 201, "project_data", ProjectCreate
+    ),
+    BatchRoute(
+        "PATCH",
+        "/projects/{project_id:int}",
+        projects.update_project,
+        200,
+        "project_data",
+        ProjectUpdate,
+    ),
+    BatchRoute("DELETE", "/projects/{project_id:int}", projects.delete_project, 204),
+    BatchRoute(
+        "POST",
+        "/projects/{project_id:int}/testcases/{testcase_id:int}",
+        projects.add_testcase_to_project,
+    ),
+    BatchRoute(
+        "DELETE",
+        "/projects/{project_id:int}/testcases/{testcase_id:int}",
+        projects.remove_testcase_from_project,
+    ),
+)
+
+
+def find_route(method: str, path: str) -> tuple[BatchRoute, dict[str, Any]] | None:
+    """
+    Find the batch route an operation targets.
+
+    Args:
+        method: HTTP method of the operation
+        path: Resolved path relative to /api
+
+    Returns:
+        Tuple of (route, path parameters), or None if no route matches
+    """
+    for route in BATCH_ROUTES:
+        params = route.match(method, path)
+        if params is not None:
+            return route, params
+    return None
+
+
+def resolve_references(value, results: dict[str, Any]):
+    """
+    Replace back-references in an operation's body with earlier results.
+
+    Args:
+        value: Body value (dicts and lists are resolved recursively)
+        results: Results of earlier operations by ref
+
+    Returns:
+        The value with every "$<ref>.<field>" string replaced
+
+    Raises:
+        KeyError: If a reference names an unknown result or field
+    """
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    if isinstance(value, str):
+        match = REFERENCE.fullmatch(value)
+        if match:
+            return results[match.group(1)][match.group(2)]
+    return value
+
+
+def resolve_path(path: str, results: dict[str, Any]) -> str:
+    """
+    Replace back-references within an operation's path.
+
+    Args:
+        path: Path relative to /api
+        results: Results of earlier operations by ref
+
+    Returns:
+        The path with every "$<ref>.<field>" replaced
+
+    Raises:
+        KeyError: If a reference names an unknown result or field
+    """
+    return REFERENCE.sub(lambda match: str(results[match.group(1)][match.group(2)]), path)
+
+
+def operation_request(if_match: str | None) -> Request:
+    """Build the request passed to handlers, carrying the operation's If-Match."""
+    headers = [(b"if-match", if_match.encode())] if if_match else []
+    return Request({"type": "http", "method": "POST", "headers": headers})
+
+
+def result_body(result) -> Any:
+    """Convert a handler's return value to the operation's result body."""
+    if result is None:
+        return None
+    if isinstance(result, Response):
+        return json.loads(result.body) if result.body else None
+    return result.model_dump()
+
+
+def operation_error(index: int, status_code: int, detail) -> HTTPException:
+    """Build the error aborting the batch at an operation."""
+    return HTTPException(
+        status_code=status_code, detail={"operation": index, "detail": detail}
+    )
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """
+    Run write operations in order, in a single transaction.
+
+    If an operation fails, the whole batch is rolled back (the session is
+    closed without committing) and the error is returned with the failing
+    operation's status code and its index. Each operation runs in a
+    savepoint, so a database error (409 for a constraint violation, 400
+    otherwise) is reported the same way instead of failing the request.
+
+    Args:
+        batch: Operations to run
+        session_factory: Session factory the batch session is created like
+    """
+    results = []
+    results_by_ref: dict[str, Any] = {}
+
+    async with BatchSession(**session_factory.kw) as session:
+        await session.begin_batch()
+        for index, operation in enumerate(batch.operations):
+            try:
+                path = resolve_path(operation.path, results_by_ref)
+                body = resolve_references(operation.body, results_by_ref)
+            except (KeyError, TypeError):
+                raise operation_error(index, 400, "Unresolved reference")
+
+            found = find_route(operation.method, path)
+            if found is None:
+                raise operation_error(
+                    index, 400, f"Unsupported operation: {operation.method} {path}"
+                )
+            route, params = found
+
+            kwargs = {**params, "session": session}
+            if route.body_model is not None:
+                try:
+                    kwargs[route.body_param] = route.body_model.model_validate(body or {})
+                except ValidationError as exc:
+                    raise operation_error(
+                        index, 422, exc.errors(include_url=False, include_context=False)
+                    )
+            if "request" in inspect.signature(route.handler).parameters:
+                kwargs["request"] = operation_request(operation.if_match)
+                kwargs["response"] = Response()
+
+            try:
+                async with session.begin_nested():
+                    body = result_body(await route.handler(**kwargs))
+            except HTTPException as exc:
+                raise operation_error(index, exc.status_code, exc.detail)
+            except IntegrityError:
+                raise operation_error(index, 409, "Conflicts with existing data")
+            except SQLAlchemyError:
+                raise operation_error(index, 400, "Database error")
+
+            results.append({"status": route.status_code, "body": body})
+            if operation.ref is not None:
+                results_by_ref[operation.ref] = body
+
+        await session.commit_batch()
+
+    return json_response({"results": results})
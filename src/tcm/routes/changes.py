@@ -0,0 +1,60 @@
+"""
+API route for the change feed.
+
+Clients keep the ``next_cursor`` of each response and pass it as ``since``
+on the next request to receive only what changed in between. With ``wait``
+the request is held open until a change arrives (long polling).
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tcm.change_feed import wait_for_changes
+from tcm.config import settings
+from tcm.database import get_session_factory
+from tcm.fast_json import json_response
+from tcm.schemas.change import ChangeFeedResponse
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangeFeedResponse)
+async def list_changes(
+    since: int = Query(0, ge=0, description="Cursor of the last change seen (0: from the start)"),
+    limit: int = Query(500, ge=1, le=1000, description="Number of changes to return"),
+    wait: float = Query(
+        0, ge=0, description="Seconds to wait for changes if there are none (long polling)"
+    ),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """
+    List create, update and delete events after a cursor, oldest first.
+
+    Covers test cases, projects and tags, and the tag assignments and
+    project memberships as added/removed events. Deleting an entity also
+    drops its memberships without separate events. ``wait`` is capped at
+    the CHANGES_MAX_WAIT setting.
+
+    Args:
+        since: Cursor of the last change seen
+        limit: Maximum number of changes to return
+        wait: Seconds to wait for changes
+        session_factory: Session factory; no connection is held while waiting
+    """
+    changes = await wait_for_changes(
+        session_factory,
+        since,
+        limit + 1,
+        min(wait, settings.changes_max_wait),
+        settings.changes_poll_interval,
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return json_response(
+        {
+            "changes": changes,
+            "next_cursor": changes[-1]["cursor"] if changes else since,
+            "has_more": has_more,
+        }
+    )
@@ -8,16 +8,31 @@ from datetime import datetime, timedelta, UTC
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
 from sqlalchemy import select, func, desc
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from tcm.database import get_async_session
+from tcm.config import settings
+from tcm.data_cache import TTLCache
+from tcm.database import get_session_factory
+from tcm.events import on_commit
 from tcm.models.tag import Tag
 from tcm.models.testcase import TestCase
 from tcm.models.project import Project
-from tcm.pages.dashboard import DashboardPage
+from tcm.pages.lazy import lazy_module, to_xml
+
+# Page modules, imported on first use
+dashboard_views = lazy_module("tcm.pages.dashboard")
 
 router = APIRouter(tags=["dashboard-pages"])
 
+# Dashboard data is identical for every user, so it is shared across requests
+dashboard_cache = TTLCache(ttl=settings.dashboard_cache_ttl)
+
+
+@on_commit
+def _invalidate_dashboard(changes) -> None:
+    """Drop cached dashboard data whenever an entity is written."""
+    dashboard_cache.invalidate()
+
 
 def format_relative_time(dt: datetime) -> str:
     """
@@ -56,16 +71,28 @@ def format_relative_time(dt: datetime) -> str:
         return f"{months} month{'s' if months != 1 else ''} ago"
 
 
-async def get_statistics(session: AsyncSession) -> dict:
+async def get_statistics(session_factory: async_sessionmaker[AsyncSession]) -> dict:
     """
     Get entity counts for statistics widgets.
 
+    Results are cached for a short TTL and shared by concurrent requests.
+
     Args:
-        session: Database session
+        session_factory: Factory for the session the counts are queried on
 
     Returns:
         Dictionary with entity counts
     """
+    async def compute():
+        async with session_factory() as session:
+            return await _count_entities(session)
+
+    stats = await dashboard_cache.get_or_compute("statistics", compute)
+    return dict(stats)
+
+
+async def _count_entities(session: AsyncSession) -> dict:
+    """Run the entity count queries behind get_statistics."""
     # Count test cases
     testcases_query = select(func.count(TestCase.id))
     testcases_result = await session.execute(testcases_query)
@@ -88,17 +115,98 @@ async def get_statistics(session: AsyncSession) -> dict:
     }
 
 
-async def get_recent_activity(session: AsyncSession, limit: int = 10) -> list[dict]:
+async def get_recent_activity(
+    session_factory: async_sessionmaker[AsyncSession], limit: int = 10
+) -> list[dict]:
     """
     Get recent activity across all entity types.
 
+    The query results are cached for a short TTL and shared by concurrent
+    requests; relative timestamps are formatted per request.
+
     Args:
-        session: Database session
+        session_factory: Factory for the session the activity is queried on
         limit: Maximum number of items to return
 
     Returns:
         List of activity dicts sorted by timestamp (newest first)
     """
+    async def compute():
+        async with session_factory() as session:
+            return await _load_recent_activity(session, limit)
+
+    activities = await dashboard_cache.get_or_compute(("recent_activity", limit), compute)
+
+    result = []
+    for activity in activities:
+        item = {key: value for key, value in activity.items() if key != "raw_timestamp"}
+        item["timestamp"] = format_relative_time(activity["raw_timestamp"])
+        result.append(item)
+    return result
+
+
+def _activity_action(entity) -> str:
+    """Tell whether an entity was created or updated, from its timestamps."""
+    is_new = (entity.updated_at - entity.created_at).total_seconds() < 60
+    return "created" if is_new else "updated"
+
+
+def testcase_activity(tc: TestCase) -> dict:
+    """Build the activity dict (with raw timestamp) of a test case."""
+    return {
+        "entity_type": "testcase",
+        "entity_id": tc.id,
+        "title": tc.title,
+        "action": _activity_action(tc),
+        "raw_timestamp": tc.updated_at,
+        "link": f"/testcases/{tc.id}",
+        "status": tc.status.value,
+        "tags": [
+            {
+                "category": tag.category,
+                "value": tag.value,
+                "is_predefined": tag.is_predefined,
+            }
+            for tag in tc.tags
+        ],
+    }
+
+
+def project_activity(proj: Project) -> dict:
+    """Build the activity dict (with raw timestamp) of a project."""
+    return {
+        "entity_type": "project",
+        "entity_id": proj.id,
+        "title": proj.name,
+        "action": _activity_action(proj),
+        "raw_timestamp": proj.updated_at,
+        "link": f"/projects/{proj.id}",
+        "status": proj.status.value,
+        "tags": [],
+    }
+
+
+def tag_activity(tag: Tag) -> dict:
+    """Build the activity dict (with raw timestamp) of a tag."""
+    return {
+        "entity_type": "tag",
+        "entity_id": tag.id,
+        "title": f"{tag.category}: {tag.value}",
+        "action": _activity_action(tag),
+        "raw_timestamp": tag.updated_at,
+        "link": f"/tags/{tag.id}/edit",
+        "status": "",
+        "tags": [],
+    }
+
+
+async def _load_recent_activity(session: AsyncSession, limit: int) -> list[dict]:
+    """
+    Run the recent activity queries behind get_recent_activity.
+
+    Returns:
+        Activity dicts with raw datetimes (newest first)
+    """
     activities = []
 
     # Get recent test cases
@@ -110,29 +218,7 @@ async def get_recent_activity(session: AsyncSession, limit: int = 10) -> list[di
     testcases_result = await session.execute(testcases_query)
     testcases = testcases_result.scalars().all()
 
-    for tc in testcases:
-        # Determine if it was created or updated
-        is_new = (tc.updated_at - tc.created_at).total_seconds() < 60
-        action = "created" if is_new else "updated"
-
-        activities.append({
-            "entity_type": "testcase",
-            "entity_id": tc.id,
-            "title": tc.title,
-            "action": action,
-            "timestamp": format_relative_time(tc.updated_at),
-            "raw_timestamp": tc.updated_at,
-            "link": f"/testcases/{tc.id}",
-            "status": tc.status.value,
-            "tags": [
-                {
-                    "category": tag.category,
-                    "value": tag.value,
-                    "is_predefined": tag.is_predefined,
-                }
-                for tag in tc.tags
-            ],
-        })
+    activities += [testcase_activity(tc) for tc in testcases]
 
     # Get recent projects
     projects_query = (
@@ -143,21 +229,7 @@ async def get_recent_activity(session: AsyncSession, limit: int = 10) -> list[di
     projects_result = await session.execute(projects_query)
     projects = projects_result.scalars().all()
 
-    for proj in projects:
-        is_new = (proj.updated_at - proj.created_at).total_seconds() < 60
-        action = "created" if is_new else "updated"
-
-        activities.append({
-            "entity_type": "project",
-            "entity_id": proj.id,
-            "title": proj.name,
-            "action": action,
-            "timestamp": format_relative_time(proj.updated_at),
-            "raw_timestamp": proj.updated_at,
-            "link": f"/projects/{proj.id}",
-            "status": proj.status.value,
-            "tags": [],
-        })
+    activities += [project_activity(proj) for proj in projects]
 
     # Get recent tags
     tags_query = (
@@ -168,55 +240,35 @@ async def get_recent_activity(session: AsyncSession, limit: int = 10) -> list[di
     tags_result = await session.execute(tags_query)
     tags = tags_result.scalars().all()
 
-    for tag in tags:
-        is_new = (tag.updated_at - tag.created_at).total_seconds() < 60
-        action = "created" if is_new else "updated"
-
-        activities.append({
-            "entity_type": "tag",
-            "entity_id": tag.id,
-            "title": f"{tag.category}: {tag.value}",
-            "action": action,
-            "timestamp": format_relative_time(tag.updated_at),
-            "raw_timestamp": tag.updated_at,
-            "link": f"/tags/{tag.id}/edit",
-            "status": "",
-            "tags": [],
-        })
+    activities += [tag_activity(tag) for tag in tags]
 
     # Sort all activities by timestamp and limit
     activities.sort(key=lambda x: x["raw_timestamp"], reverse=True)
 
-    # Remove raw_timestamp from output
-    for activity in activities:
-        del activity["raw_timestamp"]
-
     return activities[:limit]
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
 async def dashboard_page(
     request: Request,
-    session: AsyncSession = Depends(get_async_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
     """
     Render the dashboard page with statistics and recent activity.
 
     Args:
         request: FastAPI request object
-        session: Database session
+        session_factory: Factory for the sessions of cache misses
     """
-    from fasthtml.common import to_xml
-
     # Get statistics
-    stats = await get_statistics(session)
+    stats = await get_statistics(session_factory)
 
     # Get recent activity
-    activities = await get_recent_activity(session, limit=10)
+    activities = await get_recent_activity(session_factory, limit=10)
 
     return HTMLResponse(
         content=to_xml(
-            DashboardPage(
+            dashboard_views.DashboardPage(
                 stats=stats,
                 activities=activities,
             )
@@ -0,0 +1,242 @@
+"""
+API routes for background jobs.
+
+``POST /api/jobs`` queues a job and answers 202 at once; clients poll
+``GET /api/jobs/{id}`` for its status, progress and result. The job runs in
+whichever server worker claims it first (see ``tcm.jobs``); the kinds and
+their parameters are listed in ``tcm.job_kinds``.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tcm.database import get_async_session
+from tcm.fast_json import json_response
+from tcm.job_kinds import JOB_KINDS, export_path
+from tcm.jobs import JobRunner, job_notifier, submit_job, utcnow
+from tcm.models.jobs import FINISHED_STATUSES, JobStatus, jobs
+from tcm.schemas.job import JobCreate, JobListResponse, JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Runs this worker's share of the queued jobs (started with the application)
+runner = JobRunner(JOB_KINDS)
+
+# Columns of JobResponse
+JOB_RESPONSE_COLUMNS = (
+    jobs.c.id,
+    jobs.c.kind,
+    jobs.c.status,
+    jobs.c.progress,
+    jobs.c.total,
+    jobs.c.result,
+    jobs.c.error,
+    jobs.c.attempts,
+    jobs.c.max_attempts,
+    jobs.c.cancel_requested,
+    jobs.c.created_at,
+    jobs.c.started_at,
+    jobs.c.finished_at,
+)
+
+
+async def get_job_or_404(session: AsyncSession, job_id: int) -> dict:
+    """Load a job's response fields, raising 404 if it does not exist."""
+    result = await session.execute(select(*JOB_RESPONSE_COLUMNS).where(jobs.c.id == job_id))
+    job = result.mappings().first()
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job with id {job_id} not found")
+    return dict(job)
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def create_job(
+    job_data: JobCreate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Queue a background job.
+
+    The parameters are validated against the job kind's schema before the
+    job is queued. The response's Location header is the job's status URL.
+
+    Args:
+        job_data: Job kind, parameters and attempts
+        session: Database session
+    """
+    kind = JOB_KINDS.get(job_data.kind)
+    if kind is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {job_data.kind}")
+    try:
+        params = kind.params.model_validate(job_data.params)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422, detail=exc.errors(include_url=False, include_context=False)
+        )
+
+    job_id = await submit_job(
+        session, job_data.kind, params.model_dump(mode="json"), job_data.max_attempts
+    )
+    return json_response(
+        await get_job_or_404(session, job_id),
+        status_code=202,
+        headers={"Location": f"/api/jobs/{job_id}"},
+    )
+
+
+@router.get("", response_model=JobListResponse)
+async def list_jobs(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    status: JobStatus | None = Query(None, description="Filter by status"),
+    kind: str | None = Query(None, description="Filter by job kind"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    List jobs, newest first.
+
+    Args:
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        status: Optional status filter
+        kind: Optional job kind filter
+        session: Database session
+    """
+    filters = []
+    if status:
+        filters.append(jobs.c.status == status.value)
+    if kind:
+        filters.append(jobs.c.kind == kind)
+
+    total = (
+        await session.execute(select(func.count()).select_from(jobs).where(*filters))
+    ).scalar_one()
+    result = await session.execute(
+        select(*JOB_RESPONSE_COLUMNS)
+        .where(*filters)
+        .order_by(jobs.c.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return json_response(
+        {
+            "jobs": [dict(row) for row in result.mappings()],
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+        }
+    )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Get a job's status, progress and result.
+
+    Args:
+        job_id: Job ID
+        session: Database session
+    """
+    return json_response(await get_job_or_404(session, job_id))
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Cancel a job.
+
+    A queued job is cancelled at once. A running job is marked and its
+    worker stops it at its next check, leaving the batches it committed.
+
+    Args:
+        job_id: Job ID
+        session: Database session
+    """
+    job = await get_job_or_404(session, job_id)
+    if job["status"] in FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} has already {job['status']}"
+        )
+
+    await session.execute(
+        update(jobs)
+        .where(jobs.c.id == job_id, jobs.c.status == JobStatus.QUEUED.value)
+        .values(status=JobStatus.CANCELLED.value, cancel_requested=True, finished_at=utcnow())
+    )
+    await session.execute(
+        update(jobs)
+        .where(jobs.c.id == job_id, jobs.c.status == JobStatus.RUNNING.value)
+        .values(cancel_requested=True)
+    )
+    await session.commit()
+    job_notifier.notify()
+    return json_response(await get_job_or_404(session, job_id))
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse, status_code=202)
+async def retry_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Queue a failed or cancelled job again, with a fresh set of attempts.
+
+    The job resumes from the state its last attempt saved.
+
+    Args:
+        job_id: Job ID
+        session: Database session
+    """
+    job = await get_job_or_404(session, job_id)
+    if job["status"] not in (JobStatus.FAILED, JobStatus.CANCELLED):
+        raise HTTPException(
+            status_code=409, detail="Only failed or cancelled jobs can be retried"
+        )
+
+    await session.execute(
+        update(jobs)
+        .where(
+            jobs.c.id == job_id,
+            jobs.c.status.in_([JobStatus.FAILED.value, JobStatus.CANCELLED.value]),
+        )
+        .values(
+            status=JobStatus.QUEUED.value,
+            attempts=0,
+            cancel_requested=False,
+            run_after=utcnow(),
+            finished_at=None,
+        )
+    )
+    await session.commit()
+    job_notifier.notify()
+    return json_response(await get_job_or_404(session, job_id), status_code=202)
+
+
+@router.get("/{job_id}/output")
+async def get_job_output(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Download the file written by a succeeded export job.
+
+    Args:
+        job_id: Job ID
+        session: Database session
+    """
+    job = await get_job_or_404(session, job_id)
+    path = export_path(job_id)
+    if job["status"] != JobStatus.SUCCEEDED or not (job["result"] or {}).get("file"):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} has no output")
+    if not path.exists():
+        raise HTTPException(status_code=404, detail=f"Output of job {job_id} was removed")
+    return FileResponse(path, media_type="text/csv", filename=path.name)
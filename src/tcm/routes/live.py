@@ -0,0 +1,189 @@
+"""
+API route streaming live updates to open pages (Server-Sent Events).
+
+``GET /api/events?topic=...`` keeps a text/event-stream response open and
+pushes the events of the requested topics:
+
+- ``dashboard``: ``stats`` with entity count deltas (e.g.
+  ``{"testcases": 1}``) and ``activity`` with the rendered activity feed
+  items of created and updated entities
+- ``project:<id>``: ``membership`` when a test case is added to or removed
+  from the project, and ``project`` when the project is updated or deleted
+
+Any topic can receive ``resync`` when events were dropped because the client
+fell behind or reconnected after missing changes. Events carry the change
+log cursor as their ID.
+"""
+
+import re
+from collections import Counter
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import raiseload
+
+from tcm.config import settings
+from tcm.database import get_session_factory
+from tcm.live_updates import Broadcaster, LiveEvent, event_stream
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+from tcm.pages.lazy import lazy_module, to_xml
+from tcm.routes.dashboard_pages import project_activity, tag_activity, testcase_activity
+
+# Page modules, imported on first use
+dashboard_views = lazy_module("tcm.pages.dashboard")
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+DASHBOARD = "dashboard"
+
+TOPIC = re.compile(rf"{DASHBOARD}|project:\d+")
+
+# Dashboard statistics key of each entity type
+STAT_KEYS = {"testcase": "testcases", "project": "projects", "tag": "tags"}
+
+# Model, collection not needed for the activity item and activity dict builder
+# of each entity type
+ACTIVITY_SOURCES = {
+    "testcase": (TestCase, TestCase.projects, testcase_activity),
+    "project": (Project, Project.testcases, project_activity),
+    "tag": (Tag, Tag.testcases, tag_activity),
+}
+
+
+def project_topic(project_id: int) -> str:
+    """Return the topic of a project page."""
+    return f"project:{project_id}"
+
+
+async def load_activity_items(
+    session: AsyncSession, entities: dict[tuple[str, int], str]
+) -> list[str]:
+    """
+    Render the activity feed items of changed entities.
+
+    Args:
+        session: Database session
+        entities: Action of each changed entity by (entity type, ID), oldest first
+
+    Returns:
+        Rendered items, oldest first (entities deleted since are left out)
+    """
+    rendered = {}
+    for entity_type, (model, unused, to_activity) in ACTIVITY_SOURCES.items():
+        ids = [entity_id for kind, entity_id in entities if kind == entity_type]
+        if not ids:
+            continue
+        result = await session.execute(
+            select(model).options(raiseload(unused)).where(model.id.in_(ids))
+        )
+        for obj in result.scalars():
+            activity = to_activity(obj)
+            activity["action"] = entities[(entity_type, obj.id)]
+            del activity["raw_timestamp"]
+            rendered[(entity_type, obj.id)] = to_xml(
+                dashboard_views.ActivityFeedItem(**activity, timestamp="just now")
+            )
+    return [rendered[key] for key in entities if key in rendered]
+
+
+async def build_events(session: AsyncSession, changes: list[dict]) -> list[LiveEvent]:
+    """
+    Turn a batch of changes into live events.
+
+    Args:
+        session: Database session, for rendering activity items
+        changes: Changes read from the change log, oldest first
+
+    Returns:
+        Events to publish
+    """
+    events = []
+    stats = Counter()
+    activity: dict[tuple[str, int], str] = {}
+
+    for change in changes:
+        entity_type, entity_id, action = (
+            change["entity_type"],
+            change["entity_id"],
+            change["action"],
+        )
+        if entity_type == "project_testcase":
+            events.append(
+                LiveEvent(
+                    project_topic(entity_id),
+                    "membership",
+                    {"testcase_id": change["related_id"], "action": action},
+                    change["cursor"],
+                )
+            )
+            continue
+        if entity_type not in STAT_KEYS:
+            continue
+
+        if action == "created":
+            stats[STAT_KEYS[entity_type]] += 1
+        elif action == "deleted":
+            stats[STAT_KEYS[entity_type]] -= 1
+
+        key = (entity_type, entity_id)
+        if action == "deleted":
+            activity.pop(key, None)
+        else:
+            # An entity created and updated in the same batch stays "created"
+            activity.setdefault(key, action)
+        if entity_type == "project" and action != "created":
+            events.append(
+                LiveEvent(project_topic(entity_id), "project", {"action": action}, change["cursor"])
+            )
+
+    cursor = changes[-1]["cursor"]
+    deltas = {key: delta for key, delta in stats.items() if delta}
+    if deltas:
+        events.append(LiveEvent(DASHBOARD, "stats", deltas, cursor))
+    if activity:
+        items = await load_activity_items(session, activity)
+        if items:
+            events.append(LiveEvent(DASHBOARD, "activity", {"items": items}, cursor))
+    return events
+
+
+# One broadcaster per worker process
+broadcaster = Broadcaster(build_events)
+
+
+@router.get("", response_class=StreamingResponse)
+async def stream_events(
+    topic: list[str] = Query(..., description="Topics: dashboard, project:<id>"),
+    last_event_id: int | None = Header(None, description="Last event ID received"),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """
+    Stream live updates for the given topics as Server-Sent Events.
+
+    Idle streams get a heartbeat comment every LIVE_UPDATES_HEARTBEAT
+    seconds. Browsers' EventSource reconnects on its own and sends the
+    Last-Event-ID header.
+
+    Args:
+        topic: Topics to subscribe to (repeatable)
+        last_event_id: ID of the last event received, when reconnecting
+        session_factory: Factory for the relay's sessions
+
+    Raises:
+        HTTPException: 400 if a topic is unknown
+    """
+    for name in topic:
+        if not TOPIC.fullmatch(name):
+            raise HTTPException(status_code=400, detail=f"Unknown topic: {name}")
+
+    return StreamingResponse(
+        event_stream(
+            broadcaster, topic, session_factory, settings.live_updates_heartbeat, last_event_id
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
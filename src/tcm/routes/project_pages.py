@@ -9,19 +9,37 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, Form, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, raiseload
 from starlette.status import HTTP_303_SEE_OTHER
 
+from tcm.aggregates import with_testcase_count
 from tcm.database import get_async_session
 from tcm.models.project import Project, ProjectStatus
-from tcm.models.testcase import TestCase
-from tcm.pages.projects import ProjectsListPage, CreateProjectPage, EditProjectPage, ViewProjectPage
-from tcm.pages.projects.edit import NotFoundPage
+from tcm.models.testcase import TestCase, TestCaseStatus, TestCasePriority
+from tcm.pages.lazy import lazy_module, to_xml
+from tcm.project_members import (
+    MEMBER_SORTS,
+    count_members,
+    member_filters,
+    member_query,
+    member_status_counts,
+)
+
+# Page modules, imported on first use
+partials = lazy_module("tcm.pages.components.partial")
+streaming = lazy_module("tcm.pages.components.streaming")
+project_list = lazy_module("tcm.pages.projects.list")
+project_create = lazy_module("tcm.pages.projects.create")
+project_edit = lazy_module("tcm.pages.projects.edit")
+project_view = lazy_module("tcm.pages.projects.view")
 
 router = APIRouter(prefix="/projects", tags=["project-pages"])
 
+# Member rows shown per page on the project view page
+MEMBER_PAGE_SIZE = 50
+
 
 @router.get("", response_class=HTMLResponse)
 async def projects_list_page(
@@ -34,6 +52,9 @@ async def projects_list_page(
     """
     Render the projects list page.
 
+    Partial update requests (HX-Request header) get only the results
+    fragment.
+
     Args:
         request: FastAPI request object
         status: Optional status filter
@@ -41,42 +62,50 @@ async def projects_list_page(
         error: Error message from redirect
         session: Database session
     """
-    from fasthtml.common import to_xml
-
-    # Build query
-    query = select(Project).options(selectinload(Project.testcases))
+    # Build query; member counts are aggregated instead of loading test cases,
+    # and the description is not shown
+    query = with_testcase_count(
+        select(Project).options(
+            raiseload(Project.testcases), defer(Project.description, raiseload=True)
+        )
+    )
     if status:
         query = query.where(Project.status == status)
     query = query.order_by(Project.id.desc())
 
     result = await session.execute(query)
-    projects = result.scalars().all()
 
     # Convert to dict format
     projects_data = [
         {
             "id": proj.id,
             "name": proj.name,
-            "description": proj.description,
             "status": proj.status.value if hasattr(proj.status, 'value') else proj.status,
             "start_date": proj.start_date.isoformat() if proj.start_date else None,
             "end_date": proj.end_date.isoformat() if proj.end_date else None,
-            "testcase_ids": [tc.id for tc in proj.testcases],
+            "testcase_count": testcase_count,
         }
-        for proj in projects
+        for proj, testcase_count in result.all()
     ]
 
+    if partials.is_partial_request(request):
+        return partials.vary_on_partial(
+            HTMLResponse(content=to_xml(project_list.ProjectsResults(projects_data)))
+        )
+
     # Get all statuses for filter dropdown
     statuses = [s.value for s in ProjectStatus]
 
-    return HTMLResponse(
-        content=to_xml(
-            ProjectsListPage(
-                projects=projects_data,
-                statuses=statuses,
-                current_status=status,
-                success_message=success,
-                error_message=error,
+    return partials.vary_on_partial(
+        HTMLResponse(
+            content=to_xml(
+                project_list.ProjectsListPage(
+                    projects=projects_data,
+                    statuses=statuses,
+                    current_status=status,
+                    success_message=success,
+                    error_message=error,
+                )
             )
         )
     )
@@ -94,10 +123,8 @@ async def create_project_page(
         request: FastAPI request object
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     return HTMLResponse(
-        content=to_xml(CreateProjectPage())
+        content=to_xml(project_create.CreateProjectPage())
     )
 
 
@@ -123,13 +150,11 @@ async def create_project_submit(
         end_date: Project end date (optional)
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Validate required fields
     if not name:
         return HTMLResponse(
             content=to_xml(
-                CreateProjectPage(
+                project_create.CreateProjectPage(
                     error_message="Project name is required.",
                     form_data={
                         "name": name,
@@ -148,7 +173,7 @@ async def create_project_submit(
     if duplicate_result.scalar_one_or_none():
         return HTMLResponse(
             content=to_xml(
-                CreateProjectPage(
+                project_create.CreateProjectPage(
                     error_message=f"A project with name '{name}' already exists.",
                     form_data={
                         "name": name,
@@ -174,7 +199,7 @@ async def create_project_submit(
         if start_date_parsed and end_date_parsed and end_date_parsed < start_date_parsed:
             return HTMLResponse(
                 content=to_xml(
-                    CreateProjectPage(
+                    project_create.CreateProjectPage(
                         error_message="End date must be after start date.",
                         form_data={
                             "name": name,
@@ -189,7 +214,7 @@ async def create_project_submit(
     except ValueError:
         return HTMLResponse(
             content=to_xml(
-                CreateProjectPage(
+                project_create.CreateProjectPage(
                     error_message="Invalid date format.",
                     form_data={
                         "name": name,
@@ -224,6 +249,12 @@ async def create_project_submit(
 async def view_project_page(
     request: Request,
     project_id: int,
+    q: str = Query("", description="Search member titles"),
+    status: str = Query("", description="Filter members by status"),
+    priority: str = Query("", description="Filter members by priority"),
+    sort: str = Query("added", description="Sort members by added, title, status or priority"),
+    order: str = Query("asc", description="Sort direction (asc or desc)"),
+    page: int = Query(1, ge=1, description="Page number"),
     success: str = Query("", description="Success message"),
     error: str = Query("", description="Error message"),
     session: AsyncSession = Depends(get_async_session),
@@ -231,35 +262,36 @@ async def view_project_page(
     """
     Render the project details view page.
 
+    The project is looked up first so a missing project still gets a 404;
+    the layout shell is then sent and one page of member rows is streamed
+    from the database result. The per-status rollup comes from a single
+    GROUP BY query, so the page costs the same however large the project
+    is. Test cases to add are searched on demand by the add test cases modal.
+
     Args:
         request: FastAPI request object
         project_id: Project ID
+        q: Optional member title search
+        status: Optional member status filter
+        priority: Optional member priority filter
+        sort: Member sort key
+        order: Member sort direction
+        page: Page number (1-indexed)
         success: Success message from redirect
         error: Error message from redirect
         session: Database session
     """
-    from fasthtml.common import to_xml
-
-    # Get the project with test cases
-    query = (
-        select(Project)
-        .options(selectinload(Project.testcases).selectinload(TestCase.tags))
-        .where(Project.id == project_id)
-    )
+    # Get the project without loading its test cases
+    query = select(Project).options(raiseload(Project.testcases)).where(Project.id == project_id)
     result = await session.execute(query)
     project = result.scalar_one_or_none()
 
     if not project:
         return HTMLResponse(
-            content=to_xml(NotFoundPage()),
+            content=to_xml(project_edit.NotFoundPage()),
             status_code=404,
         )
 
-    # Get all available test cases
-    all_testcases_query = select(TestCase)
-    all_testcases_result = await session.execute(all_testcases_query)
-    all_testcases = all_testcases_result.scalars().all()
-
     project_data = {
         "id": project.id,
         "name": project.name,
@@ -269,37 +301,96 @@ async def view_project_page(
         "end_date": project.end_date.isoformat() if project.end_date else None,
     }
 
-    testcases_data = [
-        {
-            "id": tc.id,
-            "title": tc.title,
-            "status": tc.status.value if hasattr(tc.status, 'value') else tc.status,
-            "priority": tc.priority.value if hasattr(tc.priority, 'value') else tc.priority,
-        }
-        for tc in project.testcases
-    ]
+    # Ignore unknown values instead of failing the page
+    listing = {
+        "q": q.strip(),
+        "status": status if status in {s.value for s in TestCaseStatus} else "",
+        "priority": priority if priority in {p.value for p in TestCasePriority} else "",
+        "sort": sort if sort in MEMBER_SORTS else "added",
+        "order": order if order in ("asc", "desc") else "asc",
+        "page": page,
+    }
 
-    available_testcases_data = [
-        {
-            "id": tc.id,
-            "title": tc.title,
-        }
-        for tc in all_testcases
-    ]
+    async def render():
+        status_counts = await member_status_counts(session, project_id)
+        testcase_count = sum(status_counts.values())
 
-    return HTMLResponse(
-        content=to_xml(
-            ViewProjectPage(
-                project=project_data,
-                testcases=testcases_data,
-                available_testcases=available_testcases_data,
-                success_message=success,
-                error_message=error,
+        filters = member_filters(
+            project_id, status=listing["status"], priority=listing["priority"], q=listing["q"]
+        )
+        if listing["priority"] or listing["q"]:
+            matching_count = await count_members(session, filters)
+        elif listing["status"]:
+            matching_count = status_counts[listing["status"]]
+        else:
+            matching_count = testcase_count
+        total_pages = max(1, -(-matching_count // MEMBER_PAGE_SIZE))
+
+        if matching_count:
+            testcases_table = project_view.TestCasesTableFrame(streaming.Slot("testcases"))
+        elif testcase_count:
+            testcases_table = project_view.TestCasesEmptyState("No test cases match the filters.")
+        else:
+            testcases_table = project_view.TestCasesEmptyState()
+
+        content = project_view.ViewProjectContent(
+            project_data,
+            testcase_count=testcase_count,
+            testcases_table=testcases_table,
+            success_message=success,
+            error_message=error,
+            status_counts=status_counts if testcase_count else None,
+            listing=listing,
+            matching_count=matching_count,
+            total_pages=total_pages,
+        )
+        rows_query = (
+            member_query(
+                TestCase.id,
+                TestCase.title,
+                TestCase.status,
+                TestCase.priority,
+                TestCase.updated_at,
+                filters=filters,
+                sort=listing["sort"],
+                order=listing["order"],
             )
+            .offset((page - 1) * MEMBER_PAGE_SIZE)
+            .limit(MEMBER_PAGE_SIZE)
         )
+        return content, {"testcases": stream_project_testcase_rows(session, rows_query, project_id)}
+
+    return streaming.StreamingPageResponse(
+        render, title=project_view.project_page_title(project_data)
     )
 
 
+async def stream_project_testcase_rows(session: AsyncSession, query, project_id: int):
+    """
+    Yield table rows for the test cases in a project.
+
+    Args:
+        session: Database session
+        query: Select of member id, title, status, priority and updated_at
+        project_id: Project ID
+
+    Yields:
+        TestCaseRow elements
+    """
+    result = await session.stream(query.execution_options(yield_per=500))
+    async for row in result:
+        yield project_view.TestCaseRow(
+            {
+                "id": row.id,
+                "title": row.title,
+                "status": row.status.value if hasattr(row.status, 'value') else row.status,
+                "priority": row.priority.value if hasattr(row.priority, 'value') else row.priority,
+                "updated_at": row.updated_at.isoformat(),
+            },
+            project_id,
+        )
+
+
 @router.get("/{project_id}/edit", response_class=HTMLResponse)
 async def edit_project_page(
     request: Request,
@@ -314,8 +405,6 @@ async def edit_project_page(
         project_id: Project ID
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the project
     query = select(Project).where(Project.id == project_id)
     result = await session.execute(query)
@@ -323,7 +412,7 @@ async def edit_project_page(
 
     if not project:
         return HTMLResponse(
-            content=to_xml(NotFoundPage()),
+            content=to_xml(project_edit.NotFoundPage()),
             status_code=404,
         )
 
@@ -338,7 +427,7 @@ async def edit_project_page(
 
     return HTMLResponse(
         content=to_xml(
-            EditProjectPage(project=project_data)
+            project_edit.EditProjectPage(project=project_data)
         )
     )
 
@@ -367,8 +456,6 @@ async def edit_project_submit(
         end_date: Project end date (optional)
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the project
     query = select(Project).where(Project.id == project_id)
     result = await session.execute(query)
@@ -376,7 +463,7 @@ async def edit_project_submit(
 
     if not project:
         return HTMLResponse(
-            content=to_xml(NotFoundPage()),
+            content=to_xml(project_edit.NotFoundPage()),
             status_code=404,
         )
 
@@ -392,7 +479,7 @@ async def edit_project_submit(
         }
         return HTMLResponse(
             content=to_xml(
-                EditProjectPage(
+                project_edit.EditProjectPage(
                     project=project_data,
                     error_message="Project name is required.",
                 )
@@ -416,7 +503,7 @@ async def edit_project_submit(
         }
         return HTMLResponse(
             content=to_xml(
-                EditProjectPage(
+                project_edit.EditProjectPage(
                     project=project_data,
                     error_message=f"A project with name '{name}' already exists.",
                 )
@@ -444,7 +531,7 @@ async def edit_project_submit(
             }
             return HTMLResponse(
                 content=to_xml(
-                    EditProjectPage(
+                    project_edit.EditProjectPage(
                         project=project_data,
                         error_message="End date must be after start date.",
                     )
@@ -461,7 +548,7 @@ async def edit_project_submit(
         }
         return HTMLResponse(
             content=to_xml(
-                EditProjectPage(
+                project_edit.EditProjectPage(
                     project=project_data,
                     error_message="Invalid date format.",
                 )
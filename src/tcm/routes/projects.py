@@ -4,43 +4,91 @@ API routes for Project management.
 Provides CRUD operations for projects with test case associations.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy import select, func
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from sqlalchemy import exists, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
 
+from tcm.aggregates import get_testcase_count, with_testcase_count
 from tcm.database import get_async_session
+from tcm.expand import ExpansionLoader, parse_expand
+from tcm.fast_json import (
+    PROJECT_RESPONSE_COLUMNS,
+    TESTCASE_RESPONSE_COLUMNS,
+    json_response,
+    load_testcase_rows,
+)
+from tcm.fieldsets import PROJECT_FIELDS, PROJECT_FIELDSETS, parse_fields, selected_columns
+from tcm.http_cache import make_etag, latest, set_validators, not_modified, check_if_match
+from tcm.models.associations import project_testcases, testcase_tags
 from tcm.models.project import Project, ProjectStatus
-from tcm.models.testcase import TestCase
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase, TestCaseStatus, TestCasePriority
+from tcm.project_members import member_filters, member_query
 from tcm.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
     ProjectListResponse,
+    ProjectSummaryListResponse,
+    AvailableTestCase,
+    AvailableTestCaseListResponse,
 )
 from tcm.schemas.testcase import TestCaseResponse
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
-@router.get("", response_model=ProjectListResponse)
+def project_etag(project: Project, testcase_count: int) -> str:
+    """Build the strong ETag for a single project."""
+    return make_etag("project", project.id, project.updated_at, testcase_count)
+
+
+def project_response(project: Project, testcase_count: int) -> ProjectResponse:
+    """Serialize a project together with its test case count."""
+    return ProjectResponse.model_validate(project).model_copy(
+        update={"testcase_count": testcase_count}
+    )
+
+
+@router.get("", response_model=ProjectListResponse | ProjectSummaryListResponse)
 async def list_projects(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     status: ProjectStatus | None = Query(None, description="Filter by status"),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return, or 'summary' (default: all)"
+    ),
+    expand: str | None = Query(
+        None, description="Related records to embed: testcases, testcases.tags"
+    ),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     List all projects with pagination and optional filtering.
 
+    Rows are selected as plain columns and encoded without per-row model
+    validation (see ``tcm.fast_json``). With ``fields``, only the requested
+    columns are selected (see ``tcm.fieldsets``). ``expand`` embeds related
+    records (see ``tcm.expand``).
+
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
         status: Optional status filter
+        fields: Optional sparse fieldset
+        expand: Optional related records to embed
         session: Database session
     """
-    # Build query
-    query = select(Project)
+    selected = parse_fields(fields, PROJECT_FIELDS, PROJECT_FIELDSETS)
+    expansions = parse_expand(expand, "project")
+
+    # Select the requested response columns; member counts are aggregated
+    query = select(*selected_columns(PROJECT_RESPONSE_COLUMNS, selected))
+    if "testcase_count" in selected:
+        query = with_testcase_count(query)
 
     # Apply filters
     if status:
@@ -57,38 +105,68 @@ async def list_projects(
     # Get paginated results
     query = query.offset(skip).limit(limit).order_by(Project.id.desc())
     result = await session.execute(query)
-    projects = result.scalars().all()
-
-    return ProjectListResponse(
-        projects=[ProjectResponse.model_validate(proj) for proj in projects],
-        total=total,
-        skip=skip,
-        limit=limit,
+    projects = [dict(row) for row in result.mappings()]
+    await ExpansionLoader(session).expand("project", projects, expansions)
+
+    return json_response(
+        {
+            "projects": projects,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+        }
     )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
+    request: Request,
+    response: Response,
+    expand: str | None = Query(
+        None, description="Related records to embed: testcases, testcases.tags"
+    ),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Get a specific project by ID.
 
+    Supports conditional requests via If-None-Match / If-Modified-Since.
+    Expanded responses (see ``tcm.expand``) carry no validators, since the
+    embedded records are not covered by them.
+
     Args:
         project_id: Project ID
+        request: FastAPI request object
+        response: FastAPI response object
+        expand: Optional related records to embed
         session: Database session
     """
-    query = select(Project).where(Project.id == project_id)
+    expansions = parse_expand(expand, "project")
+    query = with_testcase_count(
+        select(Project).options(raiseload(Project.testcases)).where(Project.id == project_id)
+    )
     result = await session.execute(query)
-    project = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not project:
+    if not row:
         raise HTTPException(
             status_code=404, detail=f"Project with id {project_id} not found"
         )
+    project, testcase_count = row
+
+    if expansions:
+        content = project_response(project, testcase_count).model_dump()
+        await ExpansionLoader(session).expand("project", [content], expansions)
+        return json_response(content)
 
-    return ProjectResponse.model_validate(project)
+    etag = project_etag(project, testcase_count)
+    cached = not_modified(request, etag, project.updated_at)
+    if cached:
+        return cached
+    set_validators(response, etag, project.updated_at)
+
+    return project_response(project, testcase_count)
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
@@ -141,36 +219,43 @@ async def create_project(
     await session.commit()
     await session.refresh(project)
 
-    return ProjectResponse.model_validate(project)
+    return project_response(project, len(testcase_ids))
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Update an existing project.
 
+    Honors If-Match for lost-update protection (412 on mismatch).
+
     Args:
         project_id: Project ID
         project_data: Project data to update
+        request: FastAPI request object
+        response: FastAPI response object
         session: Database session
     """
-    # Get existing project
-    query = (
-        select(Project)
-        .options(selectinload(Project.testcases))
-        .where(Project.id == project_id)
+    # Get existing project with its member count, without loading the members
+    query = with_testcase_count(
+        select(Project).options(raiseload(Project.testcases)).where(Project.id == project_id)
     )
     result = await session.execute(query)
-    project = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not project:
+    if not row:
         raise HTTPException(
             status_code=404, detail=f"Project with id {project_id} not found"
         )
+    project, testcase_count = row
+
+    check_if_match(request, project_etag(project, testcase_count))
 
     # Extract and handle testcase_ids separately
     update_data = project_data.model_dump(exclude_unset=True)
@@ -207,12 +292,19 @@ async def update_project(
                 detail=f"Test cases with IDs {missing_ids} not found",
             )
 
+        # Replacing the membership needs the current one to diff against
+        await session.refresh(project, ["testcases"])
         project.testcases = list(testcases)
+        # Membership changes don't touch the row, so bump the timestamp explicitly
+        project.updated_at = func.now()
 
     await session.commit()
-    await session.refresh(project)
+    await session.refresh(project, ["updated_at"])
+
+    testcase_count = await get_testcase_count(session, project_id)
+    set_validators(response, project_etag(project, testcase_count), project.updated_at)
 
-    return ProjectResponse.model_validate(project)
+    return project_response(project, testcase_count)
 
 
 @router.delete("/{project_id}", status_code=204)
@@ -244,30 +336,167 @@ async def delete_project(
 @router.get("/{project_id}/testcases", response_model=list[TestCaseResponse])
 async def get_project_testcases(
     project_id: int,
+    request: Request,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    sort: Literal["added", "title", "status", "priority"] = Query(
+        "added", description="Sort key (added = date added to the project)"
+    ),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    status: TestCaseStatus | None = Query(None, description="Filter by status"),
+    priority: TestCasePriority | None = Query(None, description="Filter by priority"),
+    q: str = Query("", max_length=200, description="Search test case titles"),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Get all test cases associated with a project.
+    Get a page of the test cases associated with a project.
+
+    The number of matching test cases is returned in the X-Total-Count
+    header. The collection ETag is derived from the query, the member and tag
+    assignment counts and the latest update of the project, its test cases
+    and their tags, all computed in one aggregate query before any rows are
+    loaded. The assignment count catches deleted tags, which leave no newer
+    timestamp behind within the clock resolution. Rows are
+    encoded without per-row model validation (see ``tcm.fast_json``).
 
     Args:
         project_id: Project ID
+        request: FastAPI request object
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        sort: Sort key
+        order: Sort direction
+        status: Optional status filter
+        priority: Optional priority filter
+        q: Optional title search
         session: Database session
     """
-    # Get project with test cases
-    query = (
-        select(Project)
-        .options(selectinload(Project.testcases).selectinload(TestCase.tags))
-        .where(Project.id == project_id)
-    )
-    result = await session.execute(query)
-    project = result.scalar_one_or_none()
+    # Check the project exists and get its own timestamp
+    project_query = select(Project.updated_at).where(Project.id == project_id)
+    project_result = await session.execute(project_query)
+    project_updated_at = project_result.scalar_one_or_none()
 
-    if not project:
+    if project_updated_at is None:
         raise HTTPException(
             status_code=404, detail=f"Project with id {project_id} not found"
         )
 
-    return [TestCaseResponse.model_validate(tc) for tc in project.testcases]
+    filters = member_filters(project_id, status=status, priority=priority, q=q)
+
+    # Collection validators: member and assignment counts plus latest member/tag update
+    validators_query = (
+        select(
+            func.count(func.distinct(TestCase.id)),
+            func.count(testcase_tags.c.tag_id),
+            func.max(TestCase.updated_at),
+            func.max(Tag.updated_at),
+        )
+        .select_from(project_testcases)
+        .join(TestCase, TestCase.id == project_testcases.c.testcase_id)
+        .outerjoin(testcase_tags, testcase_tags.c.testcase_id == TestCase.id)
+        .outerjoin(Tag, Tag.id == testcase_tags.c.tag_id)
+        .where(*filters)
+    )
+    validators_result = await session.execute(validators_query)
+    count, assignments, testcases_updated_at, tags_updated_at = validators_result.one()
+
+    last_modified = latest(project_updated_at, testcases_updated_at, tags_updated_at)
+    etag = make_etag(
+        "project-testcases",
+        project_id,
+        project_updated_at,
+        count,
+        assignments,
+        testcases_updated_at,
+        tags_updated_at,
+        request.url.query,
+    )
+    cached = not_modified(request, etag, last_modified)
+    if cached:
+        return cached
+
+    # Load only the requested page of members, with their tags
+    query = (
+        member_query(*TESTCASE_RESPONSE_COLUMNS, filters=filters, sort=sort, order=order)
+        .offset(skip)
+        .limit(limit)
+    )
+    testcases = await load_testcase_rows(session, query)
+
+    page = json_response(testcases, headers={"X-Total-Count": str(count)})
+    set_validators(page, etag, last_modified)
+    return page
+
+
+@router.get("/{project_id}/available-testcases", response_model=AvailableTestCaseListResponse)
+async def search_available_testcases(
+    project_id: int,
+    q: str = Query("", max_length=200, description="Search test case titles"),
+    status: TestCaseStatus | None = Query(None, description="Filter by status"),
+    priority: TestCasePriority | None = Query(None, description="Filter by priority"),
+    tag_id: int | None = Query(None, description="Filter by tag ID"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(25, ge=1, le=200, description="Number of records to return"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Search the test cases that are not yet part of a project.
+
+    Backs the project page's "add test cases" picker. Only the columns the
+    picker shows are selected, and membership and tag filters are NOT EXISTS
+    / EXISTS subqueries, so no test case, tag or project objects are loaded.
+
+    Args:
+        project_id: Project ID
+        q: Optional title search
+        status: Optional status filter
+        priority: Optional priority filter
+        tag_id: Optional tag ID filter
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        session: Database session
+    """
+    project_exists = await session.scalar(select(Project.id).where(Project.id == project_id))
+    if project_exists is None:
+        raise HTTPException(status_code=404, detail=f"Project with id {project_id} not found")
+
+    filters = [
+        ~exists().where(
+            project_testcases.c.project_id == project_id,
+            project_testcases.c.testcase_id == TestCase.id,
+        )
+    ]
+    if q.strip():
+        filters.append(TestCase.title.ilike(f"%{q.strip()}%"))
+    if status:
+        filters.append(TestCase.status == status)
+    if priority:
+        filters.append(TestCase.priority == priority)
+    if tag_id:
+        filters.append(
+            exists().where(
+                testcase_tags.c.testcase_id == TestCase.id,
+                testcase_tags.c.tag_id == tag_id,
+            )
+        )
+
+    total = await session.scalar(select(func.count(TestCase.id)).where(*filters))
+
+    query = (
+        select(TestCase.id, TestCase.title, TestCase.status, TestCase.priority)
+        .where(*filters)
+        .order_by(TestCase.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await session.execute(query)
+
+    return AvailableTestCaseListResponse(
+        testcases=[AvailableTestCase.model_validate(dict(row)) for row in result.mappings()],
+        total=total,
+        skip=skip,
+        limit=limit,
+    )
 
 
 @router.post("/{project_id}/testcases/{testcase_id}", response_model=ProjectResponse)
@@ -284,11 +513,9 @@ async def add_testcase_to_project(
         testcase_id: Test case ID to add
         session: Database session
     """
-    # Get project
+    # Get project, without loading its members
     proj_query = (
-        select(Project)
-        .options(selectinload(Project.testcases))
-        .where(Project.id == project_id)
+        select(Project).options(raiseload(Project.testcases)).where(Project.id == project_id)
     )
     proj_result = await session.execute(proj_query)
     project = proj_result.scalar_one_or_none()
@@ -308,19 +535,20 @@ async def add_testcase_to_project(
             status_code=404, detail=f"Test case with id {testcase_id} not found"
         )
 
-    # Check if test case is already associated
-    if testcase in project.testcases:
+    # Check if test case is already associated (through the case's own, short list)
+    if project in testcase.projects:
         raise HTTPException(
             status_code=400,
             detail=f"Test case {testcase_id} is already associated with project {project_id}",
         )
 
     # Add test case
-    project.testcases.append(testcase)
+    testcase.projects.append(project)
+    project.updated_at = func.now()
     await session.commit()
-    await session.refresh(project)
+    await session.refresh(project, ["updated_at"])
 
-    return ProjectResponse.model_validate(project)
+    return project_response(project, await get_testcase_count(session, project_id))
 
 
 @router.delete("/{project_id}/testcases/{testcase_id}", response_model=ProjectResponse)
@@ -337,11 +565,9 @@ async def remove_testcase_from_project(
         testcase_id: Test case ID to remove
         session: Database session
     """
-    # Get project
+    # Get project, without loading its members
     proj_query = (
-        select(Project)
-        .options(selectinload(Project.testcases))
-        .where(Project.id == project_id)
+        select(Project).options(raiseload(Project.testcases)).where(Project.id == project_id)
     )
     proj_result = await session.execute(proj_query)
     project = proj_result.scalar_one_or_none()
@@ -351,21 +577,20 @@ async def remove_testcase_from_project(
             status_code=404, detail=f"Project with id {project_id} not found"
         )
 
-    # Find and remove test case
-    tc_to_remove = None
-    for tc in project.testcases:
-        if tc.id == testcase_id:
-            tc_to_remove = tc
-            break
+    # Find the test case and remove it through its own list of projects
+    tc_query = select(TestCase).where(TestCase.id == testcase_id)
+    tc_result = await session.execute(tc_query)
+    tc_to_remove = tc_result.scalar_one_or_none()
 
-    if not tc_to_remove:
+    if not tc_to_remove or project not in tc_to_remove.projects:
         raise HTTPException(
             status_code=404,
             detail=f"Test case {testcase_id} is not associated with project {project_id}",
         )
 
-    project.testcases.remove(tc_to_remove)
+    tc_to_remove.projects.remove(project)
+    project.updated_at = func.now()
     await session.commit()
-    await session.refresh(project)
+    await session.refresh(project, ["updated_at"])
 
-    return ProjectResponse.model_validate(project)
+    return project_response(project, await get_testcase_count(session, project_id))
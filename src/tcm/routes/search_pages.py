@@ -4,57 +4,54 @@ Page routes for Search UI.
 Provides global search across test cases, projects, and tags.
 """
 
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse
-from sqlalchemy import select, or_
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from tcm.database import get_async_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import raiseload
+
+from tcm.aggregates import TESTCASE_LIST_OPTIONS, with_testcase_count, with_usage_count
+from tcm.config import settings
+from tcm.database import get_db, get_session_factory
+from tcm.fieldsets import deferred_text
 from tcm.models.tag import Tag
 from tcm.models.testcase import TestCase
 from tcm.models.project import Project
-from tcm.pages.search import SearchPage
+from tcm.pages.lazy import lazy_module, to_xml
+from tcm.search_index import search_documents_page
+
+logger = logging.getLogger("tcm.search")
+
+# Page modules, imported on first use
+search_views = lazy_module("tcm.pages.search")
 
 router = APIRouter(tags=["search-pages"])
 
+# Results per search page
+SEARCH_PAGE_SIZE = 20
+
 
-async def search_testcases(
-    session: AsyncSession,
-    query: str,
-    status_filter: str = "",
-) -> list[dict]:
+async def load_testcase_results(session: AsyncSession, ids: list[int]) -> list[dict]:
     """
-    Search test cases by title or description.
+    Load the details shown for test case search results.
 
     Args:
         session: Database session
-        query: Search query string
-        status_filter: Optional status filter
+        ids: IDs of the test cases on the results page
 
     Returns:
-        List of matching test case dicts
+        List of test case result dicts
     """
-    # Build query
-    search_query = select(TestCase).where(
-        or_(
-            TestCase.title.ilike(f"%{query}%"),
-            TestCase.description.ilike(f"%{query}%"),
-            TestCase.steps.ilike(f"%{query}%"),
-        )
+    result = await session.execute(
+        select(TestCase)
+        .options(*TESTCASE_LIST_OPTIONS, *deferred_text(TestCase.description))
+        .where(TestCase.id.in_(ids))
     )
-
-    # Apply status filter
-    if status_filter:
-        from tcm.models.testcase import TestCaseStatus
-        try:
-            status_enum = TestCaseStatus(status_filter)
-            search_query = search_query.where(TestCase.status == status_enum)
-        except ValueError:
-            pass  # Invalid status, ignore filter
-
-    search_query = search_query.order_by(TestCase.updated_at.desc()).limit(50)
-
-    result = await session.execute(search_query)
     testcases = result.scalars().all()
 
     return [
@@ -79,44 +76,24 @@ async def search_testcases(
     ]
 
 
-async def search_projects(
-    session: AsyncSession,
-    query: str,
-    status_filter: str = "",
-) -> list[dict]:
+async def load_project_results(session: AsyncSession, ids: list[int]) -> list[dict]:
     """
-    Search projects by name or description.
+    Load the details shown for project search results.
 
     Args:
         session: Database session
-        query: Search query string
-        status_filter: Optional status filter
+        ids: IDs of the projects on the results page
 
     Returns:
-        List of matching project dicts
+        List of project result dicts
     """
-    # Build query
-    search_query = select(Project).where(
-        or_(
-            Project.name.ilike(f"%{query}%"),
-            Project.description.ilike(f"%{query}%"),
+    # Member counts are aggregated instead of loading test cases
+    result = await session.execute(
+        with_testcase_count(select(Project).options(raiseload(Project.testcases))).where(
+            Project.id.in_(ids)
         )
     )
 
-    # Apply status filter
-    if status_filter:
-        from tcm.models.project import ProjectStatus
-        try:
-            status_enum = ProjectStatus(status_filter)
-            search_query = search_query.where(Project.status == status_enum)
-        except ValueError:
-            pass  # Invalid status, ignore filter
-
-    search_query = search_query.order_by(Project.updated_at.desc()).limit(50)
-
-    result = await session.execute(search_query)
-    projects = result.scalars().all()
-
     return [
         {
             "entity_type": "project",
@@ -125,48 +102,30 @@ async def search_projects(
             "description": proj.description or "",
             "link": f"/projects/{proj.id}",
             "status": proj.status.value,
-            "testcase_count": len(proj.testcases),
+            "testcase_count": testcase_count,
             "start_date": proj.start_date.strftime("%Y-%m-%d") if proj.start_date else None,
             "end_date": proj.end_date.strftime("%Y-%m-%d") if proj.end_date else None,
         }
-        for proj in projects
+        for proj, testcase_count in result.all()
     ]
 
 
-async def search_tags(
-    session: AsyncSession,
-    query: str,
-    category_filter: str = "",
-) -> list[dict]:
+async def load_tag_results(session: AsyncSession, ids: list[int]) -> list[dict]:
     """
-    Search tags by category or value.
+    Load the details shown for tag search results.
 
     Args:
         session: Database session
-        query: Search query string
-        category_filter: Optional category filter
+        ids: IDs of the tags on the results page
 
     Returns:
-        List of matching tag dicts
+        List of tag result dicts
     """
-    # Build query
-    search_query = select(Tag).where(
-        or_(
-            Tag.category.ilike(f"%{query}%"),
-            Tag.value.ilike(f"%{query}%"),
-            Tag.description.ilike(f"%{query}%"),
-        )
+    # Usage counts are aggregated instead of loading test cases
+    result = await session.execute(
+        with_usage_count(select(Tag).options(raiseload(Tag.testcases))).where(Tag.id.in_(ids))
     )
 
-    # Apply category filter
-    if category_filter:
-        search_query = search_query.where(Tag.category == category_filter)
-
-    search_query = search_query.order_by(Tag.category, Tag.value).limit(50)
-
-    result = await session.execute(search_query)
-    tags = result.scalars().all()
-
     return [
         {
             "entity_type": "tag",
@@ -177,12 +136,87 @@ async def search_tags(
             "description": tag.description or "",
             "link": f"/tags/{tag.id}/edit",
             "is_predefined": tag.is_predefined,
-            "testcase_count": len(tag.testcases),
+            "testcase_count": usage_count,
         }
-        for tag in tags
+        for tag, usage_count in result.all()
     ]
 
 
+# Loaders of the result details, by entity type
+RESULT_LOADERS = {
+    "testcase": load_testcase_results,
+    "project": load_project_results,
+    "tag": load_tag_results,
+}
+
+
+async def run_search(
+    session_factory: async_sessionmaker[AsyncSession],
+    search: Callable[[AsyncSession], Awaitable[list[dict]]],
+    timeout: float,
+) -> tuple[list[dict] | None, float]:
+    """
+    Run one entity search on its own session, bounded by a timeout.
+
+    Args:
+        session_factory: Factory for the search's session
+        search: Coroutine function taking the session and returning results
+        timeout: Seconds before the search is cancelled
+
+    Returns:
+        (results, elapsed seconds); results is None if the search timed out
+    """
+    start = time.perf_counter()
+
+    async def execute():
+        async with session_factory() as session:
+            return await search(session)
+
+    try:
+        results = await asyncio.wait_for(execute(), timeout)
+    except TimeoutError:
+        results = None
+    return results, time.perf_counter() - start
+
+
+async def run_searches(
+    session_factory: async_sessionmaker[AsyncSession],
+    searches: dict[str, Callable[[AsyncSession], Awaitable[list[dict]]]],
+    timeout: float,
+) -> tuple[dict[str, list[dict]], dict[str, float], list[str]]:
+    """
+    Run entity searches concurrently, each on an independent connection.
+
+    Args:
+        session_factory: Factory creating one session per search
+        searches: Search coroutine functions by entity type
+        timeout: Seconds each search may take
+
+    Returns:
+        (results by entity type, elapsed seconds by entity type, entity
+        types that timed out and are missing from the results)
+    """
+    outcomes = await asyncio.gather(
+        *(run_search(session_factory, search, timeout) for search in searches.values())
+    )
+    results, timings, timed_out = {}, {}, []
+    for entity_type, (entity_results, elapsed) in zip(searches, outcomes):
+        timings[entity_type] = elapsed
+        if entity_results is None:
+            timed_out.append(entity_type)
+            logger.warning("Search for %s timed out after %.1fs", entity_type, elapsed)
+        else:
+            results[entity_type] = entity_results
+    return results, timings, timed_out
+
+
+def server_timing(timings: dict[str, float]) -> str:
+    """Format search timings as a Server-Timing header value (milliseconds)."""
+    return ", ".join(
+        f"search-{entity_type};dur={elapsed * 1000:.1f}" for entity_type, elapsed in timings.items()
+    )
+
+
 @router.get("/search", response_class=HTMLResponse)
 async def search_page(
     request: Request,
@@ -190,60 +224,97 @@ async def search_page(
     entity_type: str = Query("", description="Entity type filter"),
     status: str = Query("", description="Status filter"),
     category: str = Query("", description="Category filter for tags"),
-    session: AsyncSession = Depends(get_async_session),
+    page: int = Query(1, ge=1, description="Results page"),
+    session: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
     """
     Render the search page with results.
 
+    One query against the search index ranks and paginates matches across
+    test cases, projects and tags and counts them per type. The details of
+    the results on the page are then loaded concurrently, one connection
+    per entity type, each under ``search_timeout``; a type that times out
+    is left out and reported on the page. Durations are sent in the
+    Server-Timing header.
+
     Args:
         request: FastAPI request object
         q: Search query
         entity_type: Entity type filter (testcase, project, tag)
         status: Status filter
         category: Category filter for tags
-        session: Database session
+        page: Results page (1-indexed)
+        session: Database session for the index query
+        session_factory: Factory for the per-type detail sessions
     """
-    from fasthtml.common import to_xml
-
     # If no query, show empty search page
     if not q:
         return HTMLResponse(
             content=to_xml(
-                SearchPage(
+                search_views.SearchPage(
                     query="",
                     entity_type=entity_type,
                     status_filter=status,
                     category_filter=category,
-                    results={},
-                    total_count=0,
                 )
             )
         )
 
-    # Perform searches based on entity type filter
-    results = {}
-
-    if not entity_type or entity_type == "testcase":
-        results["testcase"] = await search_testcases(session, q, status)
-
-    if not entity_type or entity_type == "project":
-        results["project"] = await search_projects(session, q, status)
-
-    if not entity_type or entity_type == "tag":
-        results["tag"] = await search_tags(session, q, category)
+    if entity_type not in RESULT_LOADERS:
+        entity_type = ""
+
+    start = time.perf_counter()
+    documents, facets = await search_documents_page(
+        session,
+        q,
+        entity_type=entity_type,
+        status=status,
+        category=category,
+        skip=(page - 1) * SEARCH_PAGE_SIZE,
+        limit=SEARCH_PAGE_SIZE,
+    )
+    index_elapsed = time.perf_counter() - start
+    total_count = facets[entity_type] if entity_type else sum(facets.values())
+
+    # Load the details of the page's results, grouped by entity type
+    page_ids: dict[str, list[int]] = {}
+    for document in documents:
+        page_ids.setdefault(document["entity_type"], []).append(document["entity_id"])
+    searches = {
+        etype: (lambda session, load=RESULT_LOADERS[etype], ids=ids: load(session, ids))
+        for etype, ids in page_ids.items()
+    }
+    loaded, timings, timed_out = await run_searches(
+        session_factory, searches, settings.search_timeout
+    )
 
-    # Calculate total count
-    total_count = sum(len(items) for items in results.values())
+    # Keep the index's ranking
+    details = {
+        (result["entity_type"], result["entity_id"]): result
+        for results in loaded.values()
+        for result in results
+    }
+    results = [
+        details[key]
+        for key in ((document["entity_type"], document["entity_id"]) for document in documents)
+        if key in details
+    ]
 
     return HTMLResponse(
         content=to_xml(
-            SearchPage(
+            search_views.SearchPage(
                 query=q,
                 entity_type=entity_type,
                 status_filter=status,
                 category_filter=category,
                 results=results,
+                facets=facets,
                 total_count=total_count,
+                current_page=page,
+                total_pages=max(1, -(-total_count // SEARCH_PAGE_SIZE)),
+                timed_out=timed_out,
             )
-        )
+        ),
+        headers={"Server-Timing": server_timing({"index": index_elapsed, **timings})},
     )
@@ -14,8 +14,14 @@ from starlette.status import HTTP_303_SEE_OTHER
 
 from tcm.database import get_async_session
 from tcm.models.tag import Tag
-from tcm.pages.tags import TagsListPage, CreateTagPage, EditTagPage
-from tcm.pages.tags.edit import NotFoundPage
+from tcm.pages.lazy import lazy_module, to_xml
+
+# Page modules, imported on first use
+partials = lazy_module("tcm.pages.components.partial")
+streaming = lazy_module("tcm.pages.components.streaming")
+tag_list = lazy_module("tcm.pages.tags.list")
+tag_create = lazy_module("tcm.pages.tags.create")
+tag_edit = lazy_module("tcm.pages.tags.edit")
 
 router = APIRouter(prefix="/tags", tags=["tag-pages"])
 
@@ -38,6 +44,11 @@ async def tags_list_page(
     """
     Render the tags list page.
 
+    The layout shell is sent immediately and tag rows are streamed from the
+    database result, grouped by category unless a category filter is set.
+    Partial update requests (HX-Request header) get only the streamed
+    results fragment.
+
     Args:
         request: FastAPI request object
         category: Optional category filter
@@ -45,46 +56,86 @@ async def tags_list_page(
         error: Error message from redirect
         session: Database session
     """
-    from fasthtml.common import to_xml
-
-    # Build query
-    query = select(Tag)
-    if category:
-        query = query.where(Tag.category == category)
-    query = query.order_by(Tag.category, Tag.value)
-
-    result = await session.execute(query)
-    tags = result.scalars().all()
-
-    # Convert to dict format
-    tags_data = [
-        {
-            "id": tag.id,
-            "category": tag.category,
-            "value": tag.value,
-            "description": tag.description,
-            "is_predefined": tag.is_predefined,
-        }
-        for tag in tags
-    ]
 
-    # Get all categories for filter dropdown
-    categories = await get_all_categories(session)
+    partial = partials.is_partial_request(request)
 
-    return HTMLResponse(
-        content=to_xml(
-            TagsListPage(
-                tags=tags_data,
-                categories=categories,
+    async def render():
+        # Per-category counts drive both the filter dropdown and group headers
+        count_query = (
+            select(Tag.category, func.count())
+            .group_by(Tag.category)
+            .order_by(Tag.category)
+        )
+        counts = dict((await session.execute(count_query)).all())
+        total = counts.get(category, 0) if category else sum(counts.values())
+
+        if not total:
+            content_list = [tag_list.TagsEmptyState()]
+        elif category:
+            content_list = [tag_list.TagsTableFrame(streaming.Slot("tags"))]
+        else:
+            content_list = [streaming.Slot("tags")]
+
+        if partial:
+            content = tag_list.TagsResults(content_list)
+        else:
+            content = tag_list.TagsListContent(
+                content_list,
+                categories=list(counts),
                 current_category=category,
                 success_message=success,
                 error_message=error,
-                grouped=not category,  # Only group when not filtering
             )
-        )
+        rows = stream_tag_rows(session, category, counts)
+        return content, {"tags": rows}
+
+    if partial:
+        return partials.vary_on_partial(streaming.StreamingFragmentResponse(render))
+    return partials.vary_on_partial(
+        streaming.StreamingPageResponse(render, title=tag_list.TAGS_PAGE_TITLE)
     )
 
 
+async def stream_tag_rows(session: AsyncSession, category: str, counts: dict[str, int]):
+    """
+    Yield tag rows from the database, wrapped in category groups when unfiltered.
+
+    Args:
+        session: Database session
+        category: Category filter (rows are not grouped when set)
+        counts: Number of tags per category
+
+    Yields:
+        Tag rows and raw group markup
+    """
+    query = select(
+        Tag.id, Tag.category, Tag.value, Tag.description, Tag.is_predefined
+    ).order_by(Tag.category, Tag.value)
+    if category:
+        query = query.where(Tag.category == category)
+
+    result = await session.stream(query.execution_options(yield_per=500))
+    current_category = None
+    group_close = ""
+    async for row in result.mappings():
+        if not category and row["category"] != current_category:
+            current_category = row["category"]
+            group_open, next_close = streaming.split_slot(
+                tag_list.CategoryTagsGroup(
+                    current_category,
+                    [],
+                    count=counts[current_category],
+                    table=tag_list.TagsTableFrame(streaming.Slot("group")),
+                ),
+                "group",
+            )
+            yield group_close + group_open
+            group_close = next_close
+        yield tag_list.TagRow(dict(row))
+    if group_close:
+        yield group_close
+
+
 @router.get("/new", response_class=HTMLResponse)
 async def create_tag_page(
     request: Request,
@@ -97,13 +148,11 @@ async def create_tag_page(
         request: FastAPI request object
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     categories = await get_all_categories(session)
 
     return HTMLResponse(
         content=to_xml(
-            CreateTagPage(categories=categories)
+            tag_create.CreateTagPage(categories=categories)
         )
     )
 
@@ -126,14 +175,12 @@ async def create_tag_submit(
         description: Tag description (optional)
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Validate required fields
     if not category or not value:
         categories = await get_all_categories(session)
         return HTMLResponse(
             content=to_xml(
-                CreateTagPage(
+                tag_create.CreateTagPage(
                     categories=categories,
                     error_message="Category and value are required.",
                     form_data={
@@ -155,7 +202,7 @@ async def create_tag_submit(
         categories = await get_all_categories(session)
         return HTMLResponse(
             content=to_xml(
-                CreateTagPage(
+                tag_create.CreateTagPage(
                     categories=categories,
                     error_message=f"A tag with category '{category}' and value '{value}' already exists.",
                     form_data={
@@ -197,8 +244,6 @@ async def edit_tag_page(
         tag_id: Tag ID
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the tag
     query = select(Tag).where(Tag.id == tag_id)
     result = await session.execute(query)
@@ -206,7 +251,7 @@ async def edit_tag_page(
 
     if not tag:
         return HTMLResponse(
-            content=to_xml(NotFoundPage()),
+            content=to_xml(tag_edit.NotFoundPage()),
             status_code=404,
         )
 
@@ -222,7 +267,7 @@ async def edit_tag_page(
 
     return HTMLResponse(
         content=to_xml(
-            EditTagPage(tag=tag_data, categories=categories)
+            tag_edit.EditTagPage(tag=tag_data, categories=categories)
         )
     )
 
@@ -247,8 +292,6 @@ async def edit_tag_submit(
         description: Tag description (optional)
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the tag
     query = select(Tag).where(Tag.id == tag_id)
     result = await session.execute(query)
@@ -256,7 +299,7 @@ async def edit_tag_submit(
 
     if not tag:
         return HTMLResponse(
-            content=to_xml(NotFoundPage()),
+            content=to_xml(tag_edit.NotFoundPage()),
             status_code=404,
         )
 
@@ -279,7 +322,7 @@ async def edit_tag_submit(
         }
         return HTMLResponse(
             content=to_xml(
-                EditTagPage(
+                tag_edit.EditTagPage(
                     tag=tag_data,
                     categories=categories,
                     error_message="Category and value are required.",
@@ -304,7 +347,7 @@ async def edit_tag_submit(
         }
         return HTMLResponse(
             content=to_xml(
-                EditTagPage(
+                tag_edit.EditTagPage(
                     tag=tag_data,
                     categories=categories,
                     error_message=f"A tag with category '{category}' and value '{value}' already exists.",
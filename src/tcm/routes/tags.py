@@ -4,57 +4,128 @@ API routes for Tag management.
 Provides CRUD operations for tags.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from tcm.database import get_async_session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import raiseload
+
+from tcm.aggregates import get_usage_count, with_usage_count
+from tcm.database import get_async_session, get_session_factory
+from tcm.fast_json import TAG_RESPONSE_COLUMNS, json_response, tag_rows
+from tcm.fieldsets import TAG_FIELDS, TAG_FIELDSETS, parse_fields, selected_columns
+from tcm.http_cache import make_etag, derived_etag, set_validators, not_modified, check_if_match
+from tcm.models.associations import testcase_tags
 from tcm.models.tag import Tag
-from tcm.schemas.tag import TagCreate, TagUpdate, TagResponse, TagListResponse
+from tcm.schemas.tag import (
+    TagCreate,
+    TagUpdate,
+    TagResponse,
+    TagListResponse,
+    TagSummaryListResponse,
+    TagSuggestion,
+    TagCatalogResponse,
+)
+from tcm.tag_catalog import get_catalog_version, load_catalog
+from tcm.tag_index import get_tag_index
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-@router.get("", response_model=TagListResponse)
+def tag_own_etag(tag: Tag) -> str:
+    """Build the ETag of the tag's own fields, the If-Match validator."""
+    return make_etag("tag", tag.id, tag.updated_at)
+
+
+def tag_etag(tag: Tag, usage_count: int) -> str:
+    """
+    Build the strong ETag for a single tag.
+
+    The usage count is a derived part (see ``derived_etag``), so If-Match
+    still holds after only the tag's assignments changed.
+    """
+    return derived_etag(tag_own_etag(tag), usage_count)
+
+
+def tag_response(tag: Tag, usage_count: int) -> TagResponse:
+    """Serialize a tag together with its usage count."""
+    return TagResponse.model_validate(tag).model_copy(update={"usage_count": usage_count})
+
+
+@router.get("", response_model=TagListResponse | TagSummaryListResponse)
 async def list_tags(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     category: str | None = Query(None, description="Filter by category"),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return, or 'summary' (default: all)"
+    ),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     List all tags with pagination and optional filtering.
 
+    The collection ETag is derived from the count and latest update time of
+    the filtered set and of the tag assignments (which change usage counts),
+    so unchanged listings are answered with 304. No Last-Modified is sent:
+    deleting a tag or an assignment changes the counts but no timestamp, so
+    If-Modified-Since would keep answering 304 for a stale listing. Rows are encoded without
+    per-row model validation (see ``tcm.fast_json``). With ``fields``, only
+    the requested columns are selected (see ``tcm.fieldsets``).
+
     Args:
+        request: FastAPI request object
         skip: Number of records to skip
         limit: Maximum number of records to return
         category: Optional category filter
+        fields: Optional sparse fieldset
         session: Database session
     """
-    # Build query
-    query = select(Tag)
+    selected = parse_fields(fields, TAG_FIELDS, TAG_FIELDSETS)
+
+    # Select the requested response columns; usage counts are aggregated
+    query = select(*selected_columns(TAG_RESPONSE_COLUMNS, selected))
+    if "usage_count" in selected:
+        query = with_usage_count(query)
     if category:
         query = query.where(Tag.category == category)
 
-    # Get total count
-    count_query = select(func.count()).select_from(Tag)
+    # Get total count and latest update (collection ETag)
+    count_query = select(func.count(), func.max(Tag.updated_at)).select_from(Tag)
     if category:
         count_query = count_query.where(Tag.category == category)
 
     total_result = await session.execute(count_query)
-    total = total_result.scalar_one()
+    total, last_updated = total_result.one()
+    usage_result = await session.execute(
+        select(func.count(), func.max(testcase_tags.c.created_at)).select_from(testcase_tags)
+    )
+    assignments, last_assigned = usage_result.one()
+
+    etag = make_etag(
+        "tags",
+        category or "",
+        skip,
+        limit,
+        ",".join(selected),
+        total,
+        last_updated,
+        assignments,
+        last_assigned,
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
 
     # Get paginated results
     query = query.offset(skip).limit(limit).order_by(Tag.category, Tag.value)
     result = await session.execute(query)
-    tags = result.scalars().all()
 
-    return TagListResponse(
-        tags=[TagResponse.model_validate(tag) for tag in tags],
-        total=total,
-        skip=skip,
-        limit=limit,
+    page = json_response(
+        {"tags": tag_rows(result.mappings()), "total": total, "skip": skip, "limit": limit}
     )
+    set_validators(page, etag)
+    return page
 
 
 @router.get("/categories", response_model=list[str])
@@ -73,26 +144,97 @@ async def list_categories(
     return list(categories)
 
 
+@router.get("/suggest", response_model=list[TagSuggestion])
+async def suggest_tags(
+    q: str = Query("", max_length=150, description="Prefix of the tag value or category:value"),
+    category: str | None = Query(None, description="Restrict suggestions to a category"),
+    limit: int = Query(10, ge=1, le=200, description="Maximum number of suggestions"),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """
+    Suggest tags for typeahead, ranked by how many test cases use them.
+
+    Served from an in-memory prefix index that is rebuilt after tag or test
+    case writes.
+
+    Args:
+        q: Prefix to match against tag values and "category:value"
+        category: Optional category filter
+        limit: Maximum number of suggestions
+        session_factory: Factory for the session the index is rebuilt on
+    """
+    index = await get_tag_index(session_factory)
+    return index.suggest(q, category=category, limit=limit)
+
+
+@router.get("/catalog", response_model=TagCatalogResponse)
+async def get_tag_catalog(
+    request: Request,
+    response: Response,
+    since_version: int | None = Query(
+        None, ge=0, description="Only return changes made after this catalog version"
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Get the versioned tag catalog, or the changes since a known version.
+
+    The ETag is derived from the catalog version alone, so revalidating an
+    unchanged catalog costs a single-row lookup and returns 304.
+
+    Args:
+        request: FastAPI request object
+        response: FastAPI response object
+        since_version: Catalog version the client already holds
+        session: Database session
+    """
+    version = await get_catalog_version(session)
+    etag = make_etag("tag-catalog", version, "" if since_version is None else since_version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_validators(response, etag)
+
+    return await load_catalog(session, version, since_version)
+
+
 @router.get("/{tag_id}", response_model=TagResponse)
 async def get_tag(
     tag_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Get a specific tag by ID.
 
+    Supports conditional requests via If-None-Match. No Last-Modified is
+    sent: the usage count changes when test cases are (un)assigned, which
+    leaves the tag's own timestamp untouched.
+
     Args:
         tag_id: Tag ID
+        request: FastAPI request object
+        response: FastAPI response object
         session: Database session
     """
-    query = select(Tag).where(Tag.id == tag_id)
+    query = with_usage_count(
+        select(Tag).options(raiseload(Tag.testcases)).where(Tag.id == tag_id)
+    )
     result = await session.execute(query)
-    tag = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not tag:
+    if not row:
         raise HTTPException(status_code=404, detail=f"Tag with id {tag_id} not found")
+    tag, usage_count = row
+
+    etag = tag_etag(tag, usage_count)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_validators(response, etag)
 
-    return TagResponse.model_validate(tag)
+    return tag_response(tag, usage_count)
 
 
 @router.post("", response_model=TagResponse, status_code=201)
@@ -127,21 +269,27 @@ async def create_tag(
     await session.commit()
     await session.refresh(tag)
 
-    return TagResponse.model_validate(tag)
+    return tag_response(tag, 0)
 
 
 @router.patch("/{tag_id}", response_model=TagResponse)
 async def update_tag(
     tag_id: int,
     tag_data: TagUpdate,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Update an existing tag.
 
+    Honors If-Match for lost-update protection (412 on mismatch).
+
     Args:
         tag_id: Tag ID
         tag_data: Tag data to update
+        request: FastAPI request object
+        response: FastAPI response object
         session: Database session
     """
     # Get existing tag
@@ -152,6 +300,9 @@ async def update_tag(
     if not tag:
         raise HTTPException(status_code=404, detail=f"Tag with id {tag_id} not found")
 
+    check_if_match(request, tag_own_etag(tag))
+    usage_count = await get_usage_count(session, tag_id)
+
     # Update fields
     update_data = tag_data.model_dump(exclude_unset=True)
 
@@ -179,7 +330,9 @@ async def update_tag(
     await session.commit()
     await session.refresh(tag)
 
-    return TagResponse.model_validate(tag)
+    set_validators(response, tag_etag(tag, usage_count))
+
+    return tag_response(tag, usage_count)
 
 
 @router.delete("/{tag_id}", status_code=204)
@@ -13,36 +13,40 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from starlette.status import HTTP_303_SEE_OTHER
 
+from tcm import __version__
+from tcm.aggregates import TESTCASE_LIST_OPTIONS
 from tcm.database import get_async_session
+from tcm.fieldsets import deferred_text
+from tcm.http_cache import make_etag, latest, set_validators, not_modified
 from tcm.models.testcase import TestCase, TestCaseStatus, TestCasePriority
 from tcm.models.tag import Tag
-from tcm.pages.testcases import (
-    TestCasesListPage,
-    CreateTestCasePage,
-    EditTestCasePage,
-    ViewTestCasePage,
-)
-from tcm.pages.testcases.edit import NotFoundPage as EditNotFoundPage
-from tcm.pages.testcases.view import NotFoundPage as ViewNotFoundPage
+from tcm.pages.lazy import lazy_module, to_xml
+
+# Page modules, imported on first use
+partials = lazy_module("tcm.pages.components.partial")
+testcase_list = lazy_module("tcm.pages.testcases.list")
+testcase_create = lazy_module("tcm.pages.testcases.create")
+testcase_edit = lazy_module("tcm.pages.testcases.edit")
+testcase_view = lazy_module("tcm.pages.testcases.view")
 
 router = APIRouter(prefix="/testcases", tags=["testcase-pages"])
 
 
-async def get_all_tags(session: AsyncSession) -> list[dict]:
-    """Get all tags for tag selection."""
-    query = select(Tag).order_by(Tag.category, Tag.value)
+async def get_tag_categories(session: AsyncSession) -> list[str]:
+    """Get all unique tag categories for the tag browser."""
+    query = select(Tag.category).distinct().order_by(Tag.category)
     result = await session.execute(query)
-    tags = result.scalars().all()
-    return [
-        {
-            "id": tag.id,
-            "category": tag.category,
-            "value": tag.value,
-            "description": tag.description,
-            "is_predefined": tag.is_predefined,
-        }
-        for tag in tags
-    ]
+    return list(result.scalars().all())
+
+
+async def get_selected_tags(session: AsyncSession, tag_ids: list[int]) -> list[dict]:
+    """Get the tags with the given IDs (in the given order) for the tag picker."""
+    if not tag_ids:
+        return []
+    query = select(Tag.id, Tag.category, Tag.value, Tag.is_predefined).where(Tag.id.in_(tag_ids))
+    result = await session.execute(query)
+    tags = {row["id"]: dict(row) for row in result.mappings()}
+    return [tags[tag_id] for tag_id in tag_ids if tag_id in tags]
 
 
 @router.get("", response_class=HTMLResponse)
@@ -61,6 +65,9 @@ async def testcases_list_page(
     """
     Render the test cases list page.
 
+    Partial update requests (HX-Request header) get only the results
+    fragment, without the layout, the filter form or its tag options.
+
     Args:
         request: FastAPI request object
         page: Page number (1-indexed)
@@ -73,10 +80,8 @@ async def testcases_list_page(
         error: Error message from redirect
         session: Database session
     """
-    from fasthtml.common import to_xml
-
-    # Build query with eager loading
-    query = select(TestCase).options(selectinload(TestCase.tags))
+    # Build query with eager loading; the long text columns are not shown
+    query = select(TestCase).options(*TESTCASE_LIST_OPTIONS, *deferred_text())
 
     # Apply search filter
     if search:
@@ -147,9 +152,9 @@ async def testcases_list_page(
         {
             "id": tc.id,
             "title": tc.title,
-            "description": tc.description,
             "status": tc.status.value,
             "priority": tc.priority.value,
+            "updated_at": tc.updated_at.isoformat(),
             "tags": [
                 {
                     "id": tag.id,
@@ -163,23 +168,36 @@ async def testcases_list_page(
         for tc in testcases
     ]
 
-    # Get all tags for filter dropdown
-    available_tags = await get_all_tags(session)
+    listing = {
+        "page": page,
+        "page_size": page_size,
+        "search": search,
+        "status_filter": status,
+        "priority_filter": priority,
+        "tag_filter": str(tag_id) if tag_id else "",
+    }
 
-    return HTMLResponse(
-        content=to_xml(
-            TestCasesListPage(
-                testcases=testcases_data,
-                total=total,
-                page=page,
-                page_size=page_size,
-                search=search,
-                status_filter=status,
-                priority_filter=priority,
-                tag_filter=str(tag_id) if tag_id else "",
-                available_tags=available_tags,
-                success_message=success,
-                error_message=error,
+    if partials.is_partial_request(request):
+        return partials.vary_on_partial(
+            HTMLResponse(
+                content=to_xml(testcase_list.TestCasesResults(testcases_data, total, **listing))
+            )
+        )
+
+    # Only the filtered tag is rendered; the dropdown loads the rest from the tag catalog
+    selected_tags = await get_selected_tags(session, [tag_id] if tag_id else [])
+
+    return partials.vary_on_partial(
+        HTMLResponse(
+            content=to_xml(
+                testcase_list.TestCasesListPage(
+                    testcases=testcases_data,
+                    total=total,
+                    selected_tag=selected_tags[0] if selected_tags else None,
+                    success_message=success,
+                    error_message=error,
+                    **listing,
+                )
             )
         )
     )
@@ -197,13 +215,11 @@ async def create_testcase_page(
         request: FastAPI request object
         session: Database session
     """
-    from fasthtml.common import to_xml
-
-    available_tags = await get_all_tags(session)
+    tag_categories = await get_tag_categories(session)
 
     return HTMLResponse(
         content=to_xml(
-            CreateTestCasePage(available_tags=available_tags)
+            testcase_create.CreateTestCasePage(tag_categories=tag_categories)
         )
     )
 
@@ -236,15 +252,14 @@ async def create_testcase_submit(
         tag_ids: List of tag IDs to associate
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Validate required fields
     if not title or not steps or not expected_results:
-        available_tags = await get_all_tags(session)
+        selected_tag_ids = [int(tid) for tid in tag_ids if tid]
         return HTMLResponse(
             content=to_xml(
-                CreateTestCasePage(
-                    available_tags=available_tags,
+                testcase_create.CreateTestCasePage(
+                    tag_categories=await get_tag_categories(session),
+                    selected_tags=await get_selected_tags(session, selected_tag_ids),
                     error_message="Title, steps, and expected results are required.",
                     form_data={
                         "title": title,
@@ -254,7 +269,7 @@ async def create_testcase_submit(
                         "expected_results": expected_results,
                         "status": status,
                         "priority": priority,
-                        "tag_ids": [int(tid) for tid in tag_ids if tid],
+                        "tag_ids": selected_tag_ids,
                     },
                 )
             )
@@ -265,11 +280,12 @@ async def create_testcase_submit(
         status_enum = TestCaseStatus(status)
         priority_enum = TestCasePriority(priority)
     except ValueError as e:
-        available_tags = await get_all_tags(session)
+        selected_tag_ids = [int(tid) for tid in tag_ids if tid]
         return HTMLResponse(
             content=to_xml(
-                CreateTestCasePage(
-                    available_tags=available_tags,
+                testcase_create.CreateTestCasePage(
+                    tag_categories=await get_tag_categories(session),
+                    selected_tags=await get_selected_tags(session, selected_tag_ids),
                     error_message=f"Invalid status or priority: {e}",
                     form_data={
                         "title": title,
@@ -279,7 +295,7 @@ async def create_testcase_submit(
                         "expected_results": expected_results,
                         "status": status,
                         "priority": priority,
-                        "tag_ids": [int(tid) for tid in tag_ids if tid],
+                        "tag_ids": selected_tag_ids,
                     },
                 )
             )
@@ -325,14 +341,15 @@ async def view_testcase_page(
     """
     Render the view test case details page.
 
+    Supports conditional requests; unchanged pages are answered with 304
+    before rendering.
+
     Args:
         request: FastAPI request object
         testcase_id: Test case ID
         success: Success message from redirect
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the test case with relationships
     query = (
         select(TestCase)
@@ -347,10 +364,29 @@ async def view_testcase_page(
 
     if not testcase:
         return HTMLResponse(
-            content=to_xml(ViewNotFoundPage()),
+            content=to_xml(testcase_view.NotFoundPage()),
             status_code=404,
         )
 
+    # Page validators cover the test case and everything it displays
+    etag = make_etag(
+        "testcase-page",
+        __version__,
+        request.url.query,
+        testcase.id,
+        testcase.updated_at,
+        *sorted((tag.id, tag.updated_at) for tag in testcase.tags),
+        *sorted((project.id, project.updated_at) for project in testcase.projects),
+    )
+    last_modified = latest(
+        testcase.updated_at,
+        *(tag.updated_at for tag in testcase.tags),
+        *(project.updated_at for project in testcase.projects),
+    )
+    cached = not_modified(request, etag, last_modified)
+    if cached:
+        return cached
+
     # Convert to dict format
     testcase_data = {
         "id": testcase.id,
@@ -384,11 +420,13 @@ async def view_testcase_page(
         ],
     }
 
-    return HTMLResponse(
+    response = HTMLResponse(
         content=to_xml(
-            ViewTestCasePage(testcase=testcase_data, success_message=success)
+            testcase_view.ViewTestCasePage(testcase=testcase_data, success_message=success)
         )
     )
+    set_validators(response, etag, last_modified)
+    return response
 
 
 @router.get("/{testcase_id}/edit", response_class=HTMLResponse)
@@ -405,8 +443,6 @@ async def edit_testcase_page(
         testcase_id: Test case ID
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the test case with tags
     query = (
         select(TestCase)
@@ -418,11 +454,11 @@ async def edit_testcase_page(
 
     if not testcase:
         return HTMLResponse(
-            content=to_xml(EditNotFoundPage()),
+            content=to_xml(testcase_edit.NotFoundPage()),
             status_code=404,
         )
 
-    available_tags = await get_all_tags(session)
+    tag_categories = await get_tag_categories(session)
 
     # Convert to dict format
     testcase_data = {
@@ -447,9 +483,9 @@ async def edit_testcase_page(
 
     return HTMLResponse(
         content=to_xml(
-            EditTestCasePage(
+            testcase_edit.EditTestCasePage(
                 testcase=testcase_data,
-                available_tags=available_tags,
+                tag_categories=tag_categories,
             )
         )
     )
@@ -485,8 +521,6 @@ async def edit_testcase_submit(
         tag_ids: List of tag IDs to associate
         session: Database session
     """
-    from fasthtml.common import to_xml
-
     # Get the test case
     query = (
         select(TestCase)
@@ -498,13 +532,13 @@ async def edit_testcase_submit(
 
     if not testcase:
         return HTMLResponse(
-            content=to_xml(EditNotFoundPage()),
+            content=to_xml(testcase_edit.NotFoundPage()),
             status_code=404,
         )
 
     # Validate required fields
     if not title or not steps or not expected_results:
-        available_tags = await get_all_tags(session)
+        selected_tag_ids = [int(tid) for tid in tag_ids if tid]
         testcase_data = {
             "id": testcase.id,
             "title": title,
@@ -514,13 +548,13 @@ async def edit_testcase_submit(
             "expected_results": expected_results,
             "status": status,
             "priority": priority,
-            "tags": [{"id": int(tid)} for tid in tag_ids if tid],
+            "tags": await get_selected_tags(session, selected_tag_ids),
         }
         return HTMLResponse(
             content=to_xml(
-                EditTestCasePage(
+                testcase_edit.EditTestCasePage(
                     testcase=testcase_data,
-                    available_tags=available_tags,
+                    tag_categories=await get_tag_categories(session),
                     error_message="Title, steps, and expected results are required.",
                 )
             )
@@ -531,7 +565,7 @@ async def edit_testcase_submit(
         status_enum = TestCaseStatus(status)
         priority_enum = TestCasePriority(priority)
     except ValueError as e:
-        available_tags = await get_all_tags(session)
+        selected_tag_ids = [int(tid) for tid in tag_ids if tid]
         testcase_data = {
             "id": testcase.id,
             "title": title,
@@ -541,13 +575,13 @@ async def edit_testcase_submit(
             "expected_results": expected_results,
             "status": status,
             "priority": priority,
-            "tags": [{"id": int(tid)} for tid in tag_ids if tid],
+            "tags": await get_selected_tags(session, selected_tag_ids),
         }
         return HTMLResponse(
             content=to_xml(
-                EditTestCasePage(
+                testcase_edit.EditTestCasePage(
                     testcase=testcase_data,
-                    available_tags=available_tags,
+                    tag_categories=await get_tag_categories(session),
                     error_message=f"Invalid status or priority: {e}",
                 )
             )
@@ -563,6 +597,7 @@ async def edit_testcase_submit(
     testcase.priority = priority_enum
 
     # Update tags
+    previous_tag_ids = {tag.id for tag in testcase.tags}
     if tag_ids:
         tag_id_ints = [int(tid) for tid in tag_ids if tid]
         if tag_id_ints:
@@ -575,6 +610,10 @@ async def edit_testcase_submit(
     else:
         testcase.tags = []
 
+    # Association changes don't touch the row, so bump the timestamp explicitly
+    if {tag.id for tag in testcase.tags} != previous_tag_ids:
+        testcase.updated_at = func.now()
+
     await session.commit()
 
     return RedirectResponse(
@@ -4,12 +4,16 @@ API routes for TestCase management.
 Provides CRUD operations for test cases with tag associations.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from tcm.database import get_async_session
+from tcm.expand import ExpansionLoader, parse_expand
+from tcm.fast_json import TESTCASE_RESPONSE_COLUMNS, json_response, load_testcase_rows
+from tcm.fieldsets import TESTCASE_FIELDS, TESTCASE_FIELDSETS, parse_fields, selected_columns
+from tcm.http_cache import make_etag, latest, set_validators, not_modified, check_if_match
 from tcm.models.testcase import TestCase, TestCaseStatus, TestCasePriority
 from tcm.models.tag import Tag
 from tcm.schemas.testcase import (
@@ -17,33 +21,150 @@ from tcm.schemas.testcase import (
     TestCaseUpdate,
     TestCaseResponse,
     TestCaseListResponse,
+    TestCaseSummaryListResponse,
+    TestCaseBatchGetRequest,
+    TestCaseBatchResponse,
 )
 
 router = APIRouter(prefix="/testcases", tags=["testcases"])
 
+# Maximum number of test cases fetched by ID in one request
+MAX_BATCH_IDS = 1000
 
-@router.get("", response_model=TestCaseListResponse)
+
+def testcase_validators(testcase: TestCase):
+    """
+    Build the ETag and Last-Modified validators for a single test case.
+
+    The embedded tags are part of the representation, so their ids and
+    timestamps contribute to the validators as well.
+
+    Args:
+        testcase: Test case with tags loaded
+
+    Returns:
+        Tuple of (etag, last_modified)
+    """
+    tag_parts = sorted((tag.id, tag.updated_at) for tag in testcase.tags)
+    etag = make_etag("testcase", testcase.id, testcase.updated_at, *tag_parts)
+    last_modified = latest(testcase.updated_at, *(tag.updated_at for tag in testcase.tags))
+    return etag, last_modified
+
+
+def parse_ids(ids: str) -> list[int]:
+    """
+    Parse a comma-separated list of test case IDs.
+
+    Args:
+        ids: Comma-separated IDs
+
+    Returns:
+        Distinct IDs in the order given
+
+    Raises:
+        HTTPException: If an ID is not an integer or there are too many
+    """
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not parsed:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be fetched at once"
+        )
+    return list(dict.fromkeys(parsed))
+
+
+async def batch_get_testcases(
+    session: AsyncSession, ids: list[int], fields: str | None, expand: str | None
+) -> Response:
+    """
+    Fetch test cases by ID with one query for the rows and one for their tags.
+
+    Args:
+        session: Database session
+        ids: Distinct test case IDs, in the order to return them
+        fields: Optional sparse fieldset
+        expand: Optional related records to embed
+
+    Returns:
+        JSON response with the found test cases and the missing IDs, both in
+        request order
+    """
+    selected = parse_fields(fields, TESTCASE_FIELDS, TESTCASE_FIELDSETS)
+    expansions = parse_expand(expand, "testcase")
+    query = select(*selected_columns(TESTCASE_RESPONSE_COLUMNS, selected)).where(
+        TestCase.id.in_(ids)
+    )
+    rows = await load_testcase_rows(session, query, tags="tags" in selected)
+    await ExpansionLoader(session).expand("testcase", rows, expansions)
+    by_id = {row["id"]: row for row in rows}
+
+    return json_response(
+        {
+            "testcases": [by_id[testcase_id] for testcase_id in ids if testcase_id in by_id],
+            "missing": [testcase_id for testcase_id in ids if testcase_id not in by_id],
+        }
+    )
+
+
+@router.get(
+    "",
+    response_model=TestCaseListResponse | TestCaseSummaryListResponse | TestCaseBatchResponse,
+)
 async def list_testcases(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     status: TestCaseStatus | None = Query(None, description="Filter by status"),
     priority: TestCasePriority | None = Query(None, description="Filter by priority"),
     tag_id: int | None = Query(None, description="Filter by tag ID"),
+    ids: str | None = Query(
+        None, description="Comma-separated test case IDs to fetch (up to 1,000)"
+    ),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return, or 'summary' (default: all)"
+    ),
+    expand: str | None = Query(
+        None, description="Related records to embed: projects, projects.testcases"
+    ),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     List all test cases with pagination and optional filtering.
 
+    Rows are selected as plain columns and encoded without per-row model
+    validation (see ``tcm.fast_json``). With ``fields``, only the requested
+    columns are selected (see ``tcm.fieldsets``) and the tags are loaded
+    only if requested. ``expand`` embeds related records (see
+    ``tcm.expand``).
+
+    With ``ids``, the given test cases are returned in that order together
+    with the IDs that do not exist (``TestCaseBatchResponse``); pagination
+    does not apply and the filters cannot be combined with it.
+
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
         status: Optional status filter
         priority: Optional priority filter
         tag_id: Optional tag ID filter
+        ids: Optional comma-separated IDs to fetch
+        fields: Optional sparse fieldset
+        expand: Optional related records to embed
         session: Database session
     """
-    # Build query with eager loading
-    query = select(TestCase).options(selectinload(TestCase.tags))
+    if ids is not None:
+        if status or priority or tag_id:
+            raise HTTPException(status_code=400, detail="ids cannot be combined with filters")
+        return await batch_get_testcases(session, parse_ids(ids), fields, expand)
+
+    selected = parse_fields(fields, TESTCASE_FIELDS, TESTCASE_FIELDSETS)
+    expansions = parse_expand(expand, "testcase")
+
+    # Select the requested response columns; tags are loaded per page
+    query = select(*selected_columns(TESTCASE_RESPONSE_COLUMNS, selected))
 
     # Apply filters
     if status:
@@ -67,29 +188,56 @@ async def list_testcases(
 
     # Get paginated results
     query = query.offset(skip).limit(limit).order_by(TestCase.id.desc())
-    result = await session.execute(query)
-    testcases = result.scalars().unique().all()
+    testcases = await load_testcase_rows(session, query, tags="tags" in selected)
+    await ExpansionLoader(session).expand("testcase", testcases, expansions)
+
+    return json_response({"testcases": testcases, "total": total, "skip": skip, "limit": limit})
 
-    return TestCaseListResponse(
-        testcases=[TestCaseResponse.model_validate(tc) for tc in testcases],
-        total=total,
-        skip=skip,
-        limit=limit,
+
+@router.post(":batchGet", response_model=TestCaseBatchResponse)
+async def batch_get(
+    batch: TestCaseBatchGetRequest,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Fetch up to 1,000 test cases by ID.
+
+    Same as ``GET /api/testcases?ids=...``, for ID lists too long for a URL.
+
+    Args:
+        batch: IDs to fetch, optional sparse fieldset and expansions
+        session: Database session
+    """
+    return await batch_get_testcases(
+        session, list(dict.fromkeys(batch.ids)), batch.fields, batch.expand
     )
 
 
 @router.get("/{testcase_id}", response_model=TestCaseResponse)
 async def get_testcase(
     testcase_id: int,
+    request: Request,
+    response: Response,
+    expand: str | None = Query(
+        None, description="Related records to embed: projects, projects.testcases"
+    ),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Get a specific test case by ID.
 
+    Supports conditional requests via If-None-Match / If-Modified-Since.
+    Expanded responses (see ``tcm.expand``) carry no validators, since the
+    embedded records are not covered by them.
+
     Args:
         testcase_id: Test case ID
+        request: FastAPI request object
+        response: FastAPI response object
+        expand: Optional related records to embed
         session: Database session
     """
+    expansions = parse_expand(expand, "testcase")
     query = (
         select(TestCase)
         .options(selectinload(TestCase.tags))
@@ -103,6 +251,17 @@ async def get_testcase(
             status_code=404, detail=f"Test case with id {testcase_id} not found"
         )
 
+    if expansions:
+        content = TestCaseResponse.model_validate(testcase).model_dump()
+        await ExpansionLoader(session).expand("testcase", [content], expansions)
+        return json_response(content)
+
+    etag, last_modified = testcase_validators(testcase)
+    cached = not_modified(request, etag, last_modified)
+    if cached:
+        return cached
+    set_validators(response, etag, last_modified)
+
     return TestCaseResponse.model_validate(testcase)
 
 
@@ -161,14 +320,20 @@ async def create_testcase(
 async def update_testcase(
     testcase_id: int,
     testcase_data: TestCaseUpdate,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Update an existing test case.
 
+    Honors If-Match for lost-update protection (412 on mismatch).
+
     Args:
         testcase_id: Test case ID
         testcase_data: Test case data to update
+        request: FastAPI request object
+        response: FastAPI response object
         session: Database session
     """
     # Get existing test case
@@ -185,6 +350,8 @@ async def update_testcase(
             status_code=404, detail=f"Test case with id {testcase_id} not found"
         )
 
+    check_if_match(request, testcase_validators(testcase)[0])
+
     # Extract and handle tag_ids separately
     update_data = testcase_data.model_dump(exclude_unset=True)
     tag_ids = update_data.pop("tag_ids", None)
@@ -208,10 +375,15 @@ async def update_testcase(
             )
 
         testcase.tags = list(tags)
+        # Association changes don't touch the row, so bump the timestamp explicitly
+        testcase.updated_at = func.now()
 
     await session.commit()
     await session.refresh(testcase)
 
+    etag, last_modified = testcase_validators(testcase)
+    set_validators(response, etag, last_modified)
+
     return TestCaseResponse.model_validate(testcase)
 
 
@@ -286,6 +458,7 @@ async def add_tag_to_testcase(
 
     # Add tag
     testcase.tags.append(tag)
+    testcase.updated_at = func.now()
     await session.commit()
     await session.refresh(testcase)
 
@@ -334,6 +507,7 @@ async def remove_tag_from_testcase(
         )
 
     testcase.tags.remove(tag_to_remove)
+    testcase.updated_at = func.now()
     await session.commit()
     await session.refresh(testcase)
 
@@ -0,0 +1,48 @@
+"""
+Pydantic schemas for the batch API endpoint.
+"""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+# Most operations accepted in one batch
+MAX_BATCH_OPERATIONS = 100
+
+
+class BatchOperation(BaseModel):
+    """Schema for a single write operation in a batch."""
+
+    method: Literal["POST", "PATCH", "DELETE"] = Field(..., description="HTTP method")
+    path: str = Field(
+        ...,
+        description="Path relative to /api, e.g. /testcases or /projects/$release.id/testcases/3",
+    )
+    body: dict[str, Any] | None = Field(None, description="Request body of the operation")
+    ref: str | None = Field(
+        None,
+        pattern=r"^[A-Za-z_]\w*$",
+        description="Name under which later operations can reference the result",
+    )
+    if_match: str | None = Field(None, description="If-Match precondition of the operation")
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of operations."""
+
+    operations: list[BatchOperation] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_OPERATIONS, description="Operations, in order"
+    )
+
+
+class BatchResult(BaseModel):
+    """Schema for the result of one operation."""
+
+    status: int = Field(..., description="Status code of the operation")
+    body: Any = Field(None, description="Response body of the operation (None for 204)")
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch responses."""
+
+    results: list[BatchResult] = Field(..., description="Results, in operation order")
@@ -0,0 +1,31 @@
+"""
+Pydantic schemas for the change feed API endpoint.
+"""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ChangeResponse(BaseModel):
+    """Schema for a single change."""
+
+    cursor: int = Field(..., description="Position of the change in the feed")
+    entity_type: Literal["testcase", "project", "tag", "testcase_tag", "project_testcase"]
+    entity_id: int = Field(
+        ..., description="Changed entity; for memberships the test case or project"
+    )
+    related_id: int | None = Field(
+        None, description="For memberships, the tag (testcase_tag) or test case (project_testcase)"
+    )
+    action: Literal["created", "updated", "deleted", "added", "removed"]
+    changed_at: datetime
+
+
+class ChangeFeedResponse(BaseModel):
+    """Schema for a page of the change feed."""
+
+    changes: list[ChangeResponse]
+    next_cursor: int = Field(..., description="Cursor to pass as since on the next request")
+    has_more: bool = Field(..., description="Whether more changes are available right away")
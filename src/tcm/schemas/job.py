@@ -0,0 +1,83 @@
+"""
+Pydantic schemas for the background job API endpoints.
+
+Each job kind also has a schema for its parameters, validated when the job
+is submitted and again when it runs.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from tcm.models.jobs import JobStatus
+from tcm.models.testcase import TestCaseStatus
+from tcm.schemas.testcase import TestCaseCreate
+
+# Most test cases accepted by one import job
+MAX_IMPORT_TESTCASES = 10000
+
+
+class JobCreate(BaseModel):
+    """Schema for submitting a job."""
+
+    kind: str = Field(..., description="Job kind, e.g. search.reindex")
+    params: dict[str, Any] = Field(default_factory=dict, description="Parameters of the job kind")
+    max_attempts: int | None = Field(
+        None, ge=1, le=10, description="Runs before the job fails (default: JOBS_MAX_ATTEMPTS)"
+    )
+
+
+class JobResponse(BaseModel):
+    """Schema for job responses."""
+
+    id: int
+    kind: str
+    status: JobStatus
+    progress: int = Field(..., description="Units of work done")
+    total: int | None = Field(None, description="Units of work in all, once known")
+    result: dict[str, Any] | None = Field(None, description="Result of a succeeded job")
+    error: str | None = Field(None, description="Error of the last failed attempt")
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class JobListResponse(BaseModel):
+    """Schema for paginated job list responses."""
+
+    jobs: list[JobResponse]
+    total: int
+    skip: int
+    limit: int
+
+
+class ReindexParams(BaseModel):
+    """Parameters of search.reindex: rebuild the search index."""
+
+    batch_size: int = Field(500, ge=1, le=10000, description="Source rows per transaction")
+
+
+class CloneProjectParams(BaseModel):
+    """Parameters of project.clone: copy a project with its test case memberships."""
+
+    project_id: int = Field(..., description="Project to copy")
+    name: str = Field(..., min_length=1, max_length=200, description="Name of the copy")
+
+
+class ExportTestCasesParams(BaseModel):
+    """Parameters of testcases.export: write test cases to a CSV file."""
+
+    status: TestCaseStatus | None = Field(None, description="Only test cases with this status")
+    project_id: int | None = Field(None, description="Only test cases of this project")
+
+
+class ImportTestCasesParams(BaseModel):
+    """Parameters of testcases.import: create test cases in batches."""
+
+    testcases: list[TestCaseCreate] = Field(
+        ..., min_length=1, max_length=MAX_IMPORT_TESTCASES, description="Test cases to create"
+    )
@@ -8,6 +8,7 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field
 
 from tcm.models.project import ProjectStatus
+from tcm.models.testcase import TestCaseStatus, TestCasePriority
 
 
 class ProjectBase(BaseModel):
@@ -46,6 +47,7 @@ class ProjectResponse(ProjectBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    testcase_count: int = Field(0, description="Number of test cases in the project")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -57,3 +59,42 @@ class ProjectListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class ProjectSummary(BaseModel):
+    """Schema for projects in a list requested with fields=summary."""
+
+    id: int
+    name: str
+    status: ProjectStatus
+    start_date: datetime | None
+    end_date: datetime | None
+    updated_at: datetime
+    testcase_count: int = Field(0, description="Number of test cases in the project")
+
+
+class ProjectSummaryListResponse(BaseModel):
+    """Schema for paginated project list responses with fields=summary."""
+
+    projects: list[ProjectSummary]
+    total: int
+    skip: int
+    limit: int
+
+
+class AvailableTestCase(BaseModel):
+    """Schema for a test case that can be added to a project."""
+
+    id: int
+    title: str
+    status: TestCaseStatus
+    priority: TestCasePriority
+
+
+class AvailableTestCaseListResponse(BaseModel):
+    """Schema for paginated lists of test cases not yet in a project."""
+
+    testcases: list[AvailableTestCase]
+    total: int
+    skip: int
+    limit: int
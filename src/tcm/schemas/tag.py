@@ -38,6 +38,9 @@ class TagResponse(TagBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    usage_count: int | None = Field(
+        None, description="Number of test cases using the tag (not set on nested tags)"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -49,3 +52,52 @@ class TagListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class TagSummary(BaseModel):
+    """Schema for tags in a list requested with fields=summary."""
+
+    id: int
+    category: str
+    value: str
+    is_predefined: bool
+    usage_count: int = Field(0, description="Number of test cases using the tag")
+
+
+class TagSummaryListResponse(BaseModel):
+    """Schema for paginated tag list responses with fields=summary."""
+
+    tags: list[TagSummary]
+    total: int
+    skip: int
+    limit: int
+
+
+class TagSuggestion(BaseModel):
+    """Schema for tag typeahead suggestions."""
+
+    id: int
+    category: str
+    value: str
+    is_predefined: bool
+    usage_count: int = Field(0, description="Number of test cases using the tag")
+
+
+class TagCatalogEntry(BaseModel):
+    """Schema for a tag in the compact tag catalog."""
+
+    id: int
+    category: str
+    value: str
+    is_predefined: bool
+
+
+class TagCatalogResponse(BaseModel):
+    """Schema for full or incremental tag catalog responses."""
+
+    version: int = Field(..., description="Catalog version to pass as since_version next time")
+    full: bool = Field(..., description="Whether tags is the complete catalog or only changes")
+    tags: list[TagCatalogEntry]
+    deleted: list[int] = Field(
+        default_factory=list, description="IDs of tags deleted since since_version"
+    )
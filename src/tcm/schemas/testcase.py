@@ -65,3 +65,44 @@ class TestCaseListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class TestCaseSummary(BaseModel):
+    """Schema for test cases in a list requested with fields=summary."""
+
+    id: int
+    title: str
+    status: TestCaseStatus
+    priority: TestCasePriority
+    updated_at: datetime
+    tags: list[TagResponse] = []
+
+
+class TestCaseSummaryListResponse(BaseModel):
+    """Schema for paginated test case list responses with fields=summary."""
+
+    testcases: list[TestCaseSummary]
+    total: int
+    skip: int
+    limit: int
+
+
+class TestCaseBatchGetRequest(BaseModel):
+    """Schema for fetching many test cases by ID."""
+
+    ids: list[int] = Field(
+        ..., min_length=1, max_length=1000, description="Test case IDs to fetch (up to 1,000)"
+    )
+    fields: str | None = Field(
+        None, description="Comma-separated fields to return, or 'summary' (default: all)"
+    )
+    expand: str | None = Field(
+        None, description="Related records to embed: projects, projects.testcases"
+    )
+
+
+class TestCaseBatchResponse(BaseModel):
+    """Schema for test cases fetched by ID."""
+
+    testcases: list[TestCaseResponse] = Field(..., description="Found test cases, in request order")
+    missing: list[int] = Field(..., description="Requested IDs with no test case, in request order")
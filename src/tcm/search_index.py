@@ -0,0 +1,237 @@
+"""
+Ranked cross-entity search over the ``search_documents`` table.
+
+One query matches, ranks and paginates test cases, projects and tags
+together; a second counts the matches per entity type for the facets.
+Documents are kept current by the flush listener in ``tcm.models.search``.
+
+Rebuild the whole index (after bulk loads that bypass the ORM, or to
+repair it) with:
+    uv run python -m tcm.search_index [--batch-size 500]
+
+The rebuild works through each source table in ID order, one short
+transaction per batch, so writers are never blocked for longer than a
+batch takes.
+"""
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import ColumnElement
+
+from tcm.models.project import ProjectStatus
+from tcm.models.search import DOCUMENT_SOURCES, reindex_documents, search_documents
+from tcm.models.testcase import TestCaseStatus
+
+logger = logging.getLogger("tcm.search")
+
+# Statuses the status filter accepts; other values are ignored
+SEARCH_STATUSES = {status.value for status in (*TestCaseStatus, *ProjectStatus)}
+
+REBUILD_BATCH_SIZE = 500
+
+
+def _like_pattern(text: str, prefix_only: bool = False) -> str:
+    """Build a LIKE pattern matching text literally (``\\`` escapes)."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix_only else f"%{escaped}%"
+
+
+def search_rank(q: str) -> ColumnElement:
+    """
+    Relevance of a document to the query.
+
+    Title matches outweigh content matches: an exact title scores 8, a title
+    prefix 4, a title substring 2, and a content match adds 1.
+    """
+    title = search_documents.c.title
+    return case(
+        (func.lower(title) == q.lower(), 8),
+        (title.ilike(_like_pattern(q, prefix_only=True), escape="\\"), 4),
+        (title.ilike(_like_pattern(q), escape="\\"), 2),
+        else_=0,
+    ) + case((search_documents.c.content.ilike(_like_pattern(q), escape="\\"), 1), else_=0)
+
+
+def search_filters(q: str, status: str = "", category: str = "") -> list[ColumnElement]:
+    """
+    WHERE clauses shared by the result and facet queries.
+
+    The status filter applies to entities that have a status (test cases and
+    projects) and the category filter to entities that have a category
+    (tags); other entities are not excluded by them.
+
+    Args:
+        q: Search text, matched case-insensitively against title and content
+        status: Status value to filter on (ignored if unknown)
+        category: Tag category to filter on
+
+    Returns:
+        List of WHERE clauses
+    """
+    pattern = _like_pattern(q)
+    filters = [
+        or_(
+            search_documents.c.title.ilike(pattern, escape="\\"),
+            search_documents.c.content.ilike(pattern, escape="\\"),
+        )
+    ]
+    if status in SEARCH_STATUSES:
+        filters.append(
+            or_(search_documents.c.status == status, search_documents.c.status.is_(None))
+        )
+    if category:
+        filters.append(
+            or_(search_documents.c.category == category, search_documents.c.category.is_(None))
+        )
+    return filters
+
+
+async def search_documents_page(
+    session: AsyncSession,
+    q: str,
+    entity_type: str = "",
+    status: str = "",
+    category: str = "",
+    skip: int = 0,
+    limit: int = 20,
+) -> tuple[list[dict], dict[str, int]]:
+    """
+    Return one page of ranked search results and the per-type facet counts.
+
+    Args:
+        session: Database session
+        q: Search text
+        entity_type: Restrict results to one entity type ("" for all)
+        status: Status filter
+        category: Tag category filter
+        skip: Number of results to skip
+        limit: Maximum number of results
+
+    Returns:
+        (documents as dicts with a ``rank``, best first; match counts by
+        entity type, ignoring the entity type restriction)
+    """
+    filters = search_filters(q, status, category)
+
+    facet_result = await session.execute(
+        select(search_documents.c.entity_type, func.count())
+        .where(*filters)
+        .group_by(search_documents.c.entity_type)
+    )
+    facets = {etype: 0 for etype in DOCUMENT_SOURCES}
+    facets.update(dict(facet_result.all()))
+
+    if entity_type:
+        filters.append(search_documents.c.entity_type == entity_type)
+    rank = search_rank(q).label("rank")
+    result = await session.execute(
+        select(
+            search_documents.c.entity_type,
+            search_documents.c.entity_id,
+            search_documents.c.title,
+            search_documents.c.status,
+            rank,
+        )
+        .where(*filters)
+        .order_by(
+            rank.desc(),
+            search_documents.c.updated_at.desc(),
+            search_documents.c.entity_type,
+            search_documents.c.entity_id,
+        )
+        .offset(skip)
+        .limit(limit)
+    )
+    return [dict(row) for row in result.mappings()], facets
+
+
+async def rebuild_entity_documents(
+    session_factory: async_sessionmaker[AsyncSession],
+    entity_type: str,
+    batch_size: int = REBUILD_BATCH_SIZE,
+    after: int = 0,
+    on_batch: Callable[[AsyncSession, int, int], Awaitable[None]] | None = None,
+) -> int:
+    """
+    Reindex all documents of one entity type, one transaction per batch.
+
+    Each batch covers the next ``batch_size`` source IDs and also drops
+    documents in that ID range whose source row is gone; a final statement
+    drops documents past the last source ID.
+
+    Args:
+        session_factory: Factory for the per-batch sessions
+        entity_type: "testcase", "project" or "tag"
+        batch_size: Source rows per batch
+        after: Source ID to continue after (to resume an interrupted rebuild)
+        on_batch: Awaited in each batch's transaction, before it commits, with
+            the session, the last source ID of the batch and the number of
+            rows it indexed
+
+    Returns:
+        Number of source rows indexed
+    """
+    model, _ = DOCUMENT_SOURCES[entity_type]
+    low, indexed = after, 0
+    while True:
+        async with session_factory() as session:
+            ids = (
+                await session.execute(
+                    select(model.id).where(model.id > low).order_by(model.id).limit(batch_size)
+                )
+            ).scalars().all()
+            # After the last batch, also drop documents past the last source ID
+            high = ids[-1] if ids else None
+            connection = await session.connection()
+            await connection.run_sync(
+                lambda sync_connection: reindex_documents(
+                    sync_connection, entity_type, id_range=(low + 1, high)
+                )
+            )
+            if on_batch is not None and ids:
+                await on_batch(session, high, len(ids))
+            await session.commit()
+        if high is None:
+            return indexed
+        indexed += len(ids)
+        low = high
+        logger.info("Indexed %s %s documents", indexed, entity_type)
+
+
+async def rebuild_search_index(
+    session_factory: async_sessionmaker[AsyncSession],
+    batch_size: int = REBUILD_BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Reindex every searchable entity in batches.
+
+    Args:
+        session_factory: Factory for the per-batch sessions
+        batch_size: Source rows per batch
+
+    Returns:
+        Number of documents indexed by entity type
+    """
+    return {
+        entity_type: await rebuild_entity_documents(session_factory, entity_type, batch_size)
+        for entity_type in DOCUMENT_SOURCES
+    }
+
+
+if __name__ == "__main__":
+    from tcm.database import async_session_maker
+
+    parser = argparse.ArgumentParser(description="Rebuild the search index.")
+    parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for entity_type, count in asyncio.run(
+        rebuild_search_index(async_session_maker, args.batch_size)
+    ).items():
+        print(f"{entity_type}: {count} documents")
@@ -0,0 +1,259 @@
+"""
+Production server: a supervisor running several uvicorn worker processes.
+
+``tcm serve`` binds the listening socket once and starts the configured
+number of workers on it, each a uvicorn server in its own process with the
+SERVER_* settings. The supervisor then:
+
+- replaces workers that exit, which is how ``SERVER_MAX_REQUESTS``
+  recycling works: a worker stops after that many requests (plus a random
+  share of ``SERVER_MAX_REQUESTS_JITTER``, so workers do not all recycle at
+  once) and a fresh one takes its place
+- restarts all workers one by one on SIGHUP (e.g. to pick up a new
+  release), stopping each worker only once its replacement is serving
+- stops all workers on SIGINT or SIGTERM
+
+Stopped workers finish their in-flight requests, for up to
+``SERVER_GRACEFUL_TIMEOUT`` seconds.
+
+The worker count is exported as ``SERVER_WORKERS`` to the workers, which
+size their database pools so that all of them together stay within
+``DATABASE_MAX_CONNECTIONS`` (see ``tcm.config.pool_limits``). With
+``BUILD_ASSETS_ON_STARTUP`` the supervisor builds the static assets once
+before starting the workers, which then skip the build.
+"""
+
+import copy
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import time
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
+from socket import socket
+
+import uvicorn
+
+from tcm.assets import STATIC_DIR, build_assets
+from tcm.config import Settings, pool_limits, settings, worker_count
+
+logger = logging.getLogger("tcm.server")
+
+# Application import string (workers import the app themselves)
+APP = "tcm.main:app"
+
+# Seconds between checks for exited workers and signals
+SUPERVISE_INTERVAL = 0.5
+
+# Seconds to wait before replacing a worker that failed to start
+RESTART_DELAY = 1.0
+
+# Seconds a restarted worker may take to start serving
+WORKER_START_TIMEOUT = 60.0
+
+# Extra seconds a stopping worker gets past the graceful timeout before it is killed
+KILL_GRACE = 5.0
+
+# Workers are started fresh rather than forked from the supervisor
+_context = multiprocessing.get_context("spawn")
+
+
+def uvicorn_config(host: str, port: int, config: Settings = settings) -> uvicorn.Config:
+    """
+    Build the uvicorn configuration shared by the workers.
+
+    Args:
+        host: Address to bind
+        port: Port to bind
+        config: Settings with the SERVER_* options
+    """
+    return uvicorn.Config(
+        APP,
+        host=host,
+        port=port,
+        loop=config.server_loop,
+        http=config.server_http,
+        backlog=config.server_backlog,
+        timeout_keep_alive=config.server_keep_alive,
+        limit_concurrency=config.server_limit_concurrency,
+        timeout_graceful_shutdown=config.server_graceful_timeout,
+    )
+
+
+def run_worker(config: uvicorn.Config, sockets: list[socket], ready) -> None:
+    """
+    Serve requests on the shared sockets until stopped (worker process entry point).
+
+    Args:
+        config: uvicorn configuration
+        sockets: Listening sockets bound by the supervisor
+        ready: Event set once the server has started
+    """
+
+    async def notify_ready() -> None:
+        ready.set()
+
+    # uvicorn calls this on its first tick after startup (then every timeout_notify)
+    config.callback_notify = notify_ready
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+@dataclass
+class Worker:
+    """A worker process and the event it sets once it serves requests."""
+
+    process: BaseProcess
+    ready: Event
+
+    @property
+    def pid(self) -> int | None:
+        """Process ID of the worker."""
+        return self.process.pid
+
+
+class Supervisor:
+    """Runs and replaces the worker processes."""
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: int | None = None,
+        max_requests_jitter: int = 0,
+    ):
+        """
+        Initialize the supervisor.
+
+        Args:
+            config: uvicorn configuration of the workers
+            workers: Number of worker processes
+            max_requests: Requests after which a worker is recycled (None: never)
+            max_requests_jitter: Largest random number of extra requests per worker
+        """
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.processes: list[Worker] = []
+        self.sockets: list[socket] = []
+        self._signals: list[int] = []
+
+    def spawn(self) -> Worker:
+        """Start a worker process, with its own max-requests limit."""
+        config = copy.copy(self.config)
+        if self.max_requests:
+            config.limit_max_requests = self.max_requests + random.randint(
+                0, self.max_requests_jitter
+            )
+        ready = _context.Event()
+        process = _context.Process(target=run_worker, args=(config, self.sockets, ready))
+        process.start()
+        logger.info("Started worker %s", process.pid)
+        return Worker(process, ready)
+
+    def stop(self, worker: Worker) -> None:
+        """Stop a worker gracefully."""
+        if worker.process.is_alive():
+            worker.process.terminate()
+        self.join(worker)
+
+    def join(self, worker: Worker) -> None:
+        """Wait for a stopping worker, killing it if it does not finish in time."""
+        worker.process.join((self.config.timeout_graceful_shutdown or 0) + KILL_GRACE)
+        if worker.process.is_alive():
+            logger.warning("Worker %s did not stop in time, killing it", worker.pid)
+            worker.process.kill()
+            worker.process.join()
+
+    def restart_all(self) -> None:
+        """
+        Replace every worker, one at a time.
+
+        Each replacement must be serving before the worker it replaces is
+        stopped; if one fails to start, the restart is abandoned and the
+        remaining workers keep running.
+        """
+        for index, old in enumerate(self.processes):
+            new = self.spawn()
+            if not new.ready.wait(WORKER_START_TIMEOUT):
+                logger.error("Worker %s did not start, abandoning the restart", new.pid)
+                new.process.kill()
+                new.process.join()
+                return
+            self.processes[index] = new
+            self.stop(old)
+
+    def replace_exited(self) -> None:
+        """Start a new worker for each worker that exited."""
+        for index, worker in enumerate(self.processes):
+            if worker.process.exitcode is None:
+                continue
+            if worker.ready.is_set():
+                logger.info("Worker %s exited with code %s", worker.pid, worker.process.exitcode)
+            else:
+                # Do not spin when workers crash on startup (bad settings, import errors)
+                logger.error("Worker %s failed to start, retrying", worker.pid)
+                time.sleep(RESTART_DELAY)
+            self.processes[index] = self.spawn()
+
+    def run(self) -> None:
+        """Bind the socket, start the workers and supervise them until stopped."""
+        self.sockets = [self.config.bind_socket()]
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, lambda sig, frame: self._signals.append(sig))
+
+        logger.info("Starting %s workers", self.workers)
+        self.processes = [self.spawn() for _ in range(self.workers)]
+        try:
+            while True:
+                while self._signals:
+                    sig = self._signals.pop(0)
+                    if sig != signal.SIGHUP:
+                        return
+                    logger.info("Restarting workers")
+                    self.restart_all()
+                self.replace_exited()
+                time.sleep(SUPERVISE_INTERVAL)
+        finally:
+            logger.info("Stopping workers")
+            for worker in self.processes:
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            for worker in self.processes:
+                self.join(worker)
+            for sock in self.sockets:
+                sock.close()
+
+
+def serve(host: str | None = None, port: int | None = None, workers: int | None = None) -> None:
+    """
+    Run the production server.
+
+    Args:
+        host: Address to bind (defaults to the HOST setting)
+        port: Port to bind (defaults to the PORT setting)
+        workers: Number of worker processes (defaults to SERVER_WORKERS)
+    """
+    if workers is not None:
+        settings.server_workers = workers
+    workers = worker_count()
+    # Workers read their settings again from the environment
+    os.environ["SERVER_WORKERS"] = str(workers)
+    if settings.build_assets_on_startup and STATIC_DIR.exists():
+        build_assets(STATIC_DIR)
+        os.environ["BUILD_ASSETS_ON_STARTUP"] = "false"
+
+    config = uvicorn_config(host or settings.host, port or settings.port)
+    pool_size, max_overflow = pool_limits()
+    logger.info(
+        "Database pool per worker: %s connections (+%s overflow)", pool_size, max_overflow
+    )
+    Supervisor(
+        config,
+        workers,
+        max_requests=settings.server_max_requests,
+        max_requests_jitter=settings.server_max_requests_jitter,
+    ).run()
@@ -0,0 +1,109 @@
+/**
+ * Live updates
+ *
+ * Pages with a #live-updates element subscribe to the topics in its
+ * data-live-topics attribute on the /api/events Server-Sent Events stream
+ * and apply the events in place, so open pages stay current without
+ * reloading (and re-running their queries):
+ *
+ * - stats: adds the deltas to the dashboard statistics widgets
+ * - activity: puts new activity items at the top of the dashboard feed
+ * - membership: adjusts a project's test case count; the member list itself
+ *   is not re-rendered, so the out-of-date notice is shown
+ * - project: the project was updated or deleted; shows the notice
+ * - resync: events were dropped; reloads the page or shows the notice,
+ *   depending on data-live-resync
+ *
+ * EventSource reconnects on its own after a dropped connection.
+ */
+
+const ACTIVITY_LIMIT = 10;
+
+// Show the out-of-date notice, optionally with a different message
+function showLiveNotice(root, message) {
+    const notice = root.querySelector('.live-notice');
+    if (message) {
+        notice.querySelector('.live-notice-message').textContent = message;
+    }
+    notice.hidden = false;
+}
+
+// Add count deltas to the statistics widgets
+function applyStats(deltas) {
+    for (const [stat, delta] of Object.entries(deltas)) {
+        const count = document.querySelector(`[data-stat="${stat}"] .stat-count`);
+        if (count) {
+            count.textContent = String(Number(count.textContent) + delta);
+        }
+    }
+}
+
+// Put rendered activity items at the top of the feed, replacing older
+// items of the same entity
+function applyActivity(items) {
+    let feed = document.querySelector('.activity-feed');
+    if (!feed) {
+        const empty = document.querySelector('.dashboard-main .empty-state');
+        if (!empty) return;
+        feed = document.createElement('div');
+        feed.className = 'activity-feed';
+        empty.replaceWith(feed);
+    }
+    for (const html of items) {
+        const template = document.createElement('template');
+        template.innerHTML = html.trim();
+        const item = template.content.firstElementChild;
+        const entity = item.getAttribute('data-entity');
+        feed.querySelectorAll(`[data-entity="${entity}"]`).forEach(old => old.remove());
+        feed.prepend(item);
+    }
+    while (feed.children.length > ACTIVITY_LIMIT) {
+        feed.lastElementChild.remove();
+    }
+}
+
+// Adjust the test case count of a project page
+function applyMembership(root, change) {
+    const count = document.querySelector('#project-testcase-count span');
+    if (count) {
+        const delta = change.action === 'added' ? 1 : -1;
+        count.textContent = ' ' + String(Number(count.textContent.trim()) + delta);
+    }
+    showLiveNotice(root, 'Test cases were added to or removed from this project.');
+}
+
+function startLiveUpdates() {
+    const root = document.getElementById('live-updates');
+    if (!root || !window.EventSource) return;
+
+    const params = new URLSearchParams();
+    root.dataset.liveTopics.split(' ').forEach(topic => params.append('topic', topic));
+    const source = new EventSource('/api/events?' + params.toString());
+
+    source.addEventListener('stats', event => applyStats(JSON.parse(event.data)));
+    source.addEventListener('activity', event => applyActivity(JSON.parse(event.data).items));
+    source.addEventListener('membership', event => {
+        applyMembership(root, JSON.parse(event.data));
+    });
+    source.addEventListener('project', event => {
+        const change = JSON.parse(event.data);
+        showLiveNotice(
+            root,
+            change.action === 'deleted' ? 'This project was deleted.' : 'This project was updated.'
+        );
+    });
+    source.addEventListener('resync', () => {
+        if (root.dataset.liveResync === 'reload') {
+            source.close();
+            window.location.reload();
+        } else {
+            showLiveNotice(root);
+        }
+    });
+}
+
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', startLiveUpdates);
+} else {
+    startLiveUpdates();
+}
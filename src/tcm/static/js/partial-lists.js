@@ -0,0 +1,91 @@
+/**
+ * Partial list updates
+ *
+ * On list pages, GET filter forms with a data-partial-target attribute and
+ * same-page links (pagination) inside a [data-partial-root] element fetch
+ * only the results fragment, sent with an HX-Request header, and swap it in
+ * place. The filter controls stay as they are and the new URL is pushed to
+ * the history; going back or forward reloads the fragment for that URL and
+ * restores the filter controls from it. Any failure falls back to a normal
+ * page load.
+ */
+
+const PARTIAL_HEADER = 'HX-Request';
+
+// Fetch the fragment for url and replace the target element with it
+function loadPartial(targetId, url, push) {
+    const target = document.getElementById(targetId);
+    if (!target) {
+        window.location.href = url;
+        return;
+    }
+    target.setAttribute('aria-busy', 'true');
+
+    fetch(url, { headers: { [PARTIAL_HEADER]: 'true' } })
+        .then(response => {
+            if (!response.ok) throw new Error(response.statusText);
+            return response.text();
+        })
+        .then(html => {
+            target.outerHTML = html;
+            if (push) {
+                history.pushState({ partialTarget: targetId }, '', url);
+            }
+        })
+        .catch(() => {
+            window.location.href = url;
+        });
+}
+
+// Build the URL a GET form submits to, leaving out empty fields
+function formUrl(form) {
+    const params = new URLSearchParams();
+    for (const [name, value] of new FormData(form)) {
+        if (value !== '') params.append(name, value);
+    }
+    const query = params.toString();
+    return form.action.split('?')[0] + (query ? `?${query}` : '');
+}
+
+// Set the filter controls of partial forms from the current URL
+function syncPartialForms() {
+    const params = new URLSearchParams(window.location.search);
+    document.querySelectorAll('form[data-partial-target]').forEach(form => {
+        for (const field of form.elements) {
+            if (field.name) field.value = params.get(field.name) || '';
+        }
+    });
+}
+
+document.addEventListener('submit', function(event) {
+    const form = event.target;
+    const targetId = form.dataset.partialTarget;
+    if (!targetId || form.method.toLowerCase() !== 'get') return;
+
+    event.preventDefault();
+    loadPartial(targetId, formUrl(form), true);
+});
+
+document.addEventListener('click', function(event) {
+    if (event.defaultPrevented || event.button !== 0 || event.metaKey || event.ctrlKey || event.shiftKey) return;
+    const link = event.target.closest('a[href]');
+    const root = link && link.closest('[data-partial-root]');
+    if (!root || new URL(link.href).pathname !== window.location.pathname) return;
+
+    event.preventDefault();
+    loadPartial(root.id, link.href, true);
+});
+
+window.addEventListener('popstate', function(event) {
+    if (!event.state || !event.state.partialTarget) return;
+    syncPartialForms();
+    loadPartial(event.state.partialTarget, window.location.href, false);
+});
+
+// Let the history entry of the initial page be restored as a fragment too
+document.addEventListener('DOMContentLoaded', function() {
+    const root = document.querySelector('[data-partial-root]');
+    if (root && !history.state) {
+        history.replaceState({ partialTarget: root.id }, '', window.location.href);
+    }
+});
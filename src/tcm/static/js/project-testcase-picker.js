@@ -0,0 +1,180 @@
+/**
+ * Project "Add Test Cases" picker
+ *
+ * Searches the test cases that are not yet in the project on demand
+ * (GET /api/projects/{id}/available-testcases) instead of embedding every
+ * test case in the page:
+ * - Debounced title search plus status, priority and tag filters
+ * - Paginated results with a "Load more" button
+ * - Selections are kept across searches
+ * - Tag filter options are loaded once from the tag catalog
+ */
+
+const TESTCASE_PICKER_PAGE_SIZE = 25;
+const TESTCASE_PICKER_DEBOUNCE_MS = 250;
+
+const testcasePicker = {
+    projectId: null,
+    selected: new Set(),
+    skip: 0,
+    timer: null,
+    request: null,
+    tagsLoaded: false,
+};
+
+// Escape text for safe insertion into HTML
+function escapePickerHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// Current filter values of the picker
+function testcasePickerParams() {
+    const params = {};
+    const fields = { q: 'picker_search', status: 'picker_status', priority: 'picker_priority', tag_id: 'picker_tag_id' };
+    for (const [param, id] of Object.entries(fields)) {
+        const value = document.getElementById(id).value.trim();
+        if (value) params[param] = value;
+    }
+    return params;
+}
+
+// Fetch a page of matching test cases; append when loading more
+function loadTestCasePage(append) {
+    if (testcasePicker.request) {
+        testcasePicker.request.abort();
+    }
+    const controller = new AbortController();
+    testcasePicker.request = controller;
+    testcasePicker.skip = append ? testcasePicker.skip : 0;
+
+    const params = new URLSearchParams({
+        ...testcasePickerParams(),
+        skip: testcasePicker.skip,
+        limit: TESTCASE_PICKER_PAGE_SIZE,
+    });
+    const url = `/api/projects/${testcasePicker.projectId}/available-testcases?${params}`;
+
+    return fetch(url, { signal: controller.signal })
+        .then(response => {
+            if (!response.ok) throw new Error('Failed to load test cases');
+            return response.json();
+        })
+        .then(data => renderTestCasePage(data, append))
+        .catch(error => {
+            if (error.name !== 'AbortError') {
+                document.getElementById('testcase-picker-summary').textContent = 'Failed to load test cases.';
+            }
+        });
+}
+
+// Render a page of results into the modal list
+function renderTestCasePage(data, append) {
+    const list = document.getElementById('testcase-list');
+    const html = data.testcases.map(testcase => `
+        <div class="testcase-item">
+            <label class="testcase-option">
+                <input type="checkbox" name="testcase_ids" value="${testcase.id}" class="testcase-checkbox"
+                    ${testcasePicker.selected.has(String(testcase.id)) ? 'checked' : ''}
+                    onchange="toggleTestCaseSelection(this)">
+                <span class="testcase-label">${escapePickerHtml(testcase.title)}</span>
+                <span class="status-badge status-${testcase.status}">${escapePickerHtml(testcase.status)}</span>
+            </label>
+        </div>
+    `).join('');
+    if (append) {
+        list.insertAdjacentHTML('beforeend', html);
+    } else {
+        list.innerHTML = html;
+    }
+
+    testcasePicker.skip = data.skip + data.testcases.length;
+    const summary = document.getElementById('testcase-picker-summary');
+    summary.textContent = data.total === 0
+        ? 'No test cases match. All matching test cases may already be in this project.'
+        : `Showing ${testcasePicker.skip} of ${data.total} test cases not in this project.`;
+    document.getElementById('testcase-picker-more').style.display =
+        testcasePicker.skip < data.total ? 'inline-block' : 'none';
+}
+
+// Re-run the search after the user stops typing or changes a filter
+function searchTestCases() {
+    clearTimeout(testcasePicker.timer);
+    testcasePicker.timer = setTimeout(() => loadTestCasePage(false), TESTCASE_PICKER_DEBOUNCE_MS);
+}
+
+function loadMoreTestCases() {
+    loadTestCasePage(true);
+}
+
+function toggleTestCaseSelection(checkbox) {
+    if (checkbox.checked) {
+        testcasePicker.selected.add(checkbox.value);
+    } else {
+        testcasePicker.selected.delete(checkbox.value);
+    }
+    document.getElementById('testcase-picker-add').disabled = testcasePicker.selected.size === 0;
+}
+
+// Fill the tag filter from the cacheable tag catalog
+function loadPickerTags() {
+    if (testcasePicker.tagsLoaded) return;
+    testcasePicker.tagsLoaded = true;
+
+    fetch('/api/tags/catalog')
+        .then(response => response.ok ? response.json() : { tags: [] })
+        .then(catalog => {
+            const select = document.getElementById('picker_tag_id');
+            select.insertAdjacentHTML('beforeend', catalog.tags.map(tag =>
+                `<option value="${tag.id}">${escapePickerHtml(tag.category)}: ${escapePickerHtml(tag.value)}</option>`
+            ).join(''));
+        })
+        .catch(() => { testcasePicker.tagsLoaded = false; });
+}
+
+function showAddTestCaseModal(projectId) {
+    testcasePicker.projectId = projectId;
+    document.getElementById('add-testcase-modal').style.display = 'flex';
+    loadPickerTags();
+    loadTestCasePage(false);
+}
+
+function hideAddTestCaseModal() {
+    document.getElementById('add-testcase-modal').style.display = 'none';
+}
+
+function addSelectedTestCases(projectId) {
+    const testcaseIds = Array.from(testcasePicker.selected);
+
+    if (testcaseIds.length === 0) {
+        alert('Please select at least one test case to add.');
+        return;
+    }
+
+    // Add test cases one by one
+    const promises = testcaseIds.map(testcaseId =>
+        fetch('/api/projects/' + projectId + '/testcases/' + testcaseId, {
+            method: 'POST',
+        })
+    );
+
+    Promise.all(promises).then(responses => {
+        const allOk = responses.every(r => r.ok);
+        if (allOk) {
+            window.location.href = '/projects/' + projectId + '?success=Test cases added successfully';
+        } else {
+            alert('Some test cases could not be added. Please try again.');
+        }
+    }).catch(error => {
+        alert('Error: ' + error.message);
+    });
+}
+
+// Close modal when clicking outside
+window.addEventListener('click', function(event) {
+    const modal = document.getElementById('add-testcase-modal');
+    if (event.target === modal) {
+        hideAddTestCaseModal();
+    }
+});
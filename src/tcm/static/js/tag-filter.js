@@ -0,0 +1,44 @@
+/**
+ * Tag filter dropdowns
+ *
+ * Tag selects inside a [data-tag-catalog] element are filled from the
+ * cacheable tag catalog (GET /api/tags/catalog) instead of having every tag
+ * inlined in the page. The page only renders the "All Tags" option and the
+ * currently selected tag, which stays selected once the catalog is loaded.
+ */
+
+// Escape text for safe insertion into HTML
+function escapeTagFilterHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// Replace a select's tag options with the tags of the catalog
+function fillTagFilter(select, catalog) {
+    const selected = select.value;
+    for (const option of Array.from(select.options)) {
+        if (option.value) option.remove();
+    }
+    select.insertAdjacentHTML('beforeend', catalog.tags.map(tag =>
+        `<option value="${tag.id}">${escapeTagFilterHtml(tag.category)}: ${escapeTagFilterHtml(tag.value)}</option>`
+    ).join(''));
+    select.value = selected;
+}
+
+function loadTagFilters() {
+    const selects = document.querySelectorAll('[data-tag-catalog] select');
+    if (selects.length === 0) return;
+
+    fetch('/api/tags/catalog')
+        .then(response => {
+            if (!response.ok) throw new Error('Failed to load tags');
+            return response.json();
+        })
+        .then(catalog => selects.forEach(select => fillTagFilter(select, catalog)))
+        .catch(() => {
+            // Keep the server-rendered options; filtering by the selected tag still works
+        });
+}
+
+document.addEventListener('DOMContentLoaded', loadTagFilters);
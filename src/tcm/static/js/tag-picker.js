@@ -2,25 +2,71 @@
  * Enhanced Tag Picker Component JavaScript
  *
  * Provides interactive tag selection with:
- * - Autocomplete/type-ahead search
+ * - Server-side type-ahead search (GET /api/tags/suggest), debounced
  * - Visual pill display for selected tags
- * - Browse modal for viewing all tags
+ * - Browse modal whose categories are loaded on demand
  */
 
-// Add a tag to the picker
-function addTag(fieldName, tagId) {
-    const tags = window.tagPickerData[fieldName];
-    const tag = tags.find(t => t.id === tagId);
+const TAG_SUGGEST_URL = '/api/tags/suggest';
+const TAG_SUGGEST_DEBOUNCE_MS = 200;
+const TAG_SUGGEST_LIMIT = 10;
+const TAG_BROWSE_LIMIT = 200;
+
+// Tags seen in suggestion/browse responses, by field name and tag id
+const tagPickerTags = {};
+// Pending debounce timers and in-flight requests, by field name
+const tagPickerTimers = {};
+const tagPickerRequests = {};
+
+// Escape text for safe insertion into HTML
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
 
-    if (!tag) return;
+// Remember tags returned by the server so they can be added by id
+function rememberTags(fieldName, tags) {
+    const known = tagPickerTags[fieldName] = tagPickerTags[fieldName] || {};
+    tags.forEach(tag => { known[tag.id] = tag; });
+}
 
-    // Check if already selected
+// Fetch suggestions from the server
+function fetchTagSuggestions(fieldName, params) {
+    if (tagPickerRequests[fieldName]) {
+        tagPickerRequests[fieldName].abort();
+    }
+    const controller = new AbortController();
+    tagPickerRequests[fieldName] = controller;
+
+    const url = `${TAG_SUGGEST_URL}?${new URLSearchParams(params)}`;
+    return fetch(url, { signal: controller.signal })
+        .then(response => response.ok ? response.json() : [])
+        .then(tags => {
+            rememberTags(fieldName, tags);
+            return tags;
+        });
+}
+
+// Check whether a tag is currently selected
+function isTagSelected(fieldName, tagId) {
     const hiddenInputs = document.querySelectorAll(`input[data-tag-input="${fieldName}"]`);
     for (let input of hiddenInputs) {
         if (input.value === String(tagId)) {
-            return; // Already selected
+            return true;
         }
     }
+    return false;
+}
+
+// Add a tag to the picker
+function addTag(fieldName, tagId) {
+    const tag = (tagPickerTags[fieldName] || {})[tagId];
+
+    if (!tag) return;
+
+    // Check if already selected
+    if (isTagSelected(fieldName, tagId)) return;
 
     // Add hidden input for form submission
     const form = document.querySelector(`#${fieldName}_input`).closest('form');
@@ -37,7 +83,7 @@ function addTag(fieldName, tagId) {
     pill.className = 'tag-pill';
     pill.setAttribute('data-tag-id', tagId);
     pill.innerHTML = `
-        ${tag.value}
+        ${escapeHtml(tag.value)}
         <button type="button" class="tag-pill-remove" onclick="removeTag('${fieldName}', ${tagId})">×</button>
     `;
     pillsContainer.appendChild(pill);
@@ -78,39 +124,87 @@ function removeTag(fieldName, tagId) {
     }
 }
 
-// Filter tags based on input
+// Filter tags based on input (debounced server-side search)
 function filterTags(fieldName) {
     const input = document.getElementById(`${fieldName}_input`);
-    const query = input.value.toLowerCase().trim();
+    const query = input.value.trim();
     const dropdown = document.getElementById(`${fieldName}_dropdown`);
 
+    clearTimeout(tagPickerTimers[fieldName]);
+
     if (query.length < 2) {
         dropdown.style.display = 'none';
         return;
     }
 
-    const tags = window.tagPickerData[fieldName];
-    const filtered = tags.filter(tag =>
-        tag.value.toLowerCase().includes(query) ||
-        tag.category.toLowerCase().includes(query)
-    ).slice(0, 10); // Limit to 10 results
+    tagPickerTimers[fieldName] = setTimeout(() => {
+        fetchTagSuggestions(fieldName, { q: query, limit: TAG_SUGGEST_LIMIT })
+            .then(tags => {
+                // Ignore responses for a query the user has already changed
+                if (input.value.trim() !== query) return;
+                renderSuggestions(fieldName, tags);
+            })
+            .catch(error => {
+                if (error.name !== 'AbortError') {
+                    dropdown.style.display = 'none';
+                }
+            });
+    }, TAG_SUGGEST_DEBOUNCE_MS);
+}
+
+// Render the autocomplete dropdown
+function renderSuggestions(fieldName, tags) {
+    const dropdown = document.getElementById(`${fieldName}_dropdown`);
 
-    if (filtered.length === 0) {
+    if (tags.length === 0) {
         dropdown.style.display = 'none';
         return;
     }
 
-    // Build dropdown HTML
-    dropdown.innerHTML = filtered.map(tag => `
+    dropdown.innerHTML = tags.map(tag => `
         <div class="tag-autocomplete-item" onclick="addTag('${fieldName}', ${tag.id})">
-            <span class="tag-autocomplete-category">${tag.category.replace(/_/g, ' ')}</span>
-            <span class="tag-autocomplete-value">${tag.value}</span>
+            <span class="tag-autocomplete-category">${escapeHtml(tag.category.replace(/_/g, ' '))}</span>
+            <span class="tag-autocomplete-value">${escapeHtml(tag.value)}</span>
         </div>
     `).join('');
 
     dropdown.style.display = 'block';
 }
 
+// Load the tags of a category in the browse modal the first time it is opened
+function loadTagCategory(fieldName, details) {
+    if (!details.open || details.dataset.loaded) return;
+    details.dataset.loaded = 'true';
+
+    const container = details.querySelector('.category-tags');
+    const params = { category: details.dataset.category, limit: TAG_BROWSE_LIMIT };
+    const url = `${TAG_SUGGEST_URL}?${new URLSearchParams(params)}`;
+
+    fetch(url)
+        .then(response => response.ok ? response.json() : [])
+        .then(tags => {
+            rememberTags(fieldName, tags);
+            container.innerHTML = tags.map(tag => `
+                <label class="tag-option-label">
+                    <input type="checkbox" value="${tag.id}"
+                        ${isTagSelected(fieldName, tag.id) ? 'checked' : ''}
+                        onchange="toggleTagInModal('${fieldName}', ${tag.id})">
+                    <span>${escapeHtml(tag.value)}</span>
+                </label>
+            `).join('');
+            if (tags.length === TAG_BROWSE_LIMIT) {
+                container.insertAdjacentHTML(
+                    'beforeend',
+                    '<p class="form-help-text">Showing the most used tags. Type to search for others.</p>'
+                );
+            }
+        })
+        .catch(() => {
+            delete details.dataset.loaded;
+            container.innerHTML = '<p class="form-help-text">Failed to load tags.</p>';
+        });
+}
+
 // Open the tag browser modal
 function openTagBrowser(fieldName) {
     const modal = document.getElementById(`${fieldName}_modal`);
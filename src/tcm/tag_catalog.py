@@ -0,0 +1,76 @@
+"""
+Versioned tag catalog snapshots.
+
+Builds the compact tag catalog served by ``GET /api/tags/catalog``: either
+the full list of tags, or, for a client that already holds version N, only
+the tags written and the tag IDs deleted after N. Versions are maintained by
+the flush listener in ``tcm.models.catalog``.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tcm.models.catalog import TAG_CATALOG, catalog_versions, tag_tombstones
+from tcm.models.tag import Tag
+
+
+async def get_catalog_version(session: AsyncSession) -> int:
+    """
+    Return the current tag catalog version.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Latest committed catalog version (0 if no tag was ever written)
+    """
+    result = await session.execute(
+        select(catalog_versions.c.version).where(catalog_versions.c.name == TAG_CATALOG)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def load_catalog(
+    session: AsyncSession,
+    version: int,
+    since_version: int | None = None,
+) -> dict:
+    """
+    Load the tag catalog, or the changes made to it after since_version.
+
+    A full snapshot is returned when since_version is omitted or is ahead of
+    the current version (e.g. a client synced against another database).
+
+    Args:
+        session: Database session
+        version: Current catalog version, as returned by get_catalog_version
+        since_version: Catalog version the client already holds
+
+    Returns:
+        Dictionary with version, full, tags and deleted (tag IDs)
+    """
+    full = since_version is None or since_version > version
+    query = select(Tag.id, Tag.category, Tag.value, Tag.is_predefined).order_by(
+        Tag.category, Tag.value
+    )
+    deleted: list[int] = []
+    if not full:
+        query = query.where(Tag.catalog_version > since_version)
+        live_ids = select(Tag.id)
+        result = await session.execute(
+            select(tag_tombstones.c.tag_id)
+            .where(
+                tag_tombstones.c.catalog_version > since_version,
+                tag_tombstones.c.tag_id.not_in(live_ids),
+            )
+            .order_by(tag_tombstones.c.tag_id)
+        )
+        deleted = list(result.scalars().all())
+
+    result = await session.execute(query)
+    return {
+        "version": version,
+        "full": full,
+        "tags": [dict(row) for row in result.mappings()],
+        "deleted": deleted,
+    }
@@ -0,0 +1,125 @@
+"""
+In-memory prefix index for tag typeahead.
+
+Every tag is indexed under ``category:value`` and under its bare ``value``
+(lower-cased), in one sorted key list, so a prefix lookup is a binary search
+followed by a scan of the matching range. Matches are ranked by how many
+test cases use the tag. The index is built from two queries on first use,
+shared by all requests, and dropped whenever tags or test cases are
+committed (or after ``tag_index_ttl`` seconds, to pick up writes made by
+other processes).
+"""
+
+import heapq
+from bisect import bisect_left
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tcm.aggregates import tag_usage_counts
+from tcm.config import settings
+from tcm.data_cache import TTLCache
+from tcm.events import on_commit
+from tcm.models.tag import Tag
+
+# Sorts after every character a key can contain, closing a prefix range
+_PREFIX_END = "\U0010ffff"
+
+
+class TagSuggestIndex:
+    """
+    Sorted prefix index over tag keys, ranked by usage count.
+    """
+
+    def __init__(self, tags: list[dict], usage: dict[int, int]):
+        self.tags = {tag["id"]: {**tag, "usage_count": usage.get(tag["id"], 0)} for tag in tags}
+        entries = []
+        for tag in tags:
+            value = tag["value"].lower()
+            entries.append((f"{tag['category'].lower()}:{value}", tag["id"]))
+            entries.append((value, tag["id"]))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = [tag_id for _, tag_id in entries]
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        """Return the IDs of all tags with a key starting with prefix."""
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + _PREFIX_END, lo=start)
+        return set(self._ids[start:end])
+
+    def _rank(self, tag_id: int) -> tuple:
+        """Sort key: most used first, then alphabetical."""
+        tag = self.tags[tag_id]
+        return (-tag["usage_count"], tag["category"], tag["value"].lower())
+
+    def suggest(self, q: str = "", category: str | None = None, limit: int = 10) -> list[dict]:
+        """
+        Return the best tags matching a prefix.
+
+        Args:
+            q: Prefix of the tag value, or of "category:value"
+            category: Restrict matches to this category
+            limit: Maximum number of suggestions
+
+        Returns:
+            Tag dictionaries (with usage_count), most used first
+        """
+        q = q.strip().lower()
+        if category:
+            ids = self._prefix_ids(f"{category.lower()}:{q}")
+        else:
+            ids = self._prefix_ids(q)
+        return [self.tags[tag_id] for tag_id in heapq.nsmallest(limit, ids, key=self._rank)]
+
+
+# One shared index per process; rebuilt lazily after invalidation
+tag_index_cache = TTLCache(ttl=settings.tag_index_ttl)
+
+
+@on_commit
+def _invalidate_tag_index(changes) -> None:
+    """Drop the index when tags or tag assignments may have changed."""
+    if any(change.entity_type in ("tags", "testcases") for change in changes):
+        tag_index_cache.invalidate()
+
+
+async def build_tag_index(session: AsyncSession) -> TagSuggestIndex:
+    """
+    Load all tags and their usage counts into a new index.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Freshly built TagSuggestIndex
+    """
+    tags_result = await session.execute(
+        select(Tag.id, Tag.category, Tag.value, Tag.is_predefined)
+    )
+    counts = tag_usage_counts()
+    usage_result = await session.execute(select(counts.c.tag_id, counts.c.usage_count))
+    return TagSuggestIndex(
+        tags=[dict(row) for row in tags_result.mappings()],
+        usage=dict(usage_result.all()),
+    )
+
+
+async def get_tag_index(session_factory: async_sessionmaker[AsyncSession]) -> TagSuggestIndex:
+    """
+    Return the shared tag index, building it if needed.
+
+    Args:
+        session_factory: Factory for the session the index is (re)built on
+
+    Returns:
+        TagSuggestIndex
+    """
+    async def build():
+        async with session_factory() as session:
+            return await build_tag_index(session)
+
+    return await tag_index_cache.get_or_compute("tags", build)
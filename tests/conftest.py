@@ -14,8 +14,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
-from tcm.database import Base, get_db
+from tcm.database import Base, get_db, get_session_factory
 from tcm.main import app
+from tcm.routes.dashboard_pages import dashboard_cache
+from tcm.tag_index import tag_index_cache
 
 # Import all models to ensure they're registered with Base.metadata
 from tcm.models.tag import Tag
@@ -42,6 +44,16 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Drop in-process caches so data never leaks between test databases."""
+    dashboard_cache.invalidate()
+    tag_index_cache.invalidate()
+    yield
+    dashboard_cache.invalidate()
+    tag_index_cache.invalidate()
+
+
 @pytest.fixture(scope="function")
 async def test_engine():
     """Create a test database engine."""
@@ -109,6 +121,7 @@ async def test_client(test_engine, test_session_maker) -> AsyncGenerator[AsyncCl
                 await session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: test_session_maker
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -0,0 +1,173 @@
+"""
+Integration tests for the batch API endpoint.
+
+Tests ordered execution with back-references, the all-or-nothing
+transaction and operation errors for POST /api/batch.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from tcm.models.project import Project
+from tcm.routes import batch
+from tcm.routes.batch import BatchRoute
+
+
+@pytest.mark.asyncio
+class TestBatchAPI:
+    """Test suite for POST /api/batch."""
+
+    async def test_create_with_references(self, test_client: AsyncClient):
+        """Test a tag, tagged test cases and a project holding them are created together."""
+        response = await test_client.post(
+            "/api/batch",
+            json={
+                "operations": [
+                    {
+                        "method": "POST",
+                        "path": "/tags",
+                        "body": {"category": "module", "value": "auth"},
+                        "ref": "auth",
+                    },
+                    *[
+                        {
+                            "method": "POST",
+                            "path": "/testcases",
+                            "body": {
+                                "title": title,
+                                "steps": "S",
+                                "expected_results": "R",
+                                "tag_ids": ["$auth.id"],
+                            },
+                            "ref": ref,
+                        }
+                        for title, ref in (("Login", "login"), ("Logout", "logout"))
+                    ],
+                    {
+                        "method": "POST",
+                        "path": "/projects",
+                        "body": {"name": "Release", "testcase_ids": ["$login.id"]},
+                        "ref": "release",
+                    },
+                    {"method": "POST", "path": "/projects/$release.id/testcases/$logout.id"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [201, 201, 201, 201, 200]
+        tag_id = results[0]["body"]["id"]
+        assert results[1]["body"]["tags"][0]["id"] == tag_id
+        assert results[4]["body"]["testcase_count"] == 2
+
+        project_id = results[3]["body"]["id"]
+        listed = (await test_client.get(f"/api/projects/{project_id}/testcases")).json()
+        assert sorted(tc["title"] for tc in listed) == ["Login", "Logout"]
+
+    async def test_update_and_delete(self, test_client: AsyncClient):
+        """Test PATCH (with If-Match) and DELETE operations."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "ui"})
+        ).json()
+        etag = (await test_client.get(f"/api/tags/{tag['id']}")).headers["etag"]
+
+        response = await test_client.post(
+            "/api/batch",
+            json={
+                "operations": [
+                    {
+                        "method": "PATCH",
+                        "path": f"/tags/{tag['id']}",
+                        "body": {"description": "User interface"},
+                        "if_match": etag,
+                    },
+                    {"method": "DELETE", "path": f"/tags/{tag['id']}"},
+                ]
+            },
+        )
+
+        assert response.json()["results"] == [
+            {"status": 200, "body": response.json()["results"][0]["body"]},
+            {"status": 204, "body": None},
+        ]
+        assert response.json()["results"][0]["body"]["description"] == "User interface"
+        assert (await test_client.get(f"/api/tags/{tag['id']}")).status_code == 404
+
+    async def test_failure_rolls_back_batch(self, test_client: AsyncClient):
+        """Test a failing operation undoes the earlier ones and is reported."""
+        # Warm the tag suggestion index, which is refreshed by commit listeners
+        await test_client.get("/api/tags/suggest", params={"q": "x"})
+        response = await test_client.post(
+            "/api/batch",
+            json={
+                "operations": [
+                    {"method": "POST", "path": "/tags", "body": {"category": "m", "value": "x"}}
+                    for _ in range(2)
+                ]
+            },
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["operation"] == 1
+        assert (await test_client.get("/api/tags")).json()["total"] == 0
+        assert (await test_client.get("/api/tags/suggest", params={"q": "x"})).json() == []
+
+    async def test_database_error_reported_per_operation(
+        self, test_client: AsyncClient, monkeypatch
+    ):
+        """Test a constraint violation is the operation's 409, not a 500 for the batch."""
+        await test_client.post("/api/projects", json={"name": "Release"})
+
+        async def insert_duplicate(session):
+            # Skips the handlers' name check, as a concurrent insert would
+            session.add(Project(name="Release"))
+            await session.commit()
+
+        duplicate = BatchRoute("POST", "/duplicate-project", insert_duplicate, 201)
+        monkeypatch.setattr(batch, "BATCH_ROUTES", (*batch.BATCH_ROUTES, duplicate))
+        response = await test_client.post(
+            "/api/batch",
+            json={
+                "operations": [
+                    {"method": "POST", "path": "/tags", "body": {"category": "m", "value": "x"}},
+                    {"method": "POST", "path": "/duplicate-project"},
+                ]
+            },
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["operation"] == 1
+        assert (await test_client.get("/api/tags")).json()["total"] == 0
+
+    async def test_commit_listeners_run_once_committed(self, test_client: AsyncClient):
+        """Test derived state sees the batch's writes after it commits."""
+        await test_client.get("/api/tags/suggest", params={"q": "sm"})
+
+        await test_client.post(
+            "/api/batch",
+            json={
+                "operations": [
+                    {
+                        "method": "POST",
+                        "path": "/tags",
+                        "body": {"category": "type", "value": "smoke"},
+                    }
+                ]
+            },
+        )
+
+        response = await test_client.get("/api/tags/suggest", params={"q": "sm"})
+        assert [tag["value"] for tag in response.json()] == ["smoke"]
+
+    async def test_invalid_operations(self, test_client: AsyncClient):
+        """Test unsupported paths, bad references and invalid bodies are rejected."""
+        cases = [
+            ({"method": "POST", "path": "/search"}, 400),
+            ({"method": "POST", "path": "/projects/$missing.id/testcases/1"}, 400),
+            ({"method": "POST", "path": "/testcases", "body": {"title": "No steps"}}, 422),
+        ]
+        for operation, status_code in cases:
+            response = await test_client.post("/api/batch", json={"operations": [operation]})
+            assert response.status_code == status_code
+            assert response.json()["detail"]["operation"] == 0
@@ -0,0 +1,178 @@
+"""
+Integration tests for the change feed API endpoint.
+
+Tests the change log written with each mutation, cursor paging and long
+polling on /api/changes.
+"""
+
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+
+from tcm.config import settings
+from tcm.models.catalog import catalog_versions
+from tcm.models.testcase import TestCase
+
+
+def events(changes: list[dict]) -> list[tuple]:
+    """Reduce changes to (entity_type, entity_id, related_id, action) tuples."""
+    return [
+        (change["entity_type"], change["entity_id"], change["related_id"], change["action"])
+        for change in changes
+    ]
+
+
+@pytest.mark.asyncio
+class TestChangesAPI:
+    """Test suite for GET /api/changes."""
+
+    async def test_changes_in_commit_order(self, test_client: AsyncClient):
+        """Test entity and membership changes are logged in order."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()
+        testcase = (
+            await test_client.post(
+                "/api/testcases",
+                json={
+                    "title": "Login",
+                    "steps": "S",
+                    "expected_results": "R",
+                    "tag_ids": [tag["id"]],
+                },
+            )
+        ).json()
+        project = (
+            await test_client.post(
+                "/api/projects", json={"name": "Release", "testcase_ids": [testcase["id"]]}
+            )
+        ).json()
+        await test_client.patch(f"/api/testcases/{testcase['id']}", json={"title": "Log in"})
+        await test_client.delete(f"/api/testcases/{testcase['id']}/tags/{tag['id']}")
+
+        response = await test_client.get("/api/changes")
+        assert response.status_code == 200
+        body = response.json()
+        assert events(body["changes"]) == [
+            ("tag", tag["id"], None, "created"),
+            ("testcase", testcase["id"], None, "created"),
+            ("testcase_tag", testcase["id"], tag["id"], "added"),
+            ("project", project["id"], None, "created"),
+            ("project_testcase", project["id"], testcase["id"], "added"),
+            ("testcase", testcase["id"], None, "updated"),
+            ("testcase_tag", testcase["id"], tag["id"], "removed"),
+        ]
+        cursors = [change["cursor"] for change in body["changes"]]
+        assert cursors == sorted(cursors)
+        assert body["next_cursor"] == cursors[-1]
+        assert body["has_more"] is False
+
+    async def test_resume_from_cursor(self, test_client: AsyncClient):
+        """Test paging with limit and resuming from next_cursor."""
+        for value in ("a", "b", "c"):
+            await test_client.post("/api/tags", json={"category": "module", "value": value})
+
+        first = (await test_client.get("/api/changes", params={"limit": 2})).json()
+        assert len(first["changes"]) == 2
+        assert first["has_more"] is True
+
+        rest = (
+            await test_client.get("/api/changes", params={"since": first["next_cursor"]})
+        ).json()
+        assert len(rest["changes"]) == 1
+        assert rest["has_more"] is False
+
+        tag_id = (await test_client.get("/api/tags")).json()["tags"][0]["id"]
+        await test_client.delete(f"/api/tags/{tag_id}")
+        latest = (
+            await test_client.get("/api/changes", params={"since": rest["next_cursor"]})
+        ).json()
+        assert events(latest["changes"]) == [("tag", tag_id, None, "deleted")]
+
+    async def test_counter_row_exists_before_first_write(self, test_session):
+        """Test a new database has the counter row writers lock, so none must insert it."""
+        rows = (await test_session.execute(select(catalog_versions))).all()
+        assert dict(rows) == {"tags": 0, "changes": 0}
+
+    async def test_counters_locked_in_fixed_order(self, test_client: AsyncClient, test_engine):
+        """Test every transaction takes the change log counter before the tag catalog's."""
+        testcase = (
+            await test_client.post(
+                "/api/testcases", json={"title": "T", "steps": "S", "expected_results": "R"}
+            )
+        ).json()
+        locked = []
+
+        def record_lock(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE catalog_versions"):
+                locked.append(parameters[-1])
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record_lock)
+        try:
+            # Each batch operation flushes, so this transaction flushes twice
+            operations = [
+                {"method": "PATCH", "path": f"/testcases/{testcase['id']}", "body": {"title": "U"}},
+                {"method": "POST", "path": "/tags", "body": {"category": "m", "value": "x"}},
+            ]
+            response = await test_client.post("/api/batch", json={"operations": operations})
+            assert response.status_code == 200
+            batch_locks, locked[:] = list(locked), []
+
+            await test_client.post("/api/tags", json={"category": "m", "value": "y"})
+            single_locks = list(locked)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record_lock)
+
+        for locks in (batch_locks, single_locks):
+            assert locks[0] == "changes"
+            assert "tags" in locks
+
+    async def test_unchanged_flush_does_not_lock_counter(self, test_session):
+        """Test a flush that appends no change rows leaves the counter row alone."""
+        testcase = TestCase(title="T", steps="S", expected_results="R")
+        test_session.add(testcase)
+        await test_session.commit()
+        version_query = select(catalog_versions.c.version).where(
+            catalog_versions.c.name == "changes"
+        )
+        version = (await test_session.execute(version_query)).scalar_one()
+
+        # Marked dirty, but nothing to log
+        testcase.title = "T"
+        assert testcase in test_session.dirty
+        await test_session.flush()
+
+        assert (await test_session.execute(version_query)).scalar_one() == version
+
+    async def test_rolled_back_writes_are_not_logged(self, test_client: AsyncClient):
+        """Test the log is written in the mutation's transaction."""
+        operation = {"method": "POST", "path": "/tags", "body": {"category": "m", "value": "x"}}
+        response = await test_client.post("/api/batch", json={"operations": [operation] * 2})
+        assert response.status_code == 400
+
+        assert (await test_client.get("/api/changes")).json()["changes"] == []
+
+    async def test_long_poll_wakes_on_commit(self, test_client: AsyncClient, monkeypatch):
+        """Test a waiting request returns as soon as a change is committed."""
+        monkeypatch.setattr(settings, "changes_poll_interval", 10.0)
+
+        async def write_later():
+            await asyncio.sleep(0.2)
+            await test_client.post("/api/tags", json={"category": "module", "value": "late"})
+
+        start = time.monotonic()
+        response, _ = await asyncio.gather(
+            test_client.get("/api/changes", params={"wait": 5}), write_later()
+        )
+        assert time.monotonic() - start < 3
+        assert events(response.json()["changes"])[0][0] == "tag"
+
+    async def test_long_poll_times_out(self, test_client: AsyncClient, monkeypatch):
+        """Test a wait without changes returns an empty page at the same cursor."""
+        monkeypatch.setattr(settings, "changes_poll_interval", 0.05)
+
+        response = await test_client.get("/api/changes", params={"since": 7, "wait": 0.2})
+        assert response.json() == {"changes": [], "next_cursor": 7, "has_more": False}
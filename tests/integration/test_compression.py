@@ -0,0 +1,193 @@
+"""
+Integration tests for the response compression middleware.
+
+Tests content-coding negotiation, size threshold, content-type allowlist,
+ETag handling and incremental compression of streaming responses.
+"""
+
+import asyncio
+import zlib
+
+import pytest
+from httpx import AsyncClient
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from tcm.compression import CompressionMiddleware, negotiate_encoding
+
+
+class TestNegotiation:
+    """Test suite for negotiate_encoding."""
+
+    def test_prefers_server_order_on_ties(self):
+        """Test equal q-values fall back to the server preference order."""
+        assert negotiate_encoding("gzip, br, zstd", ["br", "zstd", "gzip"]) == "br"
+
+    def test_honors_q_values(self):
+        """Test a higher client q-value wins over server preference."""
+        assert negotiate_encoding("br;q=0.5, gzip;q=1.0", ["br", "gzip"]) == "gzip"
+
+    def test_q_zero_refuses_coding(self):
+        """Test q=0 excludes a coding."""
+        assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+
+    def test_wildcard(self):
+        """Test the wildcard accepts any coding."""
+        assert negotiate_encoding("*", ["gzip"]) == "gzip"
+
+    def test_identity_only(self):
+        """Test no coding is chosen when none is acceptable."""
+        assert negotiate_encoding("identity", ["br", "gzip"]) is None
+
+
+async def run_middleware(response, accept_encoding: str, **options) -> list[dict]:
+    """Run a response through the middleware and collect the sent messages."""
+    middleware = CompressionMiddleware(
+        response,
+        minimum_size=options.get("minimum_size", 100),
+        content_types=options.get("content_types", ["text/html", "text/plain"]),
+    )
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Client stays connected until the response completes
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def response_headers(messages: list[dict]) -> dict:
+    """Return the response start headers as a str dict."""
+    return {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+
+
+@pytest.mark.asyncio
+class TestCompressionMiddleware:
+    """Test suite for CompressionMiddleware."""
+
+    async def test_compresses_large_response(self):
+        """Test bodies above the threshold are gzip-compressed."""
+        body = "<p>row</p>" * 500
+        messages = await run_middleware(PlainTextResponse(body, media_type="text/html"), "gzip")
+        headers = response_headers(messages)
+
+        assert headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in headers["vary"]
+        compressed = b"".join(m.get("body", b"") for m in messages[1:])
+        assert int(headers["content-length"]) == len(compressed)
+        assert zlib.decompress(compressed, 31).decode() == body
+
+    async def test_small_response_not_compressed(self):
+        """Test bodies below the threshold pass through."""
+        messages = await run_middleware(PlainTextResponse("tiny"), "gzip")
+        assert "content-encoding" not in response_headers(messages)
+        assert messages[1]["body"] == b"tiny"
+
+    async def test_content_type_outside_allowlist(self):
+        """Test content types outside the allowlist pass through."""
+        response = PlainTextResponse("x" * 5000, media_type="application/octet-stream")
+        messages = await run_middleware(response, "gzip")
+        headers = response_headers(messages)
+        assert "content-encoding" not in headers
+        assert "vary" not in headers
+
+    async def test_already_encoded_response_untouched(self):
+        """Test responses with a Content-Encoding (precompressed assets) pass through."""
+        response = PlainTextResponse("x" * 5000, headers={"Content-Encoding": "br"})
+        messages = await run_middleware(response, "gzip")
+        assert response_headers(messages)["content-encoding"] == "br"
+        assert messages[1]["body"] == b"x" * 5000
+
+    async def test_etag_marked_for_encoding(self):
+        """Test the compressed representation gets a coding-specific ETag."""
+        response = PlainTextResponse("x" * 5000, headers={"ETag": '"abc"'})
+        messages = await run_middleware(response, "gzip")
+        assert response_headers(messages)["etag"] == '"abc-gzip"'
+
+    async def test_streaming_response_compressed_incrementally(self):
+        """Test each streamed chunk is flushed as its own compressed message."""
+        chunks = [f"<tr><td>{i}</td></tr>".encode() * 20 for i in range(5)]
+
+        async def generate():
+            for chunk in chunks:
+                yield chunk
+
+        messages = await run_middleware(
+            StreamingResponse(generate(), media_type="text/html"), "gzip"
+        )
+        headers = response_headers(messages)
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+
+        bodies = [m["body"] for m in messages[1:] if m.get("body")]
+        assert len(bodies) >= len(chunks)
+
+        # Each flushed prefix is decodable on its own (no buffering to the end)
+        decoder = zlib.decompressobj(31)
+        assert decoder.decompress(bodies[0]) == chunks[0]
+        assert zlib.decompress(b"".join(bodies), 31) == b"".join(chunks)
+
+    async def test_brotli_negotiated_when_available(self):
+        """Test brotli is used when installed and accepted."""
+        brotli = pytest.importorskip("brotli")
+        body = "<p>row</p>" * 500
+        messages = await run_middleware(PlainTextResponse(body, media_type="text/html"), "br")
+        assert response_headers(messages)["content-encoding"] == "br"
+        assert brotli.decompress(messages[1]["body"]).decode() == body
+
+    async def test_zstd_negotiated_when_available(self):
+        """Test zstd is used when installed and accepted."""
+        zstandard = pytest.importorskip("zstandard")
+        body = "<p>row</p>" * 500
+        messages = await run_middleware(PlainTextResponse(body, media_type="text/html"), "zstd")
+        assert response_headers(messages)["content-encoding"] == "zstd"
+        decompressed = zstandard.ZstdDecompressor().decompressobj().decompress(messages[1]["body"])
+        assert decompressed.decode() == body
+
+
+@pytest.mark.asyncio
+class TestAppCompression:
+    """Test suite for compression on application routes."""
+
+    async def test_page_compressed(self, test_client: AsyncClient):
+        """Test HTML pages are compressed for clients accepting gzip."""
+        response = await test_client.get("/testcases", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert b"Test Cases" in response.content
+
+    async def test_page_identity(self, test_client: AsyncClient):
+        """Test pages are sent uncompressed to clients not accepting any coding."""
+        response = await test_client.get("/testcases", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+    async def test_compressed_etag_revalidates(self, test_client: AsyncClient):
+        """Test the coding-specific ETag still produces 304 on revalidation."""
+        created = await test_client.post(
+            "/api/testcases",
+            json={"title": "Compressed", "steps": "Steps", "expected_results": "Results"},
+        )
+        url = f"/testcases/{created.json()['id']}"
+
+        first = await test_client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert first.headers["etag"].endswith('-gzip"')
+
+        cached = await test_client.get(
+            url,
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+        )
+        assert cached.status_code == 304
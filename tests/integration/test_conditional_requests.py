@@ -0,0 +1,278 @@
+"""
+Integration tests for HTTP conditional requests.
+
+Tests ETag / Last-Modified validators, 304 Not Modified responses and
+If-Match lost-update protection on API resources and pages.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+
+async def create_testcase(client: AsyncClient, title: str = "Conditional test case") -> dict:
+    """Create a test case through the API and return its JSON."""
+    response = await client.post(
+        "/api/testcases",
+        json={"title": title, "steps": "Steps", "expected_results": "Results"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.asyncio
+class TestConditionalRequests:
+    """Test suite for conditional request handling."""
+
+    async def test_get_testcase_returns_validators(self, test_client: AsyncClient):
+        """Test single test case responses carry ETag and Last-Modified."""
+        testcase = await create_testcase(test_client)
+
+        response = await test_client.get(f"/api/testcases/{testcase['id']}")
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert "last-modified" in response.headers
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    async def test_get_testcase_if_none_match(self, test_client: AsyncClient):
+        """Test matching If-None-Match returns 304 with an empty body."""
+        testcase = await create_testcase(test_client)
+        first = await test_client.get(f"/api/testcases/{testcase['id']}")
+
+        response = await test_client.get(
+            f"/api/testcases/{testcase['id']}",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == first.headers["etag"]
+
+    async def test_get_testcase_if_modified_since(self, test_client: AsyncClient):
+        """Test If-Modified-Since equal to Last-Modified returns 304."""
+        testcase = await create_testcase(test_client)
+        first = await test_client.get(f"/api/testcases/{testcase['id']}")
+
+        response = await test_client.get(
+            f"/api/testcases/{testcase['id']}",
+            headers={"If-Modified-Since": first.headers["last-modified"]},
+        )
+        assert response.status_code == 304
+
+    async def test_if_none_match_takes_precedence(self, test_client: AsyncClient):
+        """Test a stale ETag wins over a fresh If-Modified-Since."""
+        testcase = await create_testcase(test_client)
+        first = await test_client.get(f"/api/testcases/{testcase['id']}")
+
+        response = await test_client.get(
+            f"/api/testcases/{testcase['id']}",
+            headers={
+                "If-None-Match": '"stale"',
+                "If-Modified-Since": first.headers["last-modified"],
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["id"] == testcase["id"]
+
+    async def test_testcase_etag_changes_when_tag_added(self, test_client: AsyncClient):
+        """Test adding a tag produces a new ETag for the test case."""
+        testcase = await create_testcase(test_client)
+        tag = (
+            await test_client.post("/api/tags", json={"category": "os", "value": "linux"})
+        ).json()
+        first = await test_client.get(f"/api/testcases/{testcase['id']}")
+
+        await test_client.post(f"/api/testcases/{testcase['id']}/tags/{tag['id']}")
+
+        response = await test_client.get(
+            f"/api/testcases/{testcase['id']}",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert response.status_code == 200
+        assert len(response.json()["tags"]) == 1
+
+    async def test_patch_with_matching_if_match(self, test_client: AsyncClient):
+        """Test PATCH succeeds when If-Match carries the current ETag."""
+        testcase = await create_testcase(test_client)
+        first = await test_client.get(f"/api/testcases/{testcase['id']}")
+
+        response = await test_client.patch(
+            f"/api/testcases/{testcase['id']}",
+            json={"title": "Updated title"},
+            headers={"If-Match": first.headers["etag"]},
+        )
+        assert response.status_code == 200
+        assert response.json()["title"] == "Updated title"
+        assert "etag" in response.headers
+
+    async def test_patch_with_stale_if_match(self, test_client: AsyncClient):
+        """Test PATCH with an outdated ETag is rejected with 412."""
+        testcase = await create_testcase(test_client)
+
+        response = await test_client.patch(
+            f"/api/testcases/{testcase['id']}",
+            json={"title": "Lost update"},
+            headers={"If-Match": '"stale"'},
+        )
+        assert response.status_code == 412
+
+        current = await test_client.get(f"/api/testcases/{testcase['id']}")
+        assert current.json()["title"] == "Conditional test case"
+
+    async def test_patch_tag_with_stale_if_match(self, test_client: AsyncClient):
+        """Test tag PATCH honors If-Match."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "os", "value": "mac"})
+        ).json()
+
+        response = await test_client.patch(
+            f"/api/tags/{tag['id']}",
+            json={"value": "macos"},
+            headers={"If-Match": '"stale"'},
+        )
+        assert response.status_code == 412
+
+    async def test_list_tags_not_modified(self, test_client: AsyncClient):
+        """Test the tag collection answers 304 until the set changes."""
+        await test_client.post("/api/tags", json={"category": "os", "value": "linux"})
+        first = await test_client.get("/api/tags")
+        assert "etag" in first.headers
+
+        cached = await test_client.get(
+            "/api/tags", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert cached.status_code == 304
+
+        await test_client.post("/api/tags", json={"category": "os", "value": "windows"})
+        changed = await test_client.get(
+            "/api/tags", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert changed.status_code == 200
+        assert changed.json()["total"] == 2
+
+    async def test_list_tags_revalidated_after_delete(self, test_client: AsyncClient):
+        """Test deleting a tag is not hidden by an If-Modified-Since 304."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "os", "value": "linux"})
+        ).json()
+        await test_client.post("/api/tags", json={"category": "os", "value": "windows"})
+        first = await test_client.get("/api/tags")
+        assert "last-modified" not in first.headers
+
+        await test_client.delete(f"/api/tags/{tag['id']}")
+        response = await test_client.get(
+            "/api/tags", headers={"If-Modified-Since": "Fri, 31 Dec 2999 23:59:59 GMT"}
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+    async def test_get_tag_revalidated_after_assignment(self, test_client: AsyncClient):
+        """Test a new assignment is not hidden by an If-Modified-Since 304."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "os", "value": "linux"})
+        ).json()
+        first = await test_client.get(f"/api/tags/{tag['id']}")
+        assert "last-modified" not in first.headers
+
+        await test_client.post(
+            "/api/testcases",
+            json={
+                "title": "Tagged case",
+                "steps": "Steps",
+                "expected_results": "Results",
+                "tag_ids": [tag["id"]],
+            },
+        )
+        response = await test_client.get(
+            f"/api/tags/{tag['id']}",
+            headers={"If-Modified-Since": "Fri, 31 Dec 2999 23:59:59 GMT"},
+        )
+        assert response.status_code == 200
+        assert response.json()["usage_count"] == 1
+
+    async def test_list_tags_etag_depends_on_filter(self, test_client: AsyncClient):
+        """Test filtered listings have their own ETag."""
+        await test_client.post("/api/tags", json={"category": "os", "value": "linux"})
+        unfiltered = await test_client.get("/api/tags")
+        filtered = await test_client.get("/api/tags?category=os")
+        assert unfiltered.headers["etag"] != filtered.headers["etag"]
+
+    async def test_project_testcases_not_modified(self, test_client: AsyncClient):
+        """Test the project membership collection answers 304 until it changes."""
+        project = (await test_client.post("/api/projects", json={"name": "Release"})).json()
+        testcase = await create_testcase(test_client)
+        await test_client.post(f"/api/projects/{project['id']}/testcases/{testcase['id']}")
+
+        first = await test_client.get(f"/api/projects/{project['id']}/testcases")
+        assert first.status_code == 200
+
+        cached = await test_client.get(
+            f"/api/projects/{project['id']}/testcases",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert cached.status_code == 304
+
+        other = await create_testcase(test_client, title="Another case")
+        await test_client.post(f"/api/projects/{project['id']}/testcases/{other['id']}")
+        changed = await test_client.get(
+            f"/api/projects/{project['id']}/testcases",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert changed.status_code == 200
+        assert len(changed.json()) == 2
+
+    async def test_project_testcases_modified_by_tag_delete(self, test_client: AsyncClient):
+        """Test deleting a member's tag invalidates the membership collection."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "os", "value": "linux"})
+        ).json()
+        # A later tag that stays keeps the latest tag update where it was
+        other_tag = (
+            await test_client.post("/api/tags", json={"category": "os", "value": "macos"})
+        ).json()
+        project = (await test_client.post("/api/projects", json={"name": "Release"})).json()
+        testcase = (
+            await test_client.post(
+                "/api/testcases",
+                json={
+                    "title": "Tagged case",
+                    "steps": "Steps",
+                    "expected_results": "Results",
+                    "tag_ids": [tag["id"], other_tag["id"]],
+                },
+            )
+        ).json()
+        await test_client.post(f"/api/projects/{project['id']}/testcases/{testcase['id']}")
+
+        first = await test_client.get(f"/api/projects/{project['id']}/testcases")
+        assert len(first.json()[0]["tags"]) == 2
+
+        await test_client.delete(f"/api/tags/{tag['id']}")
+        changed = await test_client.get(
+            f"/api/projects/{project['id']}/testcases",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert changed.status_code == 200
+        assert [t["id"] for t in changed.json()[0]["tags"]] == [other_tag["id"]]
+
+    async def test_project_testcases_not_found(self, test_client: AsyncClient):
+        """Test the membership collection still returns 404 for unknown projects."""
+        response = await test_client.get("/api/projects/99999/testcases")
+        assert response.status_code == 404
+
+    async def test_view_testcase_page_not_modified(self, test_client: AsyncClient):
+        """Test the test case view page answers 304 for an unchanged case."""
+        testcase = await create_testcase(test_client)
+        first = await test_client.get(f"/testcases/{testcase['id']}")
+        assert first.status_code == 200
+
+        cached = await test_client.get(
+            f"/testcases/{testcase['id']}",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert cached.status_code == 304
+
+        # Different query parameters render a different page
+        with_message = await test_client.get(
+            f"/testcases/{testcase['id']}?success=Saved",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert with_message.status_code == 200
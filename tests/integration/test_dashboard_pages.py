@@ -233,3 +233,28 @@ class TestDashboardPage:
 
         # Check that the link wrapper class is present
         assert 'class="stat-widget-link"' in content
+
+    async def test_dashboard_data_is_cached(self, test_client: AsyncClient, sample_data):
+        """Test repeated dashboard requests are served from the dashboard cache."""
+        from tcm.routes.dashboard_pages import dashboard_cache
+
+        await test_client.get("/dashboard")
+        hits = dashboard_cache.hits
+
+        response = await test_client.get("/dashboard")
+        assert response.status_code == 200
+        assert dashboard_cache.hits == hits + 2  # statistics and recent activity
+        assert b"just now" in response.content
+
+    async def test_dashboard_cache_invalidated_on_write(self, test_client: AsyncClient):
+        """Test writes through the API are visible on the next dashboard request."""
+        first = await test_client.get("/dashboard")
+        assert b"No recent activity" in first.content
+
+        await test_client.post(
+            "/api/testcases",
+            json={"title": "Freshly created case", "steps": "Steps", "expected_results": "Results"},
+        )
+
+        response = await test_client.get("/dashboard")
+        assert b"Freshly created case" in response.content
@@ -0,0 +1,152 @@
+"""
+Integration tests for relationship expansion.
+
+Tests the expand parameter on the project and test case endpoints and the
+batched loader behind it.
+"""
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tcm.expand import ExpansionLoader, parse_expand
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+
+async def seed_project(test_client: AsyncClient) -> tuple[dict, list[dict], dict]:
+    """Create a tag, two test cases (one tagged) and a project holding both."""
+    tag = (await test_client.post("/api/tags", json={"category": "module", "value": "auth"})).json()
+    testcases = [
+        (
+            await test_client.post(
+                "/api/testcases",
+                json={"title": title, "steps": "S", "expected_results": "R", "tag_ids": tag_ids},
+            )
+        ).json()
+        for title, tag_ids in (("Login", [tag["id"]]), ("Logout", []))
+    ]
+    project = (
+        await test_client.post(
+            "/api/projects",
+            json={"name": "Release", "testcase_ids": [tc["id"] for tc in testcases]},
+        )
+    ).json()
+    return project, testcases, tag
+
+
+@pytest.mark.asyncio
+class TestExpandAPI:
+    """Test suite for the expand parameter."""
+
+    async def test_project_with_testcases_and_tags(self, test_client: AsyncClient):
+        """Test a project embeds its test cases and their tags."""
+        project, testcases, tag = await seed_project(test_client)
+
+        response = await test_client.get(
+            f"/api/projects/{project['id']}?expand=testcases,testcases.tags"
+        )
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        body = response.json()
+        assert body["testcase_count"] == 2
+        assert [tc["title"] for tc in body["testcases"]] == ["Login", "Logout"]
+        assert body["testcases"][0]["tags"] == [
+            (await test_client.get(f"/api/testcases/{testcases[0]['id']}")).json()["tags"][0]
+        ]
+        assert body["testcases"][0]["tags"][0]["id"] == tag["id"]
+        assert body["testcases"][1]["tags"] == []
+
+    async def test_testcase_with_projects(self, test_client: AsyncClient):
+        """Test a test case embeds the projects it belongs to."""
+        project, testcases, _ = await seed_project(test_client)
+
+        response = await test_client.get(f"/api/testcases/{testcases[1]['id']}?expand=projects")
+        assert response.json()["projects"] == [
+            (await test_client.get(f"/api/projects/{project['id']}")).json()
+        ]
+
+    async def test_list_expansion(self, test_client: AsyncClient):
+        """Test list and batch endpoints expand every record."""
+        project, testcases, _ = await seed_project(test_client)
+        await test_client.post("/api/projects", json={"name": "Empty"})
+
+        projects = (await test_client.get("/api/projects?expand=testcases")).json()["projects"]
+        assert {p["name"]: len(p["testcases"]) for p in projects} == {"Release": 2, "Empty": 0}
+
+        listed = (await test_client.get("/api/testcases?fields=title&expand=projects")).json()
+        assert [tc["projects"][0]["id"] for tc in listed["testcases"]] == [project["id"]] * 2
+
+        batch = await test_client.post(
+            "/api/testcases:batchGet",
+            json={"ids": [testcases[0]["id"]], "expand": "projects.testcases"},
+        )
+        assert len(batch.json()["testcases"][0]["projects"][0]["testcases"]) == 2
+
+    async def test_invalid_expansion(self, test_client: AsyncClient):
+        """Test unknown and too deeply nested expansions are rejected."""
+        project, _, _ = await seed_project(test_client)
+
+        response = await test_client.get(f"/api/projects/{project['id']}?expand=owners")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown expansion: owners"
+        response = await test_client.get("/api/projects?expand=testcases.projects.testcases")
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestExpansionLoader:
+    """Test suite for the batched expansion loader."""
+
+    async def seed(self, session: AsyncSession, projects: int) -> list[dict]:
+        """Create projects of three tagged test cases each; return them as dicts."""
+        tag = Tag(category="module", value="auth")
+        created = [
+            Project(
+                name=f"Project {i}",
+                testcases=[
+                    TestCase(title=f"Case {i}.{j}", steps="S", expected_results="R", tags=[tag])
+                    for j in range(3)
+                ],
+            )
+            for i in range(projects)
+        ]
+        session.add_all(created)
+        await session.commit()
+        return [{"id": project.id} for project in created]
+
+    async def test_one_query_per_level(self, test_session: AsyncSession):
+        """Test the query count does not grow with the number of records."""
+        projects = await self.seed(test_session, 10)
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sync_engine = test_session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            tree = parse_expand("testcases.tags,testcases.projects", "project")
+            await ExpansionLoader(test_session).expand("project", projects, tree)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+        assert len(statements) == 3
+        assert all(len(project["testcases"]) == 3 for project in projects)
+        assert all(
+            len(testcase["tags"]) == 1 and len(testcase["projects"]) == 1
+            for project in projects
+            for testcase in project["testcases"]
+        )
+
+    async def test_row_limit(self, test_session: AsyncSession):
+        """Test expansions loading more rows than allowed are rejected."""
+        projects = await self.seed(test_session, 2)
+
+        loader = ExpansionLoader(test_session, max_rows=8)
+        with pytest.raises(HTTPException) as exc_info:
+            await loader.expand("project", projects, parse_expand("testcases.tags", "project"))
+        assert exc_info.value.status_code == 400
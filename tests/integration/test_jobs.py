@@ -0,0 +1,424 @@
+"""
+Integration tests for background jobs.
+
+Tests the job API, the built-in job kinds, and the runner's concurrency
+limit, cancellation, retries and recovery of jobs left by a stopped worker.
+"""
+
+import asyncio
+import csv
+import io
+from datetime import timedelta
+
+import pytest
+from httpx import AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import insert, select
+
+from tcm.config import settings
+from tcm.job_kinds import JOB_KINDS
+from tcm.jobs import JobContext, JobKind, JobRunner, retry_delay, utcnow
+from tcm.models.jobs import FINISHED_STATUSES, JobStatus, jobs
+from tcm.models.project import Project
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase
+
+
+class WaitParams(BaseModel):
+    """Parameters of the test.wait kind."""
+
+    fail_times: int = 0
+
+
+class WaitKind:
+    """The test.wait kind: jobs that wait until the test opens the gate."""
+
+    def __init__(self):
+        """Initialize with the gate closed."""
+        self.gate = asyncio.Event()
+        self.calls: list[int] = []
+        self.running = 0
+        self.peak = 0
+
+    async def handler(self, context: JobContext, params: WaitParams) -> dict:
+        """Fail the first ``fail_times`` attempts, then wait for the gate to open."""
+        self.calls.append(context.job_id)
+        if self.calls.count(context.job_id) <= params.fail_times:
+            raise RuntimeError("Flaky failure")
+        await context.report(0, 1)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.gate.wait()
+        finally:
+            self.running -= 1
+        await context.report(1)
+        return {"job_id": context.job_id}
+
+
+async def wait_for_job(
+    client: AsyncClient, job_id: int, statuses=FINISHED_STATUSES, timeout: float = 10.0
+) -> dict:
+    """Poll a job until it reaches one of the statuses."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = (await client.get(f"/api/jobs/{job_id}")).json()
+        if job["status"] in statuses:
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"Job stuck: {job}"
+        await asyncio.sleep(0.05)
+
+
+async def submit(client: AsyncClient, kind: str, **params) -> int:
+    """Submit a job through the API and return its ID."""
+    response = await client.post("/api/jobs", json={"kind": kind, "params": params})
+    assert response.status_code == 202, response.text
+    return response.json()["id"]
+
+
+def make_testcase(title: str, **kwargs) -> TestCase:
+    """Build a test case with the required fields filled in."""
+    return TestCase(title=title, steps="1. Step", expected_results="Works", **kwargs)
+
+
+@pytest.fixture
+async def wait_kind() -> WaitKind:
+    """Provide the test.wait kind."""
+    return WaitKind()
+
+
+@pytest.fixture
+async def job_runner(monkeypatch, tmp_path, test_session_maker, wait_kind: WaitKind):
+    """Run jobs against the test database, checking often, and stop after the test."""
+    monkeypatch.setattr(settings, "jobs_poll_interval", 0.05)
+    monkeypatch.setattr(settings, "jobs_heartbeat_interval", 0.05)
+    monkeypatch.setattr(settings, "jobs_retry_delay", 0.0)
+    monkeypatch.setattr(settings, "jobs_output_dir", str(tmp_path))
+    monkeypatch.setitem(JOB_KINDS, "test.wait", JobKind(wait_kind.handler, WaitParams))
+
+    runner = JobRunner(JOB_KINDS)
+    runner.start(test_session_maker)
+    yield runner
+    wait_kind.gate.set()
+    await runner.stop()
+
+
+@pytest.mark.asyncio
+class TestJobsAPI:
+    """Test suite for the job endpoints."""
+
+    async def test_submit_returns_status_url(self, test_client: AsyncClient):
+        """Test a submitted job is queued and its status URL returned."""
+        response = await test_client.post("/api/jobs", json={"kind": "search.reindex"})
+        assert response.status_code == 202
+        job = response.json()
+        assert response.headers["location"] == f"/api/jobs/{job['id']}"
+        assert job["status"] == "queued"
+        assert job["attempts"] == 0
+        assert job["max_attempts"] == settings.jobs_max_attempts
+
+        listed = (await test_client.get("/api/jobs", params={"status": "queued"})).json()
+        assert [item["id"] for item in listed["jobs"]] == [job["id"]]
+        assert listed["total"] == 1
+
+    async def test_invalid_submissions(self, test_client: AsyncClient):
+        """Test unknown kinds and invalid parameters are rejected."""
+        response = await test_client.post("/api/jobs", json={"kind": "nope"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown job kind: nope"
+
+        response = await test_client.post(
+            "/api/jobs", json={"kind": "project.clone", "params": {"project_id": 1}}
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["name"]
+
+        assert (await test_client.get("/api/jobs")).json()["total"] == 0
+
+    async def test_missing_job(self, test_client: AsyncClient):
+        """Test unknown job IDs return 404."""
+        assert (await test_client.get("/api/jobs/999")).status_code == 404
+        assert (await test_client.post("/api/jobs/999/cancel")).status_code == 404
+        assert (await test_client.get("/api/jobs/999/output")).status_code == 404
+
+    async def test_cancel_queued_job(self, test_client: AsyncClient):
+        """Test a queued job is cancelled at once and can be retried."""
+        job_id = await submit(test_client, "search.reindex")
+
+        response = await test_client.post(f"/api/jobs/{job_id}/cancel")
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+        assert response.json()["finished_at"] is not None
+
+        response = await test_client.post(f"/api/jobs/{job_id}/cancel")
+        assert response.status_code == 409
+
+        response = await test_client.post(f"/api/jobs/{job_id}/retry")
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        assert response.json()["cancel_requested"] is False
+
+        response = await test_client.post(f"/api/jobs/{job_id}/retry")
+        assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("job_runner")
+class TestJobKinds:
+    """Test suite for the built-in job kinds."""
+
+    async def test_reindex(self, test_client: AsyncClient, test_session):
+        """Test the reindex job rebuilds every entity type and reports progress."""
+        test_session.add_all(
+            [make_testcase("One"), make_testcase("Two"), Tag(category="module", value="auth")]
+        )
+        await test_session.commit()
+
+        job_id = await submit(test_client, "search.reindex", batch_size=1)
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"documents": {"testcase": 2, "tag": 1, "project": 0}}
+        assert job["progress"] == job["total"] == 3
+        assert job["attempts"] == 1
+
+    async def test_clone_project(self, test_client: AsyncClient, test_session):
+        """Test the clone job copies the project and its test case memberships."""
+        testcases = [make_testcase(f"Case {index}") for index in range(3)]
+        source = Project(name="Source", description="Original", testcases=testcases[:2])
+        test_session.add_all([source, testcases[2]])
+        await test_session.commit()
+
+        job_id = await submit(test_client, "project.clone", project_id=source.id, name="Copy")
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["result"]["testcases"] == 2
+        assert job["progress"] == job["total"] == 2
+
+        clone = (await test_client.get(f"/api/projects/{job['result']['project_id']}")).json()
+        assert clone["name"] == "Copy"
+        assert clone["description"] == "Original"
+        copied = (await test_client.get(f"/api/projects/{clone['id']}/testcases")).json()
+        assert sorted(testcase["id"] for testcase in copied) == sorted(
+            testcase.id for testcase in testcases[:2]
+        )
+
+        job_id = await submit(test_client, "project.clone", project_id=source.id, name="Copy")
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "Project with name 'Copy' already exists"
+        assert job["attempts"] == 1
+
+    async def test_import_testcases(self, test_client: AsyncClient, test_session):
+        """Test the import job creates test cases with their tags."""
+        tag = Tag(category="module", value="auth")
+        test_session.add(tag)
+        await test_session.commit()
+
+        testcases = [
+            {"title": f"Imported {index}", "steps": "S", "expected_results": "R"}
+            for index in range(3)
+        ]
+        testcases[0]["tag_ids"] = [tag.id, tag.id]
+        job_id = await submit(test_client, "testcases.import", testcases=testcases)
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["result"]["created"] == 3
+        assert job["progress"] == job["total"] == 3
+
+        first = (await test_client.get(f"/api/testcases/{job['result']['ids'][0]}")).json()
+        assert first["title"] == "Imported 0"
+        assert [item["id"] for item in first["tags"]] == [tag.id]
+
+    async def test_import_unknown_tag_fails_without_retry(self, test_client: AsyncClient):
+        """Test an import referencing a missing tag fails on its first attempt."""
+        job_id = await submit(
+            test_client,
+            "testcases.import",
+            testcases=[{"title": "T", "steps": "S", "expected_results": "R", "tag_ids": [42]}],
+        )
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "Tags with IDs {42} not found"
+        assert job["attempts"] == 1
+        assert (await test_client.get("/api/testcases")).json()["total"] == 0
+
+    async def test_export_in_process_pool(
+        self,
+        job_runner: JobRunner,
+        test_client: AsyncClient,
+        test_session,
+        test_session_maker,
+        monkeypatch,
+    ):
+        """Test the export job writes its CSV in the process pool and serves it."""
+        await job_runner.stop()
+        monkeypatch.setattr(settings, "jobs_process_workers", 1)
+        job_runner.start(test_session_maker)
+
+        tag = Tag(category="module", value="auth")
+        test_session.add_all(
+            [make_testcase("Exported, with comma", tags=[tag]), make_testcase("Also exported")]
+        )
+        await test_session.commit()
+
+        job_id = await submit(test_client, "testcases.export")
+        job = await wait_for_job(test_client, job_id, timeout=30.0)
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"file": f"job-{job_id}.csv", "rows": 2}
+
+        response = await test_client.get(f"/api/jobs/{job_id}/output")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["title"] for row in rows] == ["Exported, with comma", "Also exported"]
+        assert rows[0]["tags"] == "module:auth"
+        assert rows[0]["status"] == "draft"
+
+
+@pytest.mark.asyncio
+class TestJobRunner:
+    """Test suite for claiming, cancelling, retrying and recovering jobs."""
+
+    async def test_concurrency_limit(
+        self, job_runner: JobRunner, test_client: AsyncClient, wait_kind: WaitKind
+    ):
+        """Test no more than JOBS_CONCURRENCY jobs run at a time."""
+        ids = [await submit(test_client, "test.wait") for _ in range(settings.jobs_concurrency + 1)]
+        for job_id in ids[: settings.jobs_concurrency]:
+            await wait_for_job(test_client, job_id, statuses={"running"})
+        await asyncio.sleep(0.3)
+        assert (await test_client.get(f"/api/jobs/{ids[-1]}")).json()["status"] == "queued"
+        assert job_runner.running == settings.jobs_concurrency
+
+        wait_kind.gate.set()
+        for job_id in ids:
+            assert (await wait_for_job(test_client, job_id))["status"] == "succeeded"
+        assert wait_kind.peak == settings.jobs_concurrency
+
+    async def test_cancel_running_job(self, job_runner: JobRunner, test_client: AsyncClient):
+        """Test cancelling a running job stops its task."""
+        job_id = await submit(test_client, "test.wait")
+        await wait_for_job(test_client, job_id, statuses={"running"})
+
+        response = await test_client.post(f"/api/jobs/{job_id}/cancel")
+        assert response.json()["cancel_requested"] is True
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "cancelled"
+        assert job_runner.running == 0
+
+    async def test_retry_after_failure(
+        self, job_runner: JobRunner, test_client: AsyncClient, wait_kind: WaitKind
+    ):
+        """Test a failing job is retried until it succeeds or runs out of attempts."""
+        wait_kind.gate.set()
+        job_id = await submit(test_client, "test.wait", fail_times=1)
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 2
+
+        response = await test_client.post(
+            "/api/jobs",
+            json={"kind": "test.wait", "params": {"fail_times": 5}, "max_attempts": 2},
+        )
+        job = await wait_for_job(test_client, response.json()["id"])
+        assert job["status"] == "failed"
+        assert job["error"] == "Flaky failure"
+        assert job["attempts"] == 2
+
+        response = await test_client.post(f"/api/jobs/{job['id']}/retry")
+        assert response.status_code == 202
+        assert response.json()["attempts"] == 0
+
+    async def test_shutdown_requeues_running_jobs(
+        self,
+        job_runner: JobRunner,
+        test_client: AsyncClient,
+        test_session_maker,
+        wait_kind: WaitKind,
+    ):
+        """Test stopping the runner puts its jobs back in the queue for the next worker."""
+        job_id = await submit(test_client, "test.wait")
+        await wait_for_job(test_client, job_id, statuses={"running"})
+
+        await job_runner.stop()
+        job = (await test_client.get(f"/api/jobs/{job_id}")).json()
+        assert job["status"] == "queued"
+        assert job["attempts"] == 0
+        assert job["finished_at"] is None
+
+        wait_kind.gate.set()
+        job_runner.start(test_session_maker)
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 1
+
+    async def test_stale_job_resumes_from_saved_state(
+        self, job_runner: JobRunner, test_client: AsyncClient, test_session
+    ):
+        """Test a job whose worker stopped responding is claimed again and resumes."""
+        done = [make_testcase("Imported 0"), make_testcase("Imported 1")]
+        test_session.add_all(done)
+        await test_session.commit()
+
+        testcases = [
+            {"title": f"Imported {index}", "steps": "S", "expected_results": "R"}
+            for index in range(3)
+        ]
+        stale = utcnow() - timedelta(seconds=settings.jobs_stale_after + 1)
+        result = await test_session.execute(
+            insert(jobs).values(
+                kind="testcases.import",
+                status=JobStatus.RUNNING.value,
+                params={"testcases": testcases},
+                state={"next": 2, "ids": [testcase.id for testcase in done]},
+                progress=2,
+                attempts=1,
+                max_attempts=3,
+                cancel_requested=False,
+                worker="crashed:1",
+                run_after=stale,
+                heartbeat_at=stale,
+                created_at=stale,
+            )
+        )
+        await test_session.commit()
+        job_id = result.inserted_primary_key[0]
+
+        job = await wait_for_job(test_client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 2
+        assert job["result"]["created"] == 3
+
+        titles = (await test_session.execute(select(TestCase.title))).scalars().all()
+        assert sorted(titles) == ["Imported 0", "Imported 1", "Imported 2"]
+
+    async def test_stale_job_out_of_attempts_fails(
+        self, job_runner: JobRunner, test_client: AsyncClient, test_session
+    ):
+        """Test a stale job that has used its attempts fails instead of running again."""
+        stale = utcnow() - timedelta(seconds=settings.jobs_stale_after + 1)
+        result = await test_session.execute(
+            insert(jobs).values(
+                kind="search.reindex",
+                status=JobStatus.RUNNING.value,
+                params={},
+                progress=0,
+                attempts=3,
+                max_attempts=3,
+                cancel_requested=False,
+                worker="crashed:1",
+                run_after=stale,
+                heartbeat_at=stale,
+            )
+        )
+        await test_session.commit()
+
+        job = await wait_for_job(test_client, result.inserted_primary_key[0])
+        assert job["status"] == "failed"
+        assert job["error"] == "Worker crashed:1 stopped responding"
+
+
+def test_retry_delay():
+    """Test the retry delay doubles with each attempt up to its cap."""
+    assert [retry_delay(attempts, 10.0) for attempts in (1, 2, 3)] == [10.0, 20.0, 40.0]
+    assert retry_delay(50, 10.0) == 3600.0
@@ -0,0 +1,181 @@
+"""
+Integration tests for live updates (Server-Sent Events).
+
+Tests the events relayed from the change log to subscribed clients, the
+bounded per-client queues and the event stream on /api/events.
+"""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from tcm.config import settings
+from tcm.live_updates import HEARTBEAT, Broadcaster, LiveEvent, Subscriber, event_stream
+from tcm.routes.live import broadcaster, stream_events
+
+
+async def collect(subscriber: Subscriber, timeout: float = 2.0) -> list[LiveEvent]:
+    """Collect events until none arrives for a short while."""
+    events = []
+    event = await subscriber.next(timeout)
+    while event is not None:
+        events.append(event)
+        event = await subscriber.next(0.2)
+    return events
+
+
+@pytest.fixture
+async def fast_relay(monkeypatch):
+    """Make the relay check for changes often and stop it after the test."""
+    monkeypatch.setattr(settings, "changes_poll_interval", 0.05)
+    yield
+    await broadcaster.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("fast_relay")
+class TestLiveUpdates:
+    """Test suite for the live update broadcaster."""
+
+    async def test_dashboard_events(self, test_client: AsyncClient, test_session_maker):
+        """Test writes reach dashboard clients as statistics deltas and activity items."""
+        subscriber = await broadcaster.subscribe(["dashboard"], test_session_maker)
+        try:
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+            await test_client.post(
+                "/api/testcases",
+                json={"title": "Login works", "steps": "S", "expected_results": "R"},
+            )
+            events = await collect(subscriber)
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+        stats = [event.data for event in events if event.event == "stats"]
+        assert {"tags": 1} in stats
+        assert {"testcases": 1} in stats
+        items = [
+            item for event in events if event.event == "activity" for item in event.data["items"]
+        ]
+        assert any("Login works" in item and 'data-entity="testcase:' in item for item in items)
+        assert [event.id for event in events] == sorted(event.id for event in events)
+
+    async def test_project_membership_events(
+        self, test_client: AsyncClient, test_session_maker
+    ):
+        """Test project clients only get membership changes of their project."""
+        testcase = (
+            await test_client.post(
+                "/api/testcases", json={"title": "T", "steps": "S", "expected_results": "R"}
+            )
+        ).json()
+        first = (await test_client.post("/api/projects", json={"name": "First"})).json()
+        second = (await test_client.post("/api/projects", json={"name": "Second"})).json()
+
+        watching = await broadcaster.subscribe([f"project:{first['id']}"], test_session_maker)
+        other = await broadcaster.subscribe([f"project:{second['id']}"], test_session_maker)
+        try:
+            await test_client.post(f"/api/projects/{first['id']}/testcases/{testcase['id']}")
+            await test_client.delete(f"/api/projects/{first['id']}")
+            events = await collect(watching)
+            assert await collect(other, timeout=0.3) == []
+        finally:
+            broadcaster.unsubscribe(watching)
+            broadcaster.unsubscribe(other)
+
+        assert [(event.event, event.data) for event in events] == [
+            ("membership", {"testcase_id": testcase["id"], "action": "added"}),
+            ("project", {"action": "deleted"}),
+        ]
+
+    async def test_reconnect_after_missed_changes(
+        self, test_client: AsyncClient, test_session_maker
+    ):
+        """Test a client reconnecting with an old Last-Event-ID is told to resync."""
+        subscriber = await broadcaster.subscribe(["dashboard"], test_session_maker)
+        try:
+            await test_client.post("/api/tags", json={"category": "module", "value": "a"})
+            last_id = (await collect(subscriber))[-1].id
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+        await test_client.post("/api/tags", json={"category": "module", "value": "b"})
+
+        current = await broadcaster.subscribe(["dashboard"], test_session_maker, last_id + 1)
+        behind = await broadcaster.subscribe(["dashboard"], test_session_maker, last_id)
+        try:
+            assert await current.next(0.1) is None
+            assert (await behind.next(0.1)).event == "resync"
+        finally:
+            broadcaster.unsubscribe(current)
+            broadcaster.unsubscribe(behind)
+
+    async def test_failed_batch_skipped_with_resync(
+        self, test_client: AsyncClient, test_session_maker
+    ):
+        """Test a batch whose events cannot be built is skipped and clients resync."""
+        batches = []
+
+        async def build_events(session, changes):
+            batches.append([change["cursor"] for change in changes])
+            if len(batches) == 1:
+                raise ValueError("cannot render")
+            return [LiveEvent("dashboard", "stats", {"tags": 1}, changes[-1]["cursor"])]
+
+        local = Broadcaster(build_events)
+        subscriber = await local.subscribe(["dashboard"], test_session_maker)
+        try:
+            await test_client.post("/api/tags", json={"category": "module", "value": "a"})
+            resync = await subscriber.next(2.0)
+            assert (resync.event, resync.id) == ("resync", batches[0][-1])
+
+            await test_client.post("/api/tags", json={"category": "module", "value": "b"})
+            event = await subscriber.next(2.0)
+            assert event.event == "stats"
+            assert len(batches) == 2
+            assert batches[1][0] > batches[0][-1]
+        finally:
+            await local.close()
+
+    async def test_slow_client_gets_resync(self):
+        """Test a full queue is replaced by a single resync instead of growing."""
+        subscriber = Subscriber(["dashboard"], queue_size=2)
+        for cursor in range(1, 4):
+            subscriber.offer(LiveEvent("dashboard", "stats", {"tags": 1}, cursor))
+
+        assert subscriber.queue.qsize() == 1
+        event = await subscriber.next(0.1)
+        assert (event.event, event.id) == ("resync", 3)
+        assert subscriber.dropped == 3
+
+    async def test_event_stream_heartbeat_and_unsubscribe(self, test_session_maker):
+        """Test idle streams send heartbeats and closing the stream unsubscribes."""
+        local = Broadcaster(lambda session, changes: [])
+        stream = event_stream(local, ["dashboard"], test_session_maker, heartbeat=0.05)
+        assert local.subscriber_count == 0
+
+        assert (await anext(stream)).startswith("retry:")
+        assert local.subscriber_count == 1
+        assert await anext(stream) == HEARTBEAT
+        local.publish(LiveEvent("dashboard", "stats", {"tags": 1}, 7))
+        assert await anext(stream) == 'event: stats\nid: 7\ndata: {"tags": 1}\n\n'
+
+        await stream.aclose()
+        assert local.subscriber_count == 0
+        await asyncio.sleep(0.1)
+        assert local._relay.done()
+
+    async def test_unsent_stream_does_not_subscribe(self, test_session_maker):
+        """Test a stream response whose body never starts leaves no subscriber."""
+        response = await stream_events(
+            topic=["dashboard"], last_event_id=None, session_factory=test_session_maker
+        )
+        assert broadcaster.subscriber_count == 0
+        await response.body_iterator.aclose()
+        assert broadcaster.subscriber_count == 0
+
+    async def test_unknown_topic_rejected(self, test_client: AsyncClient):
+        """Test subscribing to an unknown topic returns 400."""
+        response = await test_client.get("/api/events", params={"topic": "testcases"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown topic: testcases"
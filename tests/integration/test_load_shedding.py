@@ -0,0 +1,317 @@
+"""
+Integration tests for load shedding.
+
+Tests route classification, per-class concurrency limits with queue-time
+budgets, shedding while the database pool is congested, pool wait
+monitoring and the load shedding metrics.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from tcm.config import Settings
+from tcm.load_shedding import (
+    LoadShedder,
+    LoadSheddingMiddleware,
+    MonitoredQueuePool,
+    PoolWaitMonitor,
+    RouteClassLimit,
+    class_limits,
+    pool_monitor,
+)
+
+
+class SlowApp:
+    """ASGI app whose responses wait until the test opens the gate."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started = 0
+
+    async def __call__(self, scope, receive, send):
+        self.started += 1
+        await self.gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def make_shedder(monitor: PoolWaitMonitor | None = None, queue_timeout: float = 1.0):
+    """Build a shedder allowing one request of each class at a time."""
+    return LoadShedder(
+        limits=[
+            RouteClassLimit("heavy", 1, queue_timeout),
+            RouteClassLimit("read", 1, queue_timeout),
+            RouteClassLimit("write", 1, queue_timeout),
+        ],
+        exempt_paths=["/health", "/static/**"],
+        heavy_paths=["/search", "/projects/*"],
+        retry_after=7,
+        monitor=monitor,
+    )
+
+
+async def request(middleware: LoadSheddingMiddleware, path: str, method: str = "GET") -> dict:
+    """Send a request through the middleware and return its status, headers and body."""
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return {
+        "status": messages[0]["status"],
+        "headers": {k.decode(): v.decode() for k, v in messages[0]["headers"]},
+        "body": messages[1]["body"],
+    }
+
+
+async def started(app: SlowApp, count: int) -> None:
+    """Wait until the app has started handling a number of requests."""
+    while app.started < count:
+        await asyncio.sleep(0.01)
+
+
+class TestClassify:
+    """Test suite for route classification."""
+
+    def test_route_classes(self):
+        """Test requests are sorted into exempt, write, heavy and read classes."""
+        shedder = make_shedder()
+        assert shedder.classify("GET", "/health") is None
+        assert shedder.classify("GET", "/static/dist/app.css") is None
+        assert shedder.classify("POST", "/api/testcases") == "write"
+        assert shedder.classify("DELETE", "/api/tags/3") == "write"
+        assert shedder.classify("POST", "/projects/7/edit") == "write"
+        assert shedder.classify("GET", "/search") == "heavy"
+        assert shedder.classify("GET", "/projects/7") == "heavy"
+        assert shedder.classify("GET", "/projects/7/edit") == "read"
+        assert shedder.classify("HEAD", "/api/testcases/7") == "read"
+
+
+class TestClassLimits:
+    """Test suite for the per-worker route class limits."""
+
+    def test_default_limits_fit_connection_share(self):
+        """Test derived limits never admit more requests than the worker has connections."""
+        for workers in (1, 3, 16, 100):
+            config = Settings(
+                server_workers=workers, database_max_connections=80, database_pool_size=10
+            )
+            connections = max(1, 80 // workers)
+            limits = class_limits(config)
+            assert min(limits.values()) >= 1
+            if connections >= 3:
+                assert sum(limits.values()) <= connections
+
+        limits = class_limits(Settings(server_workers=16, database_max_connections=80))
+        assert limits == {"heavy": 1, "read": 3, "write": 1}
+
+    def test_explicit_limits_over_pool_warn(self, caplog):
+        """Test explicit limits are kept but warned about when they exceed the pool."""
+        config = Settings(
+            server_workers=16,
+            database_max_connections=80,
+            load_shedding_heavy_limit=4,
+            load_shedding_read_limit=16,
+            load_shedding_write_limit=8,
+        )
+        with caplog.at_level(logging.WARNING, logger="tcm.load_shedding"):
+            assert class_limits(config) == {"heavy": 4, "read": 16, "write": 8}
+        assert "5 database connections" in caplog.text
+
+
+@pytest.mark.asyncio
+class TestLoadSheddingMiddleware:
+    """Test suite for LoadSheddingMiddleware."""
+
+    async def test_queued_request_gets_freed_slot(self):
+        """Test a request over the limit waits and runs when a slot frees up."""
+        app = SlowApp()
+        shedder = make_shedder()
+        middleware = LoadSheddingMiddleware(app, shedder)
+
+        first = asyncio.create_task(request(middleware, "/api/tags"))
+        second = asyncio.create_task(request(middleware, "/api/tags"))
+        await started(app, 1)
+        await asyncio.sleep(0.05)
+        assert app.started == 1
+        assert shedder.stats()["classes"]["read"]["queued"] == 1
+
+        app.gate.set()
+        assert (await first)["status"] == 200
+        assert (await second)["status"] == 200
+        stats = shedder.stats()["classes"]["read"]
+        assert stats["admitted"] == 2
+        assert stats["active"] == 0
+        assert stats["max_queue_wait"] > 0
+
+    async def test_queue_timeout_sheds_request(self):
+        """Test a request that waits past its class's budget gets 503 with Retry-After."""
+        app = SlowApp()
+        shedder = make_shedder(queue_timeout=0.1)
+        middleware = LoadSheddingMiddleware(app, shedder)
+
+        first = asyncio.create_task(request(middleware, "/search"))
+        await started(app, 1)
+        response = await request(middleware, "/search")
+        assert response["status"] == 503
+        assert response["headers"]["retry-after"] == "7"
+        assert json.loads(response["body"]) == {"detail": "Server is busy, please retry later"}
+
+        app.gate.set()
+        assert (await first)["status"] == 200
+        stats = shedder.stats()["classes"]["heavy"]
+        assert (stats["admitted"], stats["shed"], stats["queued"]) == (1, 1, 0)
+
+    async def test_classes_keep_their_own_capacity(self):
+        """Test full heavy and read classes leave writes and health checks their slots."""
+        app = SlowApp()
+        middleware = LoadSheddingMiddleware(app, make_shedder(queue_timeout=0.1))
+
+        busy = [
+            asyncio.create_task(request(middleware, "/search")),
+            asyncio.create_task(request(middleware, "/api/tags")),
+        ]
+        await started(app, 2)
+        write = asyncio.create_task(request(middleware, "/api/tags", method="POST"))
+        health = asyncio.create_task(request(middleware, "/health"))
+        await started(app, 4)
+
+        app.gate.set()
+        for task in [*busy, write, health]:
+            assert (await task)["status"] == 200
+
+    async def test_client_leaving_queue(self):
+        """Test a request cancelled while queued gives up its place without taking a slot."""
+        app = SlowApp()
+        shedder = make_shedder()
+        middleware = LoadSheddingMiddleware(app, shedder)
+
+        first = asyncio.create_task(request(middleware, "/api/tags"))
+        await started(app, 1)
+        queued = asyncio.create_task(request(middleware, "/api/tags"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        app.gate.set()
+        await first
+        stats = shedder.stats()["classes"]["read"]
+        assert (stats["active"], stats["queued"]) == (0, 0)
+        assert (await request(middleware, "/api/tags"))["status"] == 200
+
+    async def test_pool_congestion_sheds_reads(self):
+        """Test a slow pool checkout sheds heavy reads and reads that would queue."""
+        app = SlowApp()
+        monitor = PoolWaitMonitor(threshold=0.2, cooldown=0.3)
+        shedder = make_shedder(monitor)
+        middleware = LoadSheddingMiddleware(app, shedder)
+        app.gate.set()
+
+        monitor.record(0.05)
+        assert monitor.congested_for() == 0
+        monitor.record(0.25)
+        assert monitor.congested_for() > 0
+
+        response = await request(middleware, "/projects/3")
+        assert response["status"] == 503
+        assert response["headers"]["retry-after"] == "1"
+        assert (await request(middleware, "/api/tags"))["status"] == 200
+        assert (await request(middleware, "/api/tags", method="POST"))["status"] == 200
+
+        app.gate.clear()
+        busy = asyncio.create_task(request(middleware, "/api/tags"))
+        await started(app, 3)
+        assert (await request(middleware, "/api/tags"))["status"] == 503
+        app.gate.set()
+        await busy
+
+        await asyncio.sleep(0.3)
+        assert (await request(middleware, "/projects/3"))["status"] == 200
+        stats = shedder.stats()
+        assert stats["shed_congested"] == 2
+        assert stats["database_pool"]["slow_checkouts"] == 1
+        assert stats["database_pool"]["max_wait"] == 0.25
+
+
+@pytest.mark.asyncio
+class TestPoolMonitoring:
+    """Test suite for database pool wait monitoring."""
+
+    async def test_checkout_waits_recorded(self, tmp_path, monkeypatch):
+        """Test the monitored pool records how long checkouts waited for a connection."""
+        monkeypatch.setattr(pool_monitor, "threshold", 60.0)
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=MonitoredQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        checkouts = pool_monitor.checkouts
+        try:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+                async def second_checkout():
+                    async with engine.connect() as other:
+                        await other.execute(text("SELECT 1"))
+
+                waiting = asyncio.create_task(second_checkout())
+                await asyncio.sleep(0.2)
+            await waiting
+        finally:
+            await engine.dispose()
+
+        assert pool_monitor.checkouts == checkouts + 2
+        assert pool_monitor.max_wait >= 0.15
+
+    async def test_connect_time_not_counted_as_wait(self, tmp_path, monkeypatch):
+        """Test opening a slow new connection does not count as waiting for the pool."""
+        monkeypatch.setattr(pool_monitor, "max_wait", 0.0)
+        monkeypatch.setattr(pool_monitor, "slow_checkouts", 0)
+        create_connection = MonitoredQueuePool._create_connection
+
+        def slow_create_connection(self):
+            time.sleep(0.2)
+            return create_connection(self)
+
+        monkeypatch.setattr(MonitoredQueuePool, "_create_connection", slow_create_connection)
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=MonitoredQueuePool
+        )
+        try:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
+        assert pool_monitor.max_wait < 0.1
+        assert pool_monitor.slow_checkouts == 0
+
+
+@pytest.mark.asyncio
+class TestLoadSheddingMetrics:
+    """Test suite for the load shedding metrics endpoint."""
+
+    async def test_metrics(self, test_client: AsyncClient):
+        """Test /metrics reports each route class and the database pool."""
+        before = (await test_client.get("/metrics")).json()["load_shedding"]
+        await test_client.get("/api/tags")
+        after = (await test_client.get("/metrics")).json()["load_shedding"]
+
+        assert set(after["classes"]) == {"heavy", "read", "write"}
+        assert after["classes"]["read"]["admitted"] == before["classes"]["read"]["admitted"] + 1
+        assert after["classes"]["read"]["active"] == 0
+        assert "checkouts" in after["database_pool"]
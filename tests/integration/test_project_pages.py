@@ -102,6 +102,17 @@ class TestProjectsListPage:
         assert b"Project Beta" in response.content
         assert b"Project Gamma" in response.content
 
+    async def test_projects_list_shows_testcase_counts(
+        self, test_client: AsyncClient, sample_projects, sample_testcases
+    ):
+        """Test the list shows each project's member count."""
+        project = sample_projects[0]
+        for testcase in sample_testcases[:2]:
+            await test_client.post(f"/api/projects/{project.id}/testcases/{testcase.id}")
+
+        response = await test_client.get("/projects")
+        assert '<td class="text-center">2</td>' in response.text
+
     async def test_projects_list_filter_by_status(self, test_client: AsyncClient, sample_projects):
         """Test filtering projects by status."""
         response = await test_client.get("/projects?status=active")
@@ -130,6 +141,30 @@ class TestProjectsListPage:
         assert b"No projects found" in response.content
 
 
+@pytest.mark.asyncio
+class TestProjectsListPartial:
+    """Test suite for partial updates of the projects list."""
+
+    async def test_partial_request_returns_results_fragment(
+        self, test_client: AsyncClient, sample_projects
+    ):
+        """Test an HX-Request gets only the projects table."""
+        response = await test_client.get("/projects?status=active", headers={"HX-Request": "true"})
+        assert response.status_code == 200
+        assert response.text.startswith('<div data-partial-root="true" id="projects-results"')
+        assert "Project Alpha" in response.text
+        assert "Project Beta" not in response.text
+        assert "<html" not in response.text
+        assert "All Statuses" not in response.text
+        assert "HX-Request" in response.headers["vary"]
+
+    async def test_full_page_wires_partial_updates(self, test_client: AsyncClient):
+        """Test the full page marks the filter form for partial updates."""
+        response = await test_client.get("/projects")
+        assert 'data-partial-target="projects-results"' in response.text
+        assert 'id="projects-results"' in response.text
+
+
 @pytest.mark.asyncio
 class TestCreateProjectPage:
     """Test suite for create project page."""
@@ -340,6 +375,81 @@ class TestViewProjectPage:
         assert response.status_code == 200
         assert testcase.title.encode() in response.content
 
+    async def test_view_project_does_not_embed_available_testcases(
+        self, test_client: AsyncClient, sample_projects, sample_testcases
+    ):
+        """Test members stream into the table while the add modal is searched on demand."""
+        project = sample_projects[0]
+        member, other = sample_testcases[0], sample_testcases[1]
+        await test_client.post(f"/api/projects/{project.id}/testcases/{member.id}")
+
+        response = await test_client.get(f"/projects/{project.id}")
+        assert response.status_code == 200
+        html = response.text
+        table, modal = html.split('id="add-testcase-modal"')
+        assert f'href="/testcases/{member.id}"' in table
+        assert other.title not in html
+        assert 'id="picker_search"' in modal
+        assert "project-testcase-picker" in html
+        assert "Test Cases:</strong><span> 1</span>" in html
+
+    async def test_view_project_paginates_members(
+        self, test_client: AsyncClient, sample_projects
+    ):
+        """Test the member table shows one page with pagination links."""
+        project = sample_projects[0]
+        for i in range(55):
+            response = await test_client.post(
+                "/api/testcases",
+                json={"title": f"Member {i:02d}", "steps": "Steps", "expected_results": "Results"},
+            )
+            await test_client.post(
+                f"/api/projects/{project.id}/testcases/{response.json()['id']}"
+            )
+
+        response = await test_client.get(f"/projects/{project.id}", params={"sort": "title"})
+        html = response.text
+        assert html.count('class="testcase-row"') == 50
+        assert "Member 49" in html and "Member 50" not in html
+        assert "Page 1 of 2" in html
+        assert f'href="/projects/{project.id}?sort=title&amp;page=2"' in html
+
+        response = await test_client.get(
+            f"/projects/{project.id}", params={"sort": "title", "order": "desc", "page": 2}
+        )
+        html = response.text
+        assert html.count('class="testcase-row"') == 5
+        assert "Member 04" in html and "Member 05" not in html
+
+    async def test_view_project_status_rollup_and_filter(
+        self, test_client: AsyncClient, sample_projects
+    ):
+        """Test per-status counts are shown and link to the status filter."""
+        project = sample_projects[0]
+        members = [("Active one", "active"), ("Active two", "active"), ("Draft", "draft")]
+        for title, status in members:
+            response = await test_client.post(
+                "/api/testcases",
+                json={"title": title, "steps": "S", "expected_results": "R", "status": status},
+            )
+            await test_client.post(
+                f"/api/projects/{project.id}/testcases/{response.json()['id']}"
+            )
+
+        response = await test_client.get(f"/projects/{project.id}")
+        html = response.text
+        assert 'class="status-rollup"' in html
+        assert '<span class="status-badge status-active">Active</span><span> 2</span>' in html
+        assert f'href="/projects/{project.id}?status=active"' in html
+
+        response = await test_client.get(f"/projects/{project.id}", params={"status": "active"})
+        html = response.text
+        assert html.count('class="testcase-row"') == 2
+        assert "2 of 3 test cases match" in html
+
+        response = await test_client.get(f"/projects/{project.id}", params={"q": "nothing"})
+        assert "No test cases match the filters." in response.text
+
     async def test_view_project_shows_add_testcases_button(
         self, test_client: AsyncClient, sample_projects
     ):
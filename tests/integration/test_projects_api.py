@@ -6,6 +6,7 @@ Tests all CRUD operations and test case management for the /api/projects endpoin
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
 
 @pytest.mark.asyncio
@@ -440,3 +441,289 @@ class TestProjectsAPI:
         )
         assert response.status_code == 404
         assert "not associated" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+class TestAvailableTestCasesAPI:
+    """Test suite for searching test cases that can be added to a project."""
+
+    async def create_testcase(self, client: AsyncClient, title: str, **fields) -> int:
+        """Create a test case and return its ID."""
+        response = await client.post(
+            "/api/testcases",
+            json={"title": title, "steps": "Steps", "expected_results": "Results", **fields},
+        )
+        return response.json()["id"]
+
+    async def create_project(self, client: AsyncClient, testcase_ids: list[int]) -> int:
+        """Create a project with the given members and return its ID."""
+        response = await client.post(
+            "/api/projects", json={"name": "Picker project", "testcase_ids": testcase_ids}
+        )
+        return response.json()["id"]
+
+    async def test_excludes_members(self, test_client: AsyncClient):
+        """Test only test cases outside the project are returned."""
+        member = await self.create_testcase(test_client, "Login works")
+        other = await self.create_testcase(test_client, "Logout works")
+        project_id = await self.create_project(test_client, [member])
+
+        response = await test_client.get(f"/api/projects/{project_id}/available-testcases")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert [tc["id"] for tc in data["testcases"]] == [other]
+        assert set(data["testcases"][0]) == {"id", "title", "status", "priority"}
+
+    async def test_search_and_filters(self, test_client: AsyncClient):
+        """Test title search and status, priority and tag filters."""
+        tag = await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        tag_id = tag.json()["id"]
+        login = await self.create_testcase(
+            test_client, "Login works", status="active", priority="high", tag_ids=[tag_id]
+        )
+        await self.create_testcase(test_client, "Login fails", status="draft", priority="high")
+        await self.create_testcase(test_client, "Checkout", status="active", priority="low")
+        project_id = await self.create_project(test_client, [])
+        url = f"/api/projects/{project_id}/available-testcases"
+
+        response = await test_client.get(url, params={"q": "login"})
+        assert response.json()["total"] == 2
+
+        response = await test_client.get(url, params={"q": "login", "status": "active"})
+        assert [tc["id"] for tc in response.json()["testcases"]] == [login]
+
+        response = await test_client.get(url, params={"priority": "low"})
+        assert [tc["title"] for tc in response.json()["testcases"]] == ["Checkout"]
+
+        response = await test_client.get(url, params={"tag_id": tag_id})
+        assert [tc["id"] for tc in response.json()["testcases"]] == [login]
+
+    async def test_pagination(self, test_client: AsyncClient):
+        """Test results are paginated newest first with the full total."""
+        ids = [await self.create_testcase(test_client, f"Case {i}") for i in range(5)]
+        project_id = await self.create_project(test_client, [])
+
+        response = await test_client.get(
+            f"/api/projects/{project_id}/available-testcases", params={"skip": 2, "limit": 2}
+        )
+        data = response.json()
+        assert data["total"] == 5
+        assert [tc["id"] for tc in data["testcases"]] == [ids[2], ids[1]]
+
+    async def test_project_not_found(self, test_client: AsyncClient):
+        """Test searching for a missing project returns 404."""
+        response = await test_client.get("/api/projects/99999/available-testcases")
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+class TestProjectTestCasesListing:
+    """Test suite for paginating, sorting and filtering project members."""
+
+    async def create_project(self, client: AsyncClient) -> tuple[int, dict[str, int]]:
+        """Create a project with four members; return its ID and member IDs by title."""
+        ids = {}
+        for title, status, priority in [
+            ("Bravo", "active", "low"),
+            ("Alpha", "draft", "critical"),
+            ("Delta", "active", "medium"),
+            ("Charlie", "archived", "high"),
+        ]:
+            response = await client.post(
+                "/api/testcases",
+                json={
+                    "title": title,
+                    "steps": "Steps",
+                    "expected_results": "Results",
+                    "status": status,
+                    "priority": priority,
+                },
+            )
+            ids[title] = response.json()["id"]
+        response = await client.post("/api/projects", json={"name": "Release"})
+        project_id = response.json()["id"]
+        for testcase_id in ids.values():
+            await client.post(f"/api/projects/{project_id}/testcases/{testcase_id}")
+        return project_id, ids
+
+    async def titles(self, client: AsyncClient, project_id: int, **params) -> list[str]:
+        """Return the member titles for the given query parameters."""
+        response = await client.get(f"/api/projects/{project_id}/testcases", params=params)
+        assert response.status_code == 200
+        return [tc["title"] for tc in response.json()]
+
+    async def test_pagination_and_total(self, test_client: AsyncClient):
+        """Test members are paginated in the order they were added."""
+        project_id, _ = await self.create_project(test_client)
+
+        response = await test_client.get(
+            f"/api/projects/{project_id}/testcases", params={"skip": 1, "limit": 2}
+        )
+        assert [tc["title"] for tc in response.json()] == ["Alpha", "Delta"]
+        assert response.headers["x-total-count"] == "4"
+
+    async def test_sorting(self, test_client: AsyncClient):
+        """Test sorting by title, status and priority in logical order."""
+        project_id, _ = await self.create_project(test_client)
+
+        assert await self.titles(test_client, project_id, sort="title") == [
+            "Alpha", "Bravo", "Charlie", "Delta"
+        ]
+        assert await self.titles(test_client, project_id, sort="priority", order="desc") == [
+            "Alpha", "Charlie", "Delta", "Bravo"
+        ]
+        assert await self.titles(test_client, project_id, sort="status") == [
+            "Alpha", "Bravo", "Delta", "Charlie"
+        ]
+
+    async def test_filters(self, test_client: AsyncClient):
+        """Test status, priority and title filters."""
+        project_id, _ = await self.create_project(test_client)
+
+        assert await self.titles(test_client, project_id, status="active") == ["Bravo", "Delta"]
+        assert await self.titles(test_client, project_id, priority="high") == ["Charlie"]
+        assert await self.titles(test_client, project_id, q="ta") == ["Delta"]
+
+    async def test_invalid_sort(self, test_client: AsyncClient):
+        """Test an unknown sort key is rejected."""
+        project_id, _ = await self.create_project(test_client)
+        response = await test_client.get(
+            f"/api/projects/{project_id}/testcases", params={"sort": "id"}
+        )
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestProjectTestCaseCount:
+    """Test suite for the aggregated testcase_count field."""
+
+    async def create_testcase(self, client: AsyncClient, title: str) -> int:
+        """Create a test case and return its ID."""
+        response = await client.post(
+            "/api/testcases",
+            json={"title": title, "steps": "Steps", "expected_results": "Results"},
+        )
+        return response.json()["id"]
+
+    async def test_counts_in_list_and_detail(self, test_client: AsyncClient):
+        """Test list and detail responses include the member count."""
+        ids = [await self.create_testcase(test_client, f"Case {i}") for i in range(3)]
+        full = await test_client.post("/api/projects", json={"name": "Full", "testcase_ids": ids})
+        assert full.json()["testcase_count"] == 3
+        await test_client.post("/api/projects", json={"name": "Empty"})
+
+        response = await test_client.get("/api/projects")
+        counts = {
+            project["name"]: project["testcase_count"] for project in response.json()["projects"]
+        }
+        assert counts == {"Full": 3, "Empty": 0}
+
+        response = await test_client.get(f"/api/projects/{full.json()['id']}")
+        assert response.json()["testcase_count"] == 3
+
+    async def test_count_after_membership_changes(self, test_client: AsyncClient):
+        """Test add/remove responses and the ETag follow the member count."""
+        testcase_id = await self.create_testcase(test_client, "Case")
+        project = await test_client.post("/api/projects", json={"name": "Project"})
+        project_id = project.json()["id"]
+
+        response = await test_client.post(f"/api/projects/{project_id}/testcases/{testcase_id}")
+        assert response.json()["testcase_count"] == 1
+        etag = (await test_client.get(f"/api/projects/{project_id}")).headers["etag"]
+
+        # Deleting a member test case does not touch the project row
+        await test_client.delete(f"/api/testcases/{testcase_id}")
+        response = await test_client.get(
+            f"/api/projects/{project_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["testcase_count"] == 0
+
+
+    async def test_membership_writes_do_not_load_members(
+        self, test_client: AsyncClient, test_engine
+    ):
+        """Test update/add/remove count the members instead of loading them."""
+        ids = [await self.create_testcase(test_client, f"Case {i}") for i in range(3)]
+        project = await test_client.post("/api/projects", json={"name": "P", "testcase_ids": ids})
+        project_id = project.json()["id"]
+        other_id = await self.create_testcase(test_client, "Other")
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            patched = await test_client.patch(f"/api/projects/{project_id}", json={"name": "Q"})
+            added = await test_client.post(f"/api/projects/{project_id}/testcases/{other_id}")
+            removed = await test_client.delete(f"/api/projects/{project_id}/testcases/{ids[0]}")
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        assert patched.json()["testcase_count"] == 3
+        assert added.json()["testcase_count"] == 4
+        assert removed.json()["testcase_count"] == 3
+        # The project's member collection is the only load joining test cases
+        assert not any(
+            "project_testcases" in statement and "JOIN testcases" in statement
+            for statement in statements
+        )
+
+@pytest.mark.asyncio
+class TestProjectSparseFields:
+    """Test suite for the project list encoding and sparse fieldsets."""
+
+    async def test_list_matches_detail_representation(self, test_client: AsyncClient):
+        """Test list items are encoded exactly like the validated detail response."""
+        testcase = (
+            await test_client.post(
+                "/api/testcases", json={"title": "Case", "steps": "S", "expected_results": "R"}
+            )
+        ).json()
+        project = (
+            await test_client.post(
+                "/api/projects",
+                json={
+                    "name": "Release",
+                    "description": "Q3 release",
+                    "start_date": "2026-07-01T00:00:00",
+                    "testcase_ids": [testcase["id"]],
+                },
+            )
+        ).json()
+
+        listed = (await test_client.get("/api/projects")).json()["projects"]
+        detail = (await test_client.get(f"/api/projects/{project['id']}")).json()
+        assert listed == [detail]
+        assert list(listed[0]) == list(detail)
+
+    async def test_summary_fieldset(self, test_client: AsyncClient):
+        """Test fields=summary leaves out the description and audit fields."""
+        await test_client.post("/api/projects", json={"name": "Release", "description": "Long"})
+
+        response = await test_client.get("/api/projects?fields=summary")
+        assert response.status_code == 200
+        assert list(response.json()["projects"][0]) == [
+            "name",
+            "status",
+            "start_date",
+            "end_date",
+            "id",
+            "updated_at",
+            "testcase_count",
+        ]
+
+    async def test_explicit_fields_without_count(self, test_client: AsyncClient):
+        """Test listed fields are returned without the aggregated count."""
+        project = (await test_client.post("/api/projects", json={"name": "Release"})).json()
+
+        response = await test_client.get("/api/projects?fields=name")
+        assert response.json()["projects"] == [{"name": "Release", "id": project["id"]}]
+
+    async def test_unknown_field(self, test_client: AsyncClient):
+        """Test unknown fields are rejected."""
+        response = await test_client.get("/api/projects?fields=name,budget")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown fields: budget"
@@ -0,0 +1,183 @@
+"""
+Integration tests for the unified search index.
+
+Tests incremental maintenance of search documents, ranked queries with
+facets, and the batched rebuild.
+"""
+
+import pytest
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tcm.models.project import Project, ProjectStatus
+from tcm.models.search import search_documents
+from tcm.models.tag import Tag
+from tcm.models.testcase import TestCase, TestCaseStatus
+from tcm.search_index import rebuild_search_index, search_documents_page
+
+
+async def documents(session: AsyncSession) -> dict[tuple[str, int], dict]:
+    """Return all search documents by (entity type, entity ID)."""
+    result = await session.execute(select(search_documents))
+    return {(row["entity_type"], row["entity_id"]): dict(row) for row in result.mappings()}
+
+
+def make_testcase(title: str, **kwargs) -> TestCase:
+    """Build a test case with the required fields filled in."""
+    return TestCase(title=title, steps="1. Step", expected_results="Works", **kwargs)
+
+
+@pytest.mark.asyncio
+class TestSearchIndexMaintenance:
+    """Test suite for incremental search document maintenance."""
+
+    async def test_documents_written_with_entities(self, test_session: AsyncSession):
+        """Test creating entities indexes their text and filter columns."""
+        tag = Tag(category="module", value="checkout", description="Checkout flow")
+        testcase = make_testcase(
+            "Pay by card", description="Card payment", status=TestCaseStatus.ACTIVE, tags=[tag]
+        )
+        project = Project(name="Payments", status=ProjectStatus.ON_HOLD)
+        test_session.add_all([tag, testcase, project])
+        await test_session.commit()
+
+        docs = await documents(test_session)
+        assert docs[("tag", tag.id)]["title"] == "module: checkout"
+        assert docs[("tag", tag.id)]["category"] == "module"
+        assert docs[("testcase", testcase.id)]["content"] == "Card payment 1. Step"
+        assert docs[("testcase", testcase.id)]["status"] == "active"
+        assert docs[("testcase", testcase.id)]["priority"] == "medium"
+        assert docs[("project", project.id)]["status"] == "on_hold"
+
+    async def test_update_and_delete(self, test_session: AsyncSession):
+        """Test updates rewrite the document and deletes remove it."""
+        testcase = make_testcase("Old title")
+        tag = Tag(category="module", value="gone")
+        test_session.add_all([testcase, tag])
+        await test_session.commit()
+
+        testcase.title = "New title"
+        await test_session.delete(tag)
+        await test_session.commit()
+
+        docs = await documents(test_session)
+        assert docs[("testcase", testcase.id)]["title"] == "New title"
+        assert ("tag", tag.id) not in docs
+
+
+@pytest.mark.asyncio
+class TestSearchDocumentsPage:
+    """Test suite for the ranked search query."""
+
+    async def test_ranked_by_title_match(self, test_session: AsyncSession):
+        """Test exact and prefix title matches rank above content matches."""
+        content_match = make_testcase("Login", description="Uses the checkout page")
+        prefix_match = make_testcase("Checkout with coupon")
+        exact_match = Project(name="Checkout")
+        test_session.add_all([content_match, prefix_match, exact_match])
+        await test_session.commit()
+
+        results, facets = await search_documents_page(test_session, "CHECKOUT")
+        assert [(doc["entity_type"], doc["entity_id"]) for doc in results] == [
+            ("project", exact_match.id),
+            ("testcase", prefix_match.id),
+            ("testcase", content_match.id),
+        ]
+        assert facets == {"testcase": 2, "project": 1, "tag": 0}
+
+    async def test_pagination_and_entity_type(self, test_session: AsyncSession):
+        """Test pages follow the ranking and facets ignore the type filter."""
+        test_session.add_all([make_testcase(f"Report {i}") for i in range(5)])
+        test_session.add(Tag(category="report", value="weekly"))
+        await test_session.commit()
+
+        first, facets = await search_documents_page(
+            test_session, "report", entity_type="testcase", limit=3
+        )
+        second, _ = await search_documents_page(
+            test_session, "report", entity_type="testcase", skip=3, limit=3
+        )
+        assert len(first) == 3 and len(second) == 2
+        assert {doc["entity_type"] for doc in first + second} == {"testcase"}
+        assert facets == {"testcase": 5, "project": 0, "tag": 1}
+
+    async def test_filters(self, test_session: AsyncSession):
+        """Test status and category filters only apply to entities having them."""
+        test_session.add_all(
+            [
+                make_testcase("Audit draft", status=TestCaseStatus.DRAFT),
+                make_testcase("Audit active", status=TestCaseStatus.ACTIVE),
+                Tag(category="compliance", value="audit"),
+                Tag(category="other", value="audit"),
+            ]
+        )
+        await test_session.commit()
+
+        results, _ = await search_documents_page(
+            test_session, "audit", status="active", category="compliance"
+        )
+        assert sorted(doc["title"] for doc in results) == ["Audit active", "compliance: audit"]
+
+    async def test_like_wildcards_are_literal(self, test_session: AsyncSession):
+        """Test % and _ in the query match literally."""
+        test_session.add_all([make_testcase("100% coverage"), make_testcase("1000 users")])
+        await test_session.commit()
+
+        results, _ = await search_documents_page(test_session, "100%")
+        assert [doc["title"] for doc in results] == ["100% coverage"]
+
+
+@pytest.mark.asyncio
+class TestRebuildSearchIndex:
+    """Test suite for the batched index rebuild."""
+
+    async def test_rebuild(self, test_session: AsyncSession, test_session_maker):
+        """Test a rebuild indexes rows written around the ORM and drops stale documents."""
+        test_session.add_all([make_testcase(f"Case {i}") for i in range(5)])
+        await test_session.commit()
+        # Bulk load and delete behind the flush listener's back
+        await test_session.execute(
+            insert(Tag), [{"category": "bulk", "value": f"tag {i}"} for i in range(3)]
+        )
+        await test_session.execute(delete(TestCase).where(TestCase.id == 5))
+        await test_session.commit()
+
+        counts = await rebuild_search_index(test_session_maker, batch_size=2)
+
+        assert counts == {"testcase": 4, "project": 0, "tag": 3}
+        docs = await documents(test_session)
+        testcase_keys = {key for key in docs if key[0] == "testcase"}
+        assert testcase_keys == {("testcase", i) for i in range(1, 5)}
+        assert len([key for key in docs if key[0] == "tag"]) == 3
+
+    async def test_write_interleaved_with_rebuild_batch(
+        self, test_session: AsyncSession, test_engine
+    ):
+        """Test a write reindexing a document a rebuild batch just rewrote does not conflict."""
+        testcase = make_testcase("Before")
+        test_session.add(testcase)
+        await test_session.commit()
+
+        # A rebuild batch committing the same document while the write reindexes it
+        rebuild_sql = (
+            "INSERT INTO search_documents (entity_type, entity_id, title, content) "
+            f"VALUES ('testcase', {testcase.id}, 'Rebuilt', '') "
+            "ON CONFLICT (entity_type, entity_id) DO UPDATE SET title = excluded.title"
+        )
+        interleaved = []
+
+        def rebuild_batch(conn, cursor, statement, parameters, context, executemany):
+            if not interleaved and statement.startswith("INSERT INTO search_documents"):
+                interleaved.append(statement)
+                conn.connection.cursor().execute(rebuild_sql)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", rebuild_batch)
+        try:
+            testcase.title = "After"
+            await test_session.commit()
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", rebuild_batch)
+
+        assert interleaved
+        docs = await documents(test_session)
+        assert docs[("testcase", testcase.id)]["title"] == "After"
@@ -4,6 +4,8 @@ Integration tests for search page.
 Tests global search across test cases, projects, and tags.
 """
 
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -245,6 +247,14 @@ class TestSearchPage:
         # Should show tags for test cases
         assert b"unit" in response.content or b"search" in response.content
 
+    async def test_search_shows_aggregated_counts(self, test_client: AsyncClient, sample_data):
+        """Test project member and tag usage counts come out of the search query."""
+        response = await test_client.get("/search?q=search&entity_type=project")
+        assert "Test Cases: 1" in response.text
+
+        response = await test_client.get("/search?q=unit&entity_type=tag")
+        assert "Test Cases: 1" in response.text
+
     async def test_search_description_search(self, test_client: AsyncClient, sample_data):
         """Test searching in descriptions."""
         response = await test_client.get("/search?q=functionality")
@@ -271,3 +281,64 @@ class TestSearchPage:
 
         # Should find at least 2 different types
         assert found_types >= 2
+
+
+@pytest.mark.asyncio
+class TestConcurrentSearch:
+    """Test suite for concurrent entity searches with timeouts."""
+
+    async def test_server_timing_header(self, test_client: AsyncClient, sample_data):
+        """Test each entity search reports its duration."""
+        response = await test_client.get("/search?q=search")
+        timing = response.headers["server-timing"]
+        for entity_type in ("index", "testcase", "project", "tag"):
+            assert f"search-{entity_type};dur=" in timing
+
+    async def test_timed_out_search_gives_partial_results(
+        self, test_client: AsyncClient, sample_data, monkeypatch
+    ):
+        """Test slow result details are dropped while the other results are shown."""
+        from tcm.config import settings
+        from tcm.routes import search_pages
+
+        async def slow_load_tag_results(session, ids):
+            await asyncio.sleep(5)
+            return []
+
+        monkeypatch.setitem(search_pages.RESULT_LOADERS, "tag", slow_load_tag_results)
+        monkeypatch.setattr(settings, "search_timeout", 0.2)
+
+        response = await test_client.get("/search?q=search")
+        assert response.status_code == 200
+        assert b"Search Functionality Test" in response.content
+        assert b"Search for Tags took too long" in response.content
+
+
+@pytest.mark.asyncio
+class TestRankedSearch:
+    """Test suite for ranked, paginated search with facets."""
+
+    async def test_facets_link_to_entity_types(self, test_client: AsyncClient, sample_data):
+        """Test the page shows match counts per entity type."""
+        response = await test_client.get("/search?q=search&entity_type=testcase")
+        assert "All (3)" in response.text
+        assert "Test Cases (1)" in response.text
+        assert 'href="/search?q=search&amp;entity_type=project"' in response.text
+        assert "Search Feature Project" not in response.text
+
+    async def test_results_paginated(self, test_client: AsyncClient, test_session: AsyncSession):
+        """Test results beyond the page size are on the next page."""
+        test_session.add_all(
+            [
+                TestCase(title=f"Paged case {i:02d}", steps="1. Step", expected_results="Works")
+                for i in range(25)
+            ]
+        )
+        await test_session.commit()
+
+        first = await test_client.get("/search?q=paged")
+        second = await test_client.get("/search?q=paged&page=2")
+        assert "Found 25 results" in first.text
+        assert "Page 1 of 2" in first.text
+        assert first.text.count("result-testcase") == 20
+        assert second.text.count("result-testcase") == 5
@@ -0,0 +1,148 @@
+"""
+Integration tests for the static asset pipeline.
+
+Tests fingerprinting, the manifest, precompressed variants and the cache
+headers used when serving built assets.
+"""
+
+import gzip
+import shutil
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from tcm import assets
+from tcm.assets import (
+    STATIC_DIR,
+    AssetStaticFiles,
+    asset_url,
+    build_assets,
+    image_srcset,
+    load_manifest,
+)
+
+
+@pytest.fixture
+def built_static(tmp_path):
+    """Copy the static sources to a temporary directory and build them."""
+    static_dir = tmp_path / "static"
+    shutil.copytree(STATIC_DIR / "css", static_dir / "css")
+    shutil.copytree(STATIC_DIR / "js", static_dir / "js")
+    manifest = build_assets(static_dir)
+    return static_dir, manifest
+
+
+@pytest.fixture
+async def static_client(built_static):
+    """HTTP client for an app serving the built static directory."""
+    static_dir, _ = built_static
+    app = Starlette(routes=[Mount("/static", AssetStaticFiles(directory=str(static_dir)))])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class TestAssetBuild:
+    """Test suite for build_assets."""
+
+    def test_manifest_maps_to_fingerprinted_names(self, built_static):
+        """Test every source file gets a content-hashed name in the manifest."""
+        static_dir, manifest = built_static
+        hashed = manifest["css/styles.css"]
+        assert hashed.startswith("css/styles.") and hashed.endswith(".css")
+        assert hashed != "css/styles.css"
+        assert (static_dir / "dist" / hashed).read_bytes() == (
+            static_dir / "css" / "styles.css"
+        ).read_bytes()
+        assert load_manifest(static_dir) == manifest
+
+    def test_gzip_variant_written(self, built_static):
+        """Test compressible files get a gzip variant with identical content."""
+        static_dir, manifest = built_static
+        built = static_dir / "dist" / manifest["js/tag-picker.js"]
+        compressed = built.with_name(built.name + ".gz")
+        assert gzip.decompress(compressed.read_bytes()) == built.read_bytes()
+
+    def test_fingerprint_changes_with_content(self, built_static):
+        """Test editing a file produces a new fingerprint."""
+        static_dir, manifest = built_static
+        with open(static_dir / "css" / "styles.css", "a") as css:
+            css.write("\n/* changed */\n")
+        rebuilt = build_assets(static_dir)
+        assert rebuilt["css/styles.css"] != manifest["css/styles.css"]
+
+    def test_rebuild_replaces_previous_build(self, built_static):
+        """Test a rebuild swaps in a complete build and leaves no staging directories."""
+        static_dir, manifest = built_static
+        (static_dir / "css" / "extra.css").write_text("body { margin: 0; }\n")
+        rebuilt = build_assets(static_dir)
+
+        assert set(rebuilt) == set(manifest) | {"css/extra.css"}
+        assert load_manifest(static_dir) == rebuilt
+        assert all((static_dir / "dist" / hashed).is_file() for hashed in rebuilt.values())
+        assert sorted(path.name for path in static_dir.iterdir()) == ["css", "dist", "js"]
+
+    def test_asset_url_falls_back_without_manifest(self):
+        """Test unbuilt assets keep their plain static URL."""
+        assert asset_url("does/not/exist.css") == "/static/does/not/exist.css"
+
+    def test_image_srcset_lists_built_variants(self, monkeypatch):
+        """Test the srcset names every built width of a format and nothing else."""
+        manifest = {
+            "images/logo.png": "images/logo.1.png",
+            "images/logo-64w.webp": "images/logo-64w.2.webp",
+            "images/logo-128w.webp": "images/logo-128w.3.webp",
+            "images/logo-64w.avif": "images/logo-64w.4.avif",
+        }
+        monkeypatch.setattr(assets, "load_manifest", lambda: manifest)
+        assert image_srcset("images/logo.png", "webp") == (
+            "/static/dist/images/logo-64w.2.webp 64w, /static/dist/images/logo-128w.3.webp 128w"
+        )
+        assert image_srcset("images/logo.png", "avif") == "/static/dist/images/logo-64w.4.avif 64w"
+        assert image_srcset("images/other.png", "webp") == ""
+
+
+@pytest.mark.asyncio
+class TestAssetServing:
+    """Test suite for AssetStaticFiles."""
+
+    async def test_built_asset_is_immutable(self, static_client, built_static):
+        """Test fingerprinted assets are served with a long-lived immutable policy."""
+        _, manifest = built_static
+        response = await static_client.get(
+            f"/static/dist/{manifest['css/styles.css']}",
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+        assert "content-encoding" not in response.headers
+
+    async def test_gzip_variant_negotiated(self, static_client, built_static):
+        """Test clients accepting gzip receive the precompressed file."""
+        _, manifest = built_static
+        response = await static_client.get(
+            f"/static/dist/{manifest['css/styles.css']}",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/css")
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert b"{" in response.content  # httpx transparently decompresses
+
+    async def test_brotli_variant_negotiated(self, static_client, built_static):
+        """Test clients accepting brotli receive the brotli file when available."""
+        pytest.importorskip("brotli")
+        _, manifest = built_static
+        response = await static_client.get(
+            f"/static/dist/{manifest['js/tag-picker.js']}",
+            headers={"Accept-Encoding": "gzip, br"},
+        )
+        assert response.headers["content-encoding"] == "br"
+
+    async def test_source_files_not_immutable(self, static_client):
+        """Test unfingerprinted files keep default revalidation headers."""
+        response = await static_client.get("/static/css/styles.css")
+        assert response.status_code == 200
+        assert "immutable" not in response.headers.get("cache-control", "")
@@ -88,6 +88,53 @@ class TestTagsListPage:
         assert response.status_code == 200
         assert b"No tags found" in response.content
 
+    async def test_tags_list_streamed_in_category_groups(
+        self, test_client: AsyncClient, sample_tags
+    ):
+        """Test the streamed list wraps each category's rows in its own group."""
+        response = await test_client.get("/tags")
+        assert response.status_code == 200
+        assert "content-length" not in response.headers
+        html = response.text
+        assert html.count('class="category-group"') == 3
+        assert html.count('class="tag-row"') == 4
+        # Categories stream in order, each with its count and its own rows
+        custom, priority, test_type = (
+            html.index("Custom</span>"),
+            html.index("Priority</span>"),
+            html.index("Test Type</span>"),
+        )
+        assert custom < priority < test_type
+        assert "(2)" in html[test_type:]
+        assert html.index("integration") > test_type
+        assert html.rstrip().endswith("</html>")
+
+
+@pytest.mark.asyncio
+class TestTagsListPartial:
+    """Test suite for partial updates of the tags list."""
+
+    async def test_partial_request_streams_results_fragment(
+        self, test_client: AsyncClient, sample_tags
+    ):
+        """Test an HX-Request gets only the tag table, without layout or filters."""
+        response = await test_client.get(
+            "/tags?category=test_type", headers={"HX-Request": "true"}
+        )
+        assert response.status_code == 200
+        assert response.text.startswith('<div data-partial-root="true" id="tags-results"')
+        assert "unit" in response.text and "integration" in response.text
+        assert "my_tag" not in response.text
+        assert "<html" not in response.text
+        assert "All Categories" not in response.text
+        assert "HX-Request" in response.headers["vary"]
+
+    async def test_full_page_wires_partial_updates(self, test_client: AsyncClient, sample_tags):
+        """Test the full page marks the filter form for partial updates."""
+        response = await test_client.get("/tags")
+        assert 'data-partial-target="tags-results"' in response.text
+        assert 'id="tags-results"' in response.text
+
 
 @pytest.mark.asyncio
 class TestCreateTagPage:
@@ -236,3 +236,320 @@ class TestTagsAPI:
         response = await test_client.delete("/api/tags/99999")
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+class TestTagSuggestAPI:
+    """Test suite for the tag typeahead endpoint."""
+
+    async def create_tag(self, client: AsyncClient, category: str, value: str) -> int:
+        """Create a tag and return its ID."""
+        response = await client.post("/api/tags", json={"category": category, "value": value})
+        return response.json()["id"]
+
+    async def test_suggest_by_value_prefix(self, test_client: AsyncClient):
+        """Test tags are matched by the prefix of their value."""
+        await self.create_tag(test_client, "test_type", "smoke")
+        await self.create_tag(test_client, "test_type", "security")
+        await self.create_tag(test_client, "module", "smtp")
+
+        response = await test_client.get("/api/tags/suggest", params={"q": "sm"})
+        assert response.status_code == 200
+        assert sorted(tag["value"] for tag in response.json()) == ["smoke", "smtp"]
+
+    async def test_suggest_by_category_value_prefix(self, test_client: AsyncClient):
+        """Test "category:value" prefixes and the category filter."""
+        await self.create_tag(test_client, "test_type", "smoke")
+        await self.create_tag(test_client, "module", "smtp")
+
+        response = await test_client.get("/api/tags/suggest", params={"q": "module:s"})
+        assert [tag["value"] for tag in response.json()] == ["smtp"]
+
+        response = await test_client.get(
+            "/api/tags/suggest", params={"q": "s", "category": "test_type"}
+        )
+        assert [tag["value"] for tag in response.json()] == ["smoke"]
+
+    async def test_suggest_ranked_by_usage(self, test_client: AsyncClient):
+        """Test more widely used tags are suggested first."""
+        rare = await self.create_tag(test_client, "module", "billing")
+        popular = await self.create_tag(test_client, "module", "basket")
+        for i in range(2):
+            await test_client.post(
+                "/api/testcases",
+                json={
+                    "title": f"Case {i}",
+                    "steps": "Steps",
+                    "expected_results": "Results",
+                    "tag_ids": [popular],
+                },
+            )
+
+        response = await test_client.get("/api/tags/suggest", params={"q": "b"})
+        data = response.json()
+        assert [tag["id"] for tag in data] == [popular, rare]
+        assert data[0]["usage_count"] == 2
+        assert data[1]["usage_count"] == 0
+
+    async def test_suggest_sees_new_tags(self, test_client: AsyncClient):
+        """Test the index is rebuilt after a tag is created."""
+        await test_client.get("/api/tags/suggest", params={"q": "zz"})
+        await self.create_tag(test_client, "module", "zzz")
+
+        response = await test_client.get("/api/tags/suggest", params={"q": "zz"})
+        assert [tag["value"] for tag in response.json()] == ["zzz"]
+
+    async def test_suggest_limit(self, test_client: AsyncClient):
+        """Test the number of suggestions is capped."""
+        for i in range(5):
+            await self.create_tag(test_client, "module", f"mod-{i}")
+
+        response = await test_client.get("/api/tags/suggest", params={"q": "mod", "limit": 3})
+        assert len(response.json()) == 3
+
+
+@pytest.mark.asyncio
+class TestTagCatalogAPI:
+    """Test suite for the versioned tag catalog endpoint."""
+
+    async def create_tag(self, client: AsyncClient, category: str, value: str) -> int:
+        """Create a tag and return its ID."""
+        response = await client.post("/api/tags", json={"category": category, "value": value})
+        return response.json()["id"]
+
+    async def test_full_catalog(self, test_client: AsyncClient):
+        """Test the full catalog lists every tag with the current version."""
+        await self.create_tag(test_client, "module", "billing")
+        await self.create_tag(test_client, "browser", "firefox")
+
+        response = await test_client.get("/api/tags/catalog")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == 2
+        assert data["full"] is True
+        assert data["deleted"] == []
+        assert [(tag["category"], tag["value"]) for tag in data["tags"]] == [
+            ("browser", "firefox"),
+            ("module", "billing"),
+        ]
+        assert set(data["tags"][0]) == {"id", "category", "value", "is_predefined"}
+
+    async def test_empty_catalog(self, test_client: AsyncClient):
+        """Test an empty database has catalog version 0."""
+        response = await test_client.get("/api/tags/catalog")
+        assert response.json() == {"version": 0, "full": True, "tags": [], "deleted": []}
+
+    async def test_delta_since_version(self, test_client: AsyncClient):
+        """Test only tags written and deleted after since_version are returned."""
+        removed = await self.create_tag(test_client, "module", "legacy")
+        kept = await self.create_tag(test_client, "module", "billing")
+        renamed = await self.create_tag(test_client, "module", "basket")
+        version = (await test_client.get("/api/tags/catalog")).json()["version"]
+
+        await test_client.patch(f"/api/tags/{renamed}", json={"value": "cart"})
+        await test_client.delete(f"/api/tags/{removed}")
+        added = await self.create_tag(test_client, "module", "checkout")
+
+        response = await test_client.get("/api/tags/catalog", params={"since_version": version})
+        data = response.json()
+        assert data["full"] is False
+        assert data["version"] == version + 3
+        assert sorted(tag["id"] for tag in data["tags"]) == sorted([renamed, added])
+        assert kept not in [tag["id"] for tag in data["tags"]]
+        assert data["deleted"] == [removed]
+
+        response = await test_client.get(
+            "/api/tags/catalog", params={"since_version": data["version"]}
+        )
+        assert response.json()["tags"] == []
+        assert response.json()["deleted"] == []
+
+    async def test_reused_id_is_not_reported_deleted(self, test_client: AsyncClient):
+        """Test a tag ID reused after deletion is sent as a tag, not a deletion."""
+        await self.create_tag(test_client, "module", "billing")
+        removed = await self.create_tag(test_client, "module", "legacy")
+        version = (await test_client.get("/api/tags/catalog")).json()["version"]
+
+        await test_client.delete(f"/api/tags/{removed}")
+        added = await self.create_tag(test_client, "module", "checkout")
+
+        response = await test_client.get("/api/tags/catalog", params={"since_version": version})
+        data = response.json()
+        assert [tag["id"] for tag in data["tags"]] == [added]
+        assert added not in data["deleted"]
+
+    async def test_tag_assignment_does_not_bump_version(self, test_client: AsyncClient):
+        """Test tagging a test case leaves the catalog version unchanged."""
+        tag_id = await self.create_tag(test_client, "module", "billing")
+        version = (await test_client.get("/api/tags/catalog")).json()["version"]
+
+        await test_client.post(
+            "/api/testcases",
+            json={
+                "title": "Case",
+                "steps": "Steps",
+                "expected_results": "Results",
+                "tag_ids": [tag_id],
+            },
+        )
+
+        assert (await test_client.get("/api/tags/catalog")).json()["version"] == version
+
+    async def test_since_future_version_returns_full_catalog(self, test_client: AsyncClient):
+        """Test a since_version ahead of the server falls back to a full snapshot."""
+        await self.create_tag(test_client, "module", "billing")
+
+        response = await test_client.get("/api/tags/catalog", params={"since_version": 99})
+        data = response.json()
+        assert data["full"] is True
+        assert len(data["tags"]) == 1
+
+    async def test_catalog_conditional_get(self, test_client: AsyncClient):
+        """Test the catalog ETag revalidates until a tag is written."""
+        await self.create_tag(test_client, "module", "billing")
+        response = await test_client.get("/api/tags/catalog")
+        etag = response.headers["etag"]
+
+        response = await test_client.get("/api/tags/catalog", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        await self.create_tag(test_client, "module", "basket")
+        response = await test_client.get("/api/tags/catalog", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+class TestTagUsageCount:
+    """Test suite for the aggregated usage_count field."""
+
+    async def test_usage_count_in_list_and_detail(self, test_client: AsyncClient):
+        """Test list and detail responses include how many test cases use a tag."""
+        used = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()
+        unused = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "ui"})
+        ).json()
+        assert used["usage_count"] == 0
+
+        for i in range(2):
+            await test_client.post(
+                "/api/testcases",
+                json={
+                    "title": f"Case {i}",
+                    "steps": "S",
+                    "expected_results": "R",
+                    "tag_ids": [used["id"]],
+                },
+            )
+
+        response = await test_client.get("/api/tags")
+        counts = {tag["id"]: tag["usage_count"] for tag in response.json()["tags"]}
+        assert counts == {used["id"]: 2, unused["id"]: 0}
+
+        response = await test_client.get(f"/api/tags/{used['id']}")
+        assert response.json()["usage_count"] == 2
+
+    async def test_tagging_invalidates_etags(self, test_client: AsyncClient):
+        """Test assigning a tag changes the tag and tag list ETags."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()
+        tag_etag = (await test_client.get(f"/api/tags/{tag['id']}")).headers["etag"]
+        list_etag = (await test_client.get("/api/tags")).headers["etag"]
+
+        await test_client.post(
+            "/api/testcases",
+            json={"title": "Case", "steps": "S", "expected_results": "R", "tag_ids": [tag["id"]]},
+        )
+
+        response = await test_client.get(
+            f"/api/tags/{tag['id']}", headers={"If-None-Match": tag_etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["usage_count"] == 1
+        response = await test_client.get("/api/tags", headers={"If-None-Match": list_etag})
+        assert response.status_code == 200
+
+    async def test_update_with_if_match(self, test_client: AsyncClient):
+        """Test the ETag from GET satisfies If-Match on PATCH."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()
+        etag = (await test_client.get(f"/api/tags/{tag['id']}")).headers["etag"]
+
+        response = await test_client.patch(
+            f"/api/tags/{tag['id']}", json={"description": "Auth"}, headers={"If-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["usage_count"] == 0
+
+    async def test_if_match_ignores_usage_changes(self, test_client: AsyncClient):
+        """Test assigning a tag does not fail a PATCH carrying the earlier ETag."""
+        response = await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        tag = response.json()
+        etag = (await test_client.get(f"/api/tags/{tag['id']}")).headers["etag"]
+        await test_client.post(
+            "/api/testcases",
+            json={"title": "Case", "steps": "S", "expected_results": "R", "tag_ids": [tag["id"]]},
+        )
+
+        response = await test_client.patch(
+            f"/api/tags/{tag['id']}", json={"description": "Auth"}, headers={"If-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["usage_count"] == 1
+
+    async def test_list_matches_detail_representation(self, test_client: AsyncClient):
+        """Test list items are encoded exactly like the validated detail response."""
+        tag = (
+            await test_client.post(
+                "/api/tags", json={"category": "module", "value": "auth", "description": "Auth"}
+            )
+        ).json()
+
+        listed = (await test_client.get("/api/tags")).json()["tags"]
+        detail = (await test_client.get(f"/api/tags/{tag['id']}")).json()
+        assert listed == [detail]
+        assert list(listed[0]) == list(detail)
+
+
+@pytest.mark.asyncio
+class TestTagSparseFields:
+    """Test suite for sparse fieldsets on the tag list."""
+
+    async def test_summary_fieldset(self, test_client: AsyncClient):
+        """Test fields=summary returns the summary fields with usage counts."""
+        tag = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()
+        await test_client.post(
+            "/api/testcases",
+            json={"title": "Case", "steps": "S", "expected_results": "R", "tag_ids": [tag["id"]]},
+        )
+
+        response = await test_client.get("/api/tags?fields=summary")
+        assert response.json()["tags"] == [
+            {
+                "category": "module",
+                "value": "auth",
+                "is_predefined": False,
+                "id": tag["id"],
+                "usage_count": 1,
+            }
+        ]
+
+    async def test_fieldset_is_part_of_etag(self, test_client: AsyncClient):
+        """Test a cached full listing does not satisfy a sparse request."""
+        await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        etag = (await test_client.get("/api/tags")).headers["etag"]
+
+        response = await test_client.get("/api/tags?fields=value", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert list(response.json()["tags"][0]) == ["value", "id"]
+
+    async def test_unknown_field(self, test_client: AsyncClient):
+        """Test unknown fields are rejected."""
+        response = await test_client.get("/api/tags?fields=color")
+        assert response.status_code == 400
@@ -140,6 +140,55 @@ class TestTestCasesListPage:
         assert b"No test cases found" in response.content
 
 
+@pytest.mark.asyncio
+class TestTestCasesListPartial:
+    """Test suite for partial updates of the test cases list."""
+
+    async def test_partial_request_returns_results_fragment(
+        self, test_client: AsyncClient, sample_testcases, sample_tags
+    ):
+        """Test an HX-Request gets only the table and pagination."""
+        response = await test_client.get(
+            "/testcases?status=active&page_size=1", headers={"HX-Request": "true"}
+        )
+        assert response.status_code == 200
+        assert response.text.startswith('<div data-partial-root="true" id="testcases-results"')
+        assert "Showing 1 of 2 test cases" in response.text
+        assert "/testcases?status=active&amp;page=2" in response.text
+        assert "<html" not in response.text
+        assert "filter-form" not in response.text
+        assert "test_type: functional" not in response.text
+        assert "HX-Request" in response.headers["vary"]
+
+    async def test_full_page_wires_partial_updates(self, test_client: AsyncClient):
+        """Test the full page marks the filter form and results for partial updates."""
+        response = await test_client.get("/testcases")
+        assert 'data-partial-target="testcases-results"' in response.text
+        assert 'data-partial-root="true" id="testcases-results"' in response.text
+        assert "js/partial-lists" in response.text
+        assert "HX-Request" in response.headers["vary"]
+
+    async def test_tag_filter_loaded_from_catalog(self, test_client: AsyncClient, sample_tags):
+        """Test the tag filter only renders the selected tag and loads the rest from the catalog."""
+        response = await test_client.get("/testcases")
+        assert "js/tag-filter" in response.text
+        assert "data-tag-catalog" in response.text
+        assert "test_type: functional" not in response.text
+
+        response = await test_client.get(f"/testcases?tag_id={sample_tags[1].id}")
+        assert f'<option value="{sample_tags[1].id}" selected>test_type: security' in response.text
+        assert "test_type: functional" not in response.text
+
+    async def test_pagination_links_encode_filters(
+        self, test_client: AsyncClient, sample_testcases
+    ):
+        """Test search terms are URL-encoded in pagination links."""
+        response = await test_client.get(
+            "/testcases?search=test user&page_size=1", headers={"HX-Request": "true"}
+        )
+        assert "/testcases?search=test+user&amp;page=2" in response.text
+
+
 @pytest.mark.asyncio
 class TestCreateTestCasePage:
     """Test suite for create test case page."""
@@ -226,12 +275,37 @@ class TestCreateTestCasePage:
         if response.status_code == 200:
             assert b"required" in response.content.lower()
 
-    async def test_create_testcase_shows_available_tags(self, test_client: AsyncClient, sample_tags):
-        """Test that available tags are shown in the form."""
+    async def test_create_testcase_shows_tag_categories(
+        self, test_client: AsyncClient, sample_tags
+    ):
+        """Test that tag categories are offered but the tag catalog is not inlined."""
         response = await test_client.get("/testcases/new")
         assert response.status_code == 200
+        assert b'data-category="test_type"' in response.content
+        assert b'data-category="priority"' in response.content
+        # Tags are fetched from /api/tags/suggest instead of embedded in the page
+        assert b"functional" not in response.content
+        assert b"tagPickerData" not in response.content
+
+    async def test_create_testcase_error_keeps_selected_tags(
+        self, test_client: AsyncClient, sample_tags
+    ):
+        """Test a failed submission re-renders only the selected tags as pills."""
+        response = await test_client.post(
+            "/testcases/new",
+            data={
+                "title": "Tagged",
+                "steps": "Steps",
+                "expected_results": "Results",
+                "status": "bogus",
+                "priority": "low",
+                "tag_ids": [str(sample_tags[0].id)],
+            },
+        )
+        assert response.status_code == 200
+        assert f'data-tag-id="{sample_tags[0].id}"'.encode() in response.content
         assert b"functional" in response.content
-        assert b"security" in response.content
+        assert b"security" not in response.content
 
 
 @pytest.mark.asyncio
@@ -419,3 +419,139 @@ class TestTestCasesAPI:
         response = await test_client.delete(f"/api/testcases/{tc_id}/tags/99999")
         assert response.status_code == 404
         assert "not associated" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+class TestTestCaseListEncoding:
+    """Test suite for the unvalidated list serialization path."""
+
+    async def test_list_matches_detail_representation(self, test_client: AsyncClient):
+        """Test list items are encoded exactly like the validated detail response."""
+        tag_ids = [
+            (
+                await test_client.post("/api/tags", json={"category": "module", "value": value})
+            ).json()["id"]
+            for value in ("auth", "ui")
+        ]
+        created = (
+            await test_client.post(
+                "/api/testcases",
+                json={
+                    "title": "Encoded case",
+                    "steps": "S",
+                    "expected_results": "R",
+                    "status": "active",
+                    "priority": "critical",
+                    "tag_ids": tag_ids,
+                },
+            )
+        ).json()
+        await test_client.post(
+            "/api/testcases", json={"title": "Untagged", "steps": "S", "expected_results": "R"}
+        )
+
+        response = await test_client.get("/api/testcases")
+        assert response.headers["content-type"] == "application/json"
+        listed = {testcase["id"]: testcase for testcase in response.json()["testcases"]}
+        detail = (await test_client.get(f"/api/testcases/{created['id']}")).json()
+        detail["tags"].sort(key=lambda tag: tag["id"])
+        assert listed[created["id"]] == detail
+        assert list(listed[created["id"]]) == list(detail)
+        assert response.json()["testcases"][0]["tags"] == []
+
+
+@pytest.mark.asyncio
+class TestTestCaseSparseFields:
+    """Test suite for sparse fieldsets on the test case list."""
+
+    async def test_summary_fieldset(self, test_client: AsyncClient):
+        """Test fields=summary returns the summary fields with tags."""
+        tag_id = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()["id"]
+        await test_client.post(
+            "/api/testcases",
+            json={"title": "Summary", "steps": "S", "expected_results": "R", "tag_ids": [tag_id]},
+        )
+
+        response = await test_client.get("/api/testcases?fields=summary")
+        assert response.status_code == 200
+        testcase = response.json()["testcases"][0]
+        assert list(testcase) == ["title", "status", "priority", "id", "updated_at", "tags"]
+        assert testcase["tags"][0]["id"] == tag_id
+
+    async def test_explicit_fields_skip_tags(self, test_client: AsyncClient):
+        """Test listed fields are returned in schema order, with id and without tags."""
+        await test_client.post(
+            "/api/testcases", json={"title": "Sparse", "steps": "S", "expected_results": "R"}
+        )
+
+        response = await test_client.get("/api/testcases?fields=status,title")
+        assert response.json()["testcases"] == [
+            {"title": "Sparse", "status": "draft", "id": response.json()["testcases"][0]["id"]}
+        ]
+        assert response.json()["total"] == 1
+
+    async def test_unknown_field(self, test_client: AsyncClient):
+        """Test unknown fields are rejected."""
+        response = await test_client.get("/api/testcases?fields=title,secret")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown fields: secret"
+
+
+@pytest.mark.asyncio
+class TestTestCaseBatchGet:
+    """Test suite for fetching many test cases by ID."""
+
+    async def create(self, test_client: AsyncClient, title: str, **fields) -> dict:
+        """Create a test case and return its JSON."""
+        response = await test_client.post(
+            "/api/testcases", json={"title": title, "steps": "S", "expected_results": "R", **fields}
+        )
+        return response.json()
+
+    async def test_get_by_ids(self, test_client: AsyncClient):
+        """Test ids= returns the test cases in request order and reports missing IDs."""
+        tag_id = (
+            await test_client.post("/api/tags", json={"category": "module", "value": "auth"})
+        ).json()["id"]
+        first = await self.create(test_client, "First", tag_ids=[tag_id])
+        second = await self.create(test_client, "Second")
+
+        response = await test_client.get(
+            f"/api/testcases?ids={second['id']},999,{first['id']},{second['id']}"
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert [testcase["title"] for testcase in body["testcases"]] == ["Second", "First"]
+        assert body["missing"] == [999]
+        detail = (await test_client.get(f"/api/testcases/{first['id']}")).json()
+        assert body["testcases"][1] == detail
+
+    async def test_batch_get(self, test_client: AsyncClient):
+        """Test POST :batchGet with a sparse fieldset."""
+        created = [await self.create(test_client, f"Case {i}") for i in range(3)]
+        ids = [created[2]["id"], created[0]["id"], 12345]
+
+        response = await test_client.post(
+            "/api/testcases:batchGet", json={"ids": ids, "fields": "title"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "testcases": [
+                {"title": "Case 2", "id": created[2]["id"]},
+                {"title": "Case 0", "id": created[0]["id"]},
+            ],
+            "missing": [12345],
+        }
+
+    async def test_invalid_ids(self, test_client: AsyncClient):
+        """Test malformed, oversized and filtered ID lists are rejected."""
+        assert (await test_client.get("/api/testcases?ids=1,x")).status_code == 400
+        too_many = ",".join(str(i) for i in range(1, 1002))
+        assert (await test_client.get(f"/api/testcases?ids={too_many}")).status_code == 400
+        assert (await test_client.get("/api/testcases?ids=1&status=draft")).status_code == 400
+        response = await test_client.post(
+            "/api/testcases:batchGet", json={"ids": list(range(1, 1002))}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,155 @@
+"""
+Unit tests for the single-flight TTL cache.
+"""
+
+import asyncio
+
+import pytest
+
+from tcm.data_cache import TTLCache
+
+
+@pytest.mark.asyncio
+class TestTTLCache:
+    """Test suite for TTLCache."""
+
+    async def test_value_reused_within_ttl(self):
+        """Test a cached value is returned without recomputation."""
+        cache = TTLCache(ttl=60)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"count": len(calls)}
+
+        assert await cache.get_or_compute("key", compute) == {"count": 1}
+        assert await cache.get_or_compute("key", compute) == {"count": 1}
+        assert len(calls) == 1
+        assert cache.hits == 1
+
+    async def test_concurrent_misses_share_one_computation(self):
+        """Test concurrent misses coalesce into a single computation."""
+        cache = TTLCache(ttl=60)
+        calls = []
+        release = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return "value"
+
+        tasks = [asyncio.create_task(cache.get_or_compute("key", compute)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert results == ["value"] * 10
+        assert len(calls) == 1
+        assert cache.coalesced == 9
+
+    async def test_errors_propagate_to_waiters_and_are_not_cached(self):
+        """Test a failed computation reaches all waiters and is retried later."""
+        cache = TTLCache(ttl=60)
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("boom")
+
+        tasks = [asyncio.create_task(cache.get_or_compute("key", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        async def succeeding():
+            return "ok"
+
+        assert await cache.get_or_compute("key", succeeding) == "ok"
+
+    async def test_invalidate_discards_values(self):
+        """Test invalidate forces recomputation."""
+        cache = TTLCache(ttl=60)
+        values = iter(["first", "second"])
+
+        async def compute():
+            return next(values)
+
+        assert await cache.get_or_compute("key", compute) == "first"
+        cache.invalidate()
+        assert await cache.get_or_compute("key", compute) == "second"
+
+    async def test_invalidate_during_computation_skips_store(self):
+        """Test a result computed before a write is not cached after invalidation."""
+        cache = TTLCache(ttl=60)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(cache.get_or_compute("key", slow))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        release.set()
+        assert await task == "stale"
+        assert cache.stats()["entries"] == 0
+
+    async def test_caller_after_invalidate_does_not_join_stale_computation(self):
+        """Test a miss after a write starts a fresh computation."""
+        cache = TTLCache(ttl=60)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "stale"
+
+        async def fresh():
+            return "fresh"
+
+        before = asyncio.create_task(cache.get_or_compute("key", slow))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        after = cache.get_or_compute("key", fresh)
+        assert await asyncio.wait_for(after, timeout=1) == "fresh"
+
+        release.set()
+        assert await before == "stale"
+        # The stale computation finishing does not evict or replace the fresh value
+        assert await cache.get_or_compute("key", slow) == "fresh"
+
+    async def test_zero_ttl_disables_storage(self):
+        """Test a TTL of zero never stores values."""
+        cache = TTLCache(ttl=0)
+
+        async def compute():
+            return 1
+
+        await cache.get_or_compute("key", compute)
+        assert cache.stats()["entries"] == 0
+
+    async def test_cancelled_leader_does_not_fail_waiters(self):
+        """Test cancelling the request that started a computation leaves it to the others."""
+        cache = TTLCache(ttl=60)
+        calls = []
+        release = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return "value"
+
+        leader = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get_or_compute("key", compute)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["value", "value"]
+        assert len(calls) == 1
+        assert await cache.get_or_compute("key", compute) == "value"
+        assert cache.hits == 1
@@ -0,0 +1,81 @@
+"""
+Unit tests for the rendered HTML fragment cache.
+"""
+
+from fasthtml.common import Span, to_xml
+
+from tcm.pages.components.cache import FragmentCache, cached_component, fragment_cache
+from tcm.pages.testcases.list import TestCaseRow
+
+
+class TestFragmentCache:
+    """Test suite for FragmentCache."""
+
+    def test_get_or_render_caches_html(self):
+        """Test the second lookup is served from the cache without rendering."""
+        cache = FragmentCache(max_bytes=1024)
+        calls = []
+
+        def render():
+            calls.append(1)
+            return Span("hello", cls="badge")
+
+        first = cache.get_or_render(("badge", 1), render)
+        second = cache.get_or_render(("badge", 1), render)
+
+        assert len(calls) == 1
+        assert str(first) == str(second)
+        assert 'class="badge"' in str(first)
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert cache.hit_ratio == 0.5
+
+    def test_lru_eviction_by_size(self):
+        """Test least recently used entries are evicted when over the size bound."""
+        cache = FragmentCache(max_bytes=10)
+        cache.put(("a",), "aaaa")
+        cache.put(("b",), "bbbb")
+        cache.get(("a",))  # a becomes most recently used
+        cache.put(("c",), "cccc")
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == "aaaa"
+        assert cache.get(("c",)) == "cccc"
+        assert cache.evictions == 1
+        assert cache.stats()["size_bytes"] == 8
+
+    def test_oversized_fragment_not_stored(self):
+        """Test fragments larger than the cache are never stored."""
+        cache = FragmentCache(max_bytes=4)
+        cache.put(("big",), "too large")
+        assert cache.stats()["entries"] == 0
+
+    def test_cached_component_skips_unkeyed_arguments(self):
+        """Test components render normally when the key function returns None."""
+
+        @cached_component("unit-test-badge", key=lambda value: None)
+        def Badge(value: str):
+            return Span(value)
+
+        result = Badge("x")
+        assert to_xml(result).strip() == "<span>x</span>"
+
+    def test_testcase_row_keyed_on_updated_at(self):
+        """Test a new updated_at renders a fresh row instead of the cached one."""
+        row = {
+            "id": 424242,
+            "title": "Cached title",
+            "status": "active",
+            "priority": "high",
+            "updated_at": "2025-01-01T00:00:00",
+            "tags": [],
+        }
+        assert "Cached title" in str(TestCaseRow(row))
+
+        updated = {**row, "title": "New title", "updated_at": "2025-01-02T00:00:00"}
+        assert "New title" in str(TestCaseRow(updated))
+
+        # Same version returns the cached markup
+        hits = fragment_cache.hits
+        assert "Cached title" in str(TestCaseRow(row))
+        assert fragment_cache.hits == hits + 1
@@ -0,0 +1,70 @@
+"""
+Unit tests for concurrent search execution.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from tcm.routes.search_pages import run_searches, server_timing
+
+
+@asynccontextmanager
+async def session_factory():
+    """Stand-in session factory; the searches below never touch the session."""
+    yield None
+
+
+def sleeping_search(seconds: float, results: list[dict]):
+    """Search that takes the given time and returns the given results."""
+
+    async def search(session):
+        await asyncio.sleep(seconds)
+        return results
+
+    return search
+
+
+@pytest.mark.asyncio
+class TestRunSearches:
+    """Test suite for run_searches."""
+
+    async def test_searches_run_concurrently(self):
+        """Test total latency is that of the slowest search, not the sum."""
+        start = time.perf_counter()
+        results, timings, timed_out = await run_searches(
+            session_factory,
+            {
+                "testcase": sleeping_search(0.2, [{"id": 1}]),
+                "project": sleeping_search(0.2, []),
+                "tag": sleeping_search(0.2, [{"id": 2}]),
+            },
+            timeout=5,
+        )
+        assert time.perf_counter() - start < 0.5
+        assert results == {"testcase": [{"id": 1}], "project": [], "tag": [{"id": 2}]}
+        assert set(timings) == {"testcase", "project", "tag"}
+        assert timed_out == []
+
+    async def test_timeout_returns_partial_results(self):
+        """Test a search exceeding the timeout is dropped and reported."""
+        results, timings, timed_out = await run_searches(
+            session_factory,
+            {"testcase": sleeping_search(0, [{"id": 1}]), "tag": sleeping_search(5, [])},
+            timeout=0.1,
+        )
+        assert results == {"testcase": [{"id": 1}]}
+        assert timed_out == ["tag"]
+        assert timings["tag"] < 1
+
+
+class TestServerTiming:
+    """Test suite for server_timing."""
+
+    def test_server_timing(self):
+        """Test timings are formatted as a Server-Timing header."""
+        assert server_timing({"testcase": 0.0123, "tag": 0.5}) == (
+            "search-testcase;dur=12.3, search-tag;dur=500.0"
+        )
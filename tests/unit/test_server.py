@@ -0,0 +1,140 @@
+"""
+Unit tests for the production server launcher.
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+import tcm
+from tcm import cli, server
+from tcm.config import Settings, pool_limits, worker_count
+
+
+def free_port() -> int:
+    """Return a TCP port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(url: str, timeout: float = 30.0) -> None:
+    """Poll the health check until the server answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise AssertionError(f"{url} did not become healthy")
+
+
+class TestServerSettings:
+    """Test suite for the worker and pool sizing."""
+
+    def test_worker_count(self):
+        """Test an explicit worker count is used and 0 means one per CPU core."""
+        assert worker_count(Settings(server_workers=4)) == 4
+        assert worker_count(Settings(server_workers=0)) == (os.cpu_count() or 1)
+
+    def test_pool_limits_split_connection_budget(self):
+        """Test all workers' pools together stay within the connection budget."""
+        for workers in (1, 3, 16, 200):
+            config = Settings(
+                server_workers=workers, database_max_connections=90, database_pool_size=10
+            )
+            pool_size, max_overflow = pool_limits(config)
+            assert pool_size <= 10
+            assert pool_size + max_overflow == max(1, 90 // workers)
+
+    def test_uvicorn_config(self):
+        """Test the SERVER_* settings reach the workers' uvicorn configuration."""
+        config = server.uvicorn_config(
+            "0.0.0.0",
+            9000,
+            Settings(
+                server_backlog=512,
+                server_keep_alive=20,
+                server_limit_concurrency=300,
+                server_loop="asyncio",
+                server_http="h11",
+                server_graceful_timeout=12.5,
+            ),
+        )
+        assert (config.host, config.port) == ("0.0.0.0", 9000)
+        assert config.backlog == 512
+        assert config.timeout_keep_alive == 20
+        assert config.limit_concurrency == 300
+        assert (config.loop, config.http) == ("asyncio", "h11")
+        assert config.timeout_graceful_shutdown == 12.5
+
+    def test_cli_serve(self, monkeypatch):
+        """Test `tcm serve` passes its options to the launcher."""
+        calls = []
+        monkeypatch.setattr(server, "serve", lambda **kwargs: calls.append(kwargs))
+
+        cli.main(["serve", "--port", "9000", "--workers", "3"])
+
+        assert calls == [{"host": None, "port": 9000, "workers": 3}]
+
+    def test_serve_builds_assets_once(self, monkeypatch):
+        """Test the supervisor builds the assets and tells its workers not to."""
+        builds = []
+        monkeypatch.setattr(server.settings, "build_assets_on_startup", True)
+        monkeypatch.setattr(server.settings, "server_workers", server.settings.server_workers)
+        monkeypatch.setattr(server, "build_assets", builds.append)
+        monkeypatch.setattr(server.Supervisor, "run", lambda self: None)
+        monkeypatch.setenv("BUILD_ASSETS_ON_STARTUP", "true")
+        monkeypatch.setenv("SERVER_WORKERS", "1")
+
+        server.serve(workers=2)
+
+        assert builds == [server.STATIC_DIR]
+        assert os.environ["BUILD_ASSETS_ON_STARTUP"] == "false"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="POSIX signals required")
+class TestSupervisor:
+    """Test suite for the supervisor, running real worker processes."""
+
+    def test_recycles_and_restarts_workers(self):
+        """Test workers are recycled after max requests and restarted on SIGHUP."""
+        port = free_port()
+        url = f"http://127.0.0.1:{port}/health"
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(Path(tcm.__file__).parents[1]),
+            "SERVER_MAX_REQUESTS": "2",
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", "tcm.cli", "serve", "--port", str(port), "--workers", "2"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            wait_until_healthy(url)
+            # More requests than the workers serve before they are recycled
+            for _ in range(8):
+                assert httpx.get(url, timeout=30).status_code == 200
+
+            process.send_signal(signal.SIGHUP)
+            for _ in range(4):
+                assert httpx.get(url, timeout=30).status_code == 200
+        finally:
+            process.send_signal(signal.SIGTERM)
+            _, log = process.communicate(timeout=60)
+
+        assert process.returncode == 0
+        assert log.count("exited with code 0") >= 2
+        assert "Restarting workers" in log
@@ -0,0 +1,150 @@
+"""
+Unit tests for application startup cost.
+
+Importing ``tcm.main`` is what a new worker does before it can serve, so it
+is measured with ``python -X importtime`` in a fresh interpreter.
+"""
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import tcm
+from tcm import main
+from tcm.config import settings
+from tcm.pages import lazy
+
+# Seconds `import tcm.main` may take, as reported by -X importtime. Measured
+# at about 1.1-1.4 s (fastapi and sqlalchemy are most of it); the budget
+# leaves room for slower machines, not for new eager imports.
+STARTUP_BUDGET = 3.0
+
+# Modules that must not be imported until a page is rendered
+DEFERRED_PREFIXES = ("fasthtml", "tcm.pages.")
+
+# Modules imported at startup anyway (the lazy loader itself)
+ALLOWED_AT_STARTUP = {"tcm.pages.lazy"}
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter and parse the -X importtime report.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        (self, cumulative) import time in microseconds, by module name
+    """
+    env = {**os.environ, "PYTHONPATH": str(Path(tcm.__file__).parents[1])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    # Lines look like "import time:  self [us] | cumulative | name", nested imports indented
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+class TestStartup:
+    """Test suite for the import time of the application."""
+
+    def test_import_time(self, record_property):
+        """Test importing the application stays within the startup budget."""
+        times = import_times("tcm.main")
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:15]
+        # Kept in the JUnit report (--junitxml) to follow startup cost over time
+        record_property("startup_us", times["tcm.main"][1])
+        record_property("slowest_imports_us", {name: us for name, (us, _) in slowest})
+
+        report = "\n".join(f"{us:>9} us  {name}" for name, (us, _) in slowest)
+        assert times["tcm.main"][1] / 1e6 < STARTUP_BUDGET, (
+            f"import tcm.main took {times['tcm.main'][1] / 1e6:.2f} s, slowest modules:\n"
+            f"{report}"
+        )
+
+    def test_pages_not_imported_at_startup(self):
+        """Test fasthtml and the page modules are loaded on first use only."""
+        eager = [
+            name
+            for name in import_times("tcm.main")
+            if name.startswith(DEFERRED_PREFIXES) and name not in ALLOWED_AT_STARTUP
+        ]
+        assert eager == []
+
+    def test_database_does_not_import_server(self):
+        """Test the DB layer (Alembic, job pool children) skips the uvicorn supervisor."""
+        imported = import_times("tcm.database")
+        assert "tcm.server" not in imported
+        assert "uvicorn" not in imported
+
+
+class TestLazyModule:
+    """Test suite for the lazy page module proxies."""
+
+    def test_imports_on_first_attribute_access(self):
+        """Test the module is imported when an attribute is first looked up."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from tcm.pages.lazy import lazy_module; "
+                "login = lazy_module('tcm.pages.login'); "
+                "print('tcm.pages.login' in sys.modules); "
+                "login.LoginPage; "
+                "print('tcm.pages.login' in sys.modules)",
+            ],
+            env={**os.environ, "PYTHONPATH": str(Path(tcm.__file__).parents[1])},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.split() == ["False", "True"]
+
+    def test_one_proxy_per_module(self):
+        """Test route modules share the proxy (and loaded module) of a page module."""
+        proxy = lazy.lazy_module("tcm.pages.dashboard")
+        assert lazy.lazy_module("tcm.pages.dashboard") is proxy
+
+        from tcm.pages import dashboard
+
+        assert proxy.DashboardPage is dashboard.DashboardPage
+        lazy.load_all()
+        assert proxy._module is dashboard
+
+
+class TestPreload:
+    """Test suite for preloading the page modules in the lifespan."""
+
+    def test_preload_failure_is_logged(self, monkeypatch, caplog):
+        """Test an import error during preload is reported, not swallowed."""
+
+        def broken_load_all():
+            raise ImportError("broken page module")
+
+        monkeypatch.setattr(settings, "preload_pages", True)
+        monkeypatch.setattr(settings, "jobs_enabled", False)
+        monkeypatch.setattr(lazy, "load_all", broken_load_all)
+
+        async def run_lifespan():
+            async with main.lifespan(main.app):
+                pass
+
+        with caplog.at_level(logging.ERROR, logger="tcm.main"):
+            asyncio.run(run_lifespan())
+
+        assert "Preloading page modules failed" in caplog.text
+        assert "broken page module" in caplog.text
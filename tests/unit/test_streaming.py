@@ -0,0 +1,88 @@
+"""
+Unit tests for streaming page rendering.
+"""
+
+import pytest
+from fasthtml.common import Div, Li, Main, NotStr, P, Ul, to_xml
+
+from tcm.pages.components.layout import PageLayout, _layout
+from tcm.pages.components.streaming import Slot, layout_shell, render_slots, split_slot
+
+
+async def items(*values):
+    """Async iterable over the given values."""
+    for value in values:
+        yield value
+
+
+async def collect(chunks) -> list[str]:
+    """Gather all chunks from an async iterator."""
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+class TestRenderSlots:
+    """Test suite for render_slots."""
+
+    async def test_slots_replaced_in_order(self):
+        """Test each slot marker is replaced by its streamed items."""
+        content = Div(Ul(Slot("first")), Ul(Slot("second")))
+        chunks = await collect(
+            render_slots(
+                content,
+                {"first": items(Li("a"), Li("b")), "second": items(NotStr("<li>c</li>"))},
+            )
+        )
+        assert "".join(chunks) == to_xml(
+            Div(Ul(Li("a"), Li("b")), Ul(Li("c"))), indent=False
+        )
+
+    async def test_markup_before_slot_flushed_first(self):
+        """Test content preceding a slot is yielded before any streamed item."""
+        chunks = await collect(render_slots(Ul(Slot("rows")), {"rows": items(Li("a"))}))
+        assert chunks[0] == "<ul>"
+
+    async def test_items_batched_into_chunks(self):
+        """Test streamed items are batched by size instead of one chunk per item."""
+        rows = [Li(f"row {i}") for i in range(100)]
+        chunks = await collect(
+            render_slots(Ul(Slot("rows")), {"rows": items(*rows)}, chunk_size=200)
+        )
+        assert 3 < len(chunks) < 100
+        assert "".join(chunks) == to_xml(Ul(*rows), indent=False)
+
+    async def test_missing_slot_renders_empty(self):
+        """Test a slot without an iterable is dropped."""
+        chunks = await collect(render_slots(Ul(Slot("rows")), {}))
+        assert "".join(chunks) == "<ul></ul>"
+
+
+class TestShell:
+    """Test suite for layout_shell and split_slot."""
+
+    def test_split_slot(self):
+        """Test a component is split around its slot."""
+        assert split_slot(Div(Slot("x"), cls="box"), "x") == ('<div class="box">', "</div>")
+
+    def test_layout_shell_wraps_content(self):
+        """Test the shell halves wrap content exactly like PageLayout."""
+        head, tail = layout_shell("Shell Title")
+        assert head.startswith("<!doctype html>")
+        assert "<title>Shell Title</title>" in head
+        assert head.endswith('<main class="page-main">')
+        assert head + "<p>x</p>" + tail == to_xml(
+            PageLayout(NotStr("<p>x</p>"), title="Shell Title"), indent=False
+        )
+
+    @pytest.mark.parametrize("show_header", [True, False])
+    @pytest.mark.parametrize("show_footer", [True, False])
+    def test_precomputed_layout_matches_tree(self, show_header, show_footer):
+        """Test PageLayout built from the precomputed shells renders like the full tree."""
+        page = PageLayout(
+            P("x"), title="Tags & <Things>", show_header=show_header, show_footer=show_footer
+        )
+        tree = _layout(
+            Main(P("x"), cls="page-main"), "Tags & <Things>", show_header, show_footer
+        )
+        assert to_xml(page) == to_xml(tree, indent=False)
+        assert "<title>Tags &amp; &lt;Things&gt;</title>" in page
@@ -0,0 +1,51 @@
+"""
+Unit tests for the tag typeahead prefix index.
+"""
+
+from tcm.tag_index import TagSuggestIndex
+
+
+def make_index() -> TagSuggestIndex:
+    """Build an index over a small tag catalog."""
+    tags = [
+        {"id": 1, "category": "test_type", "value": "Smoke", "is_predefined": True},
+        {"id": 2, "category": "test_type", "value": "security", "is_predefined": True},
+        {"id": 3, "category": "module", "value": "smtp", "is_predefined": False},
+        {"id": 4, "category": "module", "value": "search", "is_predefined": False},
+    ]
+    return TagSuggestIndex(tags, usage={3: 5, 2: 1})
+
+
+class TestTagSuggestIndex:
+    """Test suite for TagSuggestIndex."""
+
+    def test_value_prefix_is_case_insensitive(self):
+        """Test value prefixes match regardless of case."""
+        assert [tag["id"] for tag in make_index().suggest("SM")] == [3, 1]
+
+    def test_category_prefix(self):
+        """Test a category prefix matches every tag in the category."""
+        assert {tag["id"] for tag in make_index().suggest("module:")} == {3, 4}
+
+    def test_category_filter(self):
+        """Test the category filter restricts matches."""
+        assert [tag["id"] for tag in make_index().suggest("s", category="test_type")] == [2, 1]
+
+    def test_ranked_by_usage_then_alphabetically(self):
+        """Test most used tags come first and ties are alphabetical."""
+        results = make_index().suggest("s")
+        assert [tag["id"] for tag in results] == [3, 2, 4, 1]
+        assert results[0]["usage_count"] == 5
+
+    def test_tag_matched_once(self):
+        """Test a tag matching by both keys is returned once."""
+        index = TagSuggestIndex(
+            [{"id": 1, "category": "smoke", "value": "smoke", "is_predefined": False}], usage={}
+        )
+        assert len(index.suggest("smoke")) == 1
+
+    def test_limit_and_no_match(self):
+        """Test the limit and empty results."""
+        index = make_index()
+        assert len(index.suggest("", limit=2)) == 2
+        assert index.suggest("zzz") == []